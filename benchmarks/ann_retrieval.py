@@ -0,0 +1,120 @@
+"""Benchmark approximate (IVF) against exact vector search.
+
+Indexes the same clustered random embeddings in VectorIndex and
+IVFVectorIndex, then reports recall@k of the approximate results against
+exact search, with latencies, for a range of nprobe values.
+
+Usage:
+    uv run python -m benchmarks.ann_retrieval --documents 100000
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.ivf_index import IVFVectorIndex
+from src.infrastructure.algorithms.vector_index import VectorIndex
+from src.infrastructure.algorithms.vector_matrix import Vector
+
+
+async def _unused_embed(_text: str) -> list[float]:
+    raise NotImplementedError("The benchmark indexes precomputed vectors")
+
+
+def make_vectors(
+    rng: np.random.Generator, count: int, dimensions: int, topics: int
+) -> Vector:
+    """Create embeddings scattered around random topic directions."""
+    centers = rng.standard_normal((topics, dimensions), dtype=np.float32)
+    vectors = rng.standard_normal((count, dimensions), dtype=np.float32)
+    vectors += 2 * centers[rng.integers(0, topics, count)]
+    return vectors
+
+
+def percentiles(samples: list[float]) -> tuple[float, float]:
+    """Return the p50 and p99 of latencies given in seconds, in ms."""
+    samples.sort()
+    return samples[len(samples) // 2] * 1e3, samples[int(len(samples) * 0.99)] * 1e3
+
+
+def measure(
+    index: VectorIndex,
+    queries: Vector,
+    top_k: int,
+    options: RetrievalOptions | None = None,
+) -> tuple[list[set[UUID]], list[float]]:
+    """Search every query and return the result IDs and latencies."""
+    results, samples = [], []
+    for query in queries:
+        started = time.perf_counter()
+        found = index.search(query, top_k, options)
+        samples.append(time.perf_counter() - started)
+        results.append({document_id for document_id, _ in found})
+    return results, samples
+
+
+async def run(
+    count: int, dimensions: int, queries: int, top_k: int, nlist: int
+) -> None:
+    """Run the benchmark and print the timings."""
+    rng = np.random.default_rng(0)
+    vectors = make_vectors(rng, count, dimensions, topics=max(count // 1000, 1))
+    ids = [uuid4() for _ in range(count)]
+    exact = VectorIndex(_unused_embed)
+    approximate = IVFVectorIndex(_unused_embed, nlist=nlist, min_train_size=count)
+
+    # Queries are noisy copies of indexed documents
+    rows = rng.integers(0, count, queries)
+    noise = rng.standard_normal((queries, dimensions), dtype=np.float32)
+    query_vectors = vectors[rows] + 0.5 * noise
+
+    for document_id, vector in zip(ids, vectors, strict=True):
+        exact.put(document_id, vector)
+    started = time.perf_counter()
+    for document_id, vector in zip(ids, vectors, strict=True):
+        approximate.put(document_id, vector)
+    print(
+        f"ivf: {count} x {dimensions}d into {approximate.nlist} lists, "
+        f"{time.perf_counter() - started:.1f}s including k-means"
+    )
+    del vectors
+
+    truth, samples = measure(exact, query_vectors, top_k)
+    exact_p50, exact_p99 = percentiles(samples)
+    print(f"exact:      p50 {exact_p50:7.2f} ms  p99 {exact_p99:7.2f} ms")
+
+    for nprobe in (1, 2, 4, 8, 16, 32, 64):
+        if nprobe > approximate.nlist:
+            break
+        options = RetrievalOptions(nprobe=nprobe)
+        found, samples = measure(approximate, query_vectors, top_k, options)
+        recall = np.mean(
+            [len(f & t) / len(t) for f, t in zip(found, truth, strict=True)]
+        )
+        p50, p99 = percentiles(samples)
+        print(
+            f"nprobe {nprobe:3d}: p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  "
+            f"recall@{top_k} {recall:.3f}  speedup {exact_p50 / p50:5.1f}x"
+        )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=0, help="0 uses sqrt(documents)")
+    args = parser.parse_args()
+    asyncio.run(
+        run(args.documents, args.dimensions, args.queries, args.top_k, args.nlist)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark BM25 retrieval latency.
+
+Indexes synthetic documents with a Zipf-distributed vocabulary, then
+measures search latency for random multi-term queries, end-to-end
+BM25RAGStrategy retrieval, and the cost of incremental updates.
+
+Usage:
+    uv run python -m benchmarks.bm25_retrieval --documents 1000000
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.bm25_index import BM25Index
+from src.infrastructure.algorithms.bm25_rag_strategy import BM25RAGStrategy
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+
+
+def make_vocabulary(rng: random.Random, size: int) -> list[str]:
+    """Create random lowercase words."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [
+        "".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+        for _ in range(size)
+    ]
+
+
+def make_documents(
+    rng: random.Random, vocabulary: list[str], cumulative: list[float], count: int
+) -> list[Document]:
+    """Create documents whose words follow the cumulative vocabulary weights."""
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        Document(
+            title=" ".join(rng.choices(vocabulary, cum_weights=cumulative, k=4)),
+            content=" ".join(
+                rng.choices(vocabulary, cum_weights=cumulative, k=rng.randint(20, 80))
+            ),
+            created_at=base + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def percentiles(samples: list[float]) -> str:
+    """Format the p50 and p99 of latencies given in seconds."""
+    samples.sort()
+    p50 = samples[len(samples) // 2] * 1e3
+    p99 = samples[int(len(samples) * 0.99)] * 1e3
+    return f"p50 {p50:.2f} ms  p99 {p99:.2f} ms"
+
+
+async def run(count: int, queries: int, batch_size: int) -> None:
+    """Run the benchmark and print the timings."""
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(rng, 50_000)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    cumulative = list(itertools.accumulate(weights))
+    repository = InMemoryDocumentRepository()
+    index = BM25Index()
+
+    started = time.perf_counter()
+    for start in range(0, count, batch_size):
+        batch = make_documents(
+            rng, vocabulary, cumulative, min(batch_size, count - start)
+        )
+        await repository.save_many(batch)
+    print(f"ingest: {count} docs in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    await index.load(repository.iter_all(batch_size=batch_size))
+    print(f"index load: {time.perf_counter() - started:.1f}s")
+
+    # Query terms skip the most frequent ranks, which act like stop words
+    query_vocabulary = vocabulary[20:]
+    query_cumulative = list(itertools.accumulate(weights[20:]))
+    query_terms = [
+        " ".join(
+            rng.choices(
+                query_vocabulary, cum_weights=query_cumulative, k=rng.randint(2, 4)
+            )
+        )
+        for _ in range(queries)
+    ]
+    samples = []
+    for query in query_terms:
+        started = time.perf_counter()
+        index.search(query, top_k=10)
+        samples.append(time.perf_counter() - started)
+    print(f"index.search:       {percentiles(samples)}")
+
+    strategy = BM25RAGStrategy(repository, index)
+    samples = []
+    for query in query_terms:
+        started = time.perf_counter()
+        await strategy.retrieve_documents(query, top_k=10)
+        samples.append(time.perf_counter() - started)
+    print(f"retrieve_documents: {percentiles(samples)}")
+
+    updates = make_documents(rng, vocabulary, cumulative, 1000)
+    started = time.perf_counter()
+    for document in updates:
+        await index.add([document])
+        await index.remove(document.id)
+    elapsed = time.perf_counter() - started
+    print(f"add + remove: {elapsed / len(updates) * 1e6:.0f} us per document")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.documents, args.queries, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
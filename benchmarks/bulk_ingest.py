@@ -0,0 +1,79 @@
+"""Benchmark bulk NDJSON ingestion against one POST per document.
+
+Both paths run in-process through the ASGI app with an in-memory repository.
+
+Usage:
+    uv run python -m benchmarks.bulk_ingest --documents 20000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from src.domain.document.repositories.document_repository import DocumentRepository
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+from src.presentation.api.app import create_app
+from src.presentation.api.dependencies import get_document_repository
+
+
+def make_payloads(count: int) -> list[dict[str, str]]:
+    """Create document payloads."""
+    return [
+        {
+            "title": f"Document {i}",
+            "content": f"Synthetic content for document {i}. " * 8,
+            "source": f"source-{i % 100}.txt",
+        }
+        for i in range(count)
+    ]
+
+
+def make_client(repository: DocumentRepository) -> httpx.AsyncClient:
+    """Create an in-process client bound to the given repository."""
+    app = create_app()
+    app.dependency_overrides[get_document_repository] = lambda: repository
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+    )
+
+
+async def run(count: int, batch_size: int) -> None:
+    """Run both ingestion paths and print their throughput."""
+    payloads = make_payloads(count)
+
+    repository = InMemoryDocumentRepository()
+    async with make_client(repository) as client:
+        started = time.perf_counter()
+        for payload in payloads:
+            await client.post("/api/documents", json=payload)
+        single = time.perf_counter() - started
+    print(f"POST per document: {count / single:,.0f} docs/s")
+
+    body = "\n".join(json.dumps(payload) for payload in payloads).encode()
+    repository = InMemoryDocumentRepository()
+    async with make_client(repository) as client:
+        started = time.perf_counter()
+        response = await client.post(
+            f"/api/documents/bulk?batch_size={batch_size}", content=body
+        )
+        bulk = time.perf_counter() - started
+    assert response.json()["inserted"] == count
+    print(f"POST /bulk:        {count / bulk:,.0f} docs/s ({single / bulk:.1f}x)")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.documents, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
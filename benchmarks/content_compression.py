@@ -0,0 +1,154 @@
+"""Benchmark compressed document bodies in the in-memory repository.
+
+Compares memory held by the repository with uncompressed, zlib and lzma
+bodies, and the latency of find_by_id and of RAG retrieval (the part of a
+RAG query that reads documents) for each mode.
+
+Usage:
+    uv run python -m benchmarks.content_compression --documents 50000
+"""
+
+import argparse
+import asyncio
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.simple_rag_strategy import SimpleRAGStrategy
+from src.infrastructure.repositories.content_codec import ContentCodec
+from src.infrastructure.repositories.content_store import ContentStore
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+
+_MODES = ("none", "zlib", "lzma")
+
+
+def make_documents(count: int, seed: int = 0) -> list[Document]:
+    """Create documents of prose-like text with a Zipf-distributed vocabulary."""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(
+            rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10))
+        )
+        for _ in range(5000)
+    ]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    documents = []
+    for i in range(count):
+        words = rng.choices(vocabulary, weights, k=rng.randint(50, 400))
+        documents.append(
+            Document(
+                title=f"Document {i}",
+                content=" ".join(words) + ".",
+                source=f"source-{i % 100}.txt",
+                created_at=base + timedelta(seconds=i),
+            )
+        )
+    return documents
+
+
+def make_repository(mode: str) -> InMemoryDocumentRepository:
+    """Create a repository storing bodies as configured by mode."""
+    if mode == "none":
+        return InMemoryDocumentRepository()
+    codec = ContentCodec("zlib" if mode == "zlib" else "lzma")
+    return InMemoryDocumentRepository(contents=ContentStore(codec))
+
+
+async def fill(mode: str, documents: list[Document]) -> InMemoryDocumentRepository:
+    """Save the documents into a new repository in batches."""
+    repository = make_repository(mode)
+    for start in range(0, len(documents), 1000):
+        await repository.save_many(documents[start : start + 1000])
+    return repository
+
+
+async def latency_us(
+    operation: Callable[[], Awaitable[Any]], iterations: int
+) -> tuple[float, float]:
+    """Return the median and p99 latency of an operation in microseconds."""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await operation()
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+
+async def measure_reads(
+    repository: InMemoryDocumentRepository,
+    ids: list[UUID],
+    hot_ids: list[UUID],
+    iterations: int,
+) -> tuple[tuple[float, float], ...]:
+    """Measure find_by_id on random and on recently read IDs, and retrieval."""
+    rng = random.Random(2)
+    strategy = SimpleRAGStrategy(repository)
+    return (
+        await latency_us(lambda: repository.find_by_id(rng.choice(ids)), iterations),
+        await latency_us(
+            lambda: repository.find_by_id(rng.choice(hot_ids)), iterations
+        ),
+        await latency_us(
+            lambda: strategy.retrieve_documents("query", top_k=5), iterations
+        ),
+    )
+
+
+async def run(count: int, iterations: int) -> None:
+    """Run the benchmark and print one line per mode."""
+    documents = make_documents(count)
+    ids = [document.id for document in documents]
+    rng = random.Random(1)
+    hot_ids = rng.sample(ids, 64)
+    print(
+        f"{'mode':<6} {'MiB':>8} {'ingest s':>9} "
+        f"{'find cold p50/p99 us':>22} {'find hot p50/p99 us':>21} "
+        f"{'rag p50/p99 us':>16}"
+    )
+    for mode in _MODES:
+        # Built while tracing, so the repository's strings are counted
+        gc.collect()
+        tracemalloc.start()
+        repository = await fill(mode, make_documents(count))
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del repository
+
+        started = time.perf_counter()
+        repository = await fill(mode, documents)
+        ingest = time.perf_counter() - started
+
+        cold, hot, rag = await measure_reads(repository, ids, hot_ids, iterations)
+        print(
+            f"{mode:<6} {retained / 2**20:>8.1f} {ingest:>9.2f} "
+            f"{cold[0]:>10.1f}/{cold[1]:<11.1f} {hot[0]:>9.1f}/{hot[1]:<11.1f} "
+            f"{rag[0]:>7.1f}/{rag[1]:<8.1f}"
+        )
+        stats = await repository.stats()
+        if "compression_ratio" in stats:
+            print(f"       compression ratio {stats['compression_ratio']:.2f}")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=50_000)
+    parser.add_argument("--iterations", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.documents, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark token-budgeted context packing.
+
+Builds retrieval results of long documents made of generic sentences, with
+one sentence answering the query hidden at a random position in each. Times
+ContextPacker.pack and reports the estimated prompt tokens with and without
+packing, and how many answer sentences reach the prompt compared with
+truncating every document to the same per-document budget.
+
+Usage:
+    uv run python -m benchmarks.context_packing --documents 10 --sentences 400
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.context_packer import (
+    SEPARATOR,
+    ContextPacker,
+    estimate_tokens,
+    format_document,
+)
+
+_WORDS = [f"term{i}" for i in range(5000)]
+_QUERY_TERMS = ["glacier", "meltwater", "discharge"]
+
+
+def make_documents(
+    count: int, sentences: int, rng: random.Random
+) -> tuple[list[Document], list[str]]:
+    """Return long documents and the answer sentence hidden in each."""
+    documents = []
+    answers = []
+    for i in range(count):
+        body = [
+            " ".join(rng.choices(_WORDS, k=rng.randint(8, 20))).capitalize() + "."
+            for _ in range(sentences)
+        ]
+        answer = f"Glacier {i} meltwater discharge peaks in late summer."
+        body.insert(rng.randrange(len(body)), answer)
+        documents.append(Document(title=f"Report {i}", content=" ".join(body)))
+        answers.append(answer)
+    return documents, answers
+
+
+def truncate(documents: list[Document], document_tokens: int) -> str:
+    """Return the context keeping only the beginning of each document."""
+    return SEPARATOR.join(
+        format_document(document)[: document_tokens * 4] for document in documents
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the benchmark and print the results."""
+    rng = random.Random(args.seed)
+    documents, answers = make_documents(args.documents, args.sentences, rng)
+    query = " ".join(_QUERY_TERMS)
+    packer = ContextPacker(args.max_tokens, args.document_tokens)
+
+    latencies = []
+    packed = packer.pack(query, documents)
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        packed = packer.pack(query, documents)
+        latencies.append((time.perf_counter() - started) * 1e3)
+
+    original = SEPARATOR.join(format_document(document) for document in documents)
+    truncated = truncate(documents, args.document_tokens)
+    quantiles = statistics.quantiles(latencies, n=20)
+    print(
+        f"{len(documents)} documents, {estimate_tokens(original)} tokens unpacked, "
+        f"budget {args.max_tokens} ({args.document_tokens} per document)"
+    )
+    print(
+        f"pack latency           mean {statistics.fmean(latencies):7.2f} ms  "
+        f"p50 {statistics.median(latencies):7.2f} ms  p95 {quantiles[18]:7.2f} ms"
+    )
+    print(
+        f"packed context         {packed.usage.tokens} tokens, "
+        f"{packed.usage.tokens_saved} saved, "
+        f"{packed.usage.documents_compressed} compressed, "
+        f"{packed.usage.documents_dropped} dropped"
+    )
+    for name, text in [("extracted", packed.text), ("truncated", truncated)]:
+        kept = sum(answer in text for answer in answers)
+        print(f"{name:<22} {kept}/{len(answers)} answer sentences in the prompt")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=10)
+    parser.add_argument("--sentences", type=int, default=400)
+    parser.add_argument("--max-tokens", type=int, default=3000)
+    parser.add_argument("--document-tokens", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark per-document memory and construction cost of DocumentRecord.
+
+Compares the pydantic Document with the compact DocumentRecord that the
+repositories keep, building both from the stored form a bulk load reads
+(int IDs and microsecond timestamps).
+
+Usage:
+    uv run python -m benchmarks.document_memory --documents 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID, uuid4
+
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_record import (
+    DocumentRecord,
+    micros_to_datetime,
+)
+
+_Row = tuple[int, str, str, str, int, int]
+
+
+def make_rows(count: int) -> list[_Row]:
+    """Create stored rows as a bulk loader would read them."""
+    base = 1_700_000_000_000_000
+    return [
+        (
+            uuid4().int,
+            f"Document {i}",
+            f"Content of document {i}",
+            f"source-{i % 100}.pdf",
+            base + i,
+            base + i,
+        )
+        for i in range(count)
+    ]
+
+
+def to_document(row: _Row) -> Document:
+    """Build a validated Document from a stored row."""
+    return Document(
+        id=UUID(int=row[0]),
+        title=row[1],
+        content=row[2],
+        source=row[3],
+        created_at=micros_to_datetime(row[4]),
+        updated_at=micros_to_datetime(row[5]),
+    )
+
+
+def to_record(row: _Row) -> DocumentRecord:
+    """Build a DocumentRecord from a stored row."""
+    return DocumentRecord(*row)
+
+
+def measure(label: str, items: list[Any], build: Callable[[Any], Any]) -> None:
+    """Print retained memory per object and construction throughput."""
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(item) for item in items]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    gc.collect()
+    started = time.perf_counter()
+    objects = [build(item) for item in items]
+    elapsed = time.perf_counter() - started
+    del objects
+
+    print(
+        f"{label:<28} {retained / len(items):>7.0f} B/doc "
+        f"{len(items) / elapsed:>12,.0f} docs/s"
+    )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=100_000)
+    args = parser.parse_args()
+    rows = make_rows(args.documents)
+
+    # Title and content strings are shared by both representations, so the
+    # memory figures are the per-document overhead on top of the text.
+    measure("Document (validated)", rows, to_document)
+    measure("DocumentRecord", rows, to_record)
+
+    records = [to_record(row) for row in rows]
+    measure("DocumentRecord.to_document", records, DocumentRecord.to_document)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Benchmark micro-batching of embedding calls.
+
+Simulates an embeddings endpoint with a fixed per-request latency, a small
+per-text cost and a cap on concurrent requests, then compares upstream calls
+and wall time with and without EmbeddingBatcher for bulk ingest (chunks
+through VectorIndex.add) and for many concurrent queries.
+
+Usage:
+    uv run python -m benchmarks.embedding_batching --chunks 100000
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.vector_index import Embed, VectorIndex
+from src.infrastructure.external.embedding_batcher import EmbeddingBatcher
+
+
+class SimulatedEndpoint:
+    """Embeddings endpoint with request latency and a concurrency limit."""
+
+    def __init__(
+        self, latency_ms: float, per_text_ms: float, max_concurrency: int
+    ) -> None:
+        self._latency = latency_ms / 1000
+        self._per_text = per_text_ms / 1000
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.calls = 0
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts in one simulated request."""
+        async with self._slots:
+            self.calls += 1
+            await asyncio.sleep(self._latency + self._per_text * len(texts))
+            return [[float(len(text)), 1.0] for text in texts]
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed one text in its own simulated request."""
+        return (await self.embed_batch([text]))[0]
+
+
+async def ingest(embed: Embed, chunks: int, batch_size: int) -> float:
+    """Index synthetic chunks through VectorIndex.add; return the seconds."""
+    index = VectorIndex(embed)
+    started = time.perf_counter()
+    for start in range(0, chunks, batch_size):
+        await index.add(
+            [
+                Document(title="Chunk", content=f"passage {i}")
+                for i in range(start, min(start + batch_size, chunks))
+            ]
+        )
+    return time.perf_counter() - started
+
+
+async def queries(embed: Embed, count: int) -> float:
+    """Embed concurrent queries; return the seconds."""
+    started = time.perf_counter()
+    await asyncio.gather(*(embed(f"query {i}") for i in range(count)))
+    return time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the benchmark and print the results."""
+    chunks, unbatched_chunks = args.chunks, args.unbatched_chunks
+    concurrent_queries = args.queries
+
+    def endpoint() -> SimulatedEndpoint:
+        return SimulatedEndpoint(args.latency_ms, args.per_text_ms, args.concurrency)
+
+    direct = endpoint()
+    elapsed = await ingest(direct.embed, unbatched_chunks, args.batch_size)
+    print(
+        f"ingest {unbatched_chunks} chunks unbatched: {direct.calls} calls, "
+        f"{elapsed:.1f}s ({elapsed / unbatched_chunks * 1e3:.2f} ms per chunk)"
+    )
+
+    batched = endpoint()
+    batcher = EmbeddingBatcher(
+        batched.embed_batch, args.max_items, max_wait_ms=args.max_wait_ms
+    )
+    elapsed = await ingest(batcher.embed, chunks, args.batch_size)
+    print(
+        f"ingest {chunks} chunks batched:   {batched.calls} calls, "
+        f"{elapsed:.1f}s ({elapsed / chunks * 1e3:.3f} ms per chunk)"
+    )
+
+    direct = endpoint()
+    elapsed = await queries(direct.embed, concurrent_queries)
+    print(
+        f"{concurrent_queries} concurrent queries unbatched: "
+        f"{direct.calls} calls, {elapsed * 1e3:.0f} ms"
+    )
+    batched = endpoint()
+    batcher = EmbeddingBatcher(
+        batched.embed_batch, args.max_items, max_wait_ms=args.max_wait_ms
+    )
+    elapsed = await queries(batcher.embed, concurrent_queries)
+    print(
+        f"{concurrent_queries} concurrent queries batched:   "
+        f"{batched.calls} calls, {elapsed * 1e3:.0f} ms"
+    )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--unbatched-chunks", type=int, default=5_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--per-text-ms", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-items", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
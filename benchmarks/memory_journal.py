@@ -0,0 +1,77 @@
+"""Benchmark cold start of the journaled in-memory repository.
+
+Fills a repository, writes a snapshot, appends a WAL tail, and measures how
+long a fresh repository takes to restore from them.
+
+Usage:
+    uv run python -m benchmarks.memory_journal --documents 1000000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+
+from src.domain.document.models.document import Document
+from src.infrastructure.repositories.document_journal import DocumentJournal
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+
+
+def make_documents(start: int, count: int) -> list[Document]:
+    """Create synthetic documents with increasing timestamps."""
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        Document(
+            title=f"Document {i}",
+            content=f"Synthetic content for document {i}. " * 8,
+            source=f"source-{i % 100}.txt",
+            created_at=base + timedelta(seconds=i),
+        )
+        for i in range(start, start + count)
+    ]
+
+
+async def run(count: int, tail: int, batch_size: int) -> None:
+    """Run the benchmark and print restore timings."""
+    with tempfile.TemporaryDirectory() as directory:
+        journal = DocumentJournal(directory, snapshot_interval=count * 2)
+        repository = InMemoryDocumentRepository(journal)
+        started = time.perf_counter()
+        for start in range(0, count, batch_size):
+            await repository.save_many(
+                make_documents(start, min(batch_size, count - start))
+            )
+        print(f"ingest: {count} docs in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        journal.snapshot(list(repository._records.values()), wait=True)
+        print(f"snapshot write: {time.perf_counter() - started:.1f}s")
+        await repository.save_many(make_documents(count, tail))
+        repository.close()
+
+        started = time.perf_counter()
+        restored = InMemoryDocumentRepository(DocumentJournal(directory))
+        elapsed = time.perf_counter() - started
+        total = await restored.count()
+        print(
+            f"cold start: {total} docs (snapshot + {tail} WAL entries) in "
+            f"{elapsed:.1f}s ({total / elapsed:,.0f} docs/s)"
+        )
+        restored.close()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--tail", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.documents, args.tail, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark the overhead of MMR reranking.
+
+Builds candidate lists of near-duplicate groups (several lightly edited
+copies of each topic, ordered as a retriever would return them: every copy
+of the best topic first), then times MMRReranker.rerank with shingle
+similarity, with and without its fingerprint cache, and with embedding
+similarity. Embeddings come from an in-memory table, as they would from a
+warm embedding cache, so only the local work is measured.
+Reports the latency per query and the distinct topics reaching the prompt
+with and without reranking.
+
+Usage:
+    uv run python -m benchmarks.mmr_reranking --candidates 200 --top-k 10
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import numpy as np
+
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.mmr_reranker import MMRReranker, mmr
+from src.infrastructure.algorithms.similarity import (
+    EmbeddingSimilarity,
+    ShingleSimilarity,
+    SimilaritySource,
+)
+
+_WORDS = [f"term{i}" for i in range(5000)]
+
+
+def make_candidates(
+    count: int, copies: int, words: int, rng: random.Random
+) -> tuple[list[Document], dict[str, int]]:
+    """Return candidates in retrieval order and each title's topic."""
+    documents: list[Document] = []
+    topics: dict[str, int] = {}
+    for topic in range(-(-count // copies)):
+        base = rng.choices(_WORDS, k=words)
+        for copy in range(min(copies, count - len(documents))):
+            text = list(base)
+            for position in rng.sample(range(words), words // 20):
+                text[position] = rng.choice(_WORDS)
+            title = f"Topic {topic} copy {copy}"
+            topics[title] = topic
+            documents.append(Document(title=title, content=" ".join(text)))
+    return documents, topics
+
+
+def embedding_table(
+    documents: list[Document], query: str, dimensions: int, seed: int
+) -> dict[str, list[float]]:
+    """Return embeddings where copies of a topic are close to each other."""
+    rng = np.random.default_rng(seed)
+    table = {query: rng.standard_normal(dimensions).tolist()}
+    centers: dict[str, np.ndarray] = {}
+    for document in documents:
+        topic = document.title.split(" copy ")[0]
+        if topic not in centers:
+            centers[topic] = rng.standard_normal(dimensions)
+        noise = 0.2 * rng.standard_normal(dimensions)
+        table[f"{document.title}\n\n{document.content}"] = (
+            centers[topic] + noise
+        ).tolist()
+    return table
+
+
+async def measure(
+    similarity: SimilaritySource,
+    query: str,
+    documents: list[Document],
+    top_k: int,
+    repeat: int,
+) -> tuple[list[float], list[Document]]:
+    """Rerank repeatedly; return the latencies in ms and the last result."""
+    reranker = MMRReranker(similarity)
+    latencies = []
+    reranked: list[Document] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        reranked = await reranker.rerank(query, documents, top_k)
+        latencies.append((time.perf_counter() - started) * 1e3)
+    return latencies, reranked
+
+
+def report(name: str, latencies: list[float]) -> None:
+    """Print latency statistics in ms."""
+    quantiles = statistics.quantiles(latencies, n=20)
+    print(
+        f"{name:<22} mean {statistics.fmean(latencies):7.2f} ms  "
+        f"p50 {statistics.median(latencies):7.2f} ms  p95 {quantiles[18]:7.2f} ms"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the benchmark and print the results."""
+    rng = random.Random(args.seed)
+    documents, topics = make_candidates(args.candidates, args.copies, args.words, rng)
+    query = " ".join(rng.sample(_WORDS, 5))
+    table = embedding_table(documents, query, args.dimensions, args.seed)
+
+    async def embed(text: str) -> list[float]:
+        return table[text]
+
+    def distinct(selected: list[Document]) -> int:
+        return len({topics[document.title] for document in selected})
+
+    print(
+        f"{len(documents)} candidates in groups of {args.copies}, "
+        f"top {args.top_k}; without reranking the prompt covers "
+        f"{distinct(documents[: args.top_k])} topics"
+    )
+    sources: list[tuple[str, SimilaritySource]] = [
+        ("shingle (uncached)", ShingleSimilarity(cache_size=0)),
+        ("shingle (cached)", ShingleSimilarity()),
+        (f"embedding ({args.dimensions}d)", EmbeddingSimilarity(embed)),
+    ]
+    for name, similarity in sources:
+        latencies, reranked = await measure(
+            similarity, query, documents, args.top_k, args.repeat
+        )
+        report(name, latencies)
+        print(f"{'':<22} prompt covers {distinct(reranked)} topics")
+
+    relevance, matrix = await sources[1][1].similarities(query, documents)
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        mmr(relevance, matrix, args.top_k)
+        latencies.append((time.perf_counter() - started) * 1e3)
+    report("selection only", latencies)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--copies", type=int, default=5)
+    parser.add_argument("--words", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark compressed vector storage against exact float32 search.
+
+Indexes the same random embeddings in a float32 VectorIndex and
+in indexes storing float16 or int8 codes, optionally after random
+projection, then reports resident bytes per vector, latency and recall@k
+against exact search, without and with exact rescoring of the candidates.
+
+By default the embeddings are isotropic noise around topic centers, the
+worst case for random projection. Real embeddings concentrate in far fewer
+directions than their dimension; ``--rank`` generates such data.
+
+Usage:
+    uv run python -m benchmarks.quantized_vectors --documents 100000
+"""
+
+import argparse
+import asyncio
+import gc
+from uuid import uuid4
+
+import numpy as np
+
+from benchmarks.ann_retrieval import make_vectors, measure, percentiles
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.vector_index import VectorIndex
+from src.infrastructure.algorithms.vector_matrix import Vector
+from src.infrastructure.algorithms.vector_quantization import Precision
+
+CONFIGURATIONS: list[tuple[Precision, int]] = [
+    ("float16", 0),
+    ("int8", 0),
+    ("float16", 512),
+    ("int8", 512),
+    ("int8", 256),
+]
+
+
+def make_low_rank_vectors(
+    rng: np.random.Generator, count: int, dimensions: int, rank: int
+) -> Vector:
+    """Create embeddings in a random subspace with decaying variance, plus noise."""
+    basis = rng.standard_normal((rank, dimensions), dtype=np.float32)
+    spectrum = 1 / np.sqrt(np.arange(1, rank + 1, dtype=np.float32))
+    vectors = (rng.standard_normal((count, rank), dtype=np.float32) * spectrum) @ basis
+    vectors += 0.3 * rng.standard_normal((count, dimensions), dtype=np.float32)
+    return vectors.astype(np.float32, copy=False)
+
+
+async def _unused_embed(_text: str) -> list[float]:
+    raise NotImplementedError("The benchmark indexes precomputed vectors")
+
+
+async def run(
+    count: int,
+    dimensions: int,
+    rank: int,
+    queries: int,
+    top_k: int,
+    rescore_factors: list[int],
+) -> None:
+    """Run the benchmark and print the results."""
+    rng = np.random.default_rng(0)
+    if rank:
+        vectors = make_low_rank_vectors(rng, count, dimensions, rank)
+    else:
+        vectors = make_vectors(rng, count, dimensions, topics=max(count // 1000, 1))
+    ids = [uuid4() for _ in range(count)]
+    # Queries are noisy copies of indexed documents
+    rows = rng.integers(0, count, queries)
+    noise = rng.standard_normal((queries, dimensions), dtype=np.float32)
+    query_vectors = vectors[rows] + 0.5 * noise
+
+    exact = VectorIndex(_unused_embed, initial_capacity=count)
+    for document_id, vector in zip(ids, vectors, strict=True):
+        exact.put(document_id, vector)
+    truth, samples = measure(exact, query_vectors, top_k)
+    p50, _ = percentiles(samples)
+    shape = f"rank {rank}" if rank else "isotropic clusters"
+    print(f"{count} x {dimensions}d ({shape}), recall@{top_k} against exact float32")
+    print(
+        f"{'float32':>8s} {'full':>5s}  {exact.nbytes / count:6.0f} B/vector  "
+        f"p50 {p50:6.2f} ms  recall 1.000"
+    )
+    del exact
+    gc.collect()
+
+    for precision, projection in CONFIGURATIONS:
+        index = VectorIndex(
+            _unused_embed,
+            initial_capacity=count,
+            precision=precision,
+            projection_dimensions=projection,
+        )
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+        for factor in rescore_factors:
+            options = RetrievalOptions(rescore_factor=factor)
+            found, samples = measure(index, query_vectors, top_k, options)
+            recall = np.mean(
+                [len(f & t) / len(t) for f, t in zip(found, truth, strict=True)]
+            )
+            p50, _ = percentiles(samples)
+            rescoring = f"rescore x{factor}" if factor else "no rescore"
+            print(
+                f"{precision:>8s} {projection or 'full':>5}  "
+                f"{index.nbytes / count:6.0f} B/vector  p50 {p50:6.2f} ms  "
+                f"recall {recall:.3f}  ({rescoring})"
+            )
+        await index.clear()
+        del index
+        gc.collect()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument(
+        "--rank", type=int, default=0, help="0 uses isotropic topic clusters"
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--rescore-factors", type=int, nargs="+", default=[0, 2, 4, 10])
+    args = parser.parse_args()
+    asyncio.run(
+        run(
+            args.documents,
+            args.dimensions,
+            args.rank,
+            args.queries,
+            args.top_k,
+            args.rescore_factors,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark SqliteDocumentRepository insert and page-read throughput.
+
+Usage:
+    uv run python -m benchmarks.sqlite_document_repository --rows 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.infrastructure.repositories.sqlite_document_repository import (
+    SqliteDocumentRepository,
+)
+
+
+def make_documents(start: int, count: int) -> list[Document]:
+    """Create synthetic documents with increasing timestamps."""
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        Document(
+            title=f"Document {i}",
+            content=f"Synthetic content for document {i}. " * 8,
+            source=f"source-{i % 100}.txt",
+            created_at=base + timedelta(seconds=i),
+        )
+        for i in range(start, start + count)
+    ]
+
+
+async def run(rows: int, concurrency: int, page_size: int, pages: int) -> None:
+    """Run the benchmark and print throughput figures."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.db")
+        repository = SqliteDocumentRepository(path)
+
+        started = time.perf_counter()
+        for start in range(0, rows, concurrency):
+            batch = make_documents(start, min(concurrency, rows - start))
+            await asyncio.gather(*(repository.save(doc) for doc in batch))
+        elapsed = time.perf_counter() - started
+        print(f"insert: {rows} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+        for offset in (0, rows // 2, max(rows - page_size, 0)):
+            started = time.perf_counter()
+            for _ in range(pages):
+                await repository.find_all(limit=page_size, offset=offset)
+            elapsed = time.perf_counter() - started
+            print(
+                f"offset page @ {offset}: {pages / elapsed:,.0f} pages/s "
+                f"({pages * page_size / elapsed:,.0f} rows/s)"
+            )
+
+        started = time.perf_counter()
+        cursor: DocumentCursor | None = None
+        read = 0
+        for _ in range(pages):
+            page = await repository.find_after(cursor, limit=page_size)
+            if not page:
+                break
+            read += len(page)
+            cursor = DocumentCursor.from_document(page[-1])
+        elapsed = time.perf_counter() - started
+        print(f"cursor pages: {read / elapsed:,.0f} rows/s")
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                repository.find_all(limit=page_size, offset=rows // 2)
+                for _ in range(pages)
+            )
+        )
+        elapsed = time.perf_counter() - started
+        print(f"concurrent offset pages: {pages / elapsed:,.0f} pages/s")
+
+        repository.close()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.concurrency, args.page_size, args.pages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark VectorIndex search and incremental updates.
+
+Fills the index with random unit embeddings through put (no embedding API
+calls), then measures search latency, the cost of updates and deletes, and
+compares argpartition top-k with a full sort.
+
+Usage:
+    uv run python -m benchmarks.vector_retrieval --documents 200000
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+import numpy as np
+
+from src.infrastructure.algorithms.vector_index import VectorIndex
+
+
+async def _unused_embed(_text: str) -> list[float]:
+    raise NotImplementedError("The benchmark indexes precomputed vectors")
+
+
+def percentiles(samples: list[float]) -> str:
+    """Format the p50 and p99 of latencies given in seconds."""
+    samples.sort()
+    p50 = samples[len(samples) // 2] * 1e3
+    p99 = samples[int(len(samples) * 0.99)] * 1e3
+    return f"p50 {p50:.2f} ms  p99 {p99:.2f} ms"
+
+
+async def run(count: int, dimensions: int, queries: int, top_k: int) -> None:
+    """Run the benchmark and print the timings."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((count, dimensions), dtype=np.float32)
+    ids = [uuid4() for _ in range(count)]
+    index = VectorIndex(_unused_embed)
+
+    started = time.perf_counter()
+    for document_id, vector in zip(ids, vectors, strict=True):
+        index.put(document_id, vector)
+    elapsed = time.perf_counter() - started
+    print(
+        f"put: {count} x {dimensions}d in {elapsed:.1f}s "
+        f"({elapsed / count * 1e6:.1f} us each, capacity {index.capacity})"
+    )
+
+    query_vectors = rng.standard_normal((queries, dimensions), dtype=np.float32)
+    samples = []
+    for query in query_vectors:
+        started = time.perf_counter()
+        index.search(query, top_k)
+        samples.append(time.perf_counter() - started)
+    print(f"search top {top_k}:   {percentiles(samples)}")
+
+    matrix = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    samples = []
+    for query in query_vectors:
+        started = time.perf_counter()
+        np.argsort(-(matrix @ query))[:top_k]
+        samples.append(time.perf_counter() - started)
+    print(f"full sort top {top_k}: {percentiles(samples)}")
+
+    # Update and delete a quarter of the rows, triggering compaction
+    churn = count // 4
+    started = time.perf_counter()
+    for document_id, vector in zip(ids[:churn], vectors[:churn], strict=True):
+        index.put(document_id, vector)
+    for document_id in ids[churn : 2 * churn]:
+        await index.remove(document_id)
+    elapsed = time.perf_counter() - started
+    print(f"update + delete: {elapsed / (2 * churn) * 1e6:.1f} us each")
+
+    samples = []
+    for query in query_vectors:
+        started = time.perf_counter()
+        index.search(query, top_k)
+        samples.append(time.perf_counter() - started)
+    print(f"search after churn: {percentiles(samples)}")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=200_000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.documents, args.dimensions, args.queries, args.top_k))
+
+
+if __name__ == "__main__":
+    main()
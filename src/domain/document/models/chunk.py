@@ -0,0 +1,44 @@
+from uuid import UUID, uuid5
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Chunk(BaseModel):
+    """Passage of a document, located by character offsets into its content."""
+
+    model_config = ConfigDict(frozen=True)
+
+    document_id: UUID
+    position: int  # order of the chunk within its document
+    start: int
+    end: int
+
+    @property
+    def id(self) -> UUID:
+        """Chunk ID, derived from the parent document ID and the position."""
+        return chunk_id(self.document_id, self.position)
+
+
+def chunk_id(document_id: UUID, position: int) -> UUID:
+    """Return the deterministic ID of a document's chunk."""
+    return uuid5(document_id, str(position))
+
+
+def join_passages(content: str, chunks: list[Chunk], separator: str = "\n...\n") -> str:
+    """Join the text of a document's chunks, merging overlapping chunks.
+
+    Args:
+        content: The parent document's content
+        chunks: Chunks of that document, in any order
+        separator: Text placed between passages that are not adjacent
+
+    Returns:
+        The passages in document order
+    """
+    spans: list[list[int]] = []
+    for chunk in sorted(chunks, key=lambda chunk: chunk.start):
+        if spans and chunk.start <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], chunk.end)
+        else:
+            spans.append([chunk.start, chunk.end])
+    return separator.join(content[start:end] for start, end in spans)
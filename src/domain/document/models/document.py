@@ -1,9 +1,15 @@
+import hashlib
 from datetime import UTC, datetime
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field, field_validator
 
 
+def compute_content_hash(content: str) -> str:
+    """Return the content address (BLAKE2b-128 hex digest) of a document body."""
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
 class Document(BaseModel):
     """Document entity for RAG system."""
 
@@ -28,6 +34,11 @@ class Document(BaseModel):
             raise ValueError("Document content cannot be empty")
         return v
 
+    @property
+    def content_hash(self) -> str:
+        """Content address of the body; documents with equal bodies share it."""
+        return compute_content_hash(self.content)
+
     def update_content(self, content: str) -> None:
         """Update document content and timestamp."""
         self.content = content
@@ -0,0 +1,45 @@
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from src.domain.document.models.document import Document
+
+
+class DocumentCursor(BaseModel):
+    """Keyset position in the (created_at, id) ordering of documents."""
+
+    model_config = ConfigDict(frozen=True)
+
+    created_at: datetime
+    document_id: UUID
+
+    @classmethod
+    def from_document(cls, document: Document) -> "DocumentCursor":
+        """Create a cursor pointing at the given document."""
+        return cls(created_at=document.created_at, document_id=document.id)
+
+    def encode(self) -> str:
+        """Encode the cursor as an opaque URL-safe token."""
+        raw = f"{self.created_at.isoformat()}|{self.document_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "DocumentCursor":
+        """Decode an opaque token produced by encode().
+
+        Raises:
+            ValueError: If the token is malformed
+        """
+        padded = token + "=" * (-len(token) % 4)
+        try:
+            raw = base64.urlsafe_b64decode(padded.encode()).decode()
+            created_at, document_id = raw.split("|")
+            return cls(
+                created_at=datetime.fromisoformat(created_at),
+                document_id=UUID(document_id),
+            )
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError("Invalid document cursor") from e
@@ -0,0 +1,69 @@
+from datetime import UTC, datetime
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_record import datetime_to_micros
+
+
+class DocumentFilter(BaseModel):
+    """Metadata conditions a document must all meet; unset fields match anything.
+
+    Time ranges are half-open: ``*_after`` is inclusive and ``*_before``
+    exclusive, so adjacent ranges never overlap. ``title_prefix`` is
+    case-sensitive.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    source: str | None = None
+    title_prefix: str | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    updated_after: datetime | None = None
+    updated_before: datetime | None = None
+
+    @field_validator(
+        "created_after", "created_before", "updated_after", "updated_before"
+    )
+    @classmethod
+    def assume_utc(cls, v: datetime | None) -> datetime | None:
+        if v is not None and v.tzinfo is None:
+            return v.replace(tzinfo=UTC)
+        return v
+
+    def is_empty(self) -> bool:
+        """Return True if the filter matches every document."""
+        return not any(
+            value is not None and value != "" for value in self.model_dump().values()
+        )
+
+    def matches(self, document: Document) -> bool:
+        """Return True if the document meets every condition."""
+        return (
+            (not self.source or document.source == self.source)
+            and (not self.title_prefix or document.title.startswith(self.title_prefix))
+            and _in_range(document.created_at, self.created_after, self.created_before)
+            and _in_range(document.updated_at, self.updated_after, self.updated_before)
+        )
+
+
+def prefix_end(prefix: str) -> str | None:
+    """Return the smallest string above every string starting with prefix.
+
+    Strings with the prefix are exactly those in [prefix, prefix_end(prefix)),
+    which turns a prefix match into a range over sorted strings. None means
+    the range is unbounded above.
+    """
+    while prefix and prefix[-1] == chr(0x10FFFF):
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _in_range(value: datetime, after: datetime | None, before: datetime | None) -> bool:
+    micros = datetime_to_micros(value)
+    return (after is None or micros >= datetime_to_micros(after)) and (
+        before is None or micros < datetime_to_micros(before)
+    )
@@ -0,0 +1,87 @@
+import sys
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+from src.domain.document.models.document import Document
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def datetime_to_micros(value: datetime) -> int:
+    """Convert a datetime to microseconds since the epoch (naive means UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def micros_to_datetime(value: int) -> datetime:
+    """Convert microseconds since the epoch to an aware UTC datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class DocumentRecord:
+    """Compact, validation-free internal representation of a Document.
+
+    Repositories keep documents in this form: the ID is a 128-bit int,
+    timestamps are microseconds since the epoch, and sources are interned so
+    repeated values share one string. Repositories that deduplicate bodies
+    set content_hash and point content at the shared body, or leave content
+    empty when the body is kept compressed elsewhere. Records are built
+    from trusted data only, so no validation runs; conversion to the pydantic
+    Document happens when a document leaves the repository.
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "content",
+        "source",
+        "created_at",
+        "updated_at",
+        "content_hash",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        title: str,
+        content: str,
+        source: str,
+        created_at: int,
+        updated_at: int,
+        content_hash: str = "",
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.content = content
+        self.source = sys.intern(source)
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.content_hash = content_hash
+
+    @classmethod
+    def from_document(cls, document: Document) -> "DocumentRecord":
+        """Create a record from a (validated) Document."""
+        return cls(
+            document.id.int,
+            document.title,
+            document.content,
+            document.source,
+            datetime_to_micros(document.created_at),
+            datetime_to_micros(document.updated_at),
+        )
+
+    def to_document(self, content: str | None = None) -> Document:
+        """Convert the record to a Document without re-running validation.
+
+        Args:
+            content: Body to use instead of the record's own content
+        """
+        return Document.model_construct(
+            id=UUID(int=self.id),
+            title=self.title,
+            content=self.content if content is None else content,
+            source=self.source,
+            created_at=micros_to_datetime(self.created_at),
+            updated_at=micros_to_datetime(self.updated_at),
+        )
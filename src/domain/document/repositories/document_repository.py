@@ -1,25 +1,112 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Collection
 from uuid import UUID
 
 from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter
 
 
 class DocumentRepository(ABC):
+    # Incremented after every mutation, once reads see it, so anything
+    # derived from the stored documents can be invalidated by comparing it
+    version: int = 0
+
     @abstractmethod
     async def save(self, document: Document) -> Document:
         """Save a document to the repository."""
         pass
 
+    @abstractmethod
+    async def save_many(self, documents: list[Document]) -> list[Document]:
+        """Save a batch of documents in one repository operation."""
+        pass
+
     @abstractmethod
     async def find_by_id(self, document_id: UUID) -> Document | None:
         """Find a document by its ID."""
         pass
 
     @abstractmethod
-    async def find_all(self, limit: int = 100, offset: int = 0) -> list[Document]:
-        """Find all documents with pagination."""
+    async def find_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        document_filter: DocumentFilter | None = None,
+    ) -> list[Document]:
+        """Find all documents, or those matching the filter, with pagination."""
+        pass
+
+    @abstractmethod
+    async def find_after(
+        self,
+        cursor: DocumentCursor | None,
+        limit: int = 100,
+        document_filter: DocumentFilter | None = None,
+    ) -> list[Document]:
+        """Find documents ordered after the cursor (keyset pagination).
+
+        Documents are ordered by (created_at, id). A cursor of None starts
+        from the first document. With a filter, only matching documents are
+        returned, resolved through the backend's secondary indexes.
+        """
+        pass
+
+    async def find_ids(self, document_filter: DocumentFilter) -> set[UUID]:
+        """Return the IDs of the documents matching the filter.
+
+        Strategies use it to restrict a search to matching documents. The
+        default implementation walks filtered keyset pages; backends override
+        it to read the IDs from their indexes alone.
+        """
+        ids: set[UUID] = set()
+        cursor: DocumentCursor | None = None
+        while True:
+            page = await self.find_after(
+                cursor, limit=1000, document_filter=document_filter
+            )
+            ids.update(document.id for document in page)
+            if len(page) < 1000:
+                return ids
+            cursor = DocumentCursor.from_document(page[-1])
+
+    async def find_existing(self, document_ids: Collection[UUID]) -> set[UUID]:
+        """Return those of the given IDs that belong to stored documents.
+
+        The default implementation looks the documents up one by one;
+        backends override it with a lookup that does not read them.
+        """
+        return {
+            document_id
+            for document_id in document_ids
+            if await self.find_by_id(document_id) is not None
+        }
+
+    async def iter_all(self, batch_size: int = 1000) -> AsyncIterator[Document]:
+        """Iterate over all documents in (created_at, id) order.
+
+        The default implementation walks keyset pages, so memory stays
+        bounded by batch_size whatever the corpus size. Backends may
+        override it with a cheaper scan.
+        """
+        cursor: DocumentCursor | None = None
+        while True:
+            page = await self.find_after(cursor, limit=batch_size)
+            for document in page:
+                yield document
+            if len(page) < batch_size:
+                return
+            cursor = DocumentCursor.from_document(page[-1])
+
+    @abstractmethod
+    async def count(self, document_filter: DocumentFilter | None = None) -> int:
+        """Return the number of documents, or of those matching the filter."""
         pass
 
+    async def stats(self) -> dict[str, int | float]:
+        """Return repository metrics; backends may report more than the count."""
+        return {"documents": await self.count()}
+
     @abstractmethod
     async def update(self, document: Document) -> Document:
         """Update an existing document."""
@@ -0,0 +1,63 @@
+import re
+
+from src.domain.document.models.chunk import Chunk
+from src.domain.document.models.document import Document
+
+_TOKEN = re.compile(r"\S+")
+
+
+class Chunker:
+    """Splits document content into overlapping windows of whitespace tokens.
+
+    Each window holds up to ``max_tokens`` tokens and starts
+    ``max_tokens - overlap_tokens`` tokens after the previous one, so a
+    passage cut at a window boundary appears whole in the next window.
+    Windows end at the last sentence end they contain when there is one in
+    their second half, so chunks tend to hold whole sentences.
+    """
+
+    def __init__(self, max_tokens: int = 200, overlap_tokens: int = 40) -> None:
+        """Create a chunker.
+
+        Args:
+            max_tokens: Maximum number of tokens per chunk
+            overlap_tokens: Tokens shared by consecutive chunks
+
+        Raises:
+            ValueError: If the overlap is not smaller than the chunk size
+        """
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be in [0, max_tokens)")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+
+    def split(self, document: Document) -> list[Chunk]:
+        """Split a document into chunks covering all of its content."""
+        spans = [match.span() for match in _TOKEN.finditer(document.content)]
+        chunks: list[Chunk] = []
+        first = 0
+        while first < len(spans):
+            last = min(first + self.max_tokens, len(spans))
+            if last < len(spans):
+                last = self._sentence_end(document.content, spans, first, last)
+            chunks.append(
+                Chunk(
+                    document_id=document.id,
+                    position=len(chunks),
+                    start=spans[first][0],
+                    end=spans[last - 1][1],
+                )
+            )
+            if last == len(spans):
+                break
+            first = max(last - self.overlap_tokens, first + 1)
+        return chunks
+
+    def _sentence_end(
+        self, content: str, spans: list[tuple[int, int]], first: int, last: int
+    ) -> int:
+        # Shrink the window to end after a sentence, keeping at least half of it
+        for end in range(last, first + (last - first) // 2, -1):
+            if content[spans[end - 1][1] - 1] in ".!?":
+                return end
+        return last
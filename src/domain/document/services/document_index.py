@@ -0,0 +1,83 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable
+from uuid import UUID
+
+from src.domain.document.models.document import Document
+
+
+class DocumentIndex(ABC):
+    """Abstract base class for search indexes kept in sync with document writes.
+
+    The document use case notifies every registered index after a write, so
+    indexes are maintained incrementally instead of being rebuilt.
+    """
+
+    # Whether the documents that existed before the index was created have
+    # been loaded into it
+    loaded: bool = False
+    # Incremented after every change to the indexed documents, so results
+    # derived from the index can be invalidated by comparing it
+    version: int = 0
+    # The load in progress, shared by every caller that needs the index
+    _loading: asyncio.Future[None] | None = None
+
+    @abstractmethod
+    async def add(self, documents: list[Document]) -> None:
+        """Index new or updated documents, replacing earlier versions."""
+        pass
+
+    @abstractmethod
+    async def remove(self, document_id: UUID) -> None:
+        """Remove a document from the index."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all documents from the index."""
+        pass
+
+    async def load(
+        self, documents: AsyncIterable[Document], batch_size: int = 1000
+    ) -> None:
+        """Index all documents from an async source, e.g. a repository.
+
+        Concurrent calls share one load, so no caller sees a partly filled
+        index, and a call on a loaded index returns at once. The index is
+        marked loaded only once every document is indexed; if the load fails
+        the index is cleared and left unloaded, so the next call retries it.
+        Writes arriving meanwhile are applied as usual, and a failed load's
+        retry picks them up from the source again.
+
+        Args:
+            documents: Documents to index
+            batch_size: Number of documents indexed per batch
+        """
+        if self.loaded:
+            return
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._load(documents, batch_size))
+            self._loading.add_done_callback(self._loaded)
+        # A cancelled caller does not cancel the load the others wait for
+        await asyncio.shield(self._loading)
+
+    async def _load(self, documents: AsyncIterable[Document], batch_size: int) -> None:
+        try:
+            batch: list[Document] = []
+            async for document in documents:
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    await self.add(batch)
+                    batch = []
+            if batch:
+                await self.add(batch)
+        except BaseException:
+            await self.clear()
+            raise
+        self.loaded = True
+
+    def _loaded(self, loading: asyncio.Future[None]) -> None:
+        self._loading = None
+        if not loading.cancelled():
+            # Retrieve the error so it is not logged when nobody awaited it
+            loading.exception()
@@ -1,11 +1,39 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field, field_validator
 
+from src.domain.document.models.document_filter import DocumentFilter
+
+
+class RetrievalOptions(BaseModel):
+    """Per-query search settings; strategies ignore the ones they do not use."""
+
+    # Inverted lists probed by approximate vector search; None uses the default
+    nprobe: int | None = Field(default=None, ge=1)
+    # Compressed-vector candidates rescored exactly per result; 0 skips
+    # rescoring and None uses the default
+    rescore_factor: int | None = Field(default=None, ge=0)
+    # Wait until the document writes up to this sequence number (returned in
+    # the X-Index-Sequence header) are searchable
+    index_sequence: int | None = Field(default=None, ge=1)
+    # Only documents matching these metadata conditions are scored
+    filter: DocumentFilter | None = None
+    # Reranking of the retrieved candidates before the prompt is built;
+    # None keeps the strategy's order
+    rerank: Literal["mmr"] | None = None
+    # Candidates retrieved for reranking; None uses the configured depth
+    rerank_depth: int | None = Field(default=None, ge=1, le=1000)
+    # MMR trade-off between relevance (1.0) and novelty (0.0); None uses the
+    # configured default
+    mmr_lambda: float | None = Field(default=None, ge=0.0, le=1.0)
+
 
 class Query(BaseModel):
     """User query for RAG system."""
 
     text: str
     top_k: int = Field(default=5, ge=1, le=100)
+    options: RetrievalOptions = Field(default_factory=RetrievalOptions)
 
     @field_validator("text")
     @classmethod
@@ -15,9 +43,25 @@ class Query(BaseModel):
         return v.strip()
 
 
+class ContextUsage(BaseModel):
+    """Estimated size of the context put in a query's prompt."""
+
+    tokens: int
+    # Tokens left out by packing the retrieved documents into the budget
+    tokens_saved: int = 0
+    # Documents reduced to their most relevant sentences
+    documents_compressed: int = 0
+    # Retrieved documents left out for lack of budget
+    documents_dropped: int = 0
+
+
 class QueryResult(BaseModel):
     """Result of RAG query execution."""
 
     query: Query
     answer: str
     sources: list[str] = Field(default_factory=list)
+    # Whether the answer was reused from an earlier, similar query
+    cached: bool = False
+    # Size of the prompt context when it was packed into a token budget
+    context: ContextUsage | None = None
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 
 from src.domain.document.models.document import Document
+from src.domain.rag.models.query import RetrievalOptions
 
 
 class RAGStrategy(ABC):
@@ -8,7 +9,10 @@ class RAGStrategy(ABC):
 
     @abstractmethod
     async def retrieve_documents(
-        self, query_text: str, top_k: int = 5
+        self,
+        query_text: str,
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
     ) -> list[Document]:
         """
         Retrieve relevant documents for the given query.
@@ -19,6 +23,7 @@ class RAGStrategy(ABC):
         Args:
             query_text: The query text
             top_k: Number of documents to retrieve
+            options: Per-query search settings
 
         Returns:
             List of relevant documents
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+
+from src.domain.document.models.document import Document
+from src.domain.rag.models.query import RetrievalOptions
+
+
+class Reranker(ABC):
+    """Abstract base class for reordering retrieved documents before prompting."""
+
+    @abstractmethod
+    async def rerank(
+        self,
+        query_text: str,
+        documents: list[Document],
+        top_k: int,
+        options: RetrievalOptions | None = None,
+    ) -> list[Document]:
+        """
+        Select the documents to build the prompt from, in prompt order.
+
+        Args:
+            query_text: The query text
+            documents: Retrieved candidates, best first
+            top_k: Maximum number of documents to keep
+            options: Per-query search settings
+
+        Returns:
+            At most top_k of the candidates
+        """
+        pass
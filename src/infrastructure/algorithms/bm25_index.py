@@ -0,0 +1,259 @@
+"""Incrementally maintained BM25 inverted index."""
+
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from collections.abc import Collection
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+
+from src.domain.document.models.document import Document
+from src.domain.document.services.document_index import DocumentIndex
+
+_TOKEN = re.compile(r"\w+")
+# Term frequencies are stored as uint16
+_MAX_FREQUENCY = 0xFFFF
+
+# Common English words that carry no relevance signal
+_STOP_WORDS = """
+a an and are as at be but by can do does for from has have how i in is it its
+of on or that the their this to was were what when where which who why will
+with you
+"""
+STOP_WORDS = frozenset(_STOP_WORDS.split())
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms, dropping stop words."""
+    return [term for term in _TOKEN.findall(text.lower()) if term not in STOP_WORDS]
+
+
+def _to_array(typecode: str, values: np.ndarray[Any, Any]) -> array[Any]:
+    result = array(typecode)
+    result.frombytes(values.tobytes())
+    return result
+
+
+class _Postings:
+    """Documents containing a term, as parallel compact arrays."""
+
+    __slots__ = ("frequencies", "ordinals")
+
+    def __init__(self) -> None:
+        self.ordinals = array("I")
+        self.frequencies = array("H")
+
+
+class BM25Index(DocumentIndex):
+    """Inverted index ranking documents by BM25 over title and content.
+
+    Every indexed document version gets an ordinal; postings hold ordinals and
+    term frequencies in ``array`` buffers that are scored as numpy views
+    without copying. Updates and deletes only mark the old ordinal dead, so
+    writes cost O(terms of the document). Once dead postings exceed
+    ``compaction_ratio`` of all postings, the index is compacted and ordinals
+    are renumbered.
+    """
+
+    def __init__(
+        self, k1: float = 1.2, b: float = 0.75, compaction_ratio: float = 0.5
+    ) -> None:
+        """Create an empty index.
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+            compaction_ratio: Fraction of dead postings triggering compaction
+        """
+        self._k1 = k1
+        self._b = b
+        self._compaction_ratio = compaction_ratio
+        # Searches may run in worker threads (see HybridRAGStrategy) while
+        # writes run on the event loop; the buffers must not change under them
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._postings: dict[str, _Postings] = {}
+        self._ids: list[int] = []  # ordinal -> document ID as int
+        self._ordinals: dict[int, int] = {}  # document ID -> live ordinal
+        # ordinal -> number of terms, as float32 for scoring without casts
+        self._lengths = array("f")
+        self._term_counts = array("I")  # ordinal -> number of distinct terms
+        self._live = array("B")  # ordinal -> 1 while the version is current
+        self._total_length = 0
+        self._total_postings = 0
+        self._dead_postings = 0
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    async def add(self, documents: list[Document]) -> None:
+        """Index new or updated documents, replacing earlier versions."""
+        with self._lock:
+            self._add(documents)
+        self.version += 1
+
+    def _add(self, documents: list[Document]) -> None:
+        for document in documents:
+            document_id = document.id.int
+            self._discard(document_id)
+            terms = Counter(tokenize(document.title))
+            terms.update(tokenize(document.content))
+            ordinal = len(self._ids)
+            self._ids.append(document_id)
+            self._ordinals[document_id] = ordinal
+            length = sum(terms.values())
+            self._lengths.append(length)
+            self._term_counts.append(len(terms))
+            self._live.append(1)
+            self._total_length += length
+            self._total_postings += len(terms)
+            for term, frequency in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.ordinals.append(ordinal)
+                postings.frequencies.append(min(frequency, _MAX_FREQUENCY))
+        self._maybe_compact()
+
+    async def remove(self, document_id: UUID) -> None:
+        """Remove a document from the index."""
+        with self._lock:
+            self._discard(document_id.int)
+            self._maybe_compact()
+        self.version += 1
+
+    async def clear(self) -> None:
+        """Remove all documents from the index."""
+        with self._lock:
+            self._reset()
+        self.version += 1
+
+    def _discard(self, document_id: int) -> None:
+        ordinal = self._ordinals.pop(document_id, None)
+        if ordinal is None:
+            return
+        self._live[ordinal] = 0
+        self._total_length -= int(self._lengths[ordinal])
+        self._dead_postings += self._term_counts[ordinal]
+
+    def _maybe_compact(self) -> None:
+        if self._dead_postings > self._compaction_ratio * self._total_postings:
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop dead postings and renumber the live document versions."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        live = np.frombuffer(self._live, dtype=np.uint8).astype(bool)
+        renumbered = (np.cumsum(live) - 1).astype(np.uint32)
+        for term in list(self._postings):
+            postings = self._postings[term]
+            ordinals = np.frombuffer(postings.ordinals, dtype=np.uint32)
+            keep = live[ordinals]
+            if not keep.any():
+                del self._postings[term]
+                continue
+            frequencies = np.frombuffer(postings.frequencies, dtype=np.uint16)
+            compacted = _Postings()
+            compacted.ordinals = _to_array("I", renumbered[ordinals[keep]])
+            compacted.frequencies = _to_array("H", frequencies[keep])
+            self._postings[term] = compacted
+
+        self._ids = [self._ids[i] for i in np.flatnonzero(live)]
+        self._ordinals = {document_id: i for i, document_id in enumerate(self._ids)}
+        self._lengths = _to_array("f", np.frombuffer(self._lengths, np.float32)[live])
+        self._term_counts = _to_array(
+            "I", np.frombuffer(self._term_counts, np.uint32)[live]
+        )
+        self._live = array("B", bytes([1]) * len(self._ids))
+        self._total_postings -= self._dead_postings
+        self._dead_postings = 0
+
+    def search(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        allowed: Collection[UUID] | None = None,
+    ) -> list[tuple[UUID, float]]:
+        """Return the IDs and BM25 scores of the best matching documents.
+
+        Args:
+            query_text: The query text
+            top_k: Maximum number of results
+            allowed: Documents to rank; None ranks every document. Postings
+                of other documents are dropped before scoring, while term
+                statistics still cover the whole collection, so an allowed
+                document scores the same as in an unrestricted search.
+
+        Returns:
+            Document IDs with their scores, best first
+        """
+        with self._lock:
+            return self._search(query_text, top_k, allowed)
+
+    def _search(
+        self,
+        query_text: str,
+        top_k: int,
+        allowed: Collection[UUID] | None,
+    ) -> list[tuple[UUID, float]]:
+        terms = set(tokenize(query_text))
+        document_count = len(self._ordinals)
+        if not terms or not document_count or top_k <= 0:
+            return []
+        allowed_mask = None
+        if allowed is not None:
+            allowed_ordinals = [
+                self._ordinals[i.int] for i in allowed if i.int in self._ordinals
+            ]
+            if not allowed_ordinals:
+                return []
+            allowed_mask = np.zeros(len(self._ids), dtype=bool)
+            allowed_mask[allowed_ordinals] = True
+        average_length = self._total_length / document_count or 1.0
+        live = np.frombuffer(self._live, dtype=np.uint8).view(bool)
+        lengths = np.frombuffer(self._lengths, dtype=np.float32)
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        # BM25 length normalization k1 * (1 - b + b * length / average),
+        # kept in float32 so no step widens to float64
+        norm_base = np.float32(self._k1 * (1 - self._b))
+        norm_slope = np.float32(self._k1 * self._b / average_length)
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            ordinals = np.frombuffer(postings.ordinals, dtype=np.uint32)
+            frequencies = np.frombuffer(postings.frequencies, dtype=np.uint16)
+            if self._dead_postings:
+                alive = live[ordinals]
+                ordinals = ordinals[alive]
+                frequencies = frequencies[alive]
+            frequency = len(ordinals)
+            if not frequency:
+                continue
+            idf = math.log(1 + (document_count - frequency + 0.5) / (frequency + 0.5))
+            if allowed_mask is not None:
+                keep = allowed_mask[ordinals]
+                ordinals = ordinals[keep]
+                frequencies = frequencies[keep]
+            tf = frequencies.astype(np.float32)
+            norm = norm_base + norm_slope * lengths[ordinals]
+            # Ordinals are unique within a postings list, so += is safe
+            scores[ordinals] += np.float32(idf * (self._k1 + 1)) * tf / (tf + norm)
+
+        # Partial selection of the top k, then sort only those
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > top_k:
+            best = np.argpartition(scores[candidates], -top_k)[-top_k:]
+            candidates = candidates[best]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(UUID(int=self._ids[i]), float(scores[i])) for i in ranked]
@@ -0,0 +1,71 @@
+"""BM25 RAG strategy implementation."""
+
+from src.domain.document.models.document import Document
+from src.domain.document.repositories.document_repository import DocumentRepository
+from src.domain.rag.models.query import RetrievalOptions
+from src.domain.rag.services.rag_strategy import RAGStrategy
+from src.infrastructure.algorithms.bm25_index import BM25Index
+from src.infrastructure.algorithms.chunk_index import CHUNK_OVERSAMPLING, ChunkIndex
+from src.infrastructure.algorithms.prefilter import allowed_ids
+
+
+class BM25RAGStrategy(RAGStrategy):
+    """RAG strategy ranking documents by BM25 relevance to the query."""
+
+    def __init__(
+        self,
+        document_repository: DocumentRepository,
+        index: BM25Index,
+        chunks: ChunkIndex | None = None,
+    ):
+        """Initialize the BM25 RAG strategy.
+
+        Args:
+            document_repository: Repository for document operations
+            index: BM25 index kept in sync with document writes
+            chunks: Chunk index feeding the BM25 index, for passage retrieval
+        """
+        self.document_repository = document_repository
+        self.index = index
+        self.chunks = chunks
+
+    async def retrieve_documents(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
+    ) -> list[Document]:
+        """
+        Retrieve the documents most relevant to the query.
+
+        The index is filled from the repository on first use; afterwards it
+        is maintained incrementally as documents are written. With a chunk
+        index, chunks are ranked and each document holds only its matching
+        passages. A metadata filter in the options restricts the ranking to
+        matching documents before any of them is scored.
+
+        Args:
+            query_text: The query text
+            top_k: Number of documents to retrieve
+            options: Per-query search settings; only ``filter`` is used
+
+        Returns:
+            List of documents, most relevant first
+        """
+        if self.chunks is not None:
+            if not self.chunks.loaded:
+                await self.chunks.load(self.document_repository.iter_all())
+            allowed = await allowed_ids(self.document_repository, options, self.chunks)
+            hits = self.index.search(query_text, top_k * CHUNK_OVERSAMPLING, allowed)
+            return await self.chunks.documents(self.document_repository, hits, top_k)
+
+        if not self.index.loaded:
+            await self.index.load(self.document_repository.iter_all())
+
+        allowed = await allowed_ids(self.document_repository, options)
+        documents = []
+        for document_id, _ in self.index.search(query_text, top_k, allowed):
+            document = await self.document_repository.find_by_id(document_id)
+            if document is not None:
+                documents.append(document)
+        return documents
@@ -0,0 +1,120 @@
+"""Result cache in front of a RAG strategy."""
+
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from src.domain.document.models.document import Document
+from src.domain.document.repositories.document_repository import DocumentRepository
+from src.domain.document.services.document_index import DocumentIndex
+from src.domain.rag.models.query import RetrievalOptions
+from src.domain.rag.services.rag_strategy import RAGStrategy
+
+# Options that do not change which documents a strategy retrieves; the
+# reranking depth reaches it as top_k
+_UNKEYED_OPTIONS = {"index_sequence", "rerank", "rerank_depth", "mmr_lambda"}
+
+
+def normalize_query(query_text: str) -> str:
+    """Return the cache form of a query: case-folded, whitespace collapsed."""
+    return " ".join(query_text.split()).casefold()
+
+
+class CachingRAGStrategy(RAGStrategy):
+    """Caches the results of another strategy in a bounded LRU.
+
+    Results are keyed by the normalized query text, top_k and the retrieval
+    options. Instead of tracking which documents each result depends on, the
+    cache is tied to one data version: the sum of the version counters of
+    the repository and of the search indexes, which grows on every write.
+    When it differs from the version the entries were computed at, the whole
+    cache is dropped in O(1); a result whose retrieval overlapped a write is
+    returned but not stored. A stale result is therefore never served.
+    """
+
+    def __init__(
+        self,
+        strategy: RAGStrategy,
+        repository: DocumentRepository,
+        indexes: Sequence[DocumentIndex] = (),
+        max_entries: int = 1024,
+    ) -> None:
+        """Wrap a strategy with a result cache.
+
+        Args:
+            strategy: Strategy computing the results
+            repository: Repository whose writes invalidate the cache
+            indexes: Search indexes whose writes invalidate the cache, when
+                they are updated after the repository (e.g. in the background)
+            max_entries: Maximum number of cached results
+        """
+        self.strategy = strategy
+        self._repository = repository
+        self._indexes = list(indexes)
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int, str], list[Document]] = OrderedDict()
+        self._version = self._data_version()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _data_version(self) -> int:
+        # Every counter only grows, so their sum changes on any write
+        return self._repository.version + sum(index.version for index in self._indexes)
+
+    def _current(self) -> int:
+        version = self._data_version()
+        if version != self._version:
+            if self._entries:
+                self._entries = OrderedDict()
+                self.invalidations += 1
+            self._version = version
+        return version
+
+    async def retrieve_documents(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
+    ) -> list[Document]:
+        """
+        Return the cached result for the query, or retrieve and cache it.
+
+        Args:
+            query_text: The query text
+            top_k: Number of documents to retrieve
+            options: Per-query search settings
+
+        Returns:
+            List of relevant documents
+        """
+        key = (
+            normalize_query(query_text),
+            top_k,
+            (options or RetrievalOptions()).model_dump_json(exclude=_UNKEYED_OPTIONS),
+        )
+        version = self._current()
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(cached)
+
+        self.misses += 1
+        documents = await self.strategy.retrieve_documents(query_text, top_k, options)
+        # Only a result computed entirely at the current version is stored
+        if self._max_entries > 0 and self._current() == version:
+            self._entries[key] = list(documents)
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return documents
+
+    def stats(self) -> dict[str, int | float]:
+        """Return hit and invalidation counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,178 @@
+"""Chunk-level indexing of documents for passage retrieval."""
+
+from collections.abc import AsyncIterable, Iterable
+from uuid import UUID
+
+from src.domain.document.models.chunk import Chunk, chunk_id, join_passages
+from src.domain.document.models.document import Document
+from src.domain.document.repositories.document_repository import DocumentRepository
+from src.domain.document.services.chunker import Chunker
+from src.domain.document.services.document_index import DocumentIndex
+
+# Chunk hits fetched per requested document, since several hits may
+# collapse into the same document
+CHUNK_OVERSAMPLING = 4
+
+
+class ChunkIndex(DocumentIndex):
+    """Splits documents into chunks and indexes each chunk as a document.
+
+    The wrapped indexes see every chunk as a separate document whose ID is
+    the chunk ID, whose title is the parent's and whose content is the
+    chunk's passage. Their search results are therefore chunk IDs;
+    ``documents`` collapses those per parent document and returns the
+    parents with their content reduced to the matching passages. A parent
+    whose content changed since it was chunked (e.g. while its update is
+    still queued for indexing) is returned whole, as the stored chunk
+    offsets no longer apply to it.
+    """
+
+    def __init__(self, indexes: list[DocumentIndex], chunker: Chunker) -> None:
+        """Create an empty chunk index.
+
+        Args:
+            indexes: Indexes receiving the chunks
+            chunker: Splits documents into chunks
+        """
+        self.indexes = indexes
+        self._chunker = chunker
+        # document ID -> (start, end) of each chunk, by position
+        self._spans: dict[UUID, list[tuple[int, int]]] = {}
+        # chunk ID -> (document ID, position)
+        self._owners: dict[UUID, tuple[UUID, int]] = {}
+        # document ID -> hash of the content the spans were computed on
+        self._fingerprints: dict[UUID, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    async def _load(self, documents: AsyncIterable[Document], batch_size: int) -> None:
+        await super()._load(documents, batch_size)
+        # The wrapped indexes are filled through this one, so they count as
+        # loaded only once all chunks are in
+        for index in self.indexes:
+            index.loaded = True
+
+    async def add(self, documents: list[Document]) -> None:
+        """Chunk and index new or updated documents."""
+        passages: list[Document] = []
+        for document in documents:
+            await self.remove(document.id)
+            chunks = self._chunker.split(document)
+            self._spans[document.id] = [(chunk.start, chunk.end) for chunk in chunks]
+            self._fingerprints[document.id] = hash(document.content)
+            for chunk in chunks:
+                self._owners[chunk.id] = (document.id, chunk.position)
+                passages.append(
+                    Document(
+                        id=chunk.id,
+                        title=document.title,
+                        content=document.content[chunk.start : chunk.end],
+                        source=document.source,
+                        created_at=document.created_at,
+                        updated_at=document.updated_at,
+                    )
+                )
+        for index in self.indexes:
+            await index.add(passages)
+        self.version += 1
+
+    async def remove(self, document_id: UUID) -> None:
+        """Remove a document's chunks from the indexes."""
+        spans = self._spans.pop(document_id, None)
+        if spans is None:
+            return
+        del self._fingerprints[document_id]
+        for position in range(len(spans)):
+            passage_id = chunk_id(document_id, position)
+            del self._owners[passage_id]
+            for index in self.indexes:
+                await index.remove(passage_id)
+        self.version += 1
+
+    async def clear(self) -> None:
+        """Remove all chunks from the indexes."""
+        self._spans.clear()
+        self._owners.clear()
+        self._fingerprints.clear()
+        for index in self.indexes:
+            await index.clear()
+        self.version += 1
+
+    def chunks(self, document_id: UUID) -> list[Chunk]:
+        """Return the chunks of an indexed document, in order."""
+        return [
+            Chunk(document_id=document_id, position=position, start=start, end=end)
+            for position, (start, end) in enumerate(self._spans.get(document_id, []))
+        ]
+
+    def chunk_ids(self, document_ids: Iterable[UUID]) -> set[UUID]:
+        """Return the IDs of the indexed chunks of the given documents."""
+        return {
+            chunk_id(document_id, position)
+            for document_id in document_ids
+            for position in range(len(self._spans.get(document_id, ())))
+        }
+
+    def collapse(
+        self, hits: list[tuple[UUID, float]], top_k: int
+    ) -> list[tuple[UUID, list[Chunk]]]:
+        """Group ranked chunk hits by parent document.
+
+        Every document keeps its best chunk; further chunks of it are kept
+        only if they are among the top_k hits overall, so weak matches (which
+        dense search always returns) do not pad the passages.
+
+        Args:
+            hits: Chunk IDs with scores, best first
+            top_k: Maximum number of documents
+
+        Returns:
+            Document IDs with their matching chunks, ordered by best hit
+        """
+        groups: dict[UUID, list[Chunk]] = {}
+        for rank, (hit_id, _) in enumerate(hits):
+            owner = self._owners.get(hit_id)
+            if owner is None:
+                continue
+            document_id, position = owner
+            if document_id not in groups:
+                if len(groups) == top_k:
+                    continue
+                groups[document_id] = []
+            elif rank >= top_k:
+                continue
+            start, end = self._spans[document_id][position]
+            groups[document_id].append(
+                Chunk(document_id=document_id, position=position, start=start, end=end)
+            )
+        return list(groups.items())
+
+    async def documents(
+        self,
+        repository: DocumentRepository,
+        hits: list[tuple[UUID, float]],
+        top_k: int,
+    ) -> list[Document]:
+        """Resolve chunk hits to their documents, keeping only matching passages.
+
+        Args:
+            repository: Repository holding the parent documents
+            hits: Chunk IDs with scores, best first
+            top_k: Maximum number of documents
+
+        Returns:
+            Parent documents whose content is the joined matching passages,
+            or the whole content if it changed since it was chunked
+        """
+        documents = []
+        for document_id, chunks in self.collapse(hits, top_k):
+            document = await repository.find_by_id(document_id)
+            if document is None:
+                continue
+            if hash(document.content) != self._fingerprints.get(document_id):
+                documents.append(document)
+                continue
+            content = join_passages(document.content, chunks)
+            documents.append(document.model_copy(update={"content": content}))
+        return documents
@@ -0,0 +1,316 @@
+"""Token-budgeted packing of retrieved documents into a prompt context."""
+
+import bisect
+import math
+import re
+from typing import NamedTuple
+
+from src.domain.document.models.document import Document
+from src.domain.rag.models.query import ContextUsage
+from src.infrastructure.algorithms.bm25_index import tokenize
+
+# Separates the documents of a context, as the prompt has always done
+SEPARATOR = "\n\n---\n\n"
+# Marks the places where extracted sentences skip part of a document
+_GAP = "[...]"
+# Sentences end at ., !, ? or a line break followed by whitespace (a single
+# character class keeps the regex scan fast on long documents)
+_SENTENCE_END = re.compile(r"[.!?\n]\s+")
+_WORD = re.compile(r"\S+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Return a cheap upper estimate of the model tokens in text.
+
+    Byte-pair encodings average about four characters per token on English
+    text, while non-ASCII characters (accents, CJK, emoji) often take a
+    token each, so they are counted one by one.
+    """
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / 4) + len(text) - ascii_chars
+
+
+def format_document(document: Document, content: str | None = None) -> str:
+    """Return the prompt text of a document, optionally with other content."""
+    if content is None:
+        content = document.content
+    return f"Title: {document.title}\nContent: {content}"
+
+
+def _find_terms(
+    content: str, terms: set[str], start: int, end: int
+) -> list[tuple[int, str]]:
+    """Return the offset of every whole-word, case-insensitive term match."""
+    if not terms:
+        return []
+    lowered = content.lower()
+    if len(lowered) != len(content):
+        # Lowercasing moved offsets (e.g. "İ"), so fall back to a slower regex
+        pattern = re.compile(
+            rf"\b(?:{'|'.join(map(re.escape, sorted(terms)))})\b", re.IGNORECASE
+        )
+        return [
+            (match.start(), match.group().lower())
+            for match in pattern.finditer(content, start, end)
+        ]
+    # str.find is much faster than a regex alternation on long content
+    found = []
+    for term in terms:
+        offset = lowered.find(term, start, end)
+        while offset >= 0:
+            after = offset + len(term)
+            if not (
+                _is_word_char(lowered, offset - 1) or _is_word_char(lowered, after)
+            ):
+                found.append((offset, term))
+            offset = lowered.find(term, after, end)
+    return found
+
+
+def _is_word_char(text: str, index: int) -> bool:
+    if not 0 <= index < len(text):
+        return False
+    char = text[index]
+    return char.isalnum() or char == "_"
+
+
+class _Piece(NamedTuple):
+    """A sentence, or a window of a sentence too long to keep whole."""
+
+    sentence: int
+    part: int
+    start: int
+    end: int
+    tokens: int
+    last: bool
+
+
+class PackedContext(NamedTuple):
+    """Context text for the prompt and how it was reduced."""
+
+    text: str
+    usage: ContextUsage
+
+
+class ContextPacker:
+    """Packs the highest-ranked documents into a token budget.
+
+    Documents are taken in rank order, each limited to
+    ``max_document_tokens`` and to what is left of ``max_tokens``. A
+    document that fits is included whole. A longer one is reduced to the
+    sentences sharing the most query terms (rarer terms in the document
+    weigh more), kept in document order with gaps marked, so the passages
+    that answer the query survive where plain truncation would keep only
+    the beginning. Once less than ``min_document_tokens`` is left, the
+    remaining documents are dropped.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 3000,
+        max_document_tokens: int = 1000,
+        min_document_tokens: int = 64,
+        max_sentence_tokens: int = 96,
+    ) -> None:
+        """Create a packer.
+
+        Args:
+            max_tokens: Estimated tokens allowed for the whole context
+            max_document_tokens: Estimated tokens allowed per document
+            min_document_tokens: Smallest share worth giving a document,
+                at most max_document_tokens
+            max_sentence_tokens: Longer sentences are split into pieces of
+                this many tokens before extraction
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if min(max_tokens, max_document_tokens, min_document_tokens) <= 0:
+            raise ValueError("token limits must be positive")
+        if max_sentence_tokens <= 0:
+            raise ValueError("max_sentence_tokens must be positive")
+        self.max_tokens = max_tokens
+        self.max_document_tokens = max_document_tokens
+        self.min_document_tokens = min(min_document_tokens, max_document_tokens)
+        self.max_sentence_tokens = max_sentence_tokens
+        self.requests = 0
+        self.tokens = 0
+        self.tokens_saved = 0
+
+    def pack(self, query_text: str, documents: list[Document]) -> PackedContext:
+        """Return the context for a query from documents in rank order."""
+        query_terms = set(tokenize(query_text))
+        separator_tokens = estimate_tokens(SEPARATOR)
+        parts: list[str] = []
+        remaining = self.max_tokens
+        originals: list[str] = []
+        compressed = 0
+        dropped = 0
+        for document in documents:
+            full = format_document(document)
+            full_tokens = estimate_tokens(full)
+            originals.append(full)
+            allowance = min(self.max_document_tokens, remaining)
+            if parts:
+                allowance -= separator_tokens
+            if full_tokens <= allowance:
+                part, tokens = full, full_tokens
+            elif allowance < self.min_document_tokens:
+                dropped += 1
+                continue
+            else:
+                header_tokens = estimate_tokens(format_document(document, ""))
+                content = self._extract(
+                    document.content, query_terms, allowance - header_tokens
+                )
+                if not content:
+                    dropped += 1
+                    continue
+                part = format_document(document, content)
+                tokens = estimate_tokens(part)
+                compressed += 1
+            remaining -= tokens + (separator_tokens if parts else 0)
+            parts.append(part)
+
+        text = SEPARATOR.join(parts)
+        tokens = estimate_tokens(text)
+        usage = ContextUsage(
+            tokens=tokens,
+            tokens_saved=estimate_tokens(SEPARATOR.join(originals)) - tokens,
+            documents_compressed=compressed,
+            documents_dropped=dropped,
+        )
+        self.requests += 1
+        self.tokens += usage.tokens
+        self.tokens_saved += usage.tokens_saved
+        return PackedContext(text, usage)
+
+    def _extract(self, content: str, query_terms: set[str], budget: int) -> str:
+        """Return the most query-relevant sentences of content within budget.
+
+        Sentence boundaries are found in one pass, but only the sentences
+        considered for the budget are measured and split.
+        """
+        first = len(content) - len(content.lstrip())
+        last = len(content.rstrip())
+        boundaries = [
+            match.span() for match in _SENTENCE_END.finditer(content, first, last)
+        ]
+        starts = [first, *(end for _, end in boundaries)]
+
+        def span(sentence: int) -> tuple[int, int]:
+            if sentence == len(boundaries):
+                return starts[sentence], last
+            # Sentences keep their final punctuation
+            end = boundaries[sentence][0]
+            return starts[sentence], end + (content[end] in ".!?")
+
+        # Query terms found in each sentence, from one pass over the content
+        hits: dict[int, list[tuple[int, str]]] = {}
+        for offset, term in _find_terms(content, query_terms, first, last):
+            sentence = bisect.bisect_right(starts, offset) - 1
+            hits.setdefault(sentence, []).append((offset, term))
+        terms = {
+            sentence: {term for _, term in sentence_hits}
+            for sentence, sentence_hits in hits.items()
+        }
+        # Terms found in few sentences discriminate better between them
+        frequency: dict[str, int] = {}
+        for sentence_terms in terms.values():
+            for term in sentence_terms:
+                frequency[term] = frequency.get(term, 0) + 1
+        weight = {
+            term: math.log(1 + len(starts) / count) for term, count in frequency.items()
+        }
+        scores = {
+            sentence: sum(weight[term] for term in sentence_terms)
+            for sentence, sentence_terms in terms.items()
+        }
+
+        # Every piece is charged a gap marker and the spaces around it
+        gap_tokens = estimate_tokens(f" {_GAP} ")
+        chosen: list[_Piece] = []
+        used = gap_tokens  # The trailing marker
+        # Sentences with query terms first, best first; in a sentence cut
+        # into pieces, the pieces holding the terms first
+        for sentence in sorted(scores, key=lambda s: (-scores[s], s)):
+            if budget - used <= gap_tokens:
+                break
+            offsets = [offset for offset, _ in hits[sentence]]
+            pieces = self._pieces(content, sentence, *span(sentence))
+            pieces.sort(
+                key=lambda piece: not any(piece.start <= o < piece.end for o in offsets)
+            )
+            for piece in pieces:
+                if used + piece.tokens + gap_tokens <= budget:
+                    chosen.append(piece)
+                    used += piece.tokens + gap_tokens
+        # Then the beginning of the document, as far as it fits
+        for piece in (
+            piece
+            for sentence in range(len(starts))
+            if sentence not in scores
+            for piece in self._pieces(content, sentence, *span(sentence))
+        ):
+            if used + piece.tokens + gap_tokens > budget:
+                break
+            chosen.append(piece)
+            used += piece.tokens + gap_tokens
+        chosen.sort()
+
+        # Mark the text skipped before, between and after the chosen pieces
+        parts: list[str] = []
+        expected = (0, 0)
+        for piece in chosen:
+            if (piece.sentence, piece.part) != expected:
+                parts.append(_GAP)
+            parts.append(content[piece.start : piece.end])
+            expected = (
+                (piece.sentence + 1, 0)
+                if piece.last
+                else (piece.sentence, piece.part + 1)
+            )
+        if chosen and expected != (len(starts), 0):
+            parts.append(_GAP)
+        return " ".join(parts)
+
+    def _pieces(
+        self, content: str, sentence: int, start: int, end: int
+    ) -> list[_Piece]:
+        """Return a sentence, cut into pieces if longer than max_sentence_tokens."""
+        tokens = estimate_tokens(content[start:end])
+        if tokens <= self.max_sentence_tokens:
+            return [_Piece(sentence, 0, start, end, tokens, True)]
+        # Cut run-on text into word windows of about the maximum size
+        windows: list[tuple[int, int, int]] = []
+        window_start = window_end = start
+        window_tokens = 0
+        for word in _WORD.finditer(content, start, end):
+            word_tokens = estimate_tokens(word.group()) + 1
+            if window_tokens and window_tokens + word_tokens > self.max_sentence_tokens:
+                windows.append((window_start, window_end, window_tokens))
+                window_start, window_tokens = word.start(), 0
+            window_end = word.end()
+            window_tokens += word_tokens
+        windows.append((window_start, window_end, window_tokens))
+        return [
+            _Piece(
+                sentence,
+                part,
+                piece_start,
+                piece_end,
+                piece_tokens,
+                part == len(windows) - 1,
+            )
+            for part, (piece_start, piece_end, piece_tokens) in enumerate(windows)
+        ]
+
+    def stats(self) -> dict[str, int | float]:
+        """Return the tokens packed and saved over all requests."""
+        packed = self.tokens + self.tokens_saved
+        return {
+            "requests": self.requests,
+            "tokens": self.tokens,
+            "tokens_saved": self.tokens_saved,
+            "saved_ratio": self.tokens_saved / packed if packed else 0.0,
+        }
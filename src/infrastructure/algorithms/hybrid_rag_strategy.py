@@ -0,0 +1,172 @@
+"""Hybrid RAG strategy implementation."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable
+from uuid import UUID
+
+from src.domain.document.models.document import Document
+from src.domain.document.repositories.document_repository import DocumentRepository
+from src.domain.document.services.document_index import DocumentIndex
+from src.domain.rag.models.query import RetrievalOptions
+from src.domain.rag.services.rag_strategy import RAGStrategy
+from src.infrastructure.algorithms.bm25_index import BM25Index
+from src.infrastructure.algorithms.chunk_index import ChunkIndex
+from src.infrastructure.algorithms.prefilter import allowed_ids
+from src.infrastructure.algorithms.vector_index import VectorIndex
+
+Ranking = list[tuple[UUID, float]]
+
+logger = logging.getLogger(__name__)
+
+
+def reciprocal_rank_fusion(
+    rankings: list[tuple[Ranking, float]], k: int = 60
+) -> list[tuple[UUID, float]]:
+    """Merge rankings by weighted reciprocal rank.
+
+    A document scores ``weight / (k + rank)`` in every ranking that contains
+    it, with ranks starting at 1, so only positions matter and the legs'
+    score scales need not be comparable.
+
+    Args:
+        rankings: Each ranking, best first, with its weight
+        k: Damping constant; larger values flatten the rank differences
+
+    Returns:
+        Document IDs with their fused scores, best first
+    """
+    fused: dict[UUID, float] = {}
+    for ranking, weight in rankings:
+        for rank, (document_id, _) in enumerate(ranking, start=1):
+            fused[document_id] = fused.get(document_id, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridRAGStrategy(RAGStrategy):
+    """RAG strategy fusing BM25 and embedding rankings.
+
+    The lexical and dense legs run concurrently: the BM25 search runs in a
+    worker thread while the dense leg awaits the query embedding. Their
+    rankings are merged with reciprocal rank fusion. A leg that exceeds
+    ``leg_timeout`` or raises is dropped and the other leg's ranking is used
+    alone; a dropped lexical search still finishes in its thread, but is not
+    awaited. Only when both legs fail is the error raised.
+    """
+
+    def __init__(
+        self,
+        document_repository: DocumentRepository,
+        lexical_index: BM25Index,
+        dense_index: VectorIndex,
+        lexical_depth: int = 50,
+        dense_depth: int = 50,
+        lexical_weight: float = 1.0,
+        dense_weight: float = 1.0,
+        rrf_k: int = 60,
+        leg_timeout: float | None = None,
+        chunks: ChunkIndex | None = None,
+    ) -> None:
+        """Initialize the hybrid RAG strategy.
+
+        Args:
+            document_repository: Repository for document operations
+            lexical_index: BM25 index kept in sync with document writes
+            dense_index: Embedding index kept in sync with document writes
+            lexical_depth: Candidates taken from the lexical leg
+            dense_depth: Candidates taken from the dense leg
+            lexical_weight: Weight of the lexical ranking in the fusion
+            dense_weight: Weight of the dense ranking in the fusion
+            rrf_k: Reciprocal rank fusion damping constant
+            leg_timeout: Seconds to wait for each leg; None waits indefinitely
+            chunks: Chunk index feeding both indexes, for passage retrieval
+        """
+        self.document_repository = document_repository
+        self.lexical_index = lexical_index
+        self.dense_index = dense_index
+        self.lexical_depth = lexical_depth
+        self.dense_depth = dense_depth
+        self.lexical_weight = lexical_weight
+        self.dense_weight = dense_weight
+        self.rrf_k = rrf_k
+        self.leg_timeout = leg_timeout
+        self.chunks = chunks
+
+    async def retrieve_documents(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
+    ) -> list[Document]:
+        """
+        Retrieve the documents ranked highest by both legs combined.
+
+        With a chunk index, the legs rank chunks and each document holds only
+        its matching passages; the candidate depths then count chunks. A
+        metadata filter in the options restricts both legs to matching
+        documents before scoring.
+
+        Args:
+            query_text: The query text
+            top_k: Number of documents to retrieve
+            options: Per-query search settings; the filter applies to both
+                legs, the rest is passed to the dense leg
+
+        Returns:
+            List of documents, best fused rank first
+        """
+        # Loading is not subject to the leg timeout, so it is never cut short
+        indexes: list[DocumentIndex] = [self.lexical_index, self.dense_index]
+        if self.chunks is not None:
+            indexes = [self.chunks]
+        for index in indexes:
+            if not index.loaded:
+                await index.load(self.document_repository.iter_all())
+        allowed = await allowed_ids(self.document_repository, options, self.chunks)
+
+        legs = await asyncio.gather(
+            self._run_leg("lexical", self._lexical(query_text, allowed)),
+            self._run_leg(
+                "dense",
+                self.dense_index.query(query_text, self.dense_depth, options, allowed),
+            ),
+        )
+        errors = [leg for leg in legs if isinstance(leg, Exception)]
+        if len(errors) == len(legs):
+            # Both legs timing out still yields an empty result, as before
+            raised = [e for e in errors if not isinstance(e, TimeoutError)]
+            if raised:
+                raise raised[0]
+        lexical, dense = ([] if isinstance(leg, Exception) else leg for leg in legs)
+        fused = reciprocal_rank_fusion(
+            [(lexical, self.lexical_weight), (dense, self.dense_weight)],
+            self.rrf_k,
+        )
+        if self.chunks is not None:
+            return await self.chunks.documents(self.document_repository, fused, top_k)
+
+        documents: list[Document] = []
+        for document_id, _ in fused:
+            if len(documents) == top_k:
+                break
+            document = await self.document_repository.find_by_id(document_id)
+            if document is not None:
+                documents.append(document)
+        return documents
+
+    async def _run_leg(self, name: str, leg: Awaitable[Ranking]) -> Ranking | Exception:
+        """Return a leg's ranking, or the error that made it fail."""
+        try:
+            return await asyncio.wait_for(leg, self.leg_timeout)
+        except TimeoutError as e:
+            return e
+        except Exception as e:
+            logger.warning("Hybrid %s leg failed", name, exc_info=e)
+            return e
+
+    async def _lexical(self, query_text: str, allowed: set[UUID] | None) -> Ranking:
+        # A thread keeps the CPU-bound search off the event loop, so the
+        # dense leg proceeds and the leg timeout can fire
+        return await asyncio.to_thread(
+            self.lexical_index.search, query_text, self.lexical_depth, allowed
+        )
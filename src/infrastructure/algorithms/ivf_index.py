@@ -0,0 +1,415 @@
+"""Approximate embedding index with k-means inverted lists (IVF)."""
+
+import asyncio
+import heapq
+import math
+from collections.abc import Collection, Sequence
+from operator import itemgetter
+from typing import NamedTuple
+from uuid import UUID
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.vector_index import Embed, VectorIndex, normalize
+from src.infrastructure.algorithms.vector_matrix import Vector, VectorMatrix
+from src.infrastructure.algorithms.vector_quantization import Precision
+
+# Rows scored against the centroids per matrix product, bounding memory
+_ASSIGN_CHUNK_ROWS = 4096
+# k-means is trained on a sample of at most this many vectors per list
+_TRAINING_POINTS_PER_LIST = 64
+
+
+def assign(vectors: Vector, centroids: Vector) -> NDArray[np.intp]:
+    """Return the index of the most similar centroid for every vector."""
+    assignments = np.empty(len(vectors), dtype=np.intp)
+    for start in range(0, len(vectors), _ASSIGN_CHUNK_ROWS):
+        chunk = vectors[start : start + _ASSIGN_CHUNK_ROWS]
+        assignments[start : start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(
+    vectors: Vector, count: int, iterations: int, rng: np.random.Generator
+) -> Vector:
+    """Cluster unit vectors with spherical k-means.
+
+    Args:
+        vectors: Unit vectors to cluster, one per row
+        count: Number of centroids, at most the number of vectors
+        iterations: Number of Lloyd iterations
+        rng: Random generator for seeding and reseeding empty clusters
+
+    Returns:
+        Unit-length centroids, one per row
+    """
+    centroids = vectors[rng.choice(len(vectors), count, replace=False)]
+    for _ in range(iterations):
+        assignments = assign(vectors, centroids)
+        counts = np.bincount(assignments, minlength=count)
+        # Sum each cluster's members as contiguous runs of the sorted rows
+        order = np.argsort(assignments, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        filled = counts > 0
+        sums = np.empty_like(centroids)
+        sums[filled] = np.add.reduceat(vectors[order], starts[filled], axis=0)
+        # Empty clusters restart from random vectors
+        empty = int(np.count_nonzero(~filled))
+        sums[~filled] = vectors[rng.choice(len(vectors), empty)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        sums /= np.where(norms > 0, norms, 1)
+        centroids = sums
+    return centroids
+
+
+class _Lists(NamedTuple):
+    """Inverted lists built by a training, ready to be swapped in."""
+
+    centroids: Vector
+    lists: list[VectorMatrix]
+    list_of: dict[int, int]
+    size: int
+
+
+class IVFVectorIndex(VectorIndex):
+    """Approximate embedding index partitioning vectors by nearest centroid.
+
+    Until ``min_train_size`` vectors are stored, the index searches exactly
+    like VectorIndex. It then clusters the vectors with k-means into
+    ``nlist`` inverted lists, each a VectorMatrix, and a query scans only the
+    ``nprobe`` lists whose centroids are most similar to it. Inserts go to
+    the nearest centroid's list and deletes tombstone the row in its list;
+    once the collection has grown ``retrain_growth`` times since the last
+    training, the centroids are retrained so the lists stay balanced.
+
+    Training that a write triggers in a running event loop runs in a worker
+    thread, and queries keep using the current lists until the new ones are
+    swapped in; writes made meanwhile are replayed onto the new lists.
+
+    The lists can hold compressed codes, with exact rescoring of the probed
+    candidates, exactly as in VectorIndex.
+    """
+
+    def __init__(
+        self,
+        embed: Embed,
+        nlist: int = 0,
+        nprobe: int = 8,
+        min_train_size: int = 10_000,
+        retrain_growth: float = 4.0,
+        kmeans_iterations: int = 10,
+        seed: int = 0,
+        initial_capacity: int = 1024,
+        compaction_ratio: float = 0.25,
+        max_text_chars: int = 8000,
+        precision: Precision = "float32",
+        projection_dimensions: int = 0,
+        rescore_factor: int = 4,
+    ) -> None:
+        """Create an empty index.
+
+        Args:
+            embed: Function embedding document and query text
+            nlist: Number of inverted lists; 0 uses the square root of the
+                number of vectors at training time
+            nprobe: Lists scanned per query unless the query overrides it
+            min_train_size: Vectors needed before clustering
+            retrain_growth: Growth factor since training that triggers retraining
+            kmeans_iterations: Lloyd iterations per training
+            seed: Seed for k-means initialization and the random projection
+            initial_capacity: Rows allocated before training
+            compaction_ratio: Fraction of tombstoned rows triggering compaction
+            max_text_chars: Document text beyond this length is not embedded
+            precision: Storage type of the searched vectors
+            projection_dimensions: Random projection size of the searched
+                vectors; 0 keeps every dimension
+            rescore_factor: Compressed-search candidates rescored exactly per
+                requested result; 0 returns the approximate scores as is
+        """
+        self._nlist = nlist
+        self._nprobe = nprobe
+        self._min_train_size = min_train_size
+        self._retrain_growth = retrain_growth
+        self._kmeans_iterations = kmeans_iterations
+        self._rng = np.random.default_rng(seed)
+        self._training: asyncio.Future[None] | None = None
+        super().__init__(
+            embed,
+            initial_capacity,
+            compaction_ratio,
+            max_text_chars,
+            precision,
+            projection_dimensions,
+            rescore_factor,
+            projection_seed=seed,
+        )
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._centroids: Vector | None = None
+        self._lists: list[VectorMatrix] = []
+        self._list_of: dict[int, int] = {}  # document ID -> inverted list
+        self._trained_size = 0
+        # document ID -> unit vector, or None once removed, for the writes
+        # made while a background training runs
+        self._changes: dict[int, Vector | None] | None = None
+
+    def __len__(self) -> int:
+        if self._centroids is None:
+            return super().__len__()
+        return len(self._list_of)
+
+    @property
+    def trained(self) -> bool:
+        """Whether the vectors are partitioned into inverted lists."""
+        return self._centroids is not None
+
+    @property
+    def nlist(self) -> int:
+        """Number of inverted lists, 0 before training."""
+        return len(self._lists)
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows currently allocated."""
+        if self._centroids is None:
+            return super().capacity
+        return sum(inverted.capacity for inverted in self._lists)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of searched vectors and centroids held in memory."""
+        if self._centroids is None:
+            return super().nbytes
+        lists = sum(inverted.nbytes for inverted in self._lists)
+        return lists + self._centroids.nbytes
+
+    def put(self, document_id: UUID, vector: Sequence[float]) -> None:
+        """Index a precomputed embedding, replacing the document's previous one.
+
+        Args:
+            document_id: The document ID
+            vector: The document embedding
+        """
+        if self._centroids is None:
+            super().put(document_id, vector)
+            if self._changes is not None:
+                self._changes[document_id.int] = normalize(vector)
+            if len(self) >= self._min_train_size:
+                self._start_training()
+            return
+
+        row = normalize(vector)
+        if row.shape != self._centroids.shape[1:]:
+            raise ValueError(
+                f"Embedding has {len(row)} dimensions, "
+                f"expected {self._centroids.shape[1]}"
+            )
+        self._discard(document_id.int)
+        self._assign(self._centroids, document_id.int, row)
+        if self._originals is not None:
+            self._originals.put_many([document_id.int], row[np.newaxis])
+        if self._changes is not None:
+            self._changes[document_id.int] = row
+        if len(self._list_of) >= self._retrain_growth * self._trained_size:
+            self._start_training()
+
+    def _assign(self, centroids: Vector, document_id: int, row: Vector) -> None:
+        list_id = int(np.argmax(centroids @ row))
+        self._lists[list_id].put(document_id, row)
+        self._list_of[document_id] = list_id
+
+    async def remove(self, document_id: UUID) -> None:
+        """Remove a document from the index."""
+        if self._changes is not None:
+            self._changes[document_id.int] = None
+        if self._centroids is None:
+            await super().remove(document_id)
+        else:
+            self._pending.pop(document_id, None)
+            self._discard(document_id.int)
+            self.version += 1
+
+    def _discard(self, document_id: int) -> None:
+        list_id = self._list_of.pop(document_id, None)
+        if list_id is not None:
+            self._lists[list_id].discard(document_id)
+        if self._originals is not None:
+            self._originals.discard(document_id)
+
+    def compact(self) -> None:
+        """Pack the live rows to the front of every matrix."""
+        super().compact()
+        for inverted in self._lists:
+            inverted.compact()
+
+    def _live_vectors(self) -> tuple[list[int], Vector] | None:
+        ids: list[int]
+        if self._originals is not None:
+            # The matrices hold compressed codes; cluster the originals
+            if self._centroids is not None:
+                ids = list(self._list_of)
+            elif self._matrix is not None:
+                ids = self._matrix.live_ids()
+            else:
+                return None
+            return ids, self._originals.get(ids)
+        if self._centroids is None:
+            return None if self._matrix is None else self._matrix.live_vectors()
+        ids = []
+        parts = []
+        for inverted in self._lists:
+            list_ids, vectors = inverted.live_vectors()
+            ids.extend(list_ids)
+            parts.append(vectors)
+        return ids, np.concatenate(parts)
+
+    def train(self) -> None:
+        """Cluster the stored vectors and rebuild the inverted lists."""
+        stored = self._live_vectors()
+        if stored is not None and stored[0]:
+            self._install(self._build(*stored))
+
+    async def retrain(self) -> None:
+        """Cluster the stored vectors in a worker thread and swap in new lists.
+
+        Queries are served from the current lists until the new ones are
+        ready. If a training is already running, waits for it instead.
+        """
+        self._start_training()
+        if self._training is not None:
+            await asyncio.shield(self._training)
+
+    def _start_training(self) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Without an event loop there is nothing to keep responsive
+            self.train()
+            return
+        if self._training is None:
+            self._training = asyncio.ensure_future(self._train_in_background())
+            self._training.add_done_callback(self._trained)
+
+    async def _train_in_background(self) -> None:
+        stored = self._live_vectors()
+        if stored is None or not stored[0]:
+            return
+        ids, vectors = stored
+        changes: dict[int, Vector | None] = {}
+        self._changes = changes
+        try:
+            # The vectors may be a view of a matrix that writes modify
+            built = await asyncio.to_thread(self._build, ids, vectors.copy())
+        finally:
+            cleared = self._changes is not changes
+            if not cleared:
+                self._changes = None
+        if cleared:
+            return
+        self._install(built)
+        for document_id, row in changes.items():
+            list_id = self._list_of.pop(document_id, None)
+            if list_id is not None:
+                self._lists[list_id].discard(document_id)
+            if row is not None:
+                self._assign(built.centroids, document_id, row)
+
+    def _trained(self, training: asyncio.Future[None]) -> None:
+        self._training = None
+        if not training.cancelled():
+            # A failed training is retried on a later write; retrieve the
+            # error so it is not logged when nobody awaited it
+            training.exception()
+
+    def _build(self, ids: list[int], vectors: Vector) -> _Lists:
+        count = min(self._nlist or math.isqrt(len(ids)), len(ids))
+        sample_size = min(len(ids), count * _TRAINING_POINTS_PER_LIST)
+        sample = vectors[self._rng.choice(len(ids), sample_size, replace=False)]
+        centroids = train_centroids(sample, count, self._kmeans_iterations, self._rng)
+
+        assignments = assign(vectors, centroids)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.cumsum(np.bincount(assignments, minlength=count))
+        lists = []
+        start = 0
+        for end in bounds.tolist():
+            rows = order[start:end]
+            inverted = self._new_matrix(vectors.shape[1], max(len(rows), 16))
+            inverted.extend([ids[row] for row in rows], vectors[rows])
+            lists.append(inverted)
+            start = end
+        list_of = dict(zip(ids, assignments.tolist(), strict=True))
+        return _Lists(centroids, lists, list_of, len(ids))
+
+    def _install(self, built: _Lists) -> None:
+        self._matrix = None
+        self._centroids = built.centroids
+        self._lists = built.lists
+        self._list_of = built.list_of
+        self._trained_size = built.size
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
+        allowed: Collection[UUID] | None = None,
+    ) -> list[tuple[UUID, float]]:
+        """Return the documents most similar to a query embedding.
+
+        Args:
+            query_vector: The query embedding
+            top_k: Maximum number of results
+            options: Per-query search settings; ``nprobe`` sets how many
+                inverted lists are scanned and ``rescore_factor`` the
+                rescoring depth of compressed vectors
+            allowed: Documents to search; None searches every document.
+                Restricted searches score the allowed documents in every
+                list, so they are exact whatever the ``nprobe``.
+
+        Returns:
+            Document IDs with their cosine similarity, most similar first
+        """
+        if self._centroids is None:
+            return super().search(query_vector, top_k, options, allowed)
+        query = normalize(query_vector)
+        if allowed is not None:
+            return self._search_allowed(query, top_k, options, allowed)
+        nprobe = options.nprobe if options and options.nprobe else self._nprobe
+        nprobe = min(nprobe, len(self._lists))
+        centroid_scores = self._centroids @ query
+        probed = np.argpartition(centroid_scores, -nprobe)[-nprobe:]
+
+        depth = self._rescore_depth(top_k, options)
+        candidates: list[tuple[int, float]] = []
+        for list_id in probed.tolist():
+            candidates.extend(self._lists[list_id].top_k(query, depth or top_k))
+        best = heapq.nlargest(depth or top_k, candidates, key=itemgetter(1))
+        return self._rescore(query, best, top_k, depth)
+
+    def _search_allowed(
+        self,
+        query: Vector,
+        top_k: int,
+        options: RetrievalOptions | None,
+        allowed: Collection[UUID],
+    ) -> list[tuple[UUID, float]]:
+        """Score exactly the allowed documents, grouped by their inverted list.
+
+        A probe would miss allowed documents outside the probed lists, so
+        every list holding some of them is scanned, but only their rows.
+        """
+        members: dict[int, list[int]] = {}
+        for document_id in allowed:
+            list_id = self._list_of.get(document_id.int)
+            if list_id is not None:
+                members.setdefault(list_id, []).append(document_id.int)
+        depth = self._rescore_depth(top_k, options)
+        candidates: list[tuple[int, float]] = []
+        for list_id, ids in members.items():
+            candidates.extend(self._lists[list_id].top_k(query, depth or top_k, ids))
+        best = heapq.nlargest(depth or top_k, candidates, key=itemgetter(1))
+        return self._rescore(query, best, top_k, depth)
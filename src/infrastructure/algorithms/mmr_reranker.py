@@ -0,0 +1,87 @@
+"""Maximal marginal relevance reranking."""
+
+from typing import Any
+
+import numpy as np
+
+from src.domain.document.models.document import Document
+from src.domain.rag.models.query import RetrievalOptions
+from src.domain.rag.services.reranker import Reranker
+from src.infrastructure.algorithms.similarity import SimilaritySource
+
+
+def mmr(
+    relevance: np.ndarray[Any, Any],
+    similarity: np.ndarray[Any, Any],
+    k: int,
+    relevance_weight: float = 0.5,
+) -> list[int]:
+    """Select k items by maximal marginal relevance.
+
+    Each step picks the item maximizing ``w * relevance - (1 - w) *
+    redundancy``, where redundancy is its highest similarity to an item
+    already picked. The redundancies are kept as one vector updated with
+    the picked item's similarity row, so a step costs O(n).
+
+    Args:
+        relevance: Relevance of each item to the query
+        similarity: Pairwise item similarities
+        k: Number of items to select
+        relevance_weight: 1.0 ranks by relevance only, 0.0 by novelty only
+
+    Returns:
+        Indexes of the selected items, in selection order; ties go to the
+        lower index, i.e. the better retrieved item
+    """
+    count = len(relevance)
+    gain = relevance_weight * np.asarray(relevance, dtype=np.float32)
+    redundancy = np.zeros(count, dtype=np.float32)
+    penalty = np.float32(1 - relevance_weight)
+    available = np.ones(count, dtype=bool)
+    selected: list[int] = []
+    for _ in range(min(k, count)):
+        scores = np.where(available, gain - penalty * redundancy, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return selected
+
+
+class MMRReranker(Reranker):
+    """Reranks candidates by maximal marginal relevance.
+
+    Near-duplicate candidates mostly repeat the first one picked, so they
+    give way to documents adding new content to the prompt.
+    """
+
+    def __init__(
+        self, similarity: SimilaritySource, relevance_weight: float = 0.5
+    ) -> None:
+        """Create an MMR reranker.
+
+        Args:
+            similarity: Scores the candidates against the query and each other
+            relevance_weight: Default trade-off between relevance (1.0) and
+                novelty (0.0), unless the query sets ``mmr_lambda``
+        """
+        self._similarity = similarity
+        self._relevance_weight = relevance_weight
+
+    async def rerank(
+        self,
+        query_text: str,
+        documents: list[Document],
+        top_k: int,
+        options: RetrievalOptions | None = None,
+    ) -> list[Document]:
+        if len(documents) <= 1:
+            return documents[:top_k]
+        relevance, similarity = await self._similarity.similarities(
+            query_text, documents
+        )
+        relevance_weight = self._relevance_weight
+        if options is not None and options.mmr_lambda is not None:
+            relevance_weight = options.mmr_lambda
+        selected = mmr(relevance, similarity, top_k, relevance_weight)
+        return [documents[i] for i in selected]
@@ -1,5 +1,6 @@
 from src.domain.document.models.document import Document
 from src.domain.document.repositories.document_repository import DocumentRepository
+from src.domain.rag.models.query import RetrievalOptions
 from src.domain.rag.services.rag_strategy import RAGStrategy
 
 
@@ -10,7 +11,10 @@ class MockRAGStrategy(RAGStrategy):
         self.document_repository = document_repository
 
     async def retrieve_documents(
-        self, _query_text: str, top_k: int = 5
+        self,
+        _query_text: str,
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
     ) -> list[Document]:
         """
         Retrieve documents using mock logic.
@@ -20,10 +24,14 @@ class MockRAGStrategy(RAGStrategy):
         Args:
             query_text: The query text (not used in mock)
             top_k: Number of documents to retrieve
+            options: Per-query search settings; only ``filter`` is used
 
         Returns:
             List of mock documents
         """
         # Mock implementation: just return first top_k documents
-        documents = await self.document_repository.find_all(limit=top_k)
+        document_filter = options.filter if options is not None else None
+        documents = await self.document_repository.find_all(
+            limit=top_k, document_filter=document_filter
+        )
         return documents
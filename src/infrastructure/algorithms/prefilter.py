@@ -0,0 +1,34 @@
+"""Metadata pre-filtering shared by the index-backed RAG strategies."""
+
+from uuid import UUID
+
+from src.domain.document.repositories.document_repository import DocumentRepository
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.chunk_index import ChunkIndex
+
+
+async def allowed_ids(
+    repository: DocumentRepository,
+    options: RetrievalOptions | None,
+    chunks: ChunkIndex | None = None,
+) -> set[UUID] | None:
+    """Return the IDs a filtered query may rank, before any scoring.
+
+    The matching documents are looked up in the repository's secondary
+    indexes. With a chunk index, the IDs are those of their chunks, which
+    is what the wrapped indexes rank.
+
+    Args:
+        repository: Repository resolving the filter
+        options: Per-query search settings holding the filter
+        chunks: Chunk index feeding the searched indexes, if any
+
+    Returns:
+        The allowed IDs, or None if the query is not filtered
+    """
+    if options is None or options.filter is None or options.filter.is_empty():
+        return None
+    document_ids = await repository.find_ids(options.filter)
+    if chunks is None:
+        return document_ids
+    return chunks.chunk_ids(document_ids)
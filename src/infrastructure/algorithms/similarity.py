@@ -0,0 +1,171 @@
+"""Similarity sources scoring candidate documents for reranking."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.bm25_index import tokenize
+from src.infrastructure.algorithms.vector_index import Embed
+
+# MinHash signature and distinct term hashes of a text
+_Fingerprint = tuple[
+    np.ndarray[Any, np.dtype[np.uint64]], np.ndarray[Any, np.dtype[np.int64]]
+]
+# Relevance of each candidate to the query, and the candidates' pairwise
+# similarity matrix
+Similarities = tuple[np.ndarray[Any, np.dtype[np.float32]], np.ndarray[Any, Any]]
+
+
+class SimilaritySource(ABC):
+    """Abstract base class for the similarities MMR reranking trades off."""
+
+    @abstractmethod
+    async def similarities(
+        self, query_text: str, documents: list[Document]
+    ) -> Similarities:
+        """Score the documents against the query and against each other.
+
+        Returns:
+            A vector of query relevances and a symmetric matrix of document
+            similarities, both roughly in [0, 1]
+        """
+        pass
+
+
+class EmbeddingSimilarity(SimilaritySource):
+    """Cosine similarity of embeddings.
+
+    Documents are embedded as VectorIndex embeds them, so a caching embed
+    function (e.g. AzureOpenAIClient.get_embeddings) serves indexed
+    documents without new requests.
+    """
+
+    def __init__(self, embed: Embed, max_text_chars: int = 8000) -> None:
+        """Create an embedding similarity source.
+
+        Args:
+            embed: Turns text into an embedding vector
+            max_text_chars: Document text beyond this length is not embedded
+        """
+        self._embed = embed
+        self._max_text_chars = max_text_chars
+
+    async def similarities(
+        self, query_text: str, documents: list[Document]
+    ) -> Similarities:
+        texts = [f"{d.title}\n\n{d.content}"[: self._max_text_chars] for d in documents]
+        vectors = await asyncio.gather(
+            self._embed(query_text), *(self._embed(text) for text in texts)
+        )
+        # One conversion for all vectors, then rows scaled to unit length
+        rows = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        rows /= np.where(norms > 0, norms, 1)
+        query, matrix = rows[0], rows[1:]
+        return matrix @ query, matrix @ matrix.T
+
+
+class ShingleSimilarity(SimilaritySource):
+    """Lexical similarity from word shingles, without any external calls.
+
+    Two documents are as similar as the Jaccard similarity of their sets of
+    ``size``-word shingles, estimated from MinHash signatures so the whole
+    matrix is a single vectorized comparison. A document's relevance is the
+    share of the query's terms it contains.
+
+    Tokenizing dominates the cost, so the signature and term hashes of
+    recently seen texts are kept in an LRU; documents retrieved again by
+    later queries are not tokenized again.
+    """
+
+    def __init__(
+        self,
+        size: int = 3,
+        num_hashes: int = 64,
+        cache_size: int = 4096,
+        seed: int = 0,
+    ) -> None:
+        """Create a shingle similarity source.
+
+        Args:
+            size: Words per shingle
+            num_hashes: MinHash signature length; the Jaccard estimate has a
+                standard error of about 1 / sqrt(num_hashes)
+            cache_size: Texts whose hashes are kept; 0 disables the cache
+            seed: Seed of the MinHash hash functions
+        """
+        if size < 1 or num_hashes < 1:
+            raise ValueError("size and num_hashes must be positive")
+        self._size = size
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, _Fingerprint] = OrderedDict()
+        rng = np.random.default_rng(seed)
+        # Multiply-add hashing modulo 2**64; odd multipliers are bijective
+        self._multipliers = rng.integers(0, 2**63, num_hashes, dtype=np.uint64) * 2 + 1
+        self._offsets = rng.integers(0, 2**63, num_hashes, dtype=np.uint64)
+        self._mixers = rng.integers(0, 2**63, size, dtype=np.uint64) * 2 + 1
+
+    async def similarities(
+        self, query_text: str, documents: list[Document]
+    ) -> Similarities:
+        fingerprints = [self._fingerprint(f"{d.title} {d.content}") for d in documents]
+        signatures = np.stack([signature for signature, _ in fingerprints])
+        similarity = (signatures[:, None, :] == signatures[None, :, :]).mean(
+            axis=2, dtype=np.float32
+        )
+        query_terms = _term_hashes(tokenize(query_text))
+        if not len(query_terms):
+            return np.zeros(len(documents), dtype=np.float32), similarity
+        # Each document's terms are distinct, so counting the document's
+        # terms found in the query counts the query terms it contains
+        terms = np.concatenate([terms for _, terms in fingerprints])
+        owners = np.repeat(
+            np.arange(len(documents)), [len(terms) for _, terms in fingerprints]
+        )
+        found = np.bincount(
+            owners, weights=np.isin(terms, query_terms), minlength=len(documents)
+        )
+        relevance = (found / len(query_terms)).astype(np.float32)
+        return relevance, similarity
+
+    def _fingerprint(self, text: str) -> _Fingerprint:
+        fingerprint = self._cache.get(text)
+        if fingerprint is not None:
+            self._cache.move_to_end(text)
+            return fingerprint
+        terms = tokenize(text)
+        fingerprint = (self.signature(terms), _term_hashes(terms))
+        if self._cache_size > 0:
+            self._cache[text] = fingerprint
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return fingerprint
+
+    def signature(self, terms: list[str]) -> np.ndarray[Any, np.dtype[np.uint64]]:
+        """Return the MinHash signature of the shingles of a term sequence."""
+        hashes = np.fromiter(map(hash, terms), dtype=np.int64, count=len(terms))
+        term_hashes = hashes.view(np.uint64)
+        count = len(terms) - self._size + 1
+        if count < 1:
+            # Shorter than a shingle: the whole sequence is the only shingle
+            shingles = np.atleast_1d(
+                np.bitwise_xor.reduce(term_hashes * self._mixers[: len(terms)])
+            )
+        else:
+            # Combine the term hashes of each window with a distinct odd
+            # multiplier per position, modulo 2**64
+            shingles = term_hashes[:count] * self._mixers[0]
+            for offset in range(1, self._size):
+                shingles += term_hashes[offset : offset + count] * self._mixers[offset]
+        minhashes = shingles[None, :] * self._multipliers[:, None]
+        minhashes += self._offsets[:, None]
+        return minhashes.min(axis=1)
+
+
+def _term_hashes(terms: list[str]) -> np.ndarray[Any, np.dtype[np.int64]]:
+    """Return the distinct hashes of the terms, sorted."""
+    return np.unique(np.fromiter(map(hash, terms), dtype=np.int64, count=len(terms)))
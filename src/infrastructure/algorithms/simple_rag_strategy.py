@@ -2,6 +2,7 @@
 
 from src.domain.document.models.document import Document
 from src.domain.document.repositories.document_repository import DocumentRepository
+from src.domain.rag.models.query import RetrievalOptions
 from src.domain.rag.services.rag_strategy import RAGStrategy
 
 
@@ -17,7 +18,10 @@ class SimpleRAGStrategy(RAGStrategy):
         self.document_repository = document_repository
 
     async def retrieve_documents(
-        self, _query_text: str, top_k: int = 5
+        self,
+        _query_text: str,
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
     ) -> list[Document]:
         """
         Retrieve documents using a simple strategy.
@@ -29,10 +33,14 @@ class SimpleRAGStrategy(RAGStrategy):
         Args:
             query_text: The query text (not used in this simple implementation)
             top_k: Number of documents to retrieve
+            options: Per-query search settings; only ``filter`` is used
 
         Returns:
             List of documents
         """
         # Simple implementation: just return the most recent documents
-        documents = await self.document_repository.find_all(limit=top_k)
+        document_filter = options.filter if options is not None else None
+        documents = await self.document_repository.find_all(
+            limit=top_k, document_filter=document_filter
+        )
         return documents
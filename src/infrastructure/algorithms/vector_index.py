@@ -0,0 +1,272 @@
+"""Dense embedding index for vector retrieval."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Collection, Sequence
+from uuid import UUID
+
+import numpy as np
+
+from src.domain.document.models.document import Document
+from src.domain.document.services.document_index import DocumentIndex
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.vector_matrix import Vector, VectorMatrix
+from src.infrastructure.algorithms.vector_quantization import (
+    MappedVectors,
+    Precision,
+    VectorEncoder,
+)
+
+# Turns text into an embedding vector, e.g. AzureOpenAIClient.get_embeddings
+Embed = Callable[[str], Awaitable[list[float]]]
+
+
+def normalize(vector: Sequence[float]) -> Vector:
+    """Convert a vector to float32 with unit length (zero vectors unchanged)."""
+    row = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(row)
+    return row / norm if norm else row
+
+
+class VectorIndex(DocumentIndex):
+    """Exact embedding index holding every vector in one contiguous matrix.
+
+    Embeddings are unit-normalized, so a query is scored against all
+    documents with a single matrix-vector product (cosine similarity). See
+    VectorMatrix for how rows are grown, tombstoned and compacted.
+
+    With a ``precision`` below float32 or a ``projection_dimensions`` below
+    the embedding size, the matrix holds compressed codes instead (see
+    VectorEncoder). A query is then scored against the codes, and the best
+    ``top_k * rescore_factor`` candidates are rescored exactly against the
+    original vectors, which live in a memory-mapped file rather than in RAM.
+    """
+
+    def __init__(
+        self,
+        embed: Embed,
+        initial_capacity: int = 1024,
+        compaction_ratio: float = 0.25,
+        max_text_chars: int = 8000,
+        precision: Precision = "float32",
+        projection_dimensions: int = 0,
+        rescore_factor: int = 4,
+        projection_seed: int = 0,
+    ) -> None:
+        """Create an empty index.
+
+        Args:
+            embed: Function embedding document and query text
+            initial_capacity: Number of rows allocated for the first vectors
+            compaction_ratio: Fraction of tombstoned rows triggering compaction
+            max_text_chars: Document text beyond this length is not embedded
+            precision: Storage type of the searched vectors
+            projection_dimensions: Random projection size of the searched
+                vectors; 0 keeps every dimension
+            rescore_factor: Compressed-search candidates rescored exactly per
+                requested result; 0 returns the approximate scores as is
+            projection_seed: Seed of the random projection
+        """
+        self._embed = embed
+        self._initial_capacity = initial_capacity
+        self._compaction_ratio = compaction_ratio
+        self._max_text_chars = max_text_chars
+        self._precision: Precision = precision
+        self._projection_dimensions = projection_dimensions
+        self._rescore_factor = rescore_factor
+        self._projection_seed = projection_seed
+        # Original vectors of compressed rows, kept for exact rescoring
+        self._originals: MappedVectors | None = None
+        # document ID -> sequence number of its latest add awaiting embeddings
+        self._pending: dict[UUID, int] = {}
+        self._sequence = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        # Allocated on the first vector, once the dimension is known
+        self._matrix: VectorMatrix | None = None
+        self._encoder: VectorEncoder | None = None
+        if self._originals is not None:
+            self._originals.close()
+        self._originals = None
+
+    def _new_matrix(self, dimensions: int, initial_capacity: int) -> VectorMatrix:
+        if self._encoder is None:
+            self._encoder = VectorEncoder(
+                dimensions,
+                self._precision,
+                self._projection_dimensions,
+                self._projection_seed,
+            )
+            if not self._encoder.lossless and self._rescore_factor > 0:
+                self._originals = MappedVectors(dimensions, initial_capacity)
+        return VectorMatrix(
+            dimensions, initial_capacity, self._compaction_ratio, self._encoder
+        )
+
+    def __len__(self) -> int:
+        return 0 if self._matrix is None else len(self._matrix)
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows currently allocated."""
+        return 0 if self._matrix is None else self._matrix.capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of searched vectors held in memory."""
+        return 0 if self._matrix is None else self._matrix.nbytes
+
+    async def add(self, documents: list[Document]) -> None:
+        """Embed and index new or updated documents.
+
+        The documents are embedded concurrently, so a batching embed function
+        can send them upstream together. A document removed, cleared or added
+        again while its embedding is awaited is skipped, so a stale vector
+        never overwrites the later write.
+        """
+        sequences = []
+        for document in documents:
+            self._sequence += 1
+            self._pending[document.id] = self._sequence
+            sequences.append(self._sequence)
+        texts = [f"{d.title}\n\n{d.content}"[: self._max_text_chars] for d in documents]
+        try:
+            vectors = await asyncio.gather(*(self._embed(text) for text in texts))
+        finally:
+            # Writes made during the await removed or replaced the entries
+            # of the documents they superseded
+            current = [
+                self._pending.get(document.id) == sequence
+                for document, sequence in zip(documents, sequences, strict=True)
+            ]
+            for document, is_current in zip(documents, current, strict=True):
+                if is_current:
+                    del self._pending[document.id]
+        for document, vector, is_current in zip(
+            documents, vectors, current, strict=True
+        ):
+            if is_current:
+                self.put(document.id, vector)
+        self.version += 1
+
+    def put(self, document_id: UUID, vector: Sequence[float]) -> None:
+        """Index a precomputed embedding, replacing the document's previous one.
+
+        Args:
+            document_id: The document ID
+            vector: The document embedding
+        """
+        row = normalize(vector)
+        if self._matrix is None:
+            self._matrix = self._new_matrix(len(row), self._initial_capacity)
+        self._matrix.put(document_id.int, row)
+        if self._originals is not None:
+            self._originals.put_many([document_id.int], row[np.newaxis])
+
+    async def remove(self, document_id: UUID) -> None:
+        """Remove a document from the index."""
+        self._pending.pop(document_id, None)
+        if self._matrix is not None:
+            self._matrix.discard(document_id.int)
+        if self._originals is not None:
+            self._originals.discard(document_id.int)
+        self.version += 1
+
+    async def clear(self) -> None:
+        """Remove all documents from the index."""
+        self._pending.clear()
+        self._reset()
+        self.version += 1
+
+    def compact(self) -> None:
+        """Pack the live rows to the front of the matrix."""
+        if self._matrix is not None:
+            self._matrix.compact()
+
+    async def query(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
+        allowed: Collection[UUID] | None = None,
+    ) -> list[tuple[UUID, float]]:
+        """Embed a query and return the most similar documents.
+
+        Args:
+            query_text: The query text
+            top_k: Maximum number of results
+            options: Per-query search settings
+            allowed: Documents to search; None searches every document
+
+        Returns:
+            Document IDs with their cosine similarity, most similar first
+        """
+        if not len(self) or top_k <= 0 or (allowed is not None and not allowed):
+            return []
+        return self.search(await self._embed(query_text), top_k, options, allowed)
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
+        allowed: Collection[UUID] | None = None,
+    ) -> list[tuple[UUID, float]]:
+        """Return the documents most similar to a query embedding.
+
+        Args:
+            query_vector: The query embedding
+            top_k: Maximum number of results
+            options: Per-query search settings; ``rescore_factor`` sets the
+                rescoring depth of compressed vectors
+            allowed: Documents to search; only their rows are scored. None
+                searches every document.
+
+        Returns:
+            Document IDs with their cosine similarity, most similar first
+        """
+        if self._matrix is None:
+            return []
+        query = normalize(query_vector)
+        depth = self._rescore_depth(top_k, options)
+        allowed_ids = None if allowed is None else {i.int for i in allowed}
+        candidates = self._matrix.top_k(query, depth or top_k, allowed_ids)
+        return self._rescore(query, candidates, top_k, depth)
+
+    def _rescore_depth(self, top_k: int, options: RetrievalOptions | None) -> int:
+        """Return the number of candidates to rescore, 0 for none."""
+        if self._originals is None:
+            return 0
+        factor = self._rescore_factor
+        if options is not None and options.rescore_factor is not None:
+            factor = options.rescore_factor
+        return top_k * factor
+
+    def _rescore(
+        self,
+        query: Vector,
+        candidates: list[tuple[int, float]],
+        top_k: int,
+        depth: int,
+    ) -> list[tuple[UUID, float]]:
+        """Rank candidates by their exact score, when the originals are kept.
+
+        Args:
+            query: Unit query vector
+            candidates: Document IDs (as ints) with their approximate scores
+            top_k: Maximum number of results
+            depth: Number of candidates rescored; 0 keeps approximate scores
+
+        Returns:
+            Document IDs with their cosine similarity, most similar first
+        """
+        if self._originals is not None and depth and candidates:
+            document_ids = [document_id for document_id, _ in candidates]
+            scores = self._originals.get(document_ids) @ query
+            candidates = [
+                (document_ids[row], float(scores[row]))
+                for row in np.argsort(-scores, kind="stable")
+            ]
+        return [
+            (UUID(int=document_id), score) for document_id, score in candidates[:top_k]
+        ]
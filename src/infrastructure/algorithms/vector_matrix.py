@@ -0,0 +1,224 @@
+"""Growable matrix of document vectors with tombstoned deletes."""
+
+from collections.abc import Collection, Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from src.infrastructure.algorithms.vector_quantization import VectorEncoder
+
+Vector = NDArray[np.float32]
+
+# Compressed rows converted to float32 per matrix product; small enough that
+# the converted block stays in cache
+_SCORE_CHUNK_ROWS = 1024
+
+
+class VectorMatrix:
+    """Document vectors stored as the rows of one contiguous matrix.
+
+    Rows are appended into spare capacity that doubles when full, so inserts
+    are amortized O(dimensions). Replacing or deleting a document tombstones
+    its row; once tombstones exceed ``compaction_ratio`` of the used rows,
+    the live rows are packed to the front.
+
+    With an encoder, rows hold compressed codes rather than the vectors and
+    ``top_k`` scores are approximate; callers needing exact scores rescore
+    the candidates against the original vectors.
+    """
+
+    def __init__(
+        self,
+        dimensions: int,
+        initial_capacity: int = 1024,
+        compaction_ratio: float = 0.25,
+        encoder: "VectorEncoder | None" = None,
+    ) -> None:
+        """Allocate an empty matrix.
+
+        Args:
+            dimensions: Length of every vector
+            initial_capacity: Number of rows allocated up front
+            compaction_ratio: Fraction of tombstoned rows triggering compaction
+            encoder: Compresses the stored rows; None stores float32 vectors
+        """
+        self.dimensions = dimensions
+        self._compaction_ratio = compaction_ratio
+        self._encoder = encoder if encoder is None or not encoder.lossless else None
+        code_dimensions = dimensions if encoder is None else encoder.code_dimensions
+        dtype = np.float32 if encoder is None else encoder.dtype
+        capacity = max(initial_capacity, 1)
+        self._matrix: NDArray[np.generic] = np.empty(
+            (capacity, code_dimensions), dtype=dtype
+        )
+        # Per-row scales of int8 codes
+        self._scales: Vector | None = (
+            np.empty(capacity, dtype=np.float32)
+            if encoder is not None and encoder.scaled
+            else None
+        )
+        self._live = np.zeros(len(self._matrix), dtype=bool)  # row -> current
+        self._ids: list[int] = []  # row -> document ID as int
+        self._rows: dict[int, int] = {}  # document ID -> live row
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, document_id: int) -> bool:
+        return document_id in self._rows
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows currently allocated."""
+        return len(self._matrix)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated for the rows, their scales and liveness flags."""
+        scales = 0 if self._scales is None else self._scales.nbytes
+        return self._matrix.nbytes + scales + self._live.nbytes
+
+    def put(self, document_id: int, vector: Vector) -> None:
+        """Store a vector, replacing the document's previous one."""
+        self.extend([document_id], vector[np.newaxis])
+
+    def extend(self, document_ids: Sequence[int], vectors: Vector) -> None:
+        """Store one vector per document, replacing previous ones.
+
+        Args:
+            document_ids: Document IDs as ints, without duplicates
+            vectors: Matrix with one row per document
+        """
+        if vectors.shape[1:] != (self.dimensions,):
+            raise ValueError(
+                f"Embedding has {vectors.shape[-1]} dimensions, "
+                f"expected {self.dimensions}"
+            )
+        for document_id in document_ids:
+            self.discard(document_id)
+        size = len(self._ids)
+        end = size + len(document_ids)
+        if end > len(self._matrix):
+            capacity = max(len(self._matrix) * 2, end)
+            matrix = np.empty(
+                (capacity, self._matrix.shape[1]), dtype=self._matrix.dtype
+            )
+            matrix[:size] = self._matrix[:size]
+            live = np.zeros(capacity, dtype=bool)
+            live[:size] = self._live[:size]
+            self._matrix, self._live = matrix, live
+            if self._scales is not None:
+                scales = np.empty(capacity, dtype=np.float32)
+                scales[:size] = self._scales[:size]
+                self._scales = scales
+        if self._encoder is None:
+            self._matrix[size:end] = vectors
+        else:
+            codes, code_scales = self._encoder.encode(vectors)
+            self._matrix[size:end] = codes
+            if self._scales is not None and code_scales is not None:
+                self._scales[size:end] = code_scales
+        self._live[size:end] = True
+        self._ids.extend(document_ids)
+        self._rows.update(zip(document_ids, range(size, end), strict=True))
+
+    def discard(self, document_id: int) -> bool:
+        """Tombstone a document's row; return whether it was stored."""
+        row = self._rows.pop(document_id, None)
+        if row is None:
+            return False
+        self._live[row] = False
+        self._dead += 1
+        if self._dead > self._compaction_ratio * len(self._ids):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Pack the live rows to the front of the matrix."""
+        size = len(self._ids)
+        rows = np.flatnonzero(self._live[:size])
+        count = len(rows)
+        self._matrix[:count] = self._matrix[rows]
+        if self._scales is not None:
+            self._scales[:count] = self._scales[rows]
+        self._live[:count] = True
+        self._live[count:size] = False
+        self._ids = [self._ids[row] for row in rows]
+        self._rows = {document_id: row for row, document_id in enumerate(self._ids)}
+        self._dead = 0
+
+    def live_ids(self) -> list[int]:
+        """Return the stored document IDs."""
+        return list(self._rows)
+
+    def live_vectors(self) -> tuple[list[int], Vector]:
+        """Return the stored document IDs and a view of their vectors.
+
+        The view is only valid until the matrix is next modified.
+
+        Raises:
+            ValueError: If the rows hold compressed codes
+        """
+        if self._encoder is not None:
+            raise ValueError("Compressed rows do not hold the original vectors")
+        self.compact()
+        return list(self._ids), self._matrix[: len(self._ids)]  # type: ignore[return-value]
+
+    def top_k(
+        self, query: Vector, k: int, allowed: Collection[int] | None = None
+    ) -> list[tuple[int, float]]:
+        """Return the k rows with the highest dot product with the query.
+
+        Args:
+            query: Query vector
+            k: Maximum number of results
+            allowed: Document IDs to consider; None considers every row. Only
+                the rows of these documents are scored.
+
+        Returns:
+            Document IDs with their scores, best first
+        """
+        rows: NDArray[np.intp] | None = None
+        if allowed is None:
+            k = min(k, len(self._rows))
+            if k <= 0:
+                return []
+            size = len(self._ids)
+            scores = self._scores(query, slice(0, size))
+            if self._dead:
+                scores[~self._live[:size]] = -np.inf
+        else:
+            rows = np.fromiter(
+                (self._rows[i] for i in allowed if i in self._rows), dtype=np.intp
+            )
+            k = min(k, len(rows))
+            if k <= 0:
+                return []
+            size = len(rows)
+            scores = self._scores(query, rows)
+        best = np.argpartition(scores, -k)[-k:] if k < size else np.arange(size)
+        ranked = best[np.argsort(-scores[best], kind="stable")]
+        ranked_rows = ranked if rows is None else rows[ranked]
+        return [
+            (self._ids[row], float(score))
+            for row, score in zip(
+                ranked_rows.tolist(), scores[ranked].tolist(), strict=True
+            )
+        ]
+
+    def _scores(self, query: Vector, rows: "slice | NDArray[np.intp]") -> Vector:
+        if self._encoder is None:
+            # A single matrix-vector product scores every row
+            return self._matrix[rows].astype(np.float32, copy=False) @ query
+        query = self._encoder.project(query)
+        codes = self._matrix[rows]
+        scores = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), _SCORE_CHUNK_ROWS):
+            end = min(start + _SCORE_CHUNK_ROWS, len(codes))
+            scores[start:end] = codes[start:end].astype(np.float32) @ query
+        if self._scales is not None:
+            scores *= self._scales[rows]
+        return scores
@@ -0,0 +1,164 @@
+"""Compressed vector codes for coarse search, with full vectors for rescoring."""
+
+import tempfile
+from collections.abc import Sequence
+from typing import Literal
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.infrastructure.algorithms.vector_matrix import Vector
+
+Precision = Literal["float32", "float16", "int8"]
+
+_DTYPES: dict[Precision, type[np.generic]] = {
+    "float32": np.float32,
+    "float16": np.float16,
+    "int8": np.int8,
+}
+
+
+class VectorEncoder:
+    """Compresses unit vectors into codes that approximate their dot products.
+
+    Vectors are optionally reduced to ``projection_dimensions`` with a
+    Gaussian random projection (which approximately preserves dot products),
+    then stored as float32, float16, or int8 with one float32 scale per
+    vector (scalar quantization). Queries are projected the same way and
+    scored against the codes.
+    """
+
+    def __init__(
+        self,
+        dimensions: int,
+        precision: Precision = "float32",
+        projection_dimensions: int = 0,
+        seed: int = 0,
+    ) -> None:
+        """Create an encoder.
+
+        Args:
+            dimensions: Length of the input vectors
+            precision: Storage type of the codes
+            projection_dimensions: Reduced length; 0 (or not below
+                ``dimensions``) keeps every dimension
+            seed: Seed of the random projection
+        """
+        self.dimensions = dimensions
+        self.precision = precision
+        self.dtype = _DTYPES[precision]
+        self._projection: Vector | None = None
+        if 0 < projection_dimensions < dimensions:
+            rng = np.random.default_rng(seed)
+            projection = rng.standard_normal(
+                (dimensions, projection_dimensions), dtype=np.float32
+            )
+            self._projection = projection / np.float32(np.sqrt(projection_dimensions))
+        self.code_dimensions = (
+            dimensions if self._projection is None else projection_dimensions
+        )
+
+    @property
+    def lossless(self) -> bool:
+        """Whether codes are the vectors themselves."""
+        return self.precision == "float32" and self._projection is None
+
+    @property
+    def scaled(self) -> bool:
+        """Whether every code carries a float32 scale."""
+        return self.precision == "int8"
+
+    def project(self, vectors: Vector) -> Vector:
+        """Apply the random projection, if any, to vectors or a query."""
+        return vectors if self._projection is None else vectors @ self._projection
+
+    def encode(self, vectors: Vector) -> tuple[NDArray[np.generic], Vector | None]:
+        """Encode vectors, one per row.
+
+        Returns:
+            The codes, and for int8 the scale of each row
+        """
+        projected = self.project(vectors)
+        if not self.scaled:
+            return projected.astype(self.dtype), None
+        scales = np.abs(projected).max(axis=1) / np.float32(127)
+        scales[scales == 0] = 1
+        codes = np.rint(projected / scales[:, np.newaxis]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+
+class MappedVectors:
+    """Full-precision vectors by document ID in a memory-mapped temporary file.
+
+    Only the compressed codes need to stay resident; rescoring reads the few
+    candidate rows it needs and the OS pages the file in and out. Rows freed
+    by deletes are reused by later inserts, and the file doubles when full.
+    """
+
+    def __init__(
+        self,
+        dimensions: int,
+        initial_capacity: int = 1024,
+        directory: str | None = None,
+    ) -> None:
+        """Create an empty store.
+
+        Args:
+            dimensions: Length of every vector
+            initial_capacity: Number of rows allocated up front
+            directory: Directory of the temporary file; None uses the
+                system default
+        """
+        self.dimensions = dimensions
+        # Closed (and so deleted) by close()
+        self._file = tempfile.TemporaryFile(dir=directory)  # noqa: SIM115
+        self._rows: dict[int, int] = {}  # document ID -> row
+        self._free: list[int] = []
+        self._used = 0
+        self._map(max(initial_capacity, 1))
+
+    def _map(self, capacity: int) -> None:
+        self._file.truncate(capacity * self.dimensions * 4)
+        self._vectors: np.memmap[tuple[int, int], np.dtype[np.float32]] = np.memmap(
+            self._file, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions)
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def put_many(self, document_ids: Sequence[int], vectors: Vector) -> None:
+        """Store one vector per document, replacing previous ones."""
+        for document_id, vector in zip(document_ids, vectors, strict=True):
+            row = self._rows.get(document_id)
+            if row is None:
+                row = self._allocate()
+                self._rows[document_id] = row
+            self._vectors[row] = vector
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._used == len(self._vectors):
+            self._vectors.flush()
+            self._map(len(self._vectors) * 2)
+        self._used += 1
+        return self._used - 1
+
+    def discard(self, document_id: int) -> None:
+        """Forget a document's vector, freeing its row for reuse."""
+        row = self._rows.pop(document_id, None)
+        if row is not None:
+            self._free.append(row)
+
+    def get(self, document_ids: Sequence[int]) -> Vector:
+        """Return the vectors of stored documents, one row per ID."""
+        rows = np.fromiter(
+            (self._rows[document_id] for document_id in document_ids),
+            dtype=np.intp,
+            count=len(document_ids),
+        )
+        return np.asarray(self._vectors[rows])
+
+    def close(self) -> None:
+        """Delete the backing file."""
+        self._file.close()
@@ -0,0 +1,75 @@
+"""Vector RAG strategy implementation."""
+
+from src.domain.document.models.document import Document
+from src.domain.document.repositories.document_repository import DocumentRepository
+from src.domain.rag.models.query import RetrievalOptions
+from src.domain.rag.services.rag_strategy import RAGStrategy
+from src.infrastructure.algorithms.chunk_index import CHUNK_OVERSAMPLING, ChunkIndex
+from src.infrastructure.algorithms.prefilter import allowed_ids
+from src.infrastructure.algorithms.vector_index import VectorIndex
+
+
+class VectorRAGStrategy(RAGStrategy):
+    """RAG strategy ranking documents by embedding similarity to the query."""
+
+    def __init__(
+        self,
+        document_repository: DocumentRepository,
+        index: VectorIndex,
+        chunks: ChunkIndex | None = None,
+    ):
+        """Initialize the vector RAG strategy.
+
+        Args:
+            document_repository: Repository for document operations
+            index: Embedding index kept in sync with document writes, exact
+                (VectorIndex) or approximate (IVFVectorIndex)
+            chunks: Chunk index feeding the embedding index, for passage
+                retrieval
+        """
+        self.document_repository = document_repository
+        self.index = index
+        self.chunks = chunks
+
+    async def retrieve_documents(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
+    ) -> list[Document]:
+        """
+        Retrieve the documents whose embeddings are closest to the query's.
+
+        The index embeds the repository's documents on first use; afterwards
+        it is maintained incrementally as documents are written. With a
+        chunk index, chunks are ranked and each document holds only its
+        matching passages. A metadata filter in the options restricts the
+        search to the embeddings of matching documents.
+
+        Args:
+            query_text: The query text
+            top_k: Number of documents to retrieve
+            options: Per-query search settings
+
+        Returns:
+            List of documents, most similar first
+        """
+        if self.chunks is not None:
+            if not self.chunks.loaded:
+                await self.chunks.load(self.document_repository.iter_all())
+            allowed = await allowed_ids(self.document_repository, options, self.chunks)
+            depth = top_k * CHUNK_OVERSAMPLING
+            hits = await self.index.query(query_text, depth, options, allowed)
+            return await self.chunks.documents(self.document_repository, hits, top_k)
+
+        if not self.index.loaded:
+            await self.index.load(self.document_repository.iter_all())
+
+        allowed = await allowed_ids(self.document_repository, options)
+        documents = []
+        hits = await self.index.query(query_text, top_k, options, allowed)
+        for document_id, _ in hits:
+            document = await self.document_repository.find_by_id(document_id)
+            if document is not None:
+                documents.append(document)
+        return documents
@@ -1,6 +1,7 @@
 """Application settings and configuration."""
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import (  # type: ignore[import-untyped]
     BaseSettings,
@@ -26,10 +27,83 @@ class Settings(BaseSettings):
     azure_openai_chat_deployment: str = "gpt-35-turbo"  # For chat/completion
     azure_openai_embedding_deployment: str = "text-embedding-ada-002"  # For embeddings
 
+    # Embedding micro-batching: concurrent get_embeddings calls share a request
+    embedding_batch_max_items: int = 256  # Texts per upstream request
+    embedding_batch_max_chars: int = 400_000  # Characters per upstream request
+    embedding_batch_max_wait_ms: float = 5.0  # Wait for more texts to join
+    embedding_cache_path: str = ""  # SQLite file persisting embeddings; "" disables
+    embedding_cache_memory_size: int = 10_000  # Embeddings kept in an LRU
+
     # Azure Cognitive Search Configuration (using DefaultAzureCredential)
     azure_search_endpoint: str = "https://example.search.windows.net"
     azure_search_index_name: str = "documents"
 
+    # Document Storage Configuration
+    document_repository_backend: str = "memory"  # Options: memory, sqlite, segment
+    memory_journal_path: str = ""  # Snapshot + WAL directory; empty disables
+    memory_snapshot_interval: int = 100_000  # WAL entries between snapshots
+    memory_content_compression: Literal["none", "zlib", "lzma"] = "none"
+    memory_content_cache_size: int = 256  # Decompressed bodies kept in an LRU
+    sqlite_database_path: str = "rag_documents.db"
+    sqlite_reader_pool_size: int = 4
+    sqlite_max_batch_size: int = 256  # Max writes per group commit
+    segment_store_path: str = "rag_segments"
+    segment_max_bytes: int = 64 * 1024 * 1024
+    segment_compaction_ratio: float = 0.5  # Garbage fraction triggering compaction
+
+    # Compressed vector storage (vector, ivf and hybrid strategies)
+    vector_precision: Literal["float32", "float16", "int8"] = "float32"
+    vector_projection_dimensions: int = 0  # Random projection size; 0 disables
+    vector_rescore_factor: int = 4  # Exact rescoring depth per result; 0 disables
+
+    # Approximate vector search (RAG_STRATEGY=ivf)
+    ivf_nlist: int = 0  # Inverted lists; 0 uses sqrt(documents) at training
+    ivf_nprobe: int = 8  # Lists scanned per query unless the query overrides it
+    ivf_min_train_size: int = 10_000  # Exact search below this many documents
+
+    # Hybrid retrieval (RAG_STRATEGY=hybrid)
+    hybrid_lexical_depth: int = 50  # BM25 candidates fused per query
+    hybrid_dense_depth: int = 50  # Embedding candidates fused per query
+    hybrid_lexical_weight: float = 1.0
+    hybrid_dense_weight: float = 1.0
+    hybrid_rrf_k: int = 60  # Reciprocal rank fusion damping constant
+    hybrid_leg_timeout: float = 0.0  # Seconds per retriever leg; 0 waits
+
+    # Chunking at ingest; index strategies then retrieve passages
+    chunk_max_tokens: int = 0  # Tokens per chunk; 0 indexes whole documents
+    chunk_overlap_tokens: int = 40  # Tokens shared by consecutive chunks
+
+    # Retrieval results cached until the next document write; 0 disables
+    retrieval_cache_size: int = 0
+
+    # Concurrent identical RAG queries share one execution
+    coalesce_queries: bool = False
+
+    # Semantic answer cache: answers reused for similar queries whose
+    # retrieved documents are unchanged; 0 entries disables it
+    answer_cache_size: int = 0
+    answer_cache_threshold: float = 0.95  # Min cosine similarity of the queries
+    answer_cache_ttl_seconds: float = 3600.0
+
+    # Reranking of retrieved candidates for queries with options.rerank
+    rerank_depth: int = 50  # Candidates retrieved for reranking
+    rerank_similarity: Literal["shingle", "embedding"] = "shingle"
+    rerank_mmr_lambda: float = 0.5  # Relevance (1.0) vs novelty (0.0)
+
+    # Prompt context packed into an estimated token budget, long documents
+    # reduced to their most query-relevant sentences; 0 disables packing
+    context_max_tokens: int = 0
+    context_document_max_tokens: int = 1000  # Budget of a single document
+
+    # Background indexing of document writes
+    indexing_workers: int = 0  # Concurrent index writers; 0 indexes inline
+    indexing_max_pending: int = 10_000  # Queued writes per worker before writers wait
+    indexing_max_batch_size: int = 256  # Writes applied per worker iteration
+    indexing_wait_timeout: float = 10.0  # Max wait for a query's index_sequence
+
+    # Bulk ingestion
+    bulk_ingest_batch_size: int = 1000  # Documents per repository.save_many call
+
     # Application Configuration
     log_level: str = "INFO"
     debug: bool = False
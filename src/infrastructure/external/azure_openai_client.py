@@ -1,5 +1,6 @@
 """Azure OpenAI client implementation using DefaultAzureCredential."""
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 from azure.identity import DefaultAzureCredential
@@ -7,6 +8,8 @@ from openai import AsyncAzureOpenAI
 from openai.types.chat import ChatCompletionMessageParam
 
 from src.infrastructure.config.settings import Settings, get_settings
+from src.infrastructure.external.embedding_batcher import EmbeddingBatcher
+from src.infrastructure.external.embedding_cache import EmbeddingCache
 
 
 class AzureOpenAIClient:
@@ -29,6 +32,19 @@ class AzureOpenAIClient:
             azure_ad_token_provider=self._get_token_provider(),
         )
 
+        # Embeddings already paid for, keyed by deployment and text
+        self.embedding_cache = EmbeddingCache(
+            self.settings.embedding_cache_path or None,
+            memory_size=self.settings.embedding_cache_memory_size,
+        )
+        # Coalesces concurrent get_embeddings calls into batched requests
+        self.embedding_batcher = EmbeddingBatcher(
+            self.get_embeddings_batch,
+            max_batch_items=self.settings.embedding_batch_max_items,
+            max_batch_chars=self.settings.embedding_batch_max_chars,
+            max_wait_ms=self.settings.embedding_batch_max_wait_ms,
+        )
+
     def _get_token_provider(self) -> Any:
         """Get token provider for Azure AD authentication."""
         from azure.identity.aio import (
@@ -74,6 +90,36 @@ class AzureOpenAIClient:
 
         return response.choices[0].message.content or ""
 
+    async def stream_chat_completion(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        model: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> AsyncIterator[str]:
+        """Stream a chat completion from Azure OpenAI as it is generated.
+
+        Takes the same arguments as get_chat_completion. Closing the iterator
+        early (e.g. when the client disconnects) closes the upstream stream.
+
+        Yields:
+            Pieces of the response text, in order
+        """
+        deployment_name = model or self.settings.azure_openai_chat_deployment
+
+        stream = await self.client.chat.completions.create(
+            model=deployment_name,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        async with stream:
+            async for chunk in stream:
+                # Azure sends chunks without choices, e.g. for content filtering
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
     async def get_embeddings(
         self,
         text: str,
@@ -81,6 +127,10 @@ class AzureOpenAIClient:
     ) -> list[float]:
         """Get embeddings for text using Azure OpenAI.
 
+        Embeddings are cached (see get_embeddings_batch). Calls for the
+        default deployment are micro-batched: concurrent calls share one
+        upstream request (see EmbeddingBatcher).
+
         Args:
             text: Text to embed
             model: Optional model deployment name. If not provided, uses default
@@ -90,10 +140,47 @@ class AzureOpenAIClient:
             List of embedding values
         """
         deployment_name = model or self.settings.azure_openai_embedding_deployment
+        cached = self.embedding_cache.get_from_memory(deployment_name, text)
+        if cached is not None:
+            return cached
+        if model is None:
+            return await self.embedding_batcher.embed(text)
+        return (await self.get_embeddings_batch([text], model))[0]
+
+    async def get_embeddings_batch(
+        self,
+        texts: list[str],
+        model: str | None = None,
+    ) -> list[list[float]]:
+        """Get embeddings for several texts in one Azure OpenAI request.
 
-        response = await self.client.embeddings.create(
-            model=deployment_name,
-            input=text,
-        )
+        Cached embeddings are served from the embedding cache; only the
+        remaining texts are requested, and their embeddings are cached.
 
-        return response.data[0].embedding
+        Args:
+            texts: Texts to embed
+            model: Optional model deployment name. If not provided, uses default
+                embedding deployment.
+
+        Returns:
+            One list of embedding values per text, in input order
+        """
+        deployment_name = model or self.settings.azure_openai_embedding_deployment
+
+        # Only texts missing from the cache are sent upstream
+        vectors = await self.embedding_cache.get_many(deployment_name, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            response = await self.client.embeddings.create(
+                model=deployment_name,
+                input=[texts[i] for i in missing],
+            )
+            ordered = sorted(response.data, key=lambda item: item.index)
+            stored = await self.embedding_cache.put_many(
+                deployment_name,
+                [texts[i] for i in missing],
+                [item.embedding for item in ordered],
+            )
+            for i, vector in zip(missing, stored, strict=True):
+                vectors[i] = vector
+        return [vector for vector in vectors if vector is not None]
@@ -0,0 +1,101 @@
+"""Micro-batching of concurrent embedding requests."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+# Embeds several texts in one upstream call, returning vectors in input order
+EmbedBatch = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent single-text embedding calls into batched calls.
+
+    ``embed`` queues its text and waits. The queue is sent upstream as one
+    batch when it reaches ``max_batch_items`` texts or ``max_batch_chars``
+    characters, or ``max_wait_ms`` after its first text arrived, whichever
+    comes first. Batches are dispatched as independent tasks, so a slow
+    upstream call does not hold back the next batch.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatch,
+        max_batch_items: int = 256,
+        max_batch_chars: int = 400_000,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        """Create a batcher.
+
+        Args:
+            embed_batch: Function embedding a list of texts in one call
+            max_batch_items: Maximum number of texts per upstream call
+            max_batch_chars: Maximum total characters per upstream call; a
+                single longer text is still sent, alone
+            max_wait_ms: Longest time a text waits for others to join its batch
+        """
+        self._embed_batch = embed_batch
+        self._max_batch_items = max_batch_items
+        self._max_batch_chars = max_batch_chars
+        self._max_wait = max_wait_ms / 1000
+        self._pending: list[tuple[str, asyncio.Future[list[float]]]] = []
+        self._pending_chars = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._dispatching: set[asyncio.Task[None]] = set()
+        self.upstream_calls = 0
+        self.embedded_texts = 0
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed one text as part of the next batch.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            The text's embedding
+
+        Raises:
+            Exception: Whatever the upstream call for the batch raised
+        """
+        loop = asyncio.get_running_loop()
+        if self._pending and self._pending_chars + len(text) > self._max_batch_chars:
+            self._flush()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append((text, future))
+        self._pending_chars += len(text)
+        if len(self._pending) >= self._max_batch_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_chars = self._pending, [], 0
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            # Keep a reference so the task is not garbage collected mid-flight
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(
+        self, batch: list[tuple[str, asyncio.Future[list[float]]]]
+    ) -> None:
+        self.upstream_calls += 1
+        self.embedded_texts += len(batch)
+        try:
+            vectors = await self._embed_batch([text for text, _ in batch])
+            if len(vectors) != len(batch):
+                raise ValueError(
+                    f"Expected {len(batch)} embeddings, got {len(vectors)}"
+                )
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), vector in zip(batch, vectors, strict=True):
+            # Callers that were cancelled no longer wait for their result
+            if not future.done():
+                future.set_result(vector)
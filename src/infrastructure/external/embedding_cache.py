@@ -0,0 +1,200 @@
+"""Embedding cache with an in-memory LRU in front of a SQLite store."""
+
+import asyncio
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+A = TypeVar("A")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key BLOB PRIMARY KEY,
+    vector BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Stay well below SQLite's limit on bound parameters per statement
+_MAX_PARAMETERS = 500
+
+
+def cache_key(deployment: str, text: str) -> bytes:
+    """Return the cache key of a text embedded by a deployment.
+
+    Whitespace is normalized first, so texts differing only in spacing share
+    an entry.
+    """
+    normalized = " ".join(text.split())
+    digest = hashlib.blake2b(deployment.encode(), digest_size=16)
+    digest.update(b"\0")
+    digest.update(normalized.encode())
+    return digest.digest()
+
+
+def _decode(blob: bytes) -> list[float]:
+    return np.frombuffer(blob, dtype=np.float32).tolist()  # type: ignore[no-any-return]
+
+
+class EmbeddingCache:
+    """Embeddings keyed by (deployment, normalized text hash).
+
+    Vectors are kept as float32 bytes in a bounded LRU and, when a path is
+    given, in a SQLite table that survives restarts. SQLite is accessed from
+    a single worker thread so the event loop never blocks on disk. Vectors
+    are always returned as stored (float32 precision), so a result does not
+    depend on whether it came from the cache.
+    """
+
+    def __init__(self, database_path: str | None = None, memory_size: int = 10_000):
+        """Create the cache, opening (and creating if needed) the database.
+
+        Args:
+            database_path: SQLite file for the persistent store; None keeps
+                the cache in memory only
+            memory_size: Maximum number of vectors held in memory
+        """
+        self._memory: OrderedDict[bytes, bytes] = OrderedDict()
+        self._memory_size = memory_size
+        self._connection: sqlite3.Connection | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        if database_path:
+            self._connection = sqlite3.connect(database_path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="embedding-cache"
+            )
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_from_memory(self, deployment: str, text: str) -> list[float] | None:
+        """Return a vector held in memory, without touching the disk.
+
+        Only hits are counted, since the caller falls back to ``get_many``.
+        """
+        key = cache_key(deployment, text)
+        blob = self._memory.get(key)
+        if blob is None:
+            return None
+        self._memory.move_to_end(key)
+        self.memory_hits += 1
+        return _decode(blob)
+
+    async def get_many(
+        self, deployment: str, texts: list[str]
+    ) -> list[list[float] | None]:
+        """Look texts up in memory, then on disk.
+
+        Args:
+            deployment: Embedding deployment name
+            texts: Texts to look up
+
+        Returns:
+            The cached vector of each text, or None on a miss
+        """
+        keys = [cache_key(deployment, text) for text in texts]
+        blobs: list[bytes | None] = []
+        for key in keys:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            blobs.append(blob)
+
+        missing = [key for key, blob in zip(keys, blobs, strict=True) if blob is None]
+        if missing and self._connection is not None:
+            found = await self._run(self._select, missing)
+            for position, key in enumerate(keys):
+                if blobs[position] is None and key in found:
+                    blobs[position] = found[key]
+                    self._remember(key, found[key])
+                    self.disk_hits += 1
+        self.misses += sum(blob is None for blob in blobs)
+        return [None if blob is None else _decode(blob) for blob in blobs]
+
+    async def put_many(
+        self, deployment: str, texts: list[str], vectors: list[list[float]]
+    ) -> list[list[float]]:
+        """Store vectors for texts.
+
+        Args:
+            deployment: Embedding deployment name
+            texts: Embedded texts
+            vectors: Their embeddings, in the same order
+
+        Returns:
+            The vectors as stored, at float32 precision
+        """
+        rows = [
+            (cache_key(deployment, text), np.asarray(vector, np.float32).tobytes())
+            for text, vector in zip(texts, vectors, strict=True)
+        ]
+        for key, blob in rows:
+            self._remember(key, blob)
+        if self._connection is not None:
+            await self._run(self._insert, rows)
+        return [_decode(blob) for _, blob in rows]
+
+    def stats(self) -> dict[str, int | float]:
+        """Return hit and miss counters for sizing the cache."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the database."""
+        if self._executor is not None:
+            self._executor.shutdown()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _remember(self, key: bytes, blob: bytes) -> None:
+        if self._memory_size <= 0:
+            return
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        if len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
+
+    async def _run(self, operation: Callable[[A], T], argument: A) -> T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, operation, argument
+        )
+
+    def _select(self, keys: list[bytes]) -> dict[bytes, bytes]:
+        if self._connection is None:
+            return {}
+        found: dict[bytes, bytes] = {}
+        for start in range(0, len(keys), _MAX_PARAMETERS):
+            chunk = keys[start : start + _MAX_PARAMETERS]
+            placeholders = ", ".join("?" * len(chunk))
+            found.update(
+                self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            )
+        return found
+
+    def _insert(self, rows: list[tuple[bytes, bytes]]) -> None:
+        if self._connection is None:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
@@ -0,0 +1,174 @@
+"""Compression of document bodies at rest."""
+
+import lzma
+import zlib
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any, Literal
+
+CompressionAlgorithm = Literal["zlib", "lzma"]
+
+# zlib only looks back 32 KiB, so a larger preset dictionary is wasted
+MAX_DICTIONARY_BYTES = 32 * 1024
+
+# Every compressed body starts with a tag byte telling how it was encoded
+_RAW = 0
+_ZLIB = 1
+_ZLIB_DICTIONARY = 2
+_LZMA = 3
+
+# Raw deflate streams: no zlib header or checksum, the repository owns framing
+_DEFLATE_WBITS = -15
+# Smallest lzma dictionary (4 KiB); the default of 8 MiB would be allocated,
+# and dominate the cost, for every single body
+_MIN_LZMA_DICTIONARY_BITS = 12
+
+
+def _lzma_filters(level: int, dictionary_bits: int) -> list[dict[str, int]]:
+    return [
+        {"id": lzma.FILTER_LZMA2, "preset": level, "dict_size": 1 << dictionary_bits}
+    ]
+
+
+def train_dictionary(samples: Iterable[str], size: int = MAX_DICTIONARY_BYTES) -> bytes:
+    """Build a zlib preset dictionary from sample bodies.
+
+    Words and word pairs are ranked by the bytes they could save across the
+    samples (occurrences times length). The best ones are packed into the
+    dictionary with the most valuable last, where zlib references them with
+    the shortest distances.
+
+    Args:
+        samples: Representative document bodies
+        size: Maximum dictionary size in bytes
+
+    Returns:
+        The preset dictionary
+    """
+    counts: Counter[bytes] = Counter()
+    for sample in samples:
+        words = sample.encode().split()
+        counts.update(words)
+        counts.update(b" ".join(pair) for pair in zip(words, words[1:], strict=False))
+    ranked = sorted(
+        ((count * len(piece), piece) for piece, count in counts.items() if count > 1),
+        reverse=True,
+    )
+    chosen: list[bytes] = []
+    used = 0
+    for _, piece in ranked:
+        if used + len(piece) + 1 > size:
+            break
+        chosen.append(piece)
+        used += len(piece) + 1
+    return b" ".join(reversed(chosen))
+
+
+class ContentCodec:
+    """Compresses document bodies with zlib or lzma.
+
+    Small bodies compress poorly on their own, so with zlib they are
+    compressed against a shared preset dictionary. Unless one is given, the
+    dictionary is trained from the first ``training_samples`` small bodies;
+    bodies compressed before that stay readable, as each one is tagged with
+    how it was encoded. Bodies that do not shrink are kept uncompressed.
+    """
+
+    def __init__(
+        self,
+        algorithm: CompressionAlgorithm = "zlib",
+        level: int = 6,
+        dictionary: bytes | None = None,
+        small_body_bytes: int = 4096,
+        training_samples: int = 1000,
+    ) -> None:
+        """Configure the codec.
+
+        Args:
+            algorithm: Compression algorithm, "zlib" or "lzma"
+            level: Compression level (zlib level or lzma preset, 0-9)
+            dictionary: Preset zlib dictionary; trained from the data if None
+            small_body_bytes: Bodies up to this size use the dictionary
+            training_samples: Number of small bodies to train the dictionary on
+        """
+        if algorithm not in ("zlib", "lzma"):
+            raise ValueError(f"Unsupported compression algorithm: {algorithm}")
+        self._algorithm = algorithm
+        self._level = level
+        self._dictionary: bytes | None = None
+        # Loading a dictionary costs more than compressing a small body, so
+        # compressors are copied from one primed with it
+        self._primed: Any = None
+        if dictionary is not None:
+            self._set_dictionary(dictionary)
+        self._small_body_bytes = small_body_bytes
+        self._training_samples = training_samples
+        # lzma has no preset dictionary support, so nothing is trained for it
+        self._samples: list[str] | None = (
+            [] if dictionary is None and algorithm == "zlib" else None
+        )
+
+    @property
+    def dictionary(self) -> bytes | None:
+        """The preset dictionary in use, once given or trained."""
+        return self._dictionary
+
+    def compress(self, content: str) -> bytes:
+        """Compress a document body."""
+        data = content.encode()
+        if self._algorithm == "lzma":
+            tag = _LZMA
+            # Size the lzma window to the body and record it for decompression
+            bits = max(_MIN_LZMA_DICTIONARY_BITS, (len(data) - 1).bit_length())
+            payload = bytes((bits,)) + lzma.compress(
+                data, format=lzma.FORMAT_RAW, filters=_lzma_filters(self._level, bits)
+            )
+        elif len(data) <= self._small_body_bytes and self._primed is not None:
+            tag = _ZLIB_DICTIONARY
+            compressor = self._primed.copy()
+            payload = compressor.compress(data) + compressor.flush()
+        else:
+            tag = _ZLIB
+            payload = zlib.compress(data, self._level, wbits=_DEFLATE_WBITS)
+            if len(data) <= self._small_body_bytes:
+                self._collect_sample(content)
+        if len(payload) >= len(data):
+            return bytes((_RAW,)) + data
+        return bytes((tag,)) + payload
+
+    def decompress(self, blob: bytes) -> str:
+        """Decompress a body produced by compress."""
+        tag = blob[0]
+        payload = memoryview(blob)[1:]
+        if tag == _ZLIB_DICTIONARY:
+            if self._dictionary is None:
+                raise ValueError("Body was compressed with an unknown dictionary")
+            decompressor = zlib.decompressobj(
+                wbits=_DEFLATE_WBITS, zdict=self._dictionary
+            )
+            data = decompressor.decompress(payload) + decompressor.flush()
+        elif tag == _ZLIB:
+            data = zlib.decompress(payload, wbits=_DEFLATE_WBITS)
+        elif tag == _LZMA:
+            data = lzma.decompress(
+                payload[1:],
+                format=lzma.FORMAT_RAW,
+                filters=_lzma_filters(self._level, payload[0]),
+            )
+        else:
+            data = bytes(payload)
+        return data.decode()
+
+    def _collect_sample(self, content: str) -> None:
+        if self._samples is None:
+            return
+        self._samples.append(content)
+        if len(self._samples) >= self._training_samples:
+            self._set_dictionary(train_dictionary(self._samples))
+            self._samples = None
+
+    def _set_dictionary(self, dictionary: bytes) -> None:
+        self._primed = zlib.compressobj(
+            self._level, wbits=_DEFLATE_WBITS, zdict=dictionary
+        )
+        self._dictionary = dictionary
@@ -0,0 +1,157 @@
+"""Content-addressed storage of document bodies."""
+
+from collections import OrderedDict
+from collections.abc import Callable
+
+from src.domain.document.models.document import compute_content_hash
+from src.infrastructure.repositories.content_codec import ContentCodec
+
+
+class _Body:
+    __slots__ = ("content", "length", "references")
+
+    def __init__(self, content: str | bytes, length: int) -> None:
+        self.content = content
+        self.length = length
+        self.references = 0
+
+
+class ContentStore:
+    """Reference-counted store holding each distinct document body once.
+
+    Bodies are keyed by their content hash. Saving a body that is already
+    stored returns the existing string, so repeated bodies cost a single
+    allocation; the body is dropped when its last reference is released.
+
+    With a codec, bodies are kept compressed and only decompressed when read
+    through get, with a small LRU cache of recently decompressed bodies.
+    """
+
+    def __init__(
+        self, codec: ContentCodec | None = None, cache_size: int = 256
+    ) -> None:
+        """Create an empty store.
+
+        Args:
+            codec: Codec compressing the stored bodies; None keeps them as str
+            cache_size: Number of decompressed bodies to cache
+        """
+        self._bodies: dict[str, _Body] = {}
+        self._codec = codec
+        self._decompress: Callable[[bytes], str] = (
+            codec.decompress if codec is not None else bytes.decode
+        )
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._references = 0
+        self._logical_chars = 0
+        self._stored_chars = 0
+        self._compressed_bytes = 0
+
+    @property
+    def compressed(self) -> bool:
+        """Whether bodies are stored compressed."""
+        return self._codec is not None
+
+    def acquire(self, content: str) -> tuple[str, str]:
+        """Add a reference to a body.
+
+        Args:
+            content: The document body
+
+        Returns:
+            The content hash and the shared body string. When bodies are
+            compressed the string is empty; read the body back with get.
+        """
+        content_hash = compute_content_hash(content)
+        body = self._bodies.get(content_hash)
+        if body is None:
+            if self._codec is None:
+                body = _Body(content, len(content))
+            else:
+                blob = self._codec.compress(content)
+                self._compressed_bytes += len(blob)
+                body = _Body(blob, len(content))
+            self._bodies[content_hash] = body
+            self._stored_chars += len(content)
+        body.references += 1
+        self._references += 1
+        self._logical_chars += len(content)
+        return content_hash, body.content if isinstance(body.content, str) else ""
+
+    def get(self, content_hash: str) -> str:
+        """Return a stored body, decompressing it if needed."""
+        content = self._bodies[content_hash].content
+        if isinstance(content, str):
+            return content
+        cached = self._cache.get(content_hash)
+        if cached is not None:
+            self._cache.move_to_end(content_hash)
+            self._cache_hits += 1
+            return cached
+        self._cache_misses += 1
+        decompressed = self._decompress(content)
+        self._cache[content_hash] = decompressed
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return decompressed
+
+    def frozen_reader(self) -> Callable[[str], str]:
+        """Return a reader of the bodies stored right now.
+
+        The reader does not see later changes and leaves the cache alone, so
+        it is safe to use from a background thread, e.g. for a snapshot.
+        """
+        bodies = {
+            content_hash: body.content for content_hash, body in self._bodies.items()
+        }
+        decompress = self._decompress
+
+        def read(content_hash: str) -> str:
+            content = bodies[content_hash]
+            return content if isinstance(content, str) else decompress(content)
+
+        return read
+
+    def release(self, content_hash: str) -> None:
+        """Drop a reference to a body, freeing it after the last one."""
+        body = self._bodies[content_hash]
+        body.references -= 1
+        self._references -= 1
+        self._logical_chars -= body.length
+        if body.references == 0:
+            del self._bodies[content_hash]
+            self._cache.pop(content_hash, None)
+            self._stored_chars -= body.length
+            if isinstance(body.content, bytes):
+                self._compressed_bytes -= len(body.content)
+
+    def clear(self) -> None:
+        """Drop all bodies."""
+        self._bodies.clear()
+        self._cache.clear()
+        self._references = self._logical_chars = self._stored_chars = 0
+        self._compressed_bytes = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """Deduplication and, when compressing, compression metrics."""
+        unique = len(self._bodies)
+        stats: dict[str, int | float] = {
+            "unique_bodies": unique,
+            "body_references": self._references,
+            "dedup_ratio": self._references / unique if unique else 1.0,
+            "logical_chars": self._logical_chars,
+            "stored_chars": self._stored_chars,
+        }
+        if self._codec is not None:
+            stats["compressed_bytes"] = self._compressed_bytes
+            stats["compression_ratio"] = (
+                self._stored_chars / self._compressed_bytes
+                if self._compressed_bytes
+                else 1.0
+            )
+            stats["cache_hits"] = self._cache_hits
+            stats["cache_misses"] = self._cache_misses
+        return stats
@@ -0,0 +1,241 @@
+"""Snapshot and write-ahead log persistence for the in-memory repository."""
+
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Callable, Iterable
+from typing import BinaryIO
+
+from src.domain.document.models.document_record import DocumentRecord
+
+# Document encoding shared by snapshot and WAL: id, created_at, updated_at,
+# title length, source length, content length, followed by the three strings.
+_DOCUMENT = struct.Struct("<16sqqIII")
+# WAL frame: crc32 of the payload, payload length, then op and payload.
+_FRAME = struct.Struct("<II")
+# Snapshot header: magic, WAL generation covered by the snapshot, count.
+_SNAPSHOT_HEADER = struct.Struct("<8sQQ")
+_SNAPSHOT_MAGIC = b"RAGSNAP1"
+
+_OP_PUT = b"P"
+_OP_DELETE = b"D"
+_OP_CLEAR = b"C"
+
+_SNAPSHOT_NAME = "snapshot.bin"
+_WAL_PREFIX = "wal-"
+_WAL_SUFFIX = ".log"
+
+
+def _encode(record: DocumentRecord, content_text: str | None = None) -> bytes:
+    title = record.title.encode()
+    source = record.source.encode()
+    content = (record.content if content_text is None else content_text).encode()
+    header = _DOCUMENT.pack(
+        record.id.to_bytes(16),
+        record.created_at,
+        record.updated_at,
+        len(title),
+        len(source),
+        len(content),
+    )
+    return header + title + source + content
+
+
+def _decode(data: bytes, position: int) -> tuple[DocumentRecord, int]:
+    raw_id, created, updated, t_len, s_len, c_len = _DOCUMENT.unpack_from(
+        data, position
+    )
+    title_start = position + _DOCUMENT.size
+    source_start = title_start + t_len
+    content_start = source_start + s_len
+    end = content_start + c_len
+    record = DocumentRecord(
+        int.from_bytes(raw_id),
+        data[title_start:source_start].decode(),
+        data[content_start:end].decode(),
+        data[source_start:content_start].decode(),
+        created,
+        updated,
+    )
+    return record, end
+
+
+class DocumentJournal:
+    """Durable log of repository mutations with periodic binary snapshots.
+
+    Every mutation is appended to the current write-ahead log (WAL) file.
+    After ``snapshot_interval`` entries the full state is written to a
+    compact binary snapshot on a background thread: the WAL is rotated first,
+    so the snapshot covers every older generation, which is deleted once the
+    snapshot is in place. Restoring loads the snapshot and replays the WAL
+    files written after it.
+    """
+
+    def __init__(self, directory: str, snapshot_interval: int = 100_000) -> None:
+        """Open the journal directory.
+
+        Args:
+            directory: Directory holding the snapshot and WAL files
+            snapshot_interval: Number of WAL entries between snapshots
+        """
+        self._directory = directory
+        self._snapshot_interval = snapshot_interval
+        self._entries_since_snapshot = 0
+        self._snapshot_thread: threading.Thread | None = None
+        os.makedirs(directory, exist_ok=True)
+
+        generations = self._wal_generations()
+        self._generation = (generations[-1] if generations else 0) + 1
+        self._wal: BinaryIO = self._open_wal(self._generation)
+
+    def _wal_path(self, generation: int) -> str:
+        return os.path.join(
+            self._directory, f"{_WAL_PREFIX}{generation:08d}{_WAL_SUFFIX}"
+        )
+
+    def _open_wal(self, generation: int) -> BinaryIO:
+        return open(self._wal_path(generation), "ab")  # noqa: SIM115
+
+    def _wal_generations(self) -> list[int]:
+        return sorted(
+            int(name[len(_WAL_PREFIX) : -len(_WAL_SUFFIX)])
+            for name in os.listdir(self._directory)
+            if name.startswith(_WAL_PREFIX) and name.endswith(_WAL_SUFFIX)
+        )
+
+    def load(self) -> dict[int, DocumentRecord]:
+        """Restore the state from the latest snapshot and the WAL tail."""
+        records: dict[int, DocumentRecord] = {}
+        covered = 0
+        snapshot_path = os.path.join(self._directory, _SNAPSHOT_NAME)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "rb") as f:
+                data = f.read()
+            magic, covered, count = _SNAPSHOT_HEADER.unpack_from(data)
+            if magic != _SNAPSHOT_MAGIC:
+                raise ValueError(f"Invalid snapshot file: {snapshot_path}")
+            position = _SNAPSHOT_HEADER.size
+            for _ in range(count):
+                record, position = _decode(data, position)
+                records[record.id] = record
+
+        for generation in self._wal_generations():
+            if generation > covered:
+                self._replay(generation, records)
+        return records
+
+    def _replay(self, generation: int, records: dict[int, DocumentRecord]) -> None:
+        path = self._wal_path(generation)
+        with open(path, "rb") as f:
+            data = f.read()
+        position = 0
+        while position + _FRAME.size <= len(data):
+            crc, length = _FRAME.unpack_from(data, position)
+            start = position + _FRAME.size
+            payload = data[start : start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            op = payload[:1]
+            if op == _OP_PUT:
+                record, _ = _decode(payload, 1)
+                records[record.id] = record
+            elif op == _OP_DELETE:
+                records.pop(int.from_bytes(payload[1:17]), None)
+            elif op == _OP_CLEAR:
+                records.clear()
+            position = start + length
+        if position < len(data):
+            # Drop a torn frame left by a crash during append
+            with open(path, "r+b") as f:
+                f.truncate(position)
+
+    def _append(self, payloads: Iterable[bytes]) -> None:
+        count = 0
+        for payload in payloads:
+            self._wal.write(_FRAME.pack(zlib.crc32(payload), len(payload)))
+            self._wal.write(payload)
+            count += 1
+        self._wal.flush()
+        self._entries_since_snapshot += count
+
+    def log_puts(self, records: Iterable[DocumentRecord]) -> None:
+        """Log saved or updated documents."""
+        self._append(_OP_PUT + _encode(record) for record in records)
+
+    def log_delete(self, document_id: int) -> None:
+        """Log a deleted document."""
+        self._append([_OP_DELETE + document_id.to_bytes(16)])
+
+    def log_clear(self) -> None:
+        """Log the deletion of all documents."""
+        self._append([_OP_CLEAR])
+
+    def needs_snapshot(self) -> bool:
+        """Whether enough entries were logged to warrant a snapshot."""
+        running = self._snapshot_thread is not None and self._snapshot_thread.is_alive()
+        return not running and self._entries_since_snapshot >= self._snapshot_interval
+
+    def snapshot(
+        self,
+        records: list[DocumentRecord],
+        wait: bool = False,
+        contents: Callable[[str], str] | None = None,
+    ) -> None:
+        """Write a snapshot of the given state in the background.
+
+        The caller must pass the complete current state; the WAL is rotated
+        here, so later mutations go to a generation the snapshot does not
+        cover.
+
+        Args:
+            records: All documents currently stored
+            wait: Block until the snapshot is written
+            contents: Reads bodies by content hash for records that do not
+                hold their content (compressed bodies); called on the
+                snapshot thread
+        """
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        covered = self._generation
+        self._wal.close()
+        self._generation += 1
+        self._wal = self._open_wal(self._generation)
+        self._entries_since_snapshot = 0
+
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot,
+            args=(records, covered, contents),
+            name="document-snapshot",
+            daemon=True,
+        )
+        self._snapshot_thread.start()
+        if wait:
+            self._snapshot_thread.join()
+
+    def _write_snapshot(
+        self,
+        records: list[DocumentRecord],
+        covered: int,
+        contents: Callable[[str], str] | None,
+    ) -> None:
+        path = os.path.join(self._directory, _SNAPSHOT_NAME)
+        with open(path + ".tmp", "wb") as f:
+            f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, covered, len(records)))
+            for record in records:
+                if contents is not None and not record.content:
+                    f.write(_encode(record, contents(record.content_hash)))
+                else:
+                    f.write(_encode(record))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        for generation in self._wal_generations():
+            if generation <= covered:
+                os.remove(self._wal_path(generation))
+
+    def close(self) -> None:
+        """Wait for a running snapshot and close the WAL."""
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        self._wal.close()
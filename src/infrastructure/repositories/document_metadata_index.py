@@ -0,0 +1,343 @@
+"""Secondary indexes over document metadata shared by repository implementations."""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from itertools import islice
+from typing import Protocol
+
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter, prefix_end
+from src.domain.document.models.document_record import datetime_to_micros
+from src.infrastructure.repositories.document_order_index import DocumentOrderIndex
+
+# Ordering positions copied at a time when scanning, so a scan that stops
+# early never copies the whole range
+_SCAN_BATCH_SIZE = 1024
+# Minimum number of buffered writes before they are merged into a sorted index
+_MERGE_THRESHOLD = 4096
+
+
+class DocumentMetadata(Protocol):
+    """Indexed fields of a stored document, e.g. a DocumentRecord."""
+
+    @property
+    def title(self) -> str: ...
+
+    @property
+    def source(self) -> str: ...
+
+    @property
+    def created_at(self) -> int: ...
+
+    @property
+    def updated_at(self) -> int: ...
+
+
+def _micros(value: datetime | None) -> int | None:
+    return None if value is None else datetime_to_micros(value)
+
+
+class _SortedKeys[K: (str, int)]:
+    """(key, document ID) pairs kept sorted, with writes buffered between merges.
+
+    Inserting into the middle of a large sorted list moves everything after
+    it, which makes bulk ingest quadratic for keys such as titles that do not
+    arrive in order. Additions are appended to an unsorted buffer and
+    removals recorded as tombstones instead; both are folded into the sorted
+    run at once when they outgrow ``_MERGE_THRESHOLD`` or the square root of
+    the run. Range reads bisect the run and scan the small buffer.
+    """
+
+    def __init__(self) -> None:
+        self._sorted: list[tuple[K, int]] = []
+        self._added: list[tuple[K, int]] = []
+        self._removed: set[tuple[K, int]] = set()
+
+    def add(self, key: K, document_id: int) -> None:
+        pair = (key, document_id)
+        if pair in self._removed:
+            # Still stored, so dropping the tombstone restores it
+            self._removed.discard(pair)
+            return
+        self._added.append(pair)
+        self._maybe_merge()
+
+    def remove(self, key: K, document_id: int) -> None:
+        self._removed.add((key, document_id))
+        self._maybe_merge()
+
+    def rebuild(self, pairs: Iterable[tuple[K, int]]) -> None:
+        self._sorted = sorted(pairs)
+        self._added = []
+        self._removed = set()
+
+    def _maybe_merge(self) -> None:
+        pending = len(self._added) + len(self._removed)
+        if pending > max(_MERGE_THRESHOLD, math.isqrt(len(self._sorted))):
+            self.merge()
+
+    def merge(self) -> None:
+        """Fold buffered additions and removals into the sorted run."""
+        removed = self._removed
+        pairs = [pair for pair in self._sorted if pair not in removed]
+        pairs.extend(pair for pair in self._added if pair not in removed)
+        # Timsort keeps the sorted run and only sorts and merges the tail
+        pairs.sort()
+        self._sorted = pairs
+        self._added = []
+        self._removed = set()
+
+    def _span(self, lower: K | None, upper: K | None) -> tuple[int, int]:
+        # IDs are non-negative, so (key, -1) sorts before every pair of key
+        start = 0 if lower is None else bisect_left(self._sorted, (lower, -1))
+        stop = len(self._sorted)
+        if upper is not None:
+            stop = bisect_left(self._sorted, (upper, -1))
+        return start, max(start, stop)
+
+    def estimate(self, lower: K | None, upper: K | None) -> int:
+        """Return an upper bound on the number of keys in [lower, upper)."""
+        start, stop = self._span(lower, upper)
+        return stop - start + len(self._added)
+
+    def between(self, lower: K | None, upper: K | None) -> list[int]:
+        """Return the IDs of the documents with a key in [lower, upper)."""
+        start, stop = self._span(lower, upper)
+        removed = self._removed
+        pairs = self._sorted[start:stop]
+        pairs.extend(
+            pair
+            for pair in self._added
+            if (lower is None or pair[0] >= lower)
+            and (upper is None or pair[0] < upper)
+        )
+        return [pair[1] for pair in pairs if pair not in removed]
+
+
+class DocumentMetadataIndex:
+    """Document ordering plus secondary indexes answering DocumentFilters.
+
+    Maintained incrementally on every write next to the (created_at, id)
+    ordering of DocumentOrderIndex:
+
+    - a hash index from source to document IDs,
+    - sorted (updated_at, id) keys for update time ranges,
+    - sorted (title, id) keys, where a title prefix is a key range.
+
+    The sorted keys buffer writes and merge them in batches, so indexing a
+    document costs amortized O(sqrt(n)) rather than an O(n) list insert.
+
+    A filter is answered from the most selective of its conditions: the
+    documents in that index range are checked against the remaining
+    conditions and sorted by (created_at, id). When the created_at range is
+    the narrowest, or the best candidate set is not much smaller than it,
+    the ordering itself is scanned instead, which needs no sort and stops as
+    soon as a page is full.
+    """
+
+    def __init__(self) -> None:
+        self._order = DocumentOrderIndex()
+        self._metadata: dict[int, DocumentMetadata] = {}
+        self._sources: dict[str, set[int]] = {}
+        self._updated: _SortedKeys[int] = _SortedKeys()
+        self._titles: _SortedKeys[str] = _SortedKeys()
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+    def add(self, document_id: int, metadata: DocumentMetadata) -> None:
+        """Index a new document, or re-index a changed one."""
+        previous = self._metadata.get(document_id)
+        if previous is not None:
+            self._unlink(document_id, previous)
+        self._metadata[document_id] = metadata
+        self._sources.setdefault(metadata.source, set()).add(document_id)
+        self._updated.add(metadata.updated_at, document_id)
+        self._titles.add(metadata.title, document_id)
+        self._order.add(document_id, metadata.created_at)
+
+    def rebuild(self, entries: Iterable[tuple[int, DocumentMetadata]]) -> None:
+        """Replace the index with (document_id, metadata) pairs in one sort each."""
+        self._metadata = dict(entries)
+        self._sources = {}
+        for document_id, metadata in self._metadata.items():
+            self._sources.setdefault(metadata.source, set()).add(document_id)
+        self._updated.rebuild(
+            (metadata.updated_at, document_id)
+            for document_id, metadata in self._metadata.items()
+        )
+        self._titles.rebuild(
+            (metadata.title, document_id)
+            for document_id, metadata in self._metadata.items()
+        )
+        self._order.rebuild(
+            (document_id, metadata.created_at)
+            for document_id, metadata in self._metadata.items()
+        )
+
+    def remove(self, document_id: int) -> None:
+        """Remove a document from the index if present."""
+        metadata = self._metadata.pop(document_id, None)
+        if metadata is not None:
+            self._unlink(document_id, metadata)
+            self._order.remove(document_id)
+
+    def _unlink(self, document_id: int, metadata: DocumentMetadata) -> None:
+        ids = self._sources[metadata.source]
+        ids.discard(document_id)
+        if not ids:
+            del self._sources[metadata.source]
+        self._updated.remove(metadata.updated_at, document_id)
+        self._titles.remove(metadata.title, document_id)
+
+    def clear(self) -> None:
+        """Remove all documents from the index."""
+        self._metadata.clear()
+        self._sources.clear()
+        self._updated.rebuild(())
+        self._titles.rebuild(())
+        self._order.clear()
+
+    def slice(
+        self, limit: int, offset: int = 0, document_filter: DocumentFilter | None = None
+    ) -> list[int]:
+        """Return document IDs for an offset page of the matching documents."""
+        if document_filter is None or document_filter.is_empty():
+            return self._order.slice(limit, offset)
+        matching = self._matching(document_filter)
+        return list(islice(matching, offset, offset + limit))
+
+    def after(
+        self,
+        cursor: DocumentCursor | None,
+        limit: int,
+        document_filter: DocumentFilter | None = None,
+    ) -> list[int]:
+        """Return matching document IDs ordered after the cursor."""
+        if document_filter is None or document_filter.is_empty():
+            return self._order.after(cursor, limit)
+        return list(islice(self._matching(document_filter, cursor), limit))
+
+    def count(self, document_filter: DocumentFilter | None = None) -> int:
+        """Return the number of matching documents."""
+        if document_filter is None or document_filter.is_empty():
+            return len(self._metadata)
+        return sum(1 for _ in self._candidates(document_filter))
+
+    def ids(self, document_filter: DocumentFilter) -> list[int]:
+        """Return the IDs of the matching documents, in no particular order."""
+        return list(self._candidates(document_filter))
+
+    def _matching(
+        self, document_filter: DocumentFilter, cursor: DocumentCursor | None = None
+    ) -> Iterator[int]:
+        """Yield the matching document IDs in (created_at, id) order."""
+        start, stop = self._order.span(
+            _micros(document_filter.created_after),
+            _micros(document_filter.created_before),
+        )
+        candidates, size = self._narrowest(document_filter)
+        if candidates is None or 2 * size >= stop - start:
+            # Scan the ordering itself, from the cursor on
+            start = max(start, self._order.position(cursor))
+            yield from self._scan(start, stop, self._predicate(document_filter))
+            return
+
+        accept = self._predicate(document_filter)
+        keys = sorted(self._order.key(i) for i in candidates if accept(i))
+        if cursor is not None:
+            position = (datetime_to_micros(cursor.created_at), cursor.document_id.int)
+            keys = keys[bisect_right(keys, position) :]
+        for _, document_id in keys:
+            yield document_id
+
+    def _candidates(self, document_filter: DocumentFilter) -> Iterator[int]:
+        """Yield the matching document IDs in no particular order."""
+        candidates, size = self._narrowest(document_filter)
+        start, stop = self._order.span(
+            _micros(document_filter.created_after),
+            _micros(document_filter.created_before),
+        )
+        accept = self._predicate(document_filter)
+        if candidates is None or size >= stop - start:
+            return self._scan(start, stop, accept)
+        return (document_id for document_id in candidates if accept(document_id))
+
+    def _scan(
+        self, start: int, stop: int, accept: Callable[[int], bool]
+    ) -> Iterator[int]:
+        """Yield the accepted IDs between two positions of the ordering."""
+        for position in range(start, stop, _SCAN_BATCH_SIZE):
+            for document_id in self._order.ids(
+                position, min(position + _SCAN_BATCH_SIZE, stop)
+            ):
+                if accept(document_id):
+                    yield document_id
+
+    def _narrowest(
+        self, document_filter: DocumentFilter
+    ) -> tuple[Iterable[int] | None, int]:
+        """Return the smallest candidate set among the non-created_at indexes.
+
+        Returns:
+            The candidate IDs and their number, or (None, 0) when the filter
+            has no condition on source, title or updated_at
+        """
+        options: list[tuple[int, Callable[[], Iterable[int]]]] = []
+        if document_filter.source:
+            ids = self._sources.get(document_filter.source, set())
+            options.append((len(ids), lambda: ids))
+        if document_filter.title_prefix:
+            title_range = (
+                document_filter.title_prefix,
+                prefix_end(document_filter.title_prefix),
+            )
+            options.append(
+                (
+                    self._titles.estimate(*title_range),
+                    lambda: self._titles.between(*title_range),
+                )
+            )
+        if (
+            document_filter.updated_after is not None
+            or document_filter.updated_before is not None
+        ):
+            updated_range = (
+                _micros(document_filter.updated_after),
+                _micros(document_filter.updated_before),
+            )
+            options.append(
+                (
+                    self._updated.estimate(*updated_range),
+                    lambda: self._updated.between(*updated_range),
+                )
+            )
+        if not options:
+            return None, 0
+        size, candidates = min(options, key=lambda option: option[0])
+        return candidates(), size
+
+    def _predicate(self, document_filter: DocumentFilter) -> Callable[[int], bool]:
+        """Return a check of a document ID against every condition of the filter."""
+        source = document_filter.source or None
+        prefix = document_filter.title_prefix or None
+        created_after = _micros(document_filter.created_after)
+        created_before = _micros(document_filter.created_before)
+        updated_after = _micros(document_filter.updated_after)
+        updated_before = _micros(document_filter.updated_before)
+        metadata = self._metadata
+
+        def accept(document_id: int) -> bool:
+            entry = metadata[document_id]
+            return (
+                (source is None or entry.source == source)
+                and (prefix is None or entry.title.startswith(prefix))
+                and (created_after is None or entry.created_at >= created_after)
+                and (created_before is None or entry.created_at < created_before)
+                and (updated_after is None or entry.updated_at >= updated_after)
+                and (updated_before is None or entry.updated_at < updated_before)
+            )
+
+        return accept
@@ -0,0 +1,96 @@
+"""Ordered (created_at, id) index shared by repository implementations."""
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable
+
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_record import datetime_to_micros
+
+# (created_at in microseconds, document ID as int)
+_SortKey = tuple[int, int]
+
+
+class DocumentOrderIndex:
+    """Sorted index of document IDs by (created_at, id).
+
+    Updated incrementally on every write, so pages are served by slicing or
+    bisecting instead of re-sorting all documents. Keys use the compact
+    DocumentRecord encoding (int timestamps and IDs), which sorts the same
+    way as (datetime, UUID).
+    """
+
+    def __init__(self) -> None:
+        self._order: list[_SortKey] = []
+        self._keys: dict[int, _SortKey] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add(self, document_id: int, created_at: int) -> None:
+        """Insert a document, moving it if its created_at changed."""
+        key = (created_at, document_id)
+        previous = self._keys.get(document_id)
+        if previous == key:
+            return
+        if previous is not None:
+            self.remove(document_id)
+        insort(self._order, key)
+        self._keys[document_id] = key
+
+    def rebuild(self, entries: Iterable[tuple[int, int]]) -> None:
+        """Replace the index with (document_id, created_at) pairs in one sort.
+
+        Used for bulk loads, where a single sort beats repeated insertion.
+        """
+        self._keys = {
+            document_id: (created_at, document_id)
+            for document_id, created_at in entries
+        }
+        self._order = sorted(self._keys.values())
+
+    def remove(self, document_id: int) -> None:
+        """Remove a document from the index if present."""
+        key = self._keys.pop(document_id, None)
+        if key is not None:
+            del self._order[bisect_left(self._order, key)]
+
+    def clear(self) -> None:
+        """Remove all documents from the index."""
+        self._order.clear()
+        self._keys.clear()
+
+    def key(self, document_id: int) -> _SortKey:
+        """Return the (created_at, id) sort key of an indexed document."""
+        return self._keys[document_id]
+
+    def slice(self, limit: int, offset: int = 0) -> list[int]:
+        """Return document IDs for an offset page."""
+        return self.ids(offset, offset + limit)
+
+    def after(self, cursor: DocumentCursor | None, limit: int) -> list[int]:
+        """Return document IDs ordered after the cursor."""
+        start = self.position(cursor)
+        return self.ids(start, start + limit)
+
+    def ids(self, start: int, stop: int) -> list[int]:
+        """Return the document IDs between two positions of the ordering."""
+        return [document_id for _, document_id in self._order[start:stop]]
+
+    def position(self, cursor: DocumentCursor | None) -> int:
+        """Return the position of the first document ordered after the cursor."""
+        if cursor is None:
+            return 0
+        key = (datetime_to_micros(cursor.created_at), cursor.document_id.int)
+        return bisect_right(self._order, key)
+
+    def span(self, lower: int | None, upper: int | None) -> tuple[int, int]:
+        """Return the positions of the documents created in [lower, upper).
+
+        Bounds are microseconds since the epoch; None leaves a side open.
+        """
+        # IDs are non-negative, so (t, -1) sorts before every key at time t
+        start = 0 if lower is None else bisect_left(self._order, (lower, -1))
+        stop = (
+            len(self._order) if upper is None else bisect_left(self._order, (upper, -1))
+        )
+        return start, max(start, stop)
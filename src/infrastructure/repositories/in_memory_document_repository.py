@@ -1,47 +1,174 @@
+from collections.abc import Collection
 from uuid import UUID
 
 from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter
+from src.domain.document.models.document_record import DocumentRecord
 from src.domain.document.repositories.document_repository import DocumentRepository
+from src.infrastructure.repositories.content_store import ContentStore
+from src.infrastructure.repositories.document_journal import DocumentJournal
+from src.infrastructure.repositories.document_metadata_index import (
+    DocumentMetadataIndex,
+)
 
 
 class InMemoryDocumentRepository(DocumentRepository):
-    """In-memory implementation of DocumentRepository for testing and development."""
+    """In-memory implementation of DocumentRepository for testing and development.
 
-    def __init__(self) -> None:
-        self._documents: dict[UUID, Document] = {}
+    Documents are held as compact DocumentRecords and converted back to
+    Document (without validation) when returned. Bodies live in a
+    content-addressed store, so documents with identical content share one
+    string; a store with a codec keeps them compressed and decompresses a
+    body only when a document is read. Source, title and timestamps are
+    kept in secondary indexes (DocumentMetadataIndex), so filtered listings
+    touch only matching documents. With a journal, mutations are logged
+    to a write-ahead log with periodic snapshots, and the state is restored
+    from them on construction.
+    """
+
+    def __init__(
+        self,
+        journal: DocumentJournal | None = None,
+        contents: ContentStore | None = None,
+    ) -> None:
+        """Create the repository.
+
+        Args:
+            journal: Journal persisting the documents; None keeps them in memory only
+            contents: Store for document bodies; defaults to an uncompressed one
+        """
+        self._records: dict[int, DocumentRecord] = {}
+        self._index = DocumentMetadataIndex()
+        self._contents = contents if contents is not None else ContentStore()
+        self._journal = journal
+        if journal is not None:
+            self._records = journal.load()
+            for record in self._records.values():
+                record.content_hash, record.content = self._contents.acquire(
+                    record.content
+                )
+            self._index.rebuild(self._records.items())
+
+    def _store(self, record: DocumentRecord) -> None:
+        record.content_hash, record.content = self._contents.acquire(record.content)
+        previous = self._records.get(record.id)
+        if previous is not None:
+            self._release(previous)
+        self._records[record.id] = record
+        self._index.add(record.id, record)
+
+    def _release(self, record: DocumentRecord) -> None:
+        if record.content_hash:
+            self._contents.release(record.content_hash)
+
+    def _to_document(self, record: DocumentRecord) -> Document:
+        if record.content:
+            return record.to_document()
+        # Compressed body, decompressed on read
+        return record.to_document(self._contents.get(record.content_hash))
+
+    def _put(self, records: list[DocumentRecord]) -> None:
+        if self._journal is not None:
+            self._journal.log_puts(records)
+        for record in records:
+            self._store(record)
+        self.version += 1
+        self._maybe_snapshot()
+
+    def _maybe_snapshot(self) -> None:
+        if self._journal is not None and self._journal.needs_snapshot():
+            contents = (
+                self._contents.frozen_reader() if self._contents.compressed else None
+            )
+            self._journal.snapshot(list(self._records.values()), contents=contents)
 
     async def save(self, document: Document) -> Document:
         """Save a document to the repository."""
-        self._documents[document.id] = document
+        self._put([DocumentRecord.from_document(document)])
         return document
 
+    async def save_many(self, documents: list[Document]) -> list[Document]:
+        """Save a batch of documents in one repository operation."""
+        self._put([DocumentRecord.from_document(document) for document in documents])
+        return documents
+
     async def find_by_id(self, document_id: UUID) -> Document | None:
         """Find a document by its ID."""
-        return self._documents.get(document_id)
+        record = self._records.get(document_id.int)
+        return self._to_document(record) if record else None
+
+    async def find_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        document_filter: DocumentFilter | None = None,
+    ) -> list[Document]:
+        """Find all documents, or those matching the filter, with pagination."""
+        return [
+            self._to_document(self._records[i])
+            for i in self._index.slice(limit, offset, document_filter)
+        ]
+
+    async def find_after(
+        self,
+        cursor: DocumentCursor | None,
+        limit: int = 100,
+        document_filter: DocumentFilter | None = None,
+    ) -> list[Document]:
+        """Find documents ordered after the cursor (keyset pagination)."""
+        return [
+            self._to_document(self._records[i])
+            for i in self._index.after(cursor, limit, document_filter)
+        ]
+
+    async def find_ids(self, document_filter: DocumentFilter) -> set[UUID]:
+        """Return the IDs of the matching documents from the metadata indexes."""
+        return {UUID(int=i) for i in self._index.ids(document_filter)}
 
-    async def find_all(self, limit: int = 100, offset: int = 0) -> list[Document]:
-        """Find all documents with pagination."""
-        all_docs = list(self._documents.values())
-        # Sort by created_at for consistent ordering
-        all_docs.sort(key=lambda d: d.created_at)
-        return all_docs[offset : offset + limit]
+    async def find_existing(self, document_ids: Collection[UUID]) -> set[UUID]:
+        """Return those of the given IDs that belong to stored documents."""
+        return {i for i in document_ids if i.int in self._records}
+
+    async def count(self, document_filter: DocumentFilter | None = None) -> int:
+        """Return the number of documents, or of those matching the filter."""
+        return self._index.count(document_filter)
+
+    async def stats(self) -> dict[str, int | float]:
+        """Return repository metrics, including body deduplication."""
+        return {"documents": len(self._records), **self._contents.stats()}
 
     async def update(self, document: Document) -> Document:
         """Update an existing document."""
-        if document.id not in self._documents:
+        if document.id.int not in self._records:
             raise ValueError(f"Document with id {document.id} not found")
-        self._documents[document.id] = document
+        self._put([DocumentRecord.from_document(document)])
         return document
 
     async def delete(self, document_id: UUID) -> bool:
         """Delete a document by its ID."""
-        if document_id in self._documents:
-            del self._documents[document_id]
+        if document_id.int in self._records:
+            if self._journal is not None:
+                self._journal.log_delete(document_id.int)
+            self._release(self._records.pop(document_id.int))
+            self._index.remove(document_id.int)
+            self.version += 1
+            self._maybe_snapshot()
             return True
         return False
 
     async def delete_all(self) -> int:
         """Delete all documents and return the count of deleted documents."""
-        count = len(self._documents)
-        self._documents.clear()
+        count = len(self._records)
+        if self._journal is not None:
+            self._journal.log_clear()
+        self._records.clear()
+        self._index.clear()
+        self._contents.clear()
+        self.version += 1
         return count
+
+    def close(self) -> None:
+        """Close the journal, if any."""
+        if self._journal is not None:
+            self._journal.close()
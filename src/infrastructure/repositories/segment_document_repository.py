@@ -0,0 +1,482 @@
+"""Append-only segment store implementation of DocumentRepository."""
+
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from collections.abc import Collection
+from typing import BinaryIO
+from uuid import UUID
+
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter
+from src.domain.document.models.document_record import (
+    DocumentRecord,
+    datetime_to_micros,
+)
+from src.domain.document.repositories.document_repository import DocumentRepository
+from src.infrastructure.repositories.document_metadata_index import (
+    DocumentMetadataIndex,
+)
+
+# Record layout: crc32 | seq, op, id, created_at, updated_at, title length,
+# source length, content length | title | source | content. The content comes
+# last so an entry can locate its whole record from the content position.
+_CRC = struct.Struct("<I")
+_RECORD = struct.Struct("<QB16sqqIII")
+_HEADER_SIZE = _CRC.size + _RECORD.size
+
+_OP_PUT = 1
+_OP_DELETE = 2
+
+_SEGMENT_PREFIX = "segment-"
+_SEGMENT_SUFFIX = ".log"
+
+
+class _Entry:
+    """Metadata and body location of a live document."""
+
+    __slots__ = (
+        "seq",
+        "segment_id",
+        "offset",
+        "length",
+        "record_size",
+        "title",
+        "source",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        seq: int,
+        segment_id: int,
+        offset: int,
+        length: int,
+        record_size: int,
+        title: str,
+        source: str,
+        created_at: int,
+        updated_at: int,
+    ) -> None:
+        self.seq = seq
+        self.segment_id = segment_id
+        self.offset = offset
+        self.length = length
+        self.record_size = record_size
+        self.title = title
+        self.source = sys.intern(source)
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @property
+    def record_offset(self) -> int:
+        return self.offset + self.length - self.record_size
+
+
+class SegmentDocumentRepository(DocumentRepository):
+    """Document repository storing bodies in append-only, memory-mapped segments.
+
+    Only metadata, its secondary indexes (DocumentMetadataIndex) and an
+    offset table are kept on the Python heap; document content is read from
+    the segment files through ``mmap`` when a document is materialized.
+    Every write appends a record, so updates and deletes leave garbage
+    behind, which a background compaction reclaims by copying live records
+    out of sealed segments and removing them. Records carry a sequence
+    number, so the state is rebuilt on startup by keeping the newest record
+    per document regardless of segment order.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        compaction_ratio: float = 0.5,
+        min_compaction_bytes: int = 1024 * 1024,
+    ) -> None:
+        """Open (and create if needed) the segment store.
+
+        Args:
+            directory: Directory holding the segment files
+            max_segment_bytes: Size after which the active segment is sealed
+            compaction_ratio: Garbage fraction that triggers compaction
+            min_compaction_bytes: Minimum garbage size that triggers compaction
+        """
+        self._directory = directory
+        self._max_segment_bytes = max_segment_bytes
+        self._compaction_ratio = compaction_ratio
+        self._min_compaction_bytes = min_compaction_bytes
+
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: threading.Thread | None = None
+
+        self._entries: dict[int, _Entry] = {}
+        self._index = DocumentMetadataIndex()
+        self._segment_sizes: dict[int, int] = {}
+        self._maps: dict[int, mmap.mmap] = {}
+        self._seq = 0
+        self._live_bytes = 0
+        self._total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+        self._next_segment_id = max(self._segment_sizes, default=0) + 1
+        if self._segment_sizes:
+            # Keep appending to the newest segment
+            self._active_id = max(self._segment_sizes)
+        else:
+            self._active_id = self._allocate_segment()
+        self._active_file = self._open_segment(self._active_id)
+
+    def _segment_path(self, segment_id: int) -> str:
+        return os.path.join(
+            self._directory, f"{_SEGMENT_PREFIX}{segment_id:08d}{_SEGMENT_SUFFIX}"
+        )
+
+    def _open_segment(self, segment_id: int) -> BinaryIO:
+        """Open a segment for appending; the caller owns the handle."""
+        return open(self._segment_path(segment_id), "ab")  # noqa: SIM115
+
+    def _allocate_segment(self) -> int:
+        segment_id = self._next_segment_id
+        self._next_segment_id += 1
+        self._segment_sizes[segment_id] = 0
+        return segment_id
+
+    def _load(self) -> None:
+        """Rebuild the offset table by replaying every segment."""
+        newest: dict[int, int] = {}
+        for name in sorted(os.listdir(self._directory)):
+            path = os.path.join(self._directory, name)
+            if name.endswith(".tmp"):
+                # Leftover of an interrupted compaction
+                os.remove(path)
+                continue
+            if not (
+                name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX)
+            ):
+                continue
+            segment_id = int(name[len(_SEGMENT_PREFIX) : -len(_SEGMENT_SUFFIX)])
+            with open(path, "rb") as f:
+                data = f.read()
+            size = self._replay(segment_id, data, newest)
+            if size < len(data):
+                # Drop a torn record left by a crash during append
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+            self._segment_sizes[segment_id] = size
+            self._total_bytes += size
+
+        self._index.rebuild(self._entries.items())
+        for entry in self._entries.values():
+            self._live_bytes += entry.record_size
+
+    def _replay(self, segment_id: int, data: bytes, newest: dict[int, int]) -> int:
+        """Apply the records of one segment and return its valid length."""
+        position = 0
+        while position + _HEADER_SIZE <= len(data):
+            (crc,) = _CRC.unpack_from(data, position)
+            seq, op, raw_id, created, updated, t_len, s_len, c_len = (
+                _RECORD.unpack_from(data, position + _CRC.size)
+            )
+            end = position + _HEADER_SIZE + t_len + s_len + c_len
+            if end > len(data) or zlib.crc32(data[position + _CRC.size : end]) != crc:
+                break
+
+            self._seq = max(self._seq, seq)
+            document_id = int.from_bytes(raw_id)
+            if seq > newest.get(document_id, 0):
+                newest[document_id] = seq
+                if op == _OP_PUT:
+                    title_end = position + _HEADER_SIZE + t_len
+                    source_end = title_end + s_len
+                    self._entries[document_id] = _Entry(
+                        seq=seq,
+                        segment_id=segment_id,
+                        offset=source_end,
+                        length=c_len,
+                        record_size=end - position,
+                        title=data[position + _HEADER_SIZE : title_end].decode(),
+                        source=data[title_end:source_end].decode(),
+                        created_at=created,
+                        updated_at=updated,
+                    )
+                else:
+                    self._entries.pop(document_id, None)
+            position = end
+        return position
+
+    def _append(self, op: int, document_id: UUID, document: Document | None) -> _Entry:
+        """Append a record to the active segment.
+
+        Must hold the lock, and flush the active file before releasing it.
+        """
+        self._seq += 1
+        title = source = content = b""
+        created = updated = 0
+        if document is not None:
+            title = document.title.encode()
+            source = document.source.encode()
+            content = document.content.encode()
+            created = datetime_to_micros(document.created_at)
+            updated = datetime_to_micros(document.updated_at)
+
+        body = _RECORD.pack(
+            self._seq,
+            op,
+            document_id.bytes,
+            created,
+            updated,
+            len(title),
+            len(source),
+            len(content),
+        )
+        payload = body + title + source + content
+        record = _CRC.pack(zlib.crc32(payload)) + payload
+
+        if self._segment_sizes[self._active_id] + len(record) > self._max_segment_bytes:
+            self._roll_segment()
+        record_offset = self._segment_sizes[self._active_id]
+        self._active_file.write(record)
+        self._segment_sizes[self._active_id] += len(record)
+        self._total_bytes += len(record)
+
+        return _Entry(
+            seq=self._seq,
+            segment_id=self._active_id,
+            offset=record_offset + len(record) - len(content),
+            length=len(content),
+            record_size=len(record),
+            title=document.title if document else "",
+            source=document.source if document else "",
+            created_at=created,
+            updated_at=updated,
+        )
+
+    def _roll_segment(self) -> None:
+        """Seal the active segment and start a new one. Must hold the lock."""
+        if self._segment_sizes[self._active_id] == 0:
+            return
+        self._active_file.close()
+        self._active_id = self._allocate_segment()
+        self._active_file = self._open_segment(self._active_id)
+
+    def _read(self, segment_id: int, start: int, end: int) -> bytes:
+        """Read a byte range of a segment through mmap. Must hold the lock."""
+        segment_map = self._maps.get(segment_id)
+        if segment_map is None or len(segment_map) < end:
+            # The active segment grows, so its mapping is refreshed on demand
+            if segment_map is not None:
+                segment_map.close()
+            with open(self._segment_path(segment_id), "rb") as f:
+                segment_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment_id] = segment_map
+        return segment_map[start:end]
+
+    def _materialize(self, document_id: int, entry: _Entry) -> Document:
+        """Build a Document, reading its content from the segment."""
+        content = self._read(
+            entry.segment_id, entry.offset, entry.offset + entry.length
+        )
+        return DocumentRecord(
+            document_id,
+            entry.title,
+            content.decode(),
+            entry.source,
+            entry.created_at,
+            entry.updated_at,
+        ).to_document()
+
+    def _put(self, documents: list[Document]) -> None:
+        with self._lock:
+            for document in documents:
+                entry = self._append(_OP_PUT, document.id, document)
+                previous = self._entries.get(document.id.int)
+                if previous is not None:
+                    self._live_bytes -= previous.record_size
+                self._entries[document.id.int] = entry
+                self._live_bytes += entry.record_size
+                self._index.add(document.id.int, entry)
+            self._active_file.flush()
+            self.version += 1
+        self._maybe_compact()
+
+    async def save(self, document: Document) -> Document:
+        """Save a document to the repository."""
+        self._put([document])
+        return document
+
+    async def save_many(self, documents: list[Document]) -> list[Document]:
+        """Save documents with one append run and a single flush."""
+        self._put(documents)
+        return documents
+
+    async def find_by_id(self, document_id: UUID) -> Document | None:
+        """Find a document by its ID, reading its content lazily."""
+        with self._lock:
+            entry = self._entries.get(document_id.int)
+            if entry is None:
+                return None
+            return self._materialize(document_id.int, entry)
+
+    async def find_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        document_filter: DocumentFilter | None = None,
+    ) -> list[Document]:
+        """Find all documents, or those matching the filter, with pagination."""
+        with self._lock:
+            return [
+                self._materialize(i, self._entries[i])
+                for i in self._index.slice(limit, offset, document_filter)
+            ]
+
+    async def find_after(
+        self,
+        cursor: DocumentCursor | None,
+        limit: int = 100,
+        document_filter: DocumentFilter | None = None,
+    ) -> list[Document]:
+        """Find documents ordered after the cursor (keyset pagination)."""
+        with self._lock:
+            return [
+                self._materialize(i, self._entries[i])
+                for i in self._index.after(cursor, limit, document_filter)
+            ]
+
+    async def find_ids(self, document_filter: DocumentFilter) -> set[UUID]:
+        """Return the IDs of the matching documents without reading segments."""
+        with self._lock:
+            return {UUID(int=i) for i in self._index.ids(document_filter)}
+
+    async def find_existing(self, document_ids: Collection[UUID]) -> set[UUID]:
+        """Return those of the given IDs that belong to stored documents."""
+        with self._lock:
+            return {i for i in document_ids if i.int in self._entries}
+
+    async def count(self, document_filter: DocumentFilter | None = None) -> int:
+        """Return the number of documents, or of those matching the filter."""
+        with self._lock:
+            return self._index.count(document_filter)
+
+    async def update(self, document: Document) -> Document:
+        """Update an existing document."""
+        if document.id.int not in self._entries:
+            raise ValueError(f"Document with id {document.id} not found")
+        self._put([document])
+        return document
+
+    async def delete(self, document_id: UUID) -> bool:
+        """Delete a document by its ID."""
+        with self._lock:
+            previous = self._entries.pop(document_id.int, None)
+            if previous is None:
+                return False
+            self._append(_OP_DELETE, document_id, None)
+            self._active_file.flush()
+            self._live_bytes -= previous.record_size
+            self._index.remove(document_id.int)
+            self.version += 1
+        self._maybe_compact()
+        return True
+
+    async def delete_all(self) -> int:
+        """Delete all documents and return the count of deleted documents."""
+        with self._compaction_lock, self._lock:
+            count = len(self._entries)
+            self._active_file.close()
+            self._close_maps()
+            for segment_id in self._segment_sizes:
+                os.remove(self._segment_path(segment_id))
+            self._segment_sizes.clear()
+            self._entries.clear()
+            self._index.clear()
+            self._live_bytes = self._total_bytes = 0
+            self._active_id = self._allocate_segment()
+            self._active_file = self._open_segment(self._active_id)
+            self.version += 1
+        return count
+
+    def _maybe_compact(self) -> None:
+        garbage = self._total_bytes - self._live_bytes
+        if (
+            garbage < self._min_compaction_bytes
+            or garbage < self._compaction_ratio * self._total_bytes
+        ):
+            return
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self.compact, name="segment-compaction", daemon=True
+        )
+        self._compaction_thread.start()
+
+    def compact(self) -> None:
+        """Rewrite live records of all sealed segments into one new segment.
+
+        Writes continue during compaction; documents changed meanwhile keep
+        pointing at their newer record, and the stale copy is ignored on
+        replay because its sequence number is lower.
+        """
+        with self._compaction_lock:
+            with self._lock:
+                self._roll_segment()
+                sealed = {s for s in self._segment_sizes if s != self._active_id}
+                if not sealed:
+                    return
+                output_id = self._allocate_segment()
+                live = [
+                    (document_id, entry)
+                    for document_id, entry in self._entries.items()
+                    if entry.segment_id in sealed
+                ]
+
+            output_path = self._segment_path(output_id)
+            moved: list[tuple[int, _Entry, int]] = []
+            size = 0
+            with open(output_path + ".tmp", "wb") as output:
+                for document_id, entry in live:
+                    start = entry.record_offset
+                    with self._lock:
+                        record = self._read(
+                            entry.segment_id, start, start + entry.record_size
+                        )
+                    output.write(record)
+                    moved.append((document_id, entry, size + entry.offset - start))
+                    size += len(record)
+                output.flush()
+                os.fsync(output.fileno())
+            os.replace(output_path + ".tmp", output_path)
+
+            with self._lock:
+                for document_id, entry, offset in moved:
+                    if self._entries.get(document_id) is entry:
+                        entry.segment_id = output_id
+                        entry.offset = offset
+                for segment_id in sealed:
+                    segment_map = self._maps.pop(segment_id, None)
+                    if segment_map is not None:
+                        segment_map.close()
+                    os.remove(self._segment_path(segment_id))
+                    self._total_bytes -= self._segment_sizes.pop(segment_id)
+                self._segment_sizes[output_id] = size
+                self._total_bytes += size
+
+    def _close_maps(self) -> None:
+        for segment_map in self._maps.values():
+            segment_map.close()
+        self._maps.clear()
+
+    def close(self) -> None:
+        """Wait for a running compaction and release files and mappings."""
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        with self._lock:
+            self._active_file.close()
+            self._close_maps()
@@ -0,0 +1,443 @@
+"""SQLite implementation of DocumentRepository."""
+
+import asyncio
+import queue
+import sqlite3
+import threading
+from collections.abc import Callable, Collection
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+from uuid import UUID
+
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter, prefix_end
+from src.domain.document.models.document_record import (
+    DocumentRecord,
+    datetime_to_micros,
+)
+from src.domain.document.repositories.document_repository import DocumentRepository
+
+T = TypeVar("T")
+
+# A write operation returns its result and the change in document count
+_WriteOp = Callable[[sqlite3.Connection], tuple[Any, int]]
+_WriteItem = tuple[_WriteOp, "Future[Any]"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id BLOB PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    source TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL
+);
+-- Covers the (created_at, id) ordering used by find_all/find_after, so
+-- offsets and keyset seeks are resolved from the index alone.
+CREATE INDEX IF NOT EXISTS idx_documents_created_at_id
+    ON documents (created_at, id);
+-- Secondary indexes for filtered listings. A source filter is answered in
+-- (created_at, id) order straight from its index; title prefixes become
+-- ranges over the title index.
+CREATE INDEX IF NOT EXISTS idx_documents_source_created_at_id
+    ON documents (source, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_documents_updated_at
+    ON documents (updated_at);
+CREATE INDEX IF NOT EXISTS idx_documents_title
+    ON documents (title);
+"""
+
+# Stay well below SQLite's limit on bound parameters per statement
+_MAX_PARAMETERS = 500
+
+_COLUMNS = "d.id, d.title, d.content, d.source, d.created_at, d.updated_at"
+
+
+def _to_row(document: Document) -> tuple[bytes, str, str, str, int, int]:
+    return (
+        document.id.bytes,
+        document.title,
+        document.content,
+        document.source,
+        datetime_to_micros(document.created_at),
+        datetime_to_micros(document.updated_at),
+    )
+
+
+def _where(document_filter: DocumentFilter | None) -> tuple[list[str], list[Any]]:
+    """Translate a filter into SQL conditions and their parameters."""
+    conditions: list[str] = []
+    parameters: list[Any] = []
+    if document_filter is None:
+        return conditions, parameters
+    if document_filter.source:
+        conditions.append("source = ?")
+        parameters.append(document_filter.source)
+    if document_filter.title_prefix:
+        # Text compares by UTF-8 bytes, i.e. by code point, so the prefix
+        # is a range over the title index
+        conditions.append("title >= ?")
+        parameters.append(document_filter.title_prefix)
+        end = prefix_end(document_filter.title_prefix)
+        if end is not None:
+            conditions.append("title < ?")
+            parameters.append(end)
+    for column, lower, upper in (
+        ("created_at", document_filter.created_after, document_filter.created_before),
+        ("updated_at", document_filter.updated_after, document_filter.updated_before),
+    ):
+        if lower is not None:
+            conditions.append(f"{column} >= ?")
+            parameters.append(datetime_to_micros(lower))
+        if upper is not None:
+            conditions.append(f"{column} < ?")
+            parameters.append(datetime_to_micros(upper))
+    return conditions, parameters
+
+
+def _from_row(row: tuple[Any, ...]) -> Document:
+    # Rows were validated when saved, so skip validation on the way out
+    return DocumentRecord(
+        int.from_bytes(row[0]), row[1], row[2], row[3], row[4], row[5]
+    ).to_document()
+
+
+class SqliteDocumentRepository(DocumentRepository):
+    """SQLite implementation of DocumentRepository.
+
+    The database runs in WAL mode so readers never block the writer. Reads
+    are served by a pool of connections on worker threads, keeping the event
+    loop free. Writes are queued to a single writer thread which commits all
+    writes pending at that moment in one transaction (group commit).
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        reader_pool_size: int = 4,
+        max_batch_size: int = 256,
+    ) -> None:
+        """Open (and create if needed) the database.
+
+        Args:
+            database_path: Path of the SQLite database file
+            reader_pool_size: Number of reader connections and threads
+            max_batch_size: Maximum number of writes per group commit
+        """
+        self._database_path = database_path
+        self._max_batch_size = max_batch_size
+
+        writer = self._connect()
+        writer.executescript(_SCHEMA)
+        self._count: int = writer.execute("SELECT COUNT(*) FROM documents").fetchone()[
+            0
+        ]
+
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        for _ in range(reader_pool_size):
+            self._readers.put(self._connect())
+        self._reader_executor = ThreadPoolExecutor(
+            max_workers=reader_pool_size, thread_name_prefix="sqlite-reader"
+        )
+
+        self._writes: queue.Queue[_WriteItem | None] = queue.Queue()
+        self._writer_thread = threading.Thread(
+            target=self._run_writer,
+            args=(writer,),
+            name="sqlite-writer",
+            daemon=True,
+        )
+        self._writer_thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self._database_path,
+            isolation_level=None,  # Transactions are managed explicitly
+            check_same_thread=False,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _run_writer(self, connection: sqlite3.Connection) -> None:
+        """Drain the write queue, committing each drained group at once."""
+        running = True
+        while running:
+            item = self._writes.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self._max_batch_size:
+                try:
+                    item = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            self._commit_batch(connection, batch)
+        connection.close()
+
+    def _commit_batch(
+        self, connection: sqlite3.Connection, batch: list[_WriteItem]
+    ) -> None:
+        # Writes whose caller gave up before the batch was taken are skipped;
+        # the rest can no longer be cancelled, so their results can be set
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        outcomes: list[tuple[bool, Any]] = []
+        delta = 0
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            for operation, _ in batch:
+                # A savepoint per write keeps one failing write from
+                # aborting the rest of the group.
+                connection.execute("SAVEPOINT write_op")
+                try:
+                    result, count_delta = operation(connection)
+                except Exception as e:
+                    connection.execute("ROLLBACK TO write_op")
+                    connection.execute("RELEASE write_op")
+                    outcomes.append((False, e))
+                else:
+                    connection.execute("RELEASE write_op")
+                    outcomes.append((True, result))
+                    delta += count_delta
+            connection.execute("COMMIT")
+        except Exception as e:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self._count += delta
+        # Committed, so readers already see the writes
+        self.version += 1
+        for (ok, value), (_, future) in zip(outcomes, batch, strict=True):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    async def _write(self, operation: _WriteOp) -> Any:
+        future: Future[Any] = Future()
+        self._writes.put((operation, future))
+        return await asyncio.wrap_future(future)
+
+    def _with_reader(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        connection = self._readers.get()
+        try:
+            return operation(connection)
+        finally:
+            self._readers.put(connection)
+
+    async def _read(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._reader_executor, self._with_reader, operation
+        )
+
+    async def save(self, document: Document) -> Document:
+        """Save a document to the repository."""
+        row = _to_row(document)
+
+        def operation(connection: sqlite3.Connection) -> tuple[Document, int]:
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO documents VALUES (?, ?, ?, ?, ?, ?)", row
+            )
+            if cursor.rowcount:
+                return document, 1
+            connection.execute(
+                "UPDATE documents SET title = ?, content = ?, source = ?, "
+                "created_at = ?, updated_at = ? WHERE id = ?",
+                (*row[1:], row[0]),
+            )
+            return document, 0
+
+        result: Document = await self._write(operation)
+        return result
+
+    async def save_many(self, documents: list[Document]) -> list[Document]:
+        """Save a batch of documents as a single write of one group commit."""
+        rows = list({row[0]: row for row in map(_to_row, documents)}.values())
+
+        def operation(connection: sqlite3.Connection) -> tuple[list[Document], int]:
+            existing = 0
+            for start in range(0, len(rows), _MAX_PARAMETERS):
+                ids = [row[0] for row in rows[start : start + _MAX_PARAMETERS]]
+                existing += connection.execute(
+                    "SELECT COUNT(*) FROM documents WHERE id IN "
+                    f"({', '.join('?' * len(ids))})",
+                    ids,
+                ).fetchone()[0]
+            connection.executemany(
+                "INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET title = excluded.title, "
+                "content = excluded.content, source = excluded.source, "
+                "created_at = excluded.created_at, updated_at = excluded.updated_at",
+                rows,
+            )
+            return documents, len(rows) - existing
+
+        result: list[Document] = await self._write(operation)
+        return result
+
+    async def find_by_id(self, document_id: UUID) -> Document | None:
+        """Find a document by its ID."""
+
+        def operation(connection: sqlite3.Connection) -> Document | None:
+            row = connection.execute(
+                f"SELECT {_COLUMNS} FROM documents AS d WHERE d.id = ?",
+                (document_id.bytes,),
+            ).fetchone()
+            return _from_row(row) if row else None
+
+        return await self._read(operation)
+
+    async def find_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        document_filter: DocumentFilter | None = None,
+    ) -> list[Document]:
+        """Find all documents, or those matching the filter, with pagination."""
+        conditions, parameters = _where(document_filter)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+
+        def operation(connection: sqlite3.Connection) -> list[Document]:
+            # Deferred join: skip `offset` entries on the covering index
+            # alone, then fetch full rows only for the requested page.
+            rows = connection.execute(
+                f"SELECT {_COLUMNS} FROM ("
+                f"  SELECT id FROM documents {where}ORDER BY created_at, id"
+                "  LIMIT ? OFFSET ?"
+                ") AS page JOIN documents AS d ON d.id = page.id "
+                "ORDER BY d.created_at, d.id",
+                (*parameters, limit, offset),
+            ).fetchall()
+            return [_from_row(row) for row in rows]
+
+        return await self._read(operation)
+
+    async def find_after(
+        self,
+        cursor: DocumentCursor | None,
+        limit: int = 100,
+        document_filter: DocumentFilter | None = None,
+    ) -> list[Document]:
+        """Find documents ordered after the cursor (keyset pagination)."""
+        if cursor is None:
+            return await self.find_all(limit=limit, document_filter=document_filter)
+        conditions, parameters = _where(document_filter)
+        conditions.insert(0, "(created_at, id) > (?, ?)")
+        parameters[:0] = [
+            datetime_to_micros(cursor.created_at),
+            cursor.document_id.bytes,
+        ]
+
+        def operation(connection: sqlite3.Connection) -> list[Document]:
+            rows = connection.execute(
+                f"SELECT {_COLUMNS} FROM documents AS d "
+                f"WHERE {' AND '.join(conditions)} "
+                "ORDER BY d.created_at, d.id LIMIT ?",
+                (*parameters, limit),
+            ).fetchall()
+            return [_from_row(row) for row in rows]
+
+        return await self._read(operation)
+
+    async def find_ids(self, document_filter: DocumentFilter) -> set[UUID]:
+        """Return the IDs of the matching documents, read from the indexes."""
+        conditions, parameters = _where(document_filter)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        def operation(connection: sqlite3.Connection) -> set[UUID]:
+            rows = connection.execute(f"SELECT id FROM documents{where}", parameters)
+            return {UUID(bytes=row[0]) for row in rows}
+
+        return await self._read(operation)
+
+    async def find_existing(self, document_ids: Collection[UUID]) -> set[UUID]:
+        """Return those of the given IDs that belong to stored documents."""
+        ids = [document_id.bytes for document_id in document_ids]
+
+        def operation(connection: sqlite3.Connection) -> set[UUID]:
+            found: set[UUID] = set()
+            for start in range(0, len(ids), _MAX_PARAMETERS):
+                chunk = ids[start : start + _MAX_PARAMETERS]
+                rows = connection.execute(
+                    "SELECT id FROM documents WHERE id IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                found.update(UUID(bytes=row[0]) for row in rows)
+            return found
+
+        return await self._read(operation)
+
+    async def count(self, document_filter: DocumentFilter | None = None) -> int:
+        """Return the number of documents, or of those matching the filter."""
+        conditions, parameters = _where(document_filter)
+        if not conditions:
+            # Maintained by the writer thread, the only connection that writes
+            return self._count
+
+        def operation(connection: sqlite3.Connection) -> int:
+            row = connection.execute(
+                f"SELECT COUNT(*) FROM documents WHERE {' AND '.join(conditions)}",
+                parameters,
+            ).fetchone()
+            return int(row[0])
+
+        return await self._read(operation)
+
+    async def update(self, document: Document) -> Document:
+        """Update an existing document."""
+        row = _to_row(document)
+
+        def operation(connection: sqlite3.Connection) -> tuple[Document, int]:
+            cursor = connection.execute(
+                "UPDATE documents SET title = ?, content = ?, source = ?, "
+                "created_at = ?, updated_at = ? WHERE id = ?",
+                (*row[1:], row[0]),
+            )
+            if not cursor.rowcount:
+                raise ValueError(f"Document with id {document.id} not found")
+            return document, 0
+
+        result: Document = await self._write(operation)
+        return result
+
+    async def delete(self, document_id: UUID) -> bool:
+        """Delete a document by its ID."""
+
+        def operation(connection: sqlite3.Connection) -> tuple[bool, int]:
+            cursor = connection.execute(
+                "DELETE FROM documents WHERE id = ?", (document_id.bytes,)
+            )
+            return bool(cursor.rowcount), -cursor.rowcount
+
+        deleted: bool = await self._write(operation)
+        return deleted
+
+    async def delete_all(self) -> int:
+        """Delete all documents and return the count of deleted documents."""
+
+        def operation(connection: sqlite3.Connection) -> tuple[int, int]:
+            cursor = connection.execute("DELETE FROM documents")
+            return cursor.rowcount, -cursor.rowcount
+
+        deleted: int = await self._write(operation)
+        return deleted
+
+    def close(self) -> None:
+        """Flush pending writes and close all connections."""
+        self._writes.put(None)
+        self._writer_thread.join()
+        self._reader_executor.shutdown(wait=True)
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
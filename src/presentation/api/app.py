@@ -3,7 +3,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.presentation.api.routes import documents, rag  # type: ignore[attr-defined]
+from src.presentation.api.routes import documents, metrics, rag  # type: ignore[attr-defined]
 
 
 def create_app() -> FastAPI:
@@ -26,6 +26,7 @@ def create_app() -> FastAPI:
     # Include routers
     app.include_router(documents.router, prefix="/api/documents", tags=["Documents"])
     app.include_router(rag.router, prefix="/api/rag", tags=["RAG"])
+    app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
 
     # Health check endpoint
     @app.get("/health")
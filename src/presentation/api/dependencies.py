@@ -6,27 +6,96 @@ from typing import Annotated
 from fastapi import Depends
 
 from src.domain.document.repositories.document_repository import DocumentRepository
+from src.domain.document.services.chunker import Chunker
+from src.domain.document.services.document_index import DocumentIndex
+from src.domain.rag.models.query import QueryResult
 from src.domain.rag.services.rag_strategy import RAGStrategy
+from src.domain.rag.services.reranker import Reranker
+from src.infrastructure.algorithms.bm25_index import BM25Index
+from src.infrastructure.algorithms.bm25_rag_strategy import BM25RAGStrategy
+from src.infrastructure.algorithms.caching_rag_strategy import CachingRAGStrategy
+from src.infrastructure.algorithms.chunk_index import ChunkIndex
+from src.infrastructure.algorithms.context_packer import ContextPacker
+from src.infrastructure.algorithms.hybrid_rag_strategy import HybridRAGStrategy
+from src.infrastructure.algorithms.ivf_index import IVFVectorIndex
+from src.infrastructure.algorithms.mmr_reranker import MMRReranker
 from src.infrastructure.algorithms.mock_rag_strategy import MockRAGStrategy
+from src.infrastructure.algorithms.similarity import (
+    EmbeddingSimilarity,
+    ShingleSimilarity,
+    SimilaritySource,
+)
 from src.infrastructure.algorithms.simple_rag_strategy import SimpleRAGStrategy
+from src.infrastructure.algorithms.vector_index import VectorIndex
+from src.infrastructure.algorithms.vector_rag_strategy import VectorRAGStrategy
 from src.infrastructure.config.settings import Settings, get_settings
 from src.infrastructure.external.azure_openai_client import AzureOpenAIClient
+from src.infrastructure.repositories.content_codec import ContentCodec
+from src.infrastructure.repositories.content_store import ContentStore
+from src.infrastructure.repositories.document_journal import DocumentJournal
 from src.infrastructure.repositories.in_memory_document_repository import (
     InMemoryDocumentRepository,
 )
+from src.infrastructure.repositories.segment_document_repository import (
+    SegmentDocumentRepository,
+)
+from src.infrastructure.repositories.sqlite_document_repository import (
+    SqliteDocumentRepository,
+)
 from src.usecase.document.document_usecase import DocumentUseCase
+from src.usecase.document.indexing_queue import IndexingQueue
+from src.usecase.rag.answer_cache import AnswerCache
 from src.usecase.rag.rag_query_usecase import RAGQueryUseCase
+from src.usecase.rag.single_flight import SingleFlight
 
 # Repository instances (singleton pattern for in-memory storage)
 _document_repository: DocumentRepository | None = None
 _azure_openai_client: AzureOpenAIClient | None = None
+_bm25_index: BM25Index | None = None
+_vector_index: VectorIndex | None = None
+_ivf_index: IVFVectorIndex | None = None
+_chunk_index: ChunkIndex | None = None
+_indexing_queue: IndexingQueue | None = None
+_reranker: Reranker | None = None
+_retrieval_cache: CachingRAGStrategy | None = None
+_answer_cache: AnswerCache | None = None
+_single_flight: SingleFlight[QueryResult] | None = None
+_context_packer: ContextPacker | None = None
 
 
-def get_document_repository() -> DocumentRepository:
-    """Get document repository instance."""
+def get_document_repository(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> DocumentRepository:
+    """Get document repository instance based on configuration."""
     global _document_repository
     if _document_repository is None:
-        _document_repository = InMemoryDocumentRepository()
+        if settings.document_repository_backend == "sqlite":
+            _document_repository = SqliteDocumentRepository(
+                settings.sqlite_database_path,
+                reader_pool_size=settings.sqlite_reader_pool_size,
+                max_batch_size=settings.sqlite_max_batch_size,
+            )
+        elif settings.document_repository_backend == "segment":
+            _document_repository = SegmentDocumentRepository(
+                settings.segment_store_path,
+                max_segment_bytes=settings.segment_max_bytes,
+                compaction_ratio=settings.segment_compaction_ratio,
+            )
+        else:
+            # Default to in-memory storage, optionally journaled to disk
+            journal = None
+            if settings.memory_journal_path:
+                journal = DocumentJournal(
+                    settings.memory_journal_path,
+                    snapshot_interval=settings.memory_snapshot_interval,
+                )
+            contents = None
+            if settings.memory_content_compression != "none":
+                contents = ContentStore(
+                    ContentCodec(settings.memory_content_compression),
+                    cache_size=settings.memory_content_cache_size,
+                )
+            _document_repository = InMemoryDocumentRepository(journal, contents)
     return _document_repository
 
 
@@ -40,18 +109,170 @@ def get_azure_openai_client(
     return _azure_openai_client
 
 
+def get_bm25_index() -> BM25Index:
+    """Get the BM25 index instance shared by writes and retrieval."""
+    global _bm25_index
+    if _bm25_index is None:
+        _bm25_index = BM25Index()
+    return _bm25_index
+
+
+def get_vector_index(
+    openai_client: Annotated[AzureOpenAIClient, Depends(get_azure_openai_client)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> VectorIndex:
+    """Get the embedding index instance shared by writes and retrieval."""
+    global _vector_index
+    if _vector_index is None:
+        _vector_index = VectorIndex(
+            openai_client.get_embeddings,
+            precision=settings.vector_precision,
+            projection_dimensions=settings.vector_projection_dimensions,
+            rescore_factor=settings.vector_rescore_factor,
+        )
+    return _vector_index
+
+
+def get_ivf_index(
+    openai_client: Annotated[AzureOpenAIClient, Depends(get_azure_openai_client)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> IVFVectorIndex:
+    """Get the approximate embedding index shared by writes and retrieval."""
+    global _ivf_index
+    if _ivf_index is None:
+        _ivf_index = IVFVectorIndex(
+            openai_client.get_embeddings,
+            nlist=settings.ivf_nlist,
+            nprobe=settings.ivf_nprobe,
+            min_train_size=settings.ivf_min_train_size,
+            precision=settings.vector_precision,
+            projection_dimensions=settings.vector_projection_dimensions,
+            rescore_factor=settings.vector_rescore_factor,
+        )
+    return _ivf_index
+
+
+def get_search_indexes(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> list[DocumentIndex]:
+    """Get the search indexes used by the configured RAG strategy."""
+    strategy_type = os.getenv("RAG_STRATEGY", "simple")
+    if strategy_type == "bm25":
+        return [get_bm25_index()]
+    elif strategy_type == "vector":
+        return [get_vector_index(get_azure_openai_client(settings), settings)]
+    elif strategy_type == "ivf":
+        return [get_ivf_index(get_azure_openai_client(settings), settings)]
+    elif strategy_type == "hybrid":
+        return [
+            get_bm25_index(),
+            get_vector_index(get_azure_openai_client(settings), settings),
+        ]
+    return []
+
+
+def get_chunk_index(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> ChunkIndex | None:
+    """Get the chunk index feeding the search indexes, if chunking is enabled."""
+    global _chunk_index
+    if settings.chunk_max_tokens <= 0:
+        return None
+    if _chunk_index is None:
+        indexes = get_search_indexes(settings)
+        if not indexes:
+            return None
+        chunker = Chunker(settings.chunk_max_tokens, settings.chunk_overlap_tokens)
+        _chunk_index = ChunkIndex(indexes, chunker)
+    return _chunk_index
+
+
+def get_document_indexes(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> list[DocumentIndex]:
+    """Get the indexes to maintain on document writes."""
+    chunk_index = get_chunk_index(settings)
+    if chunk_index is not None:
+        return [chunk_index]
+    return get_search_indexes(settings)
+
+
+def get_indexing_queue(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> IndexingQueue | None:
+    """Get the queue indexing document writes in the background, if enabled."""
+    global _indexing_queue
+    if settings.indexing_workers <= 0:
+        return None
+    if _indexing_queue is None:
+        indexes = get_document_indexes(settings)
+        if not indexes:
+            return None
+        _indexing_queue = IndexingQueue(
+            indexes,
+            workers=settings.indexing_workers,
+            max_pending=settings.indexing_max_pending,
+            max_batch_size=settings.indexing_max_batch_size,
+        )
+    return _indexing_queue
+
+
 def get_rag_strategy(
     document_repository: Annotated[
         DocumentRepository, Depends(get_document_repository)
     ],
-    _settings: Annotated[Settings, Depends(get_settings)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> RAGStrategy:
+    """Get RAG strategy instance, behind the retrieval cache if enabled."""
+    global _retrieval_cache
+    if settings.retrieval_cache_size <= 0:
+        return _create_rag_strategy(document_repository, settings)
+    if _retrieval_cache is None:
+        _retrieval_cache = CachingRAGStrategy(
+            _create_rag_strategy(document_repository, settings),
+            document_repository,
+            get_document_indexes(settings),
+            settings.retrieval_cache_size,
+        )
+    return _retrieval_cache
+
+
+def get_retrieval_cache() -> CachingRAGStrategy | None:
+    """Get the retrieval cache, if one has been created."""
+    return _retrieval_cache
+
+
+def _create_rag_strategy(
+    document_repository: DocumentRepository, settings: Settings
 ) -> RAGStrategy:
-    """Get RAG strategy instance based on configuration."""
+    """Create the RAG strategy selected by the RAG_STRATEGY variable."""
     # Use environment variable to switch between strategies
     strategy_type = os.getenv("RAG_STRATEGY", "simple")
+    chunks = get_chunk_index(settings)
 
     if strategy_type == "mock":
         return MockRAGStrategy(document_repository)
+    elif strategy_type == "bm25":
+        return BM25RAGStrategy(document_repository, get_bm25_index(), chunks)
+    elif strategy_type == "vector":
+        index = get_vector_index(get_azure_openai_client(settings), settings)
+        return VectorRAGStrategy(document_repository, index, chunks)
+    elif strategy_type == "ivf":
+        ivf_index = get_ivf_index(get_azure_openai_client(settings), settings)
+        return VectorRAGStrategy(document_repository, ivf_index, chunks)
+    elif strategy_type == "hybrid":
+        return HybridRAGStrategy(
+            document_repository,
+            get_bm25_index(),
+            get_vector_index(get_azure_openai_client(settings), settings),
+            lexical_depth=settings.hybrid_lexical_depth,
+            dense_depth=settings.hybrid_dense_depth,
+            lexical_weight=settings.hybrid_lexical_weight,
+            dense_weight=settings.hybrid_dense_weight,
+            rrf_k=settings.hybrid_rrf_k,
+            leg_timeout=settings.hybrid_leg_timeout or None,
+            chunks=chunks,
+        )
     else:
         # Default to SimpleRAGStrategy
         return SimpleRAGStrategy(document_repository)
@@ -59,14 +280,97 @@ def get_rag_strategy(
 
 def get_document_usecase(
     repository: Annotated[DocumentRepository, Depends(get_document_repository)],
+    indexes: Annotated[list[DocumentIndex], Depends(get_document_indexes)],
+    indexing_queue: Annotated[IndexingQueue | None, Depends(get_indexing_queue)],
 ) -> DocumentUseCase:
     """Get document use case instance."""
-    return DocumentUseCase(repository)
+    if indexing_queue is not None:
+        return DocumentUseCase(repository, indexing_queue=indexing_queue)
+    return DocumentUseCase(repository, indexes)
+
+
+def get_reranker(
+    openai_client: Annotated[AzureOpenAIClient, Depends(get_azure_openai_client)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> Reranker:
+    """Get the reranker instance for queries asking for one."""
+    global _reranker
+    if _reranker is None:
+        similarity: SimilaritySource
+        if settings.rerank_similarity == "embedding":
+            similarity = EmbeddingSimilarity(openai_client.get_embeddings)
+        else:
+            similarity = ShingleSimilarity()
+        _reranker = MMRReranker(similarity, settings.rerank_mmr_lambda)
+    return _reranker
+
+
+def get_answer_cache(
+    openai_client: Annotated[AzureOpenAIClient, Depends(get_azure_openai_client)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> AnswerCache | None:
+    """Get the semantic answer cache instance, if enabled."""
+    global _answer_cache
+    if settings.answer_cache_size <= 0:
+        return None
+    if _answer_cache is None:
+        _answer_cache = AnswerCache(
+            openai_client.get_embeddings,
+            threshold=settings.answer_cache_threshold,
+            max_entries=settings.answer_cache_size,
+            ttl_seconds=settings.answer_cache_ttl_seconds,
+        )
+    return _answer_cache
+
+
+def get_single_flight(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> SingleFlight[QueryResult] | None:
+    """Get the in-flight query table shared by requests, if coalescing is on."""
+    global _single_flight
+    if not settings.coalesce_queries:
+        return None
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
+
+
+def get_context_packer(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> ContextPacker | None:
+    """Get the packer fitting prompt contexts into a token budget, if enabled."""
+    global _context_packer
+    if settings.context_max_tokens <= 0:
+        return None
+    if _context_packer is None:
+        _context_packer = ContextPacker(
+            settings.context_max_tokens,
+            min(settings.context_document_max_tokens, settings.context_max_tokens),
+        )
+    return _context_packer
 
 
 def get_rag_query_usecase(
     rag_strategy: Annotated[RAGStrategy, Depends(get_rag_strategy)],
     openai_client: Annotated[AzureOpenAIClient, Depends(get_azure_openai_client)],
+    indexing_queue: Annotated[IndexingQueue | None, Depends(get_indexing_queue)],
+    reranker: Annotated[Reranker, Depends(get_reranker)],
+    answer_cache: Annotated[AnswerCache | None, Depends(get_answer_cache)],
+    single_flight: Annotated[
+        SingleFlight[QueryResult] | None, Depends(get_single_flight)
+    ],
+    context_packer: Annotated[ContextPacker | None, Depends(get_context_packer)],
+    settings: Annotated[Settings, Depends(get_settings)],
 ) -> RAGQueryUseCase:
     """Get RAG query use case instance."""
-    return RAGQueryUseCase(rag_strategy, openai_client)
+    return RAGQueryUseCase(
+        rag_strategy,
+        openai_client,
+        indexing_queue,
+        settings.indexing_wait_timeout or None,
+        reranker,
+        settings.rerank_depth,
+        answer_cache,
+        single_flight,
+        context_packer,
+    )
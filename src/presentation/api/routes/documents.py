@@ -1,17 +1,27 @@
 """Document API routes."""
 
+import zlib
+from collections.abc import AsyncIterator
+from datetime import datetime
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 
 from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter
+from src.infrastructure.config.settings import Settings, get_settings
 from src.presentation.api.dependencies import get_document_usecase
 from src.usecase.document.document_usecase import DocumentUseCase
 
 router = APIRouter()
 
+# Export responses are sent in chunks of roughly this many bytes
+_EXPORT_CHUNK_BYTES = 64 * 1024
+
 
 class DocumentCreateRequest(BaseModel):
     """Request schema for creating a document."""
@@ -32,6 +42,23 @@ class DocumentListResponse(BaseModel):
 
     documents: list[Document]
     total: int
+    next_cursor: str | None = None
+
+
+class BulkIngestError(BaseModel):
+    """Error for a single NDJSON line of a bulk ingestion."""
+
+    line: int
+    error: str
+
+
+class BulkIngestResponse(BaseModel):
+    """Response schema for bulk ingestion."""
+
+    inserted: int
+    # Lines whose ID was already stored; their document was replaced
+    updated: int
+    errors: list[BulkIngestError]
 
 
 class DeleteAllResponse(BaseModel):
@@ -40,17 +67,144 @@ class DeleteAllResponse(BaseModel):
     deleted_count: int
 
 
+def _set_index_sequence(response: Response, usecase: DocumentUseCase) -> None:
+    """Tell the client which index write to wait for when indexing is queued."""
+    if usecase.indexing_sequence is not None:
+        response.headers["X-Index-Sequence"] = str(usecase.indexing_sequence)
+
+
 @router.post("", response_model=Document)
 async def create_document(
     request: DocumentCreateRequest,
+    response: Response,
     usecase: Annotated[DocumentUseCase, Depends(get_document_usecase)],
 ) -> Document:
     """Create a new document."""
-    return await usecase.create(
+    document = await usecase.create(
         title=request.title,
         content=request.content,
         source=request.source,
     )
+    _set_index_sequence(response, usecase)
+    return document
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a streamed body into lines without buffering the whole body.
+
+    The chunks of an unfinished line are only joined once its end arrives,
+    so a long line costs linear time however many chunks it spans.
+    """
+    pending: list[bytes] = []
+    async for chunk in chunks:
+        if b"\n" not in chunk:
+            pending.append(chunk)
+            continue
+        first, *lines, rest = chunk.split(b"\n")
+        pending.append(first)
+        yield b"".join(pending)
+        for line in lines:
+            yield line
+        pending = [rest]
+    if any(pending):
+        yield b"".join(pending)
+
+
+@router.post("/bulk", response_model=BulkIngestResponse)
+async def bulk_create_documents(
+    request: Request,
+    response: Response,
+    usecase: Annotated[DocumentUseCase, Depends(get_document_usecase)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    batch_size: Annotated[int | None, Query(ge=1)] = None,
+) -> BulkIngestResponse:
+    """Create documents from a streamed NDJSON body, one document per line.
+
+    Lines are parsed as they arrive and saved in batches. A line whose ID
+    is already stored replaces that document and is counted as updated.
+    Invalid lines are reported with their line number and do not abort the
+    ingestion.
+    """
+    batch_size = batch_size or settings.bulk_ingest_batch_size
+    errors: list[BulkIngestError] = []
+    inserted = updated = 0
+    batch: list[Document] = []
+    batch_lines: list[int] = []
+
+    async def flush() -> None:
+        nonlocal inserted, updated
+        try:
+            batch_inserted, batch_updated = await usecase.upsert_many(batch)
+            inserted += batch_inserted
+            updated += batch_updated
+        except Exception as e:
+            errors.extend(BulkIngestError(line=n, error=str(e)) for n in batch_lines)
+        batch.clear()
+        batch_lines.clear()
+
+    line_number = 0
+    async for line in _iter_lines(request.stream()):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            document = Document.model_validate_json(line)
+        except ValidationError as e:
+            message = "; ".join(error["msg"] for error in e.errors())
+            errors.append(BulkIngestError(line=line_number, error=message))
+            continue
+        batch.append(document)
+        batch_lines.append(line_number)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    _set_index_sequence(response, usecase)
+    return BulkIngestResponse(inserted=inserted, updated=updated, errors=errors)
+
+
+async def _ndjson_chunks(documents: AsyncIterator[Document]) -> AsyncIterator[bytes]:
+    """Encode documents as NDJSON, grouping lines into larger chunks."""
+    buffer = bytearray()
+    async for document in documents:
+        buffer += document.model_dump_json().encode()
+        buffer += b"\n"
+        if len(buffer) >= _EXPORT_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream incrementally into a gzip stream."""
+    compressor = zlib.compressobj(wbits=31)  # 31 selects the gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@router.get("/export")
+async def export_documents(
+    request: Request,
+    usecase: Annotated[DocumentUseCase, Depends(get_document_usecase)],
+) -> StreamingResponse:
+    """Stream every document as NDJSON in creation order.
+
+    The body is gzip-compressed when the client accepts it.
+    """
+    chunks = _ndjson_chunks(usecase.iter_all())
+    headers = {
+        "Content-Disposition": 'attachment; filename="documents.ndjson"',
+        "Vary": "Accept-Encoding",
+    }
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        chunks = _gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type="application/x-ndjson", headers=headers)
 
 
 @router.get("/{document_id}", response_model=Document)
@@ -65,48 +219,88 @@ async def get_document(
     return document
 
 
+def _document_filter(
+    source: str | None = None,
+    title_prefix: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    updated_after: datetime | None = None,
+    updated_before: datetime | None = None,
+) -> DocumentFilter:
+    """Collect the metadata filter of a listing from its query parameters."""
+    return DocumentFilter(
+        source=source,
+        title_prefix=title_prefix,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+
 @router.get("", response_model=DocumentListResponse)
 async def list_documents(
     usecase: Annotated[DocumentUseCase, Depends(get_document_usecase)],
+    document_filter: Annotated[DocumentFilter, Depends(_document_filter)],
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> DocumentListResponse:
-    """List documents with pagination."""
-    documents = await usecase.list(limit=limit, offset=offset)
-    # For simplicity, return the count of fetched documents as total
-    # In production, you'd want a separate count query
-    return DocumentListResponse(documents=documents, total=len(documents))
+    """List documents with offset or keyset (cursor) pagination.
+
+    Metadata query parameters restrict the listing to matching documents;
+    ``total`` then counts only those.
+    """
+    try:
+        after = DocumentCursor.decode(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    documents, next_cursor = await usecase.list_page(
+        limit=limit, offset=offset, cursor=after, document_filter=document_filter
+    )
+    return DocumentListResponse(
+        documents=documents,
+        total=await usecase.count(document_filter),
+        next_cursor=next_cursor.encode() if next_cursor else None,
+    )
 
 
 @router.put("/{document_id}", response_model=Document)
 async def update_document(
     document_id: UUID,
     request: DocumentUpdateRequest,
+    response: Response,
     usecase: Annotated[DocumentUseCase, Depends(get_document_usecase)],
 ) -> Document:
     """Update a document's content."""
     document = await usecase.update(document_id, request.content)
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
+    _set_index_sequence(response, usecase)
     return document
 
 
 @router.delete("/{document_id}")
 async def delete_document(
     document_id: UUID,
+    response: Response,
     usecase: Annotated[DocumentUseCase, Depends(get_document_usecase)],
 ) -> dict[str, bool]:
     """Delete a document by ID."""
     deleted = await usecase.delete(document_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Document not found")
+    _set_index_sequence(response, usecase)
     return {"deleted": True}
 
 
 @router.delete("", response_model=DeleteAllResponse)
 async def delete_all_documents(
+    response: Response,
     usecase: Annotated[DocumentUseCase, Depends(get_document_usecase)],
 ) -> DeleteAllResponse:
     """Delete all documents."""
     count = await usecase.delete_all()
+    _set_index_sequence(response, usecase)
     return DeleteAllResponse(deleted_count=count)
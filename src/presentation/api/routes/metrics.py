@@ -0,0 +1,62 @@
+"""Metrics API routes."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+from src.domain.rag.models.query import QueryResult
+from src.infrastructure.algorithms.caching_rag_strategy import CachingRAGStrategy
+from src.infrastructure.algorithms.context_packer import ContextPacker
+from src.infrastructure.external.azure_openai_client import AzureOpenAIClient
+from src.presentation.api.dependencies import (
+    get_answer_cache,
+    get_azure_openai_client,
+    get_context_packer,
+    get_document_usecase,
+    get_indexing_queue,
+    get_retrieval_cache,
+    get_single_flight,
+)
+from src.usecase.document.document_usecase import DocumentUseCase
+from src.usecase.document.indexing_queue import IndexingQueue
+from src.usecase.rag.answer_cache import AnswerCache
+from src.usecase.rag.single_flight import SingleFlight
+
+router = APIRouter()
+
+
+class MetricsResponse(BaseModel):
+    """Response model for service metrics."""
+
+    repository: dict[str, int | float]
+    embedding_cache: dict[str, int | float] = Field(default_factory=dict)
+    indexing: dict[str, int] = Field(default_factory=dict)
+    retrieval_cache: dict[str, int | float] = Field(default_factory=dict)
+    answer_cache: dict[str, int | float] = Field(default_factory=dict)
+    query_coalescing: dict[str, int] = Field(default_factory=dict)
+    context_packing: dict[str, int | float] = Field(default_factory=dict)
+
+
+@router.get("", response_model=MetricsResponse)
+async def get_metrics(
+    usecase: Annotated[DocumentUseCase, Depends(get_document_usecase)],
+    openai_client: Annotated[AzureOpenAIClient, Depends(get_azure_openai_client)],
+    indexing_queue: Annotated[IndexingQueue | None, Depends(get_indexing_queue)],
+    retrieval_cache: Annotated[CachingRAGStrategy | None, Depends(get_retrieval_cache)],
+    answer_cache: Annotated[AnswerCache | None, Depends(get_answer_cache)],
+    single_flight: Annotated[
+        SingleFlight[QueryResult] | None, Depends(get_single_flight)
+    ],
+    context_packer: Annotated[ContextPacker | None, Depends(get_context_packer)],
+) -> MetricsResponse:
+    """Report storage metrics, cache hit rates, indexing lag and tokens saved."""
+    return MetricsResponse(
+        repository=await usecase.stats(),
+        embedding_cache=openai_client.embedding_cache.stats(),
+        indexing={} if indexing_queue is None else indexing_queue.stats(),
+        retrieval_cache={} if retrieval_cache is None else retrieval_cache.stats(),
+        answer_cache={} if answer_cache is None else answer_cache.stats(),
+        query_coalescing={} if single_flight is None else single_flight.stats(),
+        context_packing={} if context_packer is None else context_packer.stats(),
+    )
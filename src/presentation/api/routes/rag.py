@@ -1,11 +1,15 @@
 """RAG API routes."""
 
-from typing import Annotated
+import json
+from collections.abc import AsyncIterator
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 from src.domain.rag.models.query import Query, QueryResult
 from src.presentation.api.dependencies import get_rag_query_usecase
+from src.usecase.document.indexing_queue import IndexLagTimeout, UnknownIndexSequence
 from src.usecase.rag.rag_query_usecase import RAGQueryUseCase
 
 router = APIRouter()
@@ -16,5 +20,71 @@ async def execute_rag_query(
     query: Query,
     usecase: Annotated[RAGQueryUseCase, Depends(get_rag_query_usecase)],
 ) -> QueryResult:
-    """Execute a RAG query."""
-    return await usecase.execute(query_text=query.text, top_k=query.top_k)
+    """Execute a RAG query.
+
+    With ``options.index_sequence`` set, the query first waits until the
+    document write that returned that X-Index-Sequence is searchable.
+    """
+    try:
+        return await usecase.execute(
+            query_text=query.text, top_k=query.top_k, options=query.options
+        )
+    except IndexLagTimeout as e:
+        raise HTTPException(
+            status_code=503, detail="Index has not caught up with the write yet"
+        ) from e
+    except UnknownIndexSequence as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _sse_events(
+    sources: list[str], answer: AsyncIterator[str | QueryResult]
+) -> AsyncIterator[str]:
+    """Turn the sources and answer of a streamed query into Server-Sent Events."""
+    yield _sse("sources", {"sources": sources})
+    try:
+        async for event in answer:
+            if isinstance(event, QueryResult):
+                yield _sse("done", event.model_dump(mode="json"))
+            else:
+                yield _sse("token", {"text": event})
+    except Exception:
+        # The status line has been sent, so the failure is reported in-band
+        yield _sse("error", {"detail": "Answer generation failed"})
+        raise
+
+
+@router.post("/query/stream")
+async def stream_rag_query(
+    query: Query,
+    usecase: Annotated[RAGQueryUseCase, Depends(get_rag_query_usecase)],
+) -> StreamingResponse:
+    """Execute a RAG query, streaming the answer as Server-Sent Events.
+
+    A ``sources`` event is sent as soon as the documents are retrieved,
+    followed by one ``token`` event per piece of the answer and a final
+    ``done`` event carrying the same body as ``POST /query``. If generation
+    fails midway, an ``error`` event ends the stream.
+    """
+    # Retrieval finishes before responding, so its errors get a status code
+    try:
+        sources, answer = await usecase.stream(
+            query_text=query.text, top_k=query.top_k, options=query.options
+        )
+    except IndexLagTimeout as e:
+        raise HTTPException(
+            status_code=503, detail="Index has not caught up with the write yet"
+        ) from e
+    except UnknownIndexSequence as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return StreamingResponse(
+        _sse_events(sources, answer),
+        media_type="text/event-stream",
+        # Keep proxies from buffering or caching the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,16 +1,49 @@
 """Document management use cases."""
 
+from collections.abc import AsyncIterator
 from uuid import UUID
 
 from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter
 from src.domain.document.repositories.document_repository import DocumentRepository
+from src.domain.document.services.document_index import DocumentIndex
+from src.usecase.document.indexing_queue import IndexingQueue
 
 
 class DocumentUseCase:
-    """Use case for document CRUD operations."""
-
-    def __init__(self, document_repository: DocumentRepository) -> None:
+    """Use case for document CRUD operations.
+
+    Search indexes passed in are updated after every write, before the write
+    returns. With an indexing queue, writes are instead queued for its
+    background workers and return once the document is stored.
+    """
+
+    def __init__(
+        self,
+        document_repository: DocumentRepository,
+        document_indexes: list[DocumentIndex] | None = None,
+        indexing_queue: IndexingQueue | None = None,
+    ) -> None:
         self._document_repository = document_repository
+        self._document_indexes = document_indexes or []
+        self._indexing_queue = indexing_queue
+
+    @property
+    def indexing_sequence(self) -> int | None:
+        """Sequence number of the latest queued index write, if indexing is queued.
+
+        A RAG query passing it as ``index_sequence`` sees every write made
+        before it was read.
+        """
+        return None if self._indexing_queue is None else self._indexing_queue.sequence
+
+    async def _index(self, documents: list[Document]) -> None:
+        if self._indexing_queue is not None:
+            await self._indexing_queue.add(documents)
+            return
+        for index in self._document_indexes:
+            await index.add(documents)
 
     async def create(self, title: str, content: str, source: str = "") -> Document:
         """Create and save a new document.
@@ -28,7 +61,41 @@ class DocumentUseCase:
             content=content,
             source=source,
         )
-        return await self._document_repository.save(document)
+        saved = await self._document_repository.save(document)
+        await self._index([saved])
+        return saved
+
+    async def create_many(self, documents: list[Document]) -> list[Document]:
+        """Save a batch of already validated documents.
+
+        Args:
+            documents: Documents to save
+
+        Returns:
+            The saved documents
+        """
+        saved = await self._document_repository.save_many(documents)
+        await self._index(saved)
+        return saved
+
+    async def upsert_many(self, documents: list[Document]) -> tuple[int, int]:
+        """Save a batch of documents, replacing those whose ID already exists.
+
+        Whether a document exists is read before the batch is saved. A
+        document repeated in the batch counts as an update from its second
+        occurrence on.
+
+        Args:
+            documents: Documents to save
+
+        Returns:
+            The numbers of documents inserted and updated
+        """
+        ids = {document.id for document in documents}
+        existing = await self._document_repository.find_existing(ids)
+        await self.create_many(documents)
+        inserted = len(ids - existing)
+        return inserted, len(documents) - inserted
 
     async def get(self, document_id: UUID) -> Document | None:
         """Get a document by ID.
@@ -41,6 +108,44 @@ class DocumentUseCase:
         """
         return await self._document_repository.find_by_id(document_id)
 
+    async def list_page(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: DocumentCursor | None = None,
+        document_filter: DocumentFilter | None = None,
+    ) -> tuple[list[Document], DocumentCursor | None]:
+        """List a page of documents and the cursor for the next page.
+
+        When a cursor is given, keyset pagination is used and offset is
+        ignored.
+
+        Args:
+            limit: Maximum number of documents to return
+            offset: Number of documents to skip (offset mode only)
+            cursor: Position after which to continue (keyset mode)
+            document_filter: Metadata conditions the listed documents must meet
+
+        Returns:
+            The page of documents and the cursor of the next page, or None
+            if this is the last page
+        """
+        # Fetch one extra document to know whether another page exists
+        if cursor is not None:
+            documents = await self._document_repository.find_after(
+                cursor, limit=limit + 1, document_filter=document_filter
+            )
+        else:
+            documents = await self._document_repository.find_all(
+                limit=limit + 1, offset=offset, document_filter=document_filter
+            )
+
+        page = documents[:limit]
+        next_cursor = None
+        if len(documents) > limit and page:
+            next_cursor = DocumentCursor.from_document(page[-1])
+        return page, next_cursor
+
     async def list(self, limit: int = 100, offset: int = 0) -> list[Document]:
         """List documents with pagination.
 
@@ -53,6 +158,33 @@ class DocumentUseCase:
         """
         return await self._document_repository.find_all(limit=limit, offset=offset)
 
+    def iter_all(self) -> AsyncIterator[Document]:
+        """Iterate over all documents without loading them all at once.
+
+        Returns:
+            Async iterator over documents in creation order
+        """
+        return self._document_repository.iter_all()
+
+    async def count(self, document_filter: DocumentFilter | None = None) -> int:
+        """Count all documents, or those matching a filter.
+
+        Args:
+            document_filter: Metadata conditions the counted documents must meet
+
+        Returns:
+            Number of documents
+        """
+        return await self._document_repository.count(document_filter)
+
+    async def stats(self) -> dict[str, int | float]:
+        """Report storage metrics of the document repository.
+
+        Returns:
+            Metric names mapped to their values
+        """
+        return await self._document_repository.stats()
+
     async def update(self, document_id: UUID, content: str) -> Document | None:
         """Update a document's content.
 
@@ -68,7 +200,9 @@ class DocumentUseCase:
             return None
 
         document.update_content(content)
-        return await self._document_repository.update(document)
+        updated = await self._document_repository.update(document)
+        await self._index([updated])
+        return updated
 
     async def delete(self, document_id: UUID) -> bool:
         """Delete a document.
@@ -79,7 +213,13 @@ class DocumentUseCase:
         Returns:
             True if deleted, False if not found
         """
-        return await self._document_repository.delete(document_id)
+        deleted = await self._document_repository.delete(document_id)
+        if deleted and self._indexing_queue is not None:
+            await self._indexing_queue.remove(document_id)
+        elif deleted:
+            for index in self._document_indexes:
+                await index.remove(document_id)
+        return deleted
 
     async def delete_all(self) -> int:
         """Delete all documents.
@@ -87,4 +227,10 @@ class DocumentUseCase:
         Returns:
             Number of documents deleted
         """
-        return await self._document_repository.delete_all()
+        count = await self._document_repository.delete_all()
+        if self._indexing_queue is not None:
+            await self._indexing_queue.clear()
+            return count
+        for index in self._document_indexes:
+            await index.clear()
+        return count
@@ -0,0 +1,226 @@
+"""Background indexing of document writes."""
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import Awaitable, Callable
+from typing import NamedTuple
+from uuid import UUID
+
+from src.domain.document.models.document import Document
+from src.domain.document.services.document_index import DocumentIndex
+
+
+class IndexLagTimeout(TimeoutError):
+    """The writes waited for were not indexed within the timeout."""
+
+
+class UnknownIndexSequence(ValueError):
+    """The sequence number waited for has not been assigned to a write."""
+
+
+class _Operation(NamedTuple):
+    sequence: int
+    document_id: UUID
+    document: Document | None  # None removes the document
+
+
+class IndexingQueue:
+    """Applies document writes to search indexes in background worker tasks.
+
+    Every write gets the next sequence number and is routed by document ID
+    to one of ``workers`` queues, so the writes of one document are applied
+    in order while different documents are indexed concurrently. A worker
+    takes whatever has queued up, up to ``max_batch_size`` writes, and
+    passes consecutive additions to each index as one batch. A queue holds
+    at most ``max_pending`` writes; enqueueing beyond that waits, pushing
+    back on writers when indexing falls behind.
+
+    ``indexed_sequence`` is the highest sequence number up to which every
+    write has been applied; ``wait_for`` waits until it reaches a given
+    write. A failing index does not stop the queue: the write counts as
+    applied and the failure is counted in ``failed``.
+    """
+
+    def __init__(
+        self,
+        indexes: list[DocumentIndex],
+        workers: int = 4,
+        max_pending: int = 10_000,
+        max_batch_size: int = 256,
+    ) -> None:
+        """Create a queue; workers start with the first write.
+
+        Args:
+            indexes: Indexes receiving the writes
+            workers: Number of worker tasks, i.e. writes indexed concurrently
+            max_pending: Writes queued per worker before enqueueing waits
+            max_batch_size: Writes taken from the queue per worker iteration
+        """
+        self.indexes = indexes
+        self._workers = max(workers, 1)
+        self._max_pending = max_pending
+        self._max_batch_size = max_batch_size
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queues: list[asyncio.Queue[_Operation]] = []
+        self._tasks: list[asyncio.Task[None]] = []
+        self.sequence = 0  # Last sequence number assigned
+        self.indexed_sequence = 0
+        self._applied: list[int] = []  # Heap of applied numbers past indexed_sequence
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._waiter_ids = itertools.count()
+        self.failed = 0
+        self.last_error = ""
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # First write, or the previous event loop is gone together with its
+        # workers and their queued writes
+        self._loop = loop
+        self.indexed_sequence = self.sequence
+        self._applied = []
+        self._waiters = []
+        self._queues = [asyncio.Queue(self._max_pending) for _ in range(self._workers)]
+        self._tasks = [loop.create_task(self._work(queue)) for queue in self._queues]
+
+    async def add(self, documents: list[Document]) -> int:
+        """Queue new or updated documents for indexing.
+
+        Returns:
+            The sequence number of the last queued write
+        """
+        for document in documents:
+            await self._put(document.id, document)
+        return self.sequence
+
+    async def remove(self, document_id: UUID) -> int:
+        """Queue the removal of a document.
+
+        Returns:
+            The sequence number of the removal
+        """
+        return await self._put(document_id, None)
+
+    async def _put(self, document_id: UUID, document: Document | None) -> int:
+        self._start()
+        self.sequence += 1
+        operation = _Operation(self.sequence, document_id, document)
+        await self._queues[document_id.int % self._workers].put(operation)
+        return operation.sequence
+
+    async def clear(self) -> int:
+        """Apply the queued writes, then clear every index.
+
+        Returns:
+            The sequence number of the clear
+        """
+        await self.join()
+        self.sequence += 1
+        sequence = self.sequence
+        await self._each_index(lambda index: index.clear())
+        self._complete(sequence)
+        return sequence
+
+    async def join(self) -> None:
+        """Wait until every queued write has been applied."""
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+
+    async def wait_for(self, sequence: int, timeout: float | None = None) -> None:
+        """Wait until the writes up to a sequence number are searchable.
+
+        Args:
+            sequence: Sequence number returned for a write
+            timeout: Maximum wait in seconds; None waits indefinitely
+
+        Raises:
+            UnknownIndexSequence: If the sequence number has not been assigned
+            IndexLagTimeout: If the writes are not applied within the timeout
+        """
+        if sequence <= self.indexed_sequence:
+            return
+        if sequence > self.sequence:
+            raise UnknownIndexSequence(
+                f"Sequence {sequence} has not been assigned; "
+                f"the latest write is {self.sequence}"
+            )
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (sequence, next(self._waiter_ids), future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except TimeoutError as e:
+            raise IndexLagTimeout(
+                f"Writes up to sequence {sequence} were not indexed within "
+                f"{timeout}s; indexed up to {self.indexed_sequence}"
+            ) from e
+
+    def stats(self) -> dict[str, int]:
+        """Return the queue depth and how far indexing lags behind writes."""
+        return {
+            "workers": self._workers,
+            "queue_depth": sum(queue.qsize() for queue in self._queues),
+            "sequence": self.sequence,
+            "indexed_sequence": self.indexed_sequence,
+            "lag": self.sequence - self.indexed_sequence,
+            "failed": self.failed,
+        }
+
+    async def close(self) -> None:
+        """Stop the workers, abandoning queued writes."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    async def _work(self, queue: "asyncio.Queue[_Operation]") -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self._max_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            await self._apply(batch)
+            for operation in batch:
+                self._complete(operation.sequence)
+                queue.task_done()
+
+    async def _apply(self, batch: list[_Operation]) -> None:
+        additions: dict[UUID, Document] = {}
+        for operation in batch:
+            if operation.document is not None:
+                # A later version of the same document replaces the earlier one
+                additions.pop(operation.document_id, None)
+                additions[operation.document_id] = operation.document
+                continue
+            if additions:
+                await self._add(list(additions.values()))
+                additions = {}
+            await self._remove(operation.document_id)
+        if additions:
+            await self._add(list(additions.values()))
+
+    async def _add(self, documents: list[Document]) -> None:
+        await self._each_index(lambda index: index.add(documents))
+
+    async def _remove(self, document_id: UUID) -> None:
+        await self._each_index(lambda index: index.remove(document_id))
+
+    async def _each_index(
+        self, operation: Callable[[DocumentIndex], Awaitable[None]]
+    ) -> None:
+        results = await asyncio.gather(
+            *(operation(index) for index in self.indexes), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.failed += 1
+                self.last_error = repr(result)
+
+    def _complete(self, sequence: int) -> None:
+        heapq.heappush(self._applied, sequence)
+        while self._applied and self._applied[0] == self.indexed_sequence + 1:
+            self.indexed_sequence = heapq.heappop(self._applied)
+        while self._waiters and self._waiters[0][0] <= self.indexed_sequence:
+            future = heapq.heappop(self._waiters)[2]
+            if not future.done():
+                future.set_result(None)
@@ -0,0 +1,137 @@
+"""Semantic cache of generated answers."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from src.domain.document.models.document import Document
+from src.domain.rag.models.query import QueryResult
+
+# Turns text into an embedding vector, e.g. AzureOpenAIClient.get_embeddings
+Embed = Callable[[str], Awaitable[list[float]]]
+Vector = np.ndarray[Any, np.dtype[np.float32]]
+
+
+def context_key(documents: list[Document]) -> Hashable:
+    """Return a key identifying the documents an answer was generated from.
+
+    It covers each document's ID, version and the exact content put in the
+    prompt (passages differ between queries under chunking), but not their
+    order.
+    """
+    return frozenset(
+        (document.id, document.updated_at, hash(document.content))
+        for document in documents
+    )
+
+
+class _Entry(NamedTuple):
+    vector: Vector
+    context: Hashable
+    result: QueryResult
+    expires_at: float
+
+
+class AnswerCache:
+    """Answers of earlier queries, reused for paraphrases with the same context.
+
+    A query hits when an unexpired entry was generated from the same
+    retrieved documents (see context_key) and its query embedding has a
+    cosine similarity of at least ``threshold`` with the new one. Entries
+    are grouped by context, so a lookup compares only against the queries
+    answered from the same documents, in one matrix-vector product.
+    """
+
+    def __init__(
+        self,
+        embed: Embed,
+        threshold: float = 0.95,
+        max_entries: int = 1000,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            embed: Turns query text into an embedding vector
+            threshold: Minimum cosine similarity between the queries
+            max_entries: Maximum number of answers kept, least recently
+                used evicted first
+            ttl_seconds: Seconds an answer stays reusable
+            clock: Source of the current time in seconds
+        """
+        self._embed = embed
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._by_context: dict[Hashable, list[int]] = {}
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def embed(self, query_text: str) -> Vector:
+        """Return the unit-length embedding of a query."""
+        vector = np.asarray(await self._embed(query_text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, vector: Vector, documents: list[Document]) -> QueryResult | None:
+        """Return the cached result for a similar query on the same documents."""
+        context = context_key(documents)
+        entry_ids = self._by_context.get(context, [])
+        now = self._clock()
+        for entry_id in [i for i in entry_ids if self._entries[i].expires_at <= now]:
+            self._remove(entry_id)
+        entry_ids = self._by_context.get(context, [])
+        if entry_ids:
+            vectors = np.stack([self._entries[i].vector for i in entry_ids])
+            similarities = vectors @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self._threshold:
+                entry_id = entry_ids[best]
+                self._entries.move_to_end(entry_id)
+                self.hits += 1
+                return self._entries[entry_id].result
+        self.misses += 1
+        return None
+
+    def put(
+        self, vector: Vector, documents: list[Document], result: QueryResult
+    ) -> None:
+        """Store the result generated for a query from the documents."""
+        if self._max_entries <= 0:
+            return
+        context = context_key(documents)
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _Entry(
+            vector, context, result, self._clock() + self._ttl
+        )
+        self._by_context.setdefault(context, []).append(entry_id)
+        while len(self._entries) > self._max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        entry_ids = self._by_context[entry.context]
+        entry_ids.remove(entry_id)
+        if not entry_ids:
+            del self._by_context[entry.context]
+
+    def stats(self) -> dict[str, int | float]:
+        """Return hit and miss counters for sizing the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,10 +1,29 @@
 """RAG query execution use case."""
 
+from collections.abc import AsyncIterator
 from typing import Any
 
-from src.domain.rag.models.query import Query, QueryResult
+from src.domain.document.models.document import Document
+from src.domain.rag.models.query import (
+    ContextUsage,
+    Query,
+    QueryResult,
+    RetrievalOptions,
+)
 from src.domain.rag.services.rag_strategy import RAGStrategy
+from src.domain.rag.services.reranker import Reranker
+from src.infrastructure.algorithms.caching_rag_strategy import normalize_query
+from src.infrastructure.algorithms.context_packer import (
+    SEPARATOR,
+    ContextPacker,
+    format_document,
+)
 from src.infrastructure.external.azure_openai_client import AzureOpenAIClient
+from src.usecase.document.indexing_queue import IndexingQueue
+from src.usecase.rag.answer_cache import AnswerCache
+from src.usecase.rag.single_flight import SingleFlight
+
+_NO_DOCUMENTS_ANSWER = "No relevant documents found to answer your question."
 
 
 class RAGQueryUseCase:
@@ -14,89 +33,259 @@ class RAGQueryUseCase:
         self,
         rag_strategy: RAGStrategy,
         openai_client: AzureOpenAIClient,
+        indexing_queue: IndexingQueue | None = None,
+        index_wait_timeout: float | None = 10.0,
+        reranker: Reranker | None = None,
+        rerank_depth: int = 50,
+        answer_cache: AnswerCache | None = None,
+        single_flight: SingleFlight[QueryResult] | None = None,
+        context_packer: ContextPacker | None = None,
     ) -> None:
         """Initialize the RAG query use case.
 
         Args:
             rag_strategy: Strategy for retrieving documents
             openai_client: Azure OpenAI client for answer generation
+            indexing_queue: Queue indexing document writes in the background,
+                if any
+            index_wait_timeout: Longest wait in seconds for a query's
+                ``index_sequence``; None waits indefinitely
+            reranker: Reranks the retrieved candidates of queries asking for
+                it with ``options.rerank``; None ignores that option
+            rerank_depth: Candidates retrieved for reranking unless the query
+                sets ``options.rerank_depth``
+            answer_cache: Cache reusing the answers of similar queries on the
+                same documents, if any
+            single_flight: Shared by the use case instances so concurrent
+                identical queries run once; None runs every query
+            context_packer: Fits the retrieved documents into the prompt's
+                token budget; None puts every document in whole
         """
         self._rag_strategy = rag_strategy
         self._openai_client = openai_client
+        self._indexing_queue = indexing_queue
+        self._index_wait_timeout = index_wait_timeout
+        self._reranker = reranker
+        self._rerank_depth = rerank_depth
+        self._answer_cache = answer_cache
+        self._single_flight = single_flight
+        self._context_packer = context_packer
 
-    async def execute(self, query_text: str, top_k: int = 5) -> QueryResult:
+    async def execute(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
+    ) -> QueryResult:
         """Execute a RAG query by orchestrating retrieval and generation.
 
         This method:
-        1. Validates the query
+        1. Validates the query and, if asked, waits for queued index writes
         2. Retrieves relevant documents using the strategy
-        3. Generates an answer using Azure OpenAI
-        4. Returns the complete result
+        3. If asked, reranks a deeper candidate list down to top_k
+        4. Reuses the answer to a similar query on the same documents if one
+           is cached, or else generates an answer using Azure OpenAI from
+           the documents packed into the context's token budget
+        5. Returns the complete result
+
+        While an identical query (same normalized text, top_k, options and
+        strategy) is in flight, the query awaits its result instead.
 
         Args:
             query_text: The query text
             top_k: Number of relevant documents to retrieve (1-100)
+            options: Per-query search settings passed to the strategy
 
         Returns:
             The query result with answer and sources
+
+        Raises:
+            UnknownIndexSequence: If ``options.index_sequence`` has not been
+                assigned
+            IndexLagTimeout: If the writes up to ``options.index_sequence``
+                are not indexed in time
         """
         # Create query object with validation
-        query = Query(text=query_text, top_k=top_k)
+        query = Query(
+            text=query_text, top_k=top_k, options=options or RetrievalOptions()
+        )
+        if self._single_flight is None:
+            return await self._execute(query)
 
-        # Step 1: Retrieve documents using the strategy
-        documents = await self._rag_strategy.retrieve_documents(
-            query.text,
+        key = (
+            normalize_query(query.text),
             query.top_k,
+            type(self._rag_strategy).__qualname__,
+            query.options.model_dump_json(),
         )
+        result = await self._single_flight.run(key, lambda: self._execute(query))
+        if result.query != query:
+            # Shared with a query differing only in case or spacing
+            result = result.model_copy(update={"query": query})
+        return result
+
+    async def stream(
+        self,
+        query_text: str,
+        top_k: int = 5,
+        options: RetrievalOptions | None = None,
+    ) -> tuple[list[str], AsyncIterator[str | QueryResult]]:
+        """Execute a RAG query, streaming the answer as it is generated.
+
+        Runs the same steps as execute, but returns once the documents are
+        retrieved; the answer is then generated while the returned iterator
+        is consumed. A cached answer is yielded as one piece. Streamed
+        queries are not coalesced, since each caller needs its own stream.
+
+        Args:
+            query_text: The query text
+            top_k: Number of relevant documents to retrieve (1-100)
+            options: Per-query search settings passed to the strategy
 
-        # Step 2: Generate answer using Azure OpenAI
+        Returns:
+            The sources, and an iterator yielding pieces of the answer text
+            followed by the complete query result
+
+        Raises:
+            UnknownIndexSequence: If ``options.index_sequence`` has not been
+                assigned
+            IndexLagTimeout: If the writes up to ``options.index_sequence``
+                are not indexed in time
+        """
+        query = Query(
+            text=query_text, top_k=top_k, options=options or RetrievalOptions()
+        )
+        documents = await self._retrieve(query)
+        return self._sources(query, documents), self._stream_answer(query, documents)
+
+    async def _stream_answer(
+        self, query: Query, documents: list[Document]
+    ) -> AsyncIterator[str | QueryResult]:
+        query_vector = None
+        if self._answer_cache is not None and documents:
+            query_vector = await self._answer_cache.embed(query.text)
+            cached = self._answer_cache.get(query_vector, documents)
+            if cached is not None:
+                yield cached.answer
+                yield cached.model_copy(update={"query": query, "cached": True})
+                return
+
+        usage = None
         if not documents:
-            answer = "No relevant documents found to answer your question."
+            answer = _NO_DOCUMENTS_ANSWER
+            yield answer
         else:
-            # Create context from documents
-            context_parts = []
-            for doc in documents:
-                context_parts.append(f"Title: {doc.title}\nContent: {doc.content}")
-
-            context = "\n\n---\n\n".join(context_parts)
-
-            # Create prompt for Azure OpenAI
-            system_prompt = (
-                "You are a helpful assistant that answers questions based on the "
-                "provided context. If the answer cannot be found in the context, "
-                "say so clearly. Be concise and accurate in your responses."
-            )
+            context, usage = self._context(query, documents)
+            pieces = []
+            async for piece in self._openai_client.stream_chat_completion(
+                self._messages(query, context), None, 0.3, 500
+            ):
+                pieces.append(piece)
+                yield piece
+            answer = "".join(pieces)
 
-            user_prompt = f"""Context:
-{context}
-
-Question: {query_text}
+        result = QueryResult(
+            query=query,
+            answer=answer.strip(),
+            sources=self._sources(query, documents),
+            context=usage,
+        )
+        if self._answer_cache is not None and query_vector is not None:
+            self._answer_cache.put(query_vector, documents, result)
+        yield result
 
-Please provide a comprehensive answer based on the context above."""
+    async def _execute(self, query: Query) -> QueryResult:
+        documents = await self._retrieve(query)
 
-            messages: list[Any] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ]
+        # Step 2: Reuse the answer to a paraphrase on the same documents
+        query_vector = None
+        if self._answer_cache is not None and documents:
+            query_vector = await self._answer_cache.embed(query.text)
+            cached = self._answer_cache.get(query_vector, documents)
+            if cached is not None:
+                return cached.model_copy(update={"query": query, "cached": True})
 
-            # Generate answer
+        # Step 3: Generate answer using Azure OpenAI
+        usage = None
+        if not documents:
+            answer = _NO_DOCUMENTS_ANSWER
+        else:
+            context, usage = self._context(query, documents)
             answer = await self._openai_client.get_chat_completion(
-                messages,
+                self._messages(query, context),
                 None,  # model
                 0.3,  # temperature - Lower for more factual responses
                 500,  # max_tokens
             )
 
-        # Step 3: Extract sources from documents
+        result = QueryResult(
+            query=query,
+            answer=answer.strip(),
+            sources=self._sources(query, documents),
+            context=usage,
+        )
+        if self._answer_cache is not None and query_vector is not None:
+            self._answer_cache.put(query_vector, documents, result)
+        return result
+
+    async def _retrieve(self, query: Query) -> list[Document]:
+        # Writes indexed in the background are searchable once applied
+        if query.options.index_sequence and self._indexing_queue is not None:
+            await self._indexing_queue.wait_for(
+                query.options.index_sequence, self._index_wait_timeout
+            )
+
+        # Step 1: Retrieve documents using the strategy, more of them when
+        # they are reranked
+        reranker = self._reranker if query.options.rerank else None
+        depth = query.top_k
+        if reranker is not None:
+            depth = max(depth, query.options.rerank_depth or self._rerank_depth)
+        documents = await self._rag_strategy.retrieve_documents(
+            query.text,
+            depth,
+            query.options,
+        )
+        if reranker is not None:
+            documents = await reranker.rerank(
+                query.text, documents, query.top_k, query.options
+            )
+        return documents
+
+    def _context(
+        self, query: Query, documents: list[Document]
+    ) -> tuple[str, ContextUsage | None]:
+        # Create context from documents, within the token budget if any
+        if self._context_packer is not None:
+            return self._context_packer.pack(query.text, documents)
+        return SEPARATOR.join(format_document(doc) for doc in documents), None
+
+    def _messages(self, query: Query, context: str) -> list[Any]:
+        # Create prompt for Azure OpenAI
+        system_prompt = (
+            "You are a helpful assistant that answers questions based on the "
+            "provided context. If the answer cannot be found in the context, "
+            "say so clearly. Be concise and accurate in your responses."
+        )
+
+        user_prompt = f"""Context:
+{context}
+
+Question: {query.text}
+
+Please provide a comprehensive answer based on the context above."""
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _sources(self, query: Query, documents: list[Document]) -> list[str]:
+        # Step 4: Extract sources from documents
         sources = []
         for doc in documents:
             if doc.source:
                 sources.append(doc.source)
             else:
                 sources.append(f"{doc.title} (ID: {doc.id})")
-
-        return QueryResult(
-            query=query,
-            answer=answer.strip(),
-            sources=sources[: query.top_k],  # Limit sources to top_k
-        )
+        return sources[: query.top_k]  # Limit sources to top_k
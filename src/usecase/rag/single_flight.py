@@ -0,0 +1,56 @@
+"""Coalescing of identical concurrent calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class SingleFlight[T]:
+    """Runs at most one call per key at a time; concurrent callers share it.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task instead of starting their own. Every
+    caller awaits it through ``asyncio.shield``, so a cancelled caller (e.g.
+    a client that disconnected) stops waiting without cancelling the work
+    the others depend on. The key is released as soon as the work finishes,
+    so results are never reused by later calls.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Task[T]] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of work(), shared with concurrent calls for key.
+
+        Args:
+            key: Identifies calls that can share one result
+            work: Starts the call; invoked only if none is in flight for key
+
+        Returns:
+            The result of the in-flight or newly started call
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark a failure as retrieved even if every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        """Return how many calls ran and how many joined a running one."""
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,61 @@
+import pytest
+
+from src.domain.document.models.chunk import Chunk, chunk_id, join_passages
+from src.domain.document.models.document import Document
+from src.domain.document.services.chunker import Chunker
+
+
+def words(count: int, start: int = 0) -> str:
+    return " ".join(f"w{i}" for i in range(start, start + count))
+
+
+class TestChunker:
+    def test_short_document_is_one_chunk(self):
+        document = Document(title="T", content="  A short body.  ")
+
+        chunks = Chunker(max_tokens=10, overlap_tokens=2).split(document)
+
+        assert len(chunks) == 1
+        assert document.content[chunks[0].start : chunks[0].end] == "A short body."
+        assert chunks[0].document_id == document.id
+
+    def test_windows_overlap(self):
+        document = Document(title="T", content=words(10))
+
+        chunks = Chunker(max_tokens=4, overlap_tokens=1).split(document)
+
+        texts = [document.content[c.start : c.end] for c in chunks]
+        assert texts == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"]
+        assert [c.position for c in chunks] == [0, 1, 2]
+
+    def test_prefers_sentence_ends(self):
+        document = Document(title="T", content="a b c. d e f g h i.")
+
+        chunks = Chunker(max_tokens=5, overlap_tokens=0).split(document)
+
+        texts = [document.content[c.start : c.end] for c in chunks]
+        assert texts == ["a b c.", "d e f g h", "i."]
+
+    def test_invalid_overlap(self):
+        with pytest.raises(ValueError, match="overlap_tokens"):
+            Chunker(max_tokens=4, overlap_tokens=4)
+
+
+class TestChunk:
+    def test_id_is_deterministic(self):
+        document = Document(title="T", content="body")
+        chunk = Chunk(document_id=document.id, position=3, start=0, end=4)
+
+        assert chunk.id == chunk_id(document.id, 3)
+        assert chunk.id != chunk_id(document.id, 2)
+
+    def test_join_passages_merges_overlaps(self):
+        content = "0123456789abcdef"
+        document = Document(title="T", content=content)
+
+        def chunk(start: int, end: int) -> Chunk:
+            return Chunk(document_id=document.id, position=0, start=start, end=end)
+
+        joined = join_passages(content, [chunk(12, 16), chunk(0, 4), chunk(2, 6)])
+
+        assert joined == "012345\n...\ncdef"
@@ -0,0 +1,32 @@
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+
+
+class TestDocumentCursor:
+    def test_encode_decode_round_trip(self):
+        cursor = DocumentCursor(
+            created_at=datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC),
+            document_id=UUID("123e4567-e89b-12d3-a456-426614174000"),
+        )
+
+        decoded = DocumentCursor.decode(cursor.encode())
+
+        assert decoded == cursor
+
+    def test_from_document(self):
+        document = Document(title="Test", content="Content")
+
+        cursor = DocumentCursor.from_document(document)
+
+        assert cursor.created_at == document.created_at
+        assert cursor.document_id == document.id
+
+    @pytest.mark.parametrize("token", ["not-a-cursor", "", "!!!", "YWJj"])
+    def test_decode_invalid_token_raises_error(self, token):
+        with pytest.raises(ValueError, match="Invalid document cursor"):
+            DocumentCursor.decode(token)
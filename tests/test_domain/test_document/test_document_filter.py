@@ -0,0 +1,56 @@
+from datetime import UTC, datetime
+
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_filter import DocumentFilter, prefix_end
+
+
+def make_document(**fields):
+    defaults = {
+        "title": "Python tips",
+        "content": "Content",
+        "source": "wiki",
+        "created_at": datetime(2024, 3, 1, tzinfo=UTC),
+        "updated_at": datetime(2024, 3, 5, tzinfo=UTC),
+    }
+    return Document(**{**defaults, **fields})
+
+
+class TestDocumentFilter:
+    def test_empty_filter_matches_everything(self):
+        document_filter = DocumentFilter()
+
+        assert document_filter.is_empty()
+        assert document_filter.matches(make_document())
+
+    def test_all_conditions_must_match(self):
+        document_filter = DocumentFilter(source="wiki", title_prefix="Py")
+
+        assert not document_filter.is_empty()
+        assert document_filter.matches(make_document())
+        assert not document_filter.matches(make_document(source="blog"))
+        assert not document_filter.matches(make_document(title="python tips"))
+
+    def test_time_ranges_are_half_open(self):
+        document_filter = DocumentFilter(
+            created_after=datetime(2024, 3, 1, tzinfo=UTC),
+            created_before=datetime(2024, 4, 1, tzinfo=UTC),
+        )
+
+        assert document_filter.matches(make_document())
+        assert not document_filter.matches(
+            make_document(created_at=datetime(2024, 4, 1, tzinfo=UTC))
+        )
+
+    def test_naive_bounds_are_utc(self):
+        document_filter = DocumentFilter(updated_before=datetime(2024, 3, 5, 0, 0, 1))
+
+        assert document_filter.updated_before is not None
+        assert document_filter.updated_before.tzinfo == UTC
+        assert document_filter.matches(make_document())
+
+
+def test_prefix_end_bounds_every_string_with_the_prefix():
+    assert prefix_end("abc") == "abd"
+    assert prefix_end("a" + chr(0x10FFFF)) == "b"
+    assert prefix_end(chr(0x10FFFF)) is None
+    assert "abc\U0010ffff" < prefix_end("abc") <= "abd"
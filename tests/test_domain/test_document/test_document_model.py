@@ -76,3 +76,11 @@ class TestDocument:
 
         assert document.content == "New content"
         assert document.updated_at > original_updated_at
+
+    def test_content_hash_depends_only_on_content(self):
+        first = Document(title="First", content="Same body", source="a.txt")
+        second = Document(title="Second", content="Same body", source="b.txt")
+        other = Document(title="First", content="Other body", source="a.txt")
+
+        assert first.content_hash == second.content_hash
+        assert first.content_hash != other.content_hash
@@ -0,0 +1,80 @@
+from datetime import UTC, datetime, timedelta, timezone
+from uuid import UUID
+
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_record import (
+    DocumentRecord,
+    datetime_to_micros,
+    micros_to_datetime,
+)
+
+
+class TestDocumentRecord:
+    def test_round_trip(self):
+        document = Document(
+            id=UUID("123e4567-e89b-12d3-a456-426614174000"),
+            title="Test Document",
+            content="This is test content",
+            source="test.pdf",
+            created_at=datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=UTC),
+            updated_at=datetime(2024, 1, 2, 12, 0, 0, tzinfo=UTC),
+        )
+
+        record = DocumentRecord.from_document(document)
+
+        assert record.id == document.id.int
+        assert record.to_document() == document
+
+    def test_to_document_behaves_like_validated_document(self):
+        document = Document(title="Test Document", content="This is test content")
+        converted = DocumentRecord.from_document(document).to_document()
+
+        assert converted.model_dump() == document.model_dump()
+        assert converted.model_dump_json() == document.model_dump_json()
+        assert (
+            converted.model_fields_set
+            == Document(**document.model_dump()).model_fields_set
+        )
+
+        converted.update_content("Updated content")
+        assert converted.content == "Updated content"
+
+    def test_sources_are_interned(self):
+        first = DocumentRecord(1, "A", "Content", "".join(["shared", ".pdf"]), 0, 0)
+        second = DocumentRecord(2, "B", "Content", "".join(["shared", ".pdf"]), 0, 0)
+
+        assert first.source is second.source
+
+    def test_to_document_skips_validation(self):
+        # Records hold trusted data, so no validator runs on conversion
+        record = DocumentRecord(1, "", "", "", 0, 0)
+
+        document = record.to_document()
+
+        assert document.title == ""
+        assert document.id == UUID(int=1)
+
+    def test_record_has_no_instance_dict(self):
+        record = DocumentRecord(1, "Title", "Content", "", 0, 0)
+
+        assert not hasattr(record, "__dict__")
+
+
+class TestMicrosConversion:
+    def test_round_trip(self):
+        value = datetime(2024, 5, 6, 7, 8, 9, 101112, tzinfo=UTC)
+
+        assert micros_to_datetime(datetime_to_micros(value)) == value
+
+    def test_naive_datetime_is_treated_as_utc(self):
+        naive = datetime(2024, 1, 1, 12, 0, 0)
+
+        assert datetime_to_micros(naive) == datetime_to_micros(
+            naive.replace(tzinfo=UTC)
+        )
+
+    def test_preserves_ordering_across_timezones(self):
+        earlier = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=9)))
+        later = datetime(2024, 1, 1, 4, 0, 0, tzinfo=UTC)
+
+        assert datetime_to_micros(earlier) < datetime_to_micros(later)
@@ -1,7 +1,7 @@
 import pytest
 from pydantic import ValidationError
 
-from src.domain.rag.models.query import Query, QueryResult
+from src.domain.rag.models.query import Query, QueryResult, RetrievalOptions
 
 
 class TestQuery:
@@ -10,6 +10,7 @@ class TestQuery:
 
         assert query.text == "What is RAG?"
         assert query.top_k == 5
+        assert query.options == RetrievalOptions()
 
     def test_create_query_with_all_fields(self):
         query = Query(
@@ -20,6 +21,14 @@ class TestQuery:
         assert query.text == "What is RAG?"
         assert query.top_k == 10
 
+    def test_retrieval_options(self):
+        query = Query.model_validate({"text": "What is RAG?", "options": {"nprobe": 4}})
+
+        assert query.options.nprobe == 4
+
+        with pytest.raises(ValidationError):
+            Query(text="What is RAG?", options=RetrievalOptions(nprobe=0))
+
     def test_empty_text_raises_error(self):
         with pytest.raises(ValidationError) as exc_info:
             Query(text="")
@@ -1,9 +1,11 @@
 """Mock OpenAI client for testing."""
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 from src.infrastructure.config.settings import Settings
 from src.infrastructure.external.azure_openai_client import AzureOpenAIClient
+from src.infrastructure.external.embedding_cache import EmbeddingCache
 
 
 class MockOpenAIClient(AzureOpenAIClient):
@@ -16,6 +18,7 @@ class MockOpenAIClient(AzureOpenAIClient):
             azure_openai_endpoint="https://mock.openai.azure.com/",
             azure_search_endpoint="https://mock.search.windows.net",
         )
+        self.embedding_cache = EmbeddingCache()
 
     async def get_chat_completion(
         self,
@@ -41,6 +44,18 @@ class MockOpenAIClient(AzureOpenAIClient):
             f"{user_message[:50]}..."
         )
 
+    async def stream_chat_completion(
+        self,
+        messages: list[Any],
+        _model: str | None = None,
+        _temperature: float = 0.7,
+        _max_tokens: int = 1000,
+    ) -> AsyncIterator[str]:
+        """Stream the mock chat completion word by word."""
+        answer = await self.get_chat_completion(messages)
+        for i, word in enumerate(answer.split(" ")):
+            yield f" {word}" if i else word
+
     async def get_embeddings(
         self,
         _text: str,
@@ -49,3 +64,11 @@ class MockOpenAIClient(AzureOpenAIClient):
         """Return mock embeddings."""
         # Return a simple mock embedding vector
         return [0.1, 0.2, 0.3, 0.4, 0.5]
+
+    async def get_embeddings_batch(
+        self,
+        texts: list[str],
+        _model: str | None = None,
+    ) -> list[list[float]]:
+        """Return one mock embedding per text."""
+        return [[0.1, 0.2, 0.3, 0.4, 0.5] for _ in texts]
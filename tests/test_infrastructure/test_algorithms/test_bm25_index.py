@@ -0,0 +1,106 @@
+from uuid import uuid4
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.bm25_index import BM25Index, tokenize
+
+
+def make_document(title: str, content: str) -> Document:
+    return Document(title=title, content=content)
+
+
+class TestBM25Index:
+    @pytest.fixture
+    def documents(self):
+        return [
+            make_document("Python Programming", "Python is a programming language."),
+            make_document("Snakes", "The python is a large snake."),
+            make_document("Cooking", "Pasta recipes for a quick dinner."),
+        ]
+
+    @pytest.fixture
+    async def index(self, documents):
+        index = BM25Index()
+        await index.add(documents)
+        return index
+
+    def test_tokenize_drops_stop_words(self):
+        assert tokenize("What is the Python language?") == ["python", "language"]
+
+    async def test_ranks_by_relevance(self, index, documents):
+        results = index.search("python programming", top_k=5)
+
+        assert [document_id for document_id, _ in results] == [
+            documents[0].id,
+            documents[1].id,
+        ]
+        assert results[0][1] > results[1][1] > 0
+
+    async def test_allowed_documents_keep_their_scores(self, index, documents):
+        unrestricted = dict(index.search("python programming", top_k=5))
+
+        results = index.search("python programming", 5, allowed={documents[1].id})
+
+        assert results == [(documents[1].id, unrestricted[documents[1].id])]
+        assert index.search("python", 5, allowed={documents[2].id}) == []
+        assert index.search("python", 5, allowed=set()) == []
+
+    async def test_top_k_limits_results(self, index):
+        results = index.search("python", top_k=1)
+
+        assert len(results) == 1
+
+    async def test_no_matching_terms(self, index):
+        assert index.search("quantum chromodynamics") == []
+        assert index.search("what is the") == []
+
+    async def test_update_replaces_previous_version(self, index, documents):
+        documents[2].update_content("Python snippets for the kitchen.")
+        await index.add([documents[2]])
+
+        assert len(index) == 3
+        assert documents[2].id in [d for d, _ in index.search("python", top_k=5)]
+        assert index.search("pasta") == []
+
+    async def test_remove(self, index, documents):
+        await index.remove(documents[0].id)
+        await index.remove(uuid4())
+
+        assert len(index) == 2
+        assert [d for d, _ in index.search("python", top_k=5)] == [documents[1].id]
+
+    async def test_compaction_matches_fresh_index(self, documents):
+        other = make_document("Other", "Unrelated python text")
+        index = BM25Index(compaction_ratio=0.2)
+        await index.add(documents)
+        await index.add([other])
+        await index.remove(documents[2].id)  # exceeds the ratio and compacts
+
+        fresh = BM25Index()
+        await fresh.add([documents[0], documents[1], other])
+
+        results = index.search("python snake", top_k=5)
+        expected = fresh.search("python snake", top_k=5)
+        assert [d for d, _ in results] == [d for d, _ in expected]
+        assert [s for _, s in results] == pytest.approx([s for _, s in expected])
+        assert index.search("pasta") == []
+
+    async def test_clear(self, index):
+        await index.clear()
+
+        assert len(index) == 0
+        assert index.search("python") == []
+
+    async def test_load(self, documents):
+        async def source():
+            for document in documents:
+                yield document
+
+        index = BM25Index()
+        assert not index.loaded
+
+        await index.load(source(), batch_size=2)
+
+        assert index.loaded
+        assert len(index) == 3
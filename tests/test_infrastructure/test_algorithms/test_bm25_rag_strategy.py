@@ -0,0 +1,51 @@
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_filter import DocumentFilter
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.bm25_index import BM25Index
+from src.infrastructure.algorithms.bm25_rag_strategy import BM25RAGStrategy
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+from src.usecase.document.document_usecase import DocumentUseCase
+
+
+class TestBM25RAGStrategy:
+    async def test_loads_existing_documents_on_first_query(self):
+        repository = InMemoryDocumentRepository()
+        python = Document(title="Python", content="Python is a programming language.")
+        cooking = Document(title="Cooking", content="Pasta recipes for dinner.")
+        await repository.save_many([python, cooking])
+        strategy = BM25RAGStrategy(repository, BM25Index())
+
+        documents = await strategy.retrieve_documents("What is Python?", top_k=5)
+
+        assert documents == [python]
+
+    async def test_follows_writes_through_the_usecase(self):
+        repository = InMemoryDocumentRepository()
+        index = BM25Index()
+        usecase = DocumentUseCase(repository, [index])
+        strategy = BM25RAGStrategy(repository, index)
+        assert await strategy.retrieve_documents("pasta") == []
+
+        created = await usecase.create("Cooking", "Pasta recipes for dinner.")
+        assert await strategy.retrieve_documents("pasta") == [created]
+
+        await usecase.update(created.id, "Soup recipes for dinner.")
+        assert await strategy.retrieve_documents("pasta") == []
+        assert [d.id for d in await strategy.retrieve_documents("soup")] == [created.id]
+
+        await usecase.delete(created.id)
+        assert await strategy.retrieve_documents("soup") == []
+
+    async def test_filter_is_applied_before_ranking(self):
+        repository = InMemoryDocumentRepository()
+        manual = Document(title="Python", content="Python python.", source="manual")
+        blog = Document(title="Python", content="A python post.", source="blog")
+        await repository.save_many([manual, blog])
+        strategy = BM25RAGStrategy(repository, BM25Index())
+        options = RetrievalOptions(filter=DocumentFilter(source="blog"))
+
+        documents = await strategy.retrieve_documents("python", 1, options)
+
+        assert documents == [blog]
@@ -0,0 +1,98 @@
+"""Tests for CachingRAGStrategy."""
+
+import asyncio
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.bm25_index import BM25Index
+from src.infrastructure.algorithms.caching_rag_strategy import CachingRAGStrategy
+from src.infrastructure.algorithms.mock_rag_strategy import MockRAGStrategy
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+
+
+class CountingStrategy(MockRAGStrategy):
+    """Mock strategy counting its retrievals."""
+
+    def __init__(self, repository):
+        super().__init__(repository)
+        self.calls = 0
+
+    async def retrieve_documents(self, query_text, top_k=5, options=None):
+        self.calls += 1
+        return await super().retrieve_documents(query_text, top_k, options)
+
+
+@pytest.fixture
+async def repository():
+    repository = InMemoryDocumentRepository()
+    await repository.save(Document(title="First", content="Content"))
+    return repository
+
+
+async def test_repeated_queries_are_served_from_the_cache(repository):
+    strategy = CountingStrategy(repository)
+    cache = CachingRAGStrategy(strategy, repository)
+
+    first = await cache.retrieve_documents("What is  RAG?", 3)
+    second = await cache.retrieve_documents("what is rag?", 3)
+    await cache.retrieve_documents("what is rag?", 4)
+    await cache.retrieve_documents("what is rag?", 3, RetrievalOptions(nprobe=2))
+
+    assert second == first
+    assert strategy.calls == 3
+    assert cache.stats()["hits"] == 1
+
+
+async def test_writes_invalidate_the_cache(repository):
+    strategy = CountingStrategy(repository)
+    index = BM25Index()
+    cache = CachingRAGStrategy(strategy, repository, [index])
+
+    await cache.retrieve_documents("query")
+    added = await repository.save(Document(title="Second", content="Content"))
+    documents = await cache.retrieve_documents("query")
+    await index.add([added])
+    await cache.retrieve_documents("query")
+
+    assert added in documents
+    assert strategy.calls == 3
+    assert cache.stats()["invalidations"] == 2
+
+
+async def test_results_overlapping_a_write_are_not_stored(repository):
+    strategy = CountingStrategy(repository)
+    cache = CachingRAGStrategy(strategy, repository)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_retrieve(query_text, top_k=5, options=None):
+        started.set()
+        await release.wait()
+        return await CountingStrategy.retrieve_documents(
+            strategy, query_text, top_k, options
+        )
+
+    strategy.retrieve_documents = slow_retrieve  # type: ignore[method-assign]
+    pending = asyncio.create_task(cache.retrieve_documents("query"))
+    await started.wait()
+    await repository.save(Document(title="Second", content="Content"))
+    release.set()
+    await pending
+
+    assert cache.stats()["entries"] == 0
+
+
+async def test_least_recently_used_results_are_evicted(repository):
+    strategy = CountingStrategy(repository)
+    cache = CachingRAGStrategy(strategy, repository, max_entries=2)
+
+    for query_text in ["a", "b", "a", "c", "a", "b"]:
+        await cache.retrieve_documents(query_text)
+
+    # "b" was evicted by "c"; "a" stayed because it was used again
+    assert strategy.calls == 4
+    assert cache.stats()["entries"] == 2
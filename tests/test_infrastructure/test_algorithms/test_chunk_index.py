@@ -0,0 +1,214 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.domain.document.models.chunk import chunk_id
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_filter import DocumentFilter
+from src.domain.document.services.chunker import Chunker
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.bm25_index import BM25Index
+from src.infrastructure.algorithms.bm25_rag_strategy import BM25RAGStrategy
+from src.infrastructure.algorithms.chunk_index import ChunkIndex
+from src.infrastructure.algorithms.hybrid_rag_strategy import HybridRAGStrategy
+from src.infrastructure.algorithms.vector_index import VectorIndex
+from src.infrastructure.algorithms.vector_rag_strategy import VectorRAGStrategy
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+from src.usecase.document.document_usecase import DocumentUseCase
+from src.usecase.document.indexing_queue import IndexingQueue
+
+LONG_CONTENT = (
+    "Pasta is boiled in salted water. "
+    "Rivers flow into the sea. "
+    "Mountains are tall and cold. "
+    "Python is a programming language."
+)
+
+
+async def keyword_embedding(text: str) -> list[float]:
+    lowered = text.lower()
+    return [float(lowered.count(word)) for word in ("python", "pasta")] + [0.1]
+
+
+class PausableChunkIndex(ChunkIndex):
+    """Chunk index whose writes wait until released."""
+
+    def __init__(self, indexes, chunker) -> None:
+        super().__init__(indexes, chunker)
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def add(self, documents: list[Document]) -> None:
+        await self.release.wait()
+        await super().add(documents)
+
+
+class TestChunkIndex:
+    @pytest.fixture
+    def document(self):
+        return Document(title="Notes", content=LONG_CONTENT)
+
+    @pytest.fixture
+    def index(self):
+        return ChunkIndex([BM25Index()], Chunker(max_tokens=6, overlap_tokens=0))
+
+    async def test_indexes_chunks(self, index, document):
+        await index.add([document])
+
+        bm25 = index.indexes[0]
+        assert len(index) == 4
+        assert len(bm25) == 4
+        hits = bm25.search("mountains")
+        assert [hit_id for hit_id, _ in hits] == [chunk_id(document.id, 2)]
+        assert index.collapse(hits, 5) == [
+            (document.id, [index.chunks(document.id)[2]])
+        ]
+
+    async def test_update_and_remove(self, index, document):
+        await index.add([document])
+        document.update_content("Only pasta now.")
+        await index.add([document])
+
+        assert len(index) == 1
+        assert index.indexes[0].search("mountains") == []
+
+        await index.remove(document.id)
+        await index.remove(uuid4())
+        assert len(index) == 0
+        assert len(index.indexes[0]) == 0
+
+    async def test_collapse_groups_hits_per_document(self, index, document):
+        other = Document(title="Other", content="Python snakes. Pasta dinner.")
+        await index.add([document, other])
+        hits = index.indexes[0].search("python pasta", top_k=10)
+
+        collapsed = index.collapse(hits, top_k=1)
+
+        assert len(collapsed) == 1
+        assert len(collapsed[0][1]) >= 1
+        assert len(index.collapse(hits, top_k=5)) == 2
+
+    async def test_load_marks_inner_indexes_loaded(self, index, document):
+        repository = InMemoryDocumentRepository()
+        await repository.save(document)
+
+        await index.load(repository.iter_all())
+
+        assert index.loaded
+        assert index.indexes[0].loaded
+        assert len(index) == 4
+
+    async def test_failed_load_leaves_inner_indexes_unloaded(self, document):
+        failures = [RuntimeError("rate limited")]
+
+        async def flaky_embedding(text: str) -> list[float]:
+            if failures:
+                raise failures.pop()
+            return await keyword_embedding(text)
+
+        bm25, dense = BM25Index(), VectorIndex(flaky_embedding)
+        index = ChunkIndex([bm25, dense], Chunker(max_tokens=6, overlap_tokens=0))
+        repository = InMemoryDocumentRepository()
+        await repository.save(document)
+
+        with pytest.raises(RuntimeError, match="rate limited"):
+            await index.load(repository.iter_all())
+
+        assert not (index.loaded or bm25.loaded or dense.loaded)
+        assert len(index) == len(bm25) == len(dense) == 0
+
+        await index.load(repository.iter_all())
+
+        assert index.loaded and bm25.loaded and dense.loaded
+        assert len(index) == len(bm25) == len(dense) == 4
+
+
+class TestChunkedStrategies:
+    @pytest.fixture
+    async def repository(self):
+        repository = InMemoryDocumentRepository()
+        await repository.save_many(
+            [
+                Document(title="Notes", content=LONG_CONTENT),
+                Document(title="Rivers", content="Rivers flow downhill."),
+            ]
+        )
+        return repository
+
+    def chunk_index(self, *indexes):
+        return ChunkIndex(list(indexes), Chunker(max_tokens=6, overlap_tokens=0))
+
+    async def test_bm25_returns_matching_passages(self, repository):
+        bm25 = BM25Index()
+        strategy = BM25RAGStrategy(repository, bm25, self.chunk_index(bm25))
+
+        documents = await strategy.retrieve_documents("mountains", top_k=5)
+
+        assert len(documents) == 1
+        assert documents[0].title == "Notes"
+        assert documents[0].content == "Mountains are tall and cold."
+
+    async def test_vector_returns_matching_passages(self, repository):
+        index = VectorIndex(keyword_embedding)
+        strategy = VectorRAGStrategy(repository, index, self.chunk_index(index))
+
+        documents = await strategy.retrieve_documents("python", top_k=1)
+
+        assert documents[0].content == "Python is a programming language."
+
+    async def test_hybrid_returns_matching_passages(self, repository):
+        bm25 = BM25Index()
+        vectors = VectorIndex(keyword_embedding)
+        strategy = HybridRAGStrategy(
+            repository, bm25, vectors, chunks=self.chunk_index(bm25, vectors)
+        )
+
+        documents = await strategy.retrieve_documents("rivers", top_k=2)
+
+        assert {d.content for d in documents} == {
+            "Rivers flow into the sea.",
+            "Rivers flow downhill.",
+        }
+
+    async def test_filter_restricts_chunks_to_matching_documents(self, repository):
+        bm25 = BM25Index()
+        vectors = VectorIndex(keyword_embedding)
+        strategy = HybridRAGStrategy(
+            repository, bm25, vectors, chunks=self.chunk_index(bm25, vectors)
+        )
+        options = RetrievalOptions(filter=DocumentFilter(title_prefix="Riv"))
+
+        documents = await strategy.retrieve_documents("rivers", 2, options)
+
+        assert [d.content for d in documents] == ["Rivers flow downhill."]
+
+    async def test_document_updated_before_reindexing_is_returned_whole(self):
+        repository = InMemoryDocumentRepository()
+        bm25 = BM25Index()
+        chunks = PausableChunkIndex([bm25], Chunker(max_tokens=6, overlap_tokens=0))
+        await chunks.load(repository.iter_all())
+        queue = IndexingQueue([chunks], workers=1)
+        usecase = DocumentUseCase(repository, indexing_queue=queue)
+        document = await usecase.create(title="Notes", content=LONG_CONTENT)
+        await queue.wait_for(queue.sequence, timeout=1)
+        strategy = BM25RAGStrategy(repository, bm25, chunks)
+
+        # The new content is stored but its chunks are not indexed yet
+        chunks.release.clear()
+        updated = "Mountains. " + LONG_CONTENT.replace("Rivers flow", "Streams run")
+        await usecase.update(document.id, updated)
+        documents = await strategy.retrieve_documents("mountains", top_k=5)
+
+        # The old offsets would cut the new content mid-sentence
+        assert [d.content for d in documents] == [updated]
+
+        chunks.release.set()
+        await queue.wait_for(queue.sequence, timeout=1)
+        documents = await strategy.retrieve_documents("mountains", top_k=5)
+        await queue.close()
+
+        assert documents[0].content.startswith("Mountains.")
+        assert documents[0].content != updated
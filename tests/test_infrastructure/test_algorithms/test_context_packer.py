@@ -0,0 +1,83 @@
+"""Tests for token-budgeted context packing."""
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.context_packer import (
+    SEPARATOR,
+    ContextPacker,
+    estimate_tokens,
+    format_document,
+)
+
+FILLER = "Rivers and mountains shape the climate of every region. " * 40
+ANSWER = "The Amazon basin receives about two meters of rain per year."
+
+
+def test_estimate_tokens_counts_non_ascii_characters_individually():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("日本語") == 3
+
+
+def test_small_documents_are_packed_whole():
+    documents = [
+        Document(title="Rivers", content="The Amazon is a river."),
+        Document(title="Deserts", content="The Sahara is a desert."),
+    ]
+
+    packed = ContextPacker().pack("amazon river", documents)
+
+    assert packed.text == SEPARATOR.join(format_document(d) for d in documents)
+    assert packed.usage.tokens == estimate_tokens(packed.text)
+    assert packed.usage.tokens_saved == 0
+    assert packed.usage.documents_compressed == 0
+
+
+def test_long_documents_keep_the_query_relevant_sentences():
+    document = Document(title="Climate", content=FILLER + ANSWER + " " + FILLER)
+    packer = ContextPacker(max_tokens=200, max_document_tokens=100)
+
+    packed = packer.pack("How much rain falls in the Amazon?", [document])
+
+    assert ANSWER in packed.text
+    assert packed.text.startswith("Title: Climate\nContent: Rivers")
+    assert "[...]" in packed.text
+    assert packed.usage.tokens <= 100
+    assert packed.usage.documents_compressed == 1
+    assert packed.usage.tokens_saved == (
+        estimate_tokens(format_document(document)) - packed.usage.tokens
+    )
+
+
+def test_lower_ranked_documents_are_dropped_when_the_budget_runs_out():
+    documents = [Document(title=f"Doc {i}", content=FILLER) for i in range(5)]
+    packer = ContextPacker(
+        max_tokens=300, max_document_tokens=120, min_document_tokens=64
+    )
+
+    packed = packer.pack("climate", documents)
+
+    assert packed.usage.tokens <= 300
+    assert packed.text.count("Title: ") == 3
+    assert packed.usage.documents_compressed == 3
+    assert packed.usage.documents_dropped == 2
+    assert packer.stats()["tokens_saved"] == packed.usage.tokens_saved
+
+
+def test_run_on_text_is_split_before_extraction():
+    words = " ".join(f"word{i}" for i in range(2000))
+    document = Document(title="Run-on", content=words + " amazon rainfall")
+    packer = ContextPacker(max_document_tokens=100, max_sentence_tokens=20)
+
+    packed = packer.pack("amazon rainfall", [document])
+
+    assert "amazon rainfall" in packed.text
+    assert packed.usage.tokens <= 100
+
+
+def test_invalid_limits_are_rejected():
+    with pytest.raises(ValueError):
+        ContextPacker(max_tokens=0)
+    with pytest.raises(ValueError):
+        ContextPacker(max_sentence_tokens=0)
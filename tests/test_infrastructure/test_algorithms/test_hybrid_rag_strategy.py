@@ -0,0 +1,182 @@
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.bm25_index import BM25Index
+from src.infrastructure.algorithms.hybrid_rag_strategy import (
+    HybridRAGStrategy,
+    reciprocal_rank_fusion,
+)
+from src.infrastructure.algorithms.vector_index import VectorIndex
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+
+
+def semantic_embedding(delay: float = 0.0):
+    """Embed text by topic, so "supper" matches "dinner" without sharing words."""
+
+    async def embed(text: str) -> list[float]:
+        await asyncio.sleep(delay)
+        lowered = text.lower()
+        food = sum(lowered.count(word) for word in ("dinner", "supper", "pasta"))
+        return [float(food), float(lowered.count("python")), 0.1]
+
+    return embed
+
+
+def test_reciprocal_rank_fusion():
+    a, b, c = uuid4(), uuid4(), uuid4()
+
+    fused = reciprocal_rank_fusion([([(a, 9.0), (b, 5.0)], 1.0), ([(b, 0.9)], 2.0)])
+
+    assert [document_id for document_id, _ in fused] == [b, a]
+    assert fused[0][1] == pytest.approx(1 / 62 + 2 / 61)
+    assert reciprocal_rank_fusion([([(c, 1.0)], 1.0), ([], 1.0)]) == [(c, 1 / 61)]
+
+
+class TestHybridRAGStrategy:
+    @pytest.fixture
+    async def repository(self):
+        repository = InMemoryDocumentRepository()
+        await repository.save_many(
+            [
+                Document(title="Python", content="Python is a programming language."),
+                Document(title="Cooking", content="Pasta recipes for dinner."),
+                Document(title="Supper", content="Ideas for a late supper."),
+            ]
+        )
+        return repository
+
+    async def test_fuses_lexical_and_dense_results(self, repository):
+        strategy = HybridRAGStrategy(
+            repository, BM25Index(), VectorIndex(semantic_embedding())
+        )
+
+        documents = await strategy.retrieve_documents("dinner", top_k=2)
+
+        # "Cooking" matches both legs; "Supper" only the dense one
+        assert [d.title for d in documents] == ["Cooking", "Supper"]
+        assert strategy.lexical_index.loaded
+        assert strategy.dense_index.loaded
+
+    async def test_candidate_depth_limits_a_leg(self, repository):
+        strategy = HybridRAGStrategy(
+            repository,
+            BM25Index(),
+            VectorIndex(semantic_embedding()),
+            dense_depth=0,
+        )
+
+        documents = await strategy.retrieve_documents("dinner", top_k=3)
+
+        assert [d.title for d in documents] == ["Cooking"]
+
+    async def test_slow_leg_is_dropped_after_timeout(self, repository):
+        dense_index = VectorIndex(semantic_embedding(delay=0.2))
+        await dense_index.load(repository.iter_all())
+        strategy = HybridRAGStrategy(
+            repository, BM25Index(), dense_index, leg_timeout=0.05
+        )
+
+        started = asyncio.get_running_loop().time()
+        documents = await strategy.retrieve_documents("dinner", top_k=3)
+
+        assert asyncio.get_running_loop().time() - started < 0.2
+        assert [d.title for d in documents] == ["Cooking"]
+
+    @staticmethod
+    async def _strategy_with_slow_lexical(repository, delay, **kwargs):
+        lexical = BM25Index()
+        await lexical.load(repository.iter_all())
+        dense = VectorIndex(semantic_embedding(delay=0.2))
+        await dense.load(repository.iter_all())
+        spans = {}
+        search = lexical.search
+
+        def slow_search(query_text, top_k=5, allowed=None):
+            started = time.perf_counter()
+            time.sleep(delay)  # A CPU-bound search holding its thread
+            results = search(query_text, top_k, allowed)
+            spans["lexical"] = (started, time.perf_counter())
+            return results
+
+        async def timed_query(query_text, top_k=5, options=None, allowed=None):
+            started = time.perf_counter()
+            results = await VectorIndex.query(
+                dense, query_text, top_k, options, allowed
+            )
+            spans["dense"] = (started, time.perf_counter())
+            return results
+
+        lexical.search = slow_search  # type: ignore[method-assign]
+        dense.query = timed_query  # type: ignore[method-assign]
+        return HybridRAGStrategy(repository, lexical, dense, **kwargs), spans
+
+    async def test_legs_run_concurrently(self, repository):
+        strategy, spans = await self._strategy_with_slow_lexical(repository, 0.2)
+
+        started = time.perf_counter()
+        documents = await strategy.retrieve_documents("dinner", top_k=2)
+        elapsed = time.perf_counter() - started
+
+        # Each leg takes 0.2s; run one after the other they would take 0.4s
+        (lexical_start, lexical_end), (dense_start, dense_end) = (
+            spans["lexical"],
+            spans["dense"],
+        )
+        assert lexical_start < dense_end and dense_start < lexical_end
+        assert elapsed < 0.35
+        assert [d.title for d in documents] == ["Cooking", "Supper"]
+
+    async def test_slow_lexical_leg_is_dropped_after_timeout(self, repository):
+        strategy, spans = await self._strategy_with_slow_lexical(
+            repository, 0.5, leg_timeout=0.3
+        )
+
+        started = time.perf_counter()
+        documents = await strategy.retrieve_documents("dinner", top_k=3)
+
+        assert time.perf_counter() - started < 0.45
+        # The query returned while the lexical search was still running
+        assert "lexical" not in spans
+        assert "dense" in spans
+        assert {d.title for d in documents} == {"Cooking", "Supper", "Python"}
+
+    @staticmethod
+    def _failing_query_embedding(query_text: str):
+        """Embed documents by topic, but fail to embed the query."""
+        embed = semantic_embedding()
+
+        async def failing(text: str) -> list[float]:
+            if text == query_text:
+                raise RuntimeError("embedding service unavailable")
+            return await embed(text)
+
+        return failing
+
+    async def test_failing_dense_leg_falls_back_to_lexical(self, repository, caplog):
+        dense = VectorIndex(self._failing_query_embedding("dinner"))
+        strategy = HybridRAGStrategy(repository, BM25Index(), dense)
+
+        documents = await strategy.retrieve_documents("dinner", top_k=3)
+
+        assert [d.title for d in documents] == ["Cooking"]
+        assert "Hybrid dense leg failed" in caplog.text
+
+    async def test_error_is_raised_when_both_legs_fail(self, repository):
+        lexical = BM25Index()
+        await lexical.load(repository.iter_all())
+
+        def failing_search(*_args):
+            raise RuntimeError("lexical index unavailable")
+
+        lexical.search = failing_search  # type: ignore[method-assign]
+        dense = VectorIndex(self._failing_query_embedding("dinner"))
+        strategy = HybridRAGStrategy(repository, lexical, dense)
+
+        with pytest.raises(RuntimeError, match="lexical index unavailable"):
+            await strategy.retrieve_documents("dinner", top_k=3)
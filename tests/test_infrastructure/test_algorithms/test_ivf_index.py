@@ -0,0 +1,146 @@
+import asyncio
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.ivf_index import IVFVectorIndex
+from src.infrastructure.algorithms.vector_index import VectorIndex
+
+
+async def _unused_embed(_text: str) -> list[float]:
+    raise NotImplementedError
+
+
+def clustered_vectors(count: int, clusters: int = 8, dimensions: int = 16):
+    """Random vectors scattered around a few well separated directions."""
+    rng = np.random.default_rng(1)
+    centers = rng.standard_normal((clusters, dimensions), dtype=np.float32)
+    noise = rng.standard_normal((count, dimensions), dtype=np.float32)
+    return centers[np.arange(count) % clusters] * 3 + noise
+
+
+class TestIVFVectorIndex:
+    @pytest.fixture
+    def vectors(self):
+        return clustered_vectors(400)
+
+    @pytest.fixture
+    def ids(self, vectors):
+        return [uuid4() for _ in range(len(vectors))]
+
+    @pytest.fixture
+    def exact(self, ids, vectors):
+        index = VectorIndex(_unused_embed)
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+        return index
+
+    @pytest.fixture
+    def index(self, ids, vectors):
+        index = IVFVectorIndex(_unused_embed, nlist=8, nprobe=2, min_train_size=200)
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+        return index
+
+    def test_exact_until_trained(self, ids, vectors, exact):
+        index = IVFVectorIndex(_unused_embed, nlist=8, min_train_size=1000)
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+
+        assert not index.trained
+        assert index.search(vectors[0], 10) == exact.search(vectors[0], 10)
+
+    def test_trains_lists(self, index):
+        assert index.trained
+        assert index.nlist == 8
+        assert len(index) == 400
+
+    def test_nprobe_all_lists_is_exact(self, index, exact, vectors):
+        options = RetrievalOptions(nprobe=8)
+        for query in vectors[:20]:
+            approximate = index.search(query, 10, options)
+            expected = exact.search(query, 10)
+            assert [d for d, _ in approximate] == [d for d, _ in expected]
+
+    def test_allowed_documents_are_searched_exactly(self, index, exact, ids, vectors):
+        allowed = set(ids[::7])
+
+        for query in vectors[:20]:
+            filtered = index.search(query, 5, allowed=allowed)
+            expected = [
+                hit for hit in exact.search(query, len(ids)) if hit[0] in allowed
+            ][:5]
+            assert [d for d, _ in filtered] == [d for d, _ in expected]
+            assert [d for d, _ in exact.search(query, 5, allowed=allowed)] == [
+                d for d, _ in expected
+            ]
+
+    def test_finds_indexed_vector(self, index, ids, vectors):
+        options = RetrievalOptions(nprobe=1)
+        for document_id, vector in zip(ids[:50], vectors[:50], strict=True):
+            best_id, score = index.search(vector, 1, options)[0]
+            assert best_id == document_id
+            assert score == pytest.approx(1.0, abs=1e-5)
+
+    async def test_insert_update_and_remove_after_training(self, index, ids):
+        vector = clustered_vectors(1)[0]
+        new_id = uuid4()
+        index.put(new_id, vector)
+        index.put(ids[0], vector)  # moves to the new vector's list
+
+        results = index.search(vector, 2, RetrievalOptions(nprobe=1))
+        assert {d for d, _ in results} == {new_id, ids[0]}
+
+        await index.remove(new_id)
+        await index.remove(uuid4())
+        assert len(index) == 400
+        assert index.search(vector, 1)[0][0] == ids[0]
+
+    async def test_trains_in_background_and_replays_writes(self, ids, vectors):
+        index = IVFVectorIndex(_unused_embed, nlist=8, min_train_size=200)
+        for document_id, vector in zip(ids[:200], vectors[:200], strict=True):
+            index.put(document_id, vector)
+        await asyncio.sleep(0)  # The training snapshots the first 200 vectors
+
+        # Writes made while the lists are built are served exactly meanwhile
+        for document_id, vector in zip(ids[200:], vectors[200:], strict=True):
+            index.put(document_id, vector)
+        await index.remove(ids[1])
+        index.put(ids[0], vectors[2])
+        assert not index.trained
+        assert index.search(vectors[300], 1)[0][0] == ids[300]
+
+        await index.retrain()
+
+        # and are replayed onto the new lists
+        options = RetrievalOptions(nprobe=8)
+        assert index.trained
+        assert len(index) == 399
+        assert ids[1] not in {d for d, _ in index.search(vectors[1], 10, options)}
+        assert {d for d, _ in index.search(vectors[2], 2, options)} == {
+            ids[0],
+            ids[2],
+        }
+        assert index.search(vectors[399], 1, options)[0][0] == ids[399]
+
+    def test_retrains_after_growth(self, ids, vectors):
+        index = IVFVectorIndex(_unused_embed, min_train_size=100, retrain_growth=2.0)
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+
+        # Trained at 100, 200 and 400 vectors; sqrt(400) lists
+        assert index.nlist == 20
+        assert len(index) == 400
+
+    def test_dimension_mismatch(self, index):
+        with pytest.raises(ValueError, match="dimensions"):
+            index.put(uuid4(), [1.0, 2.0])
+
+    async def test_clear(self, index, vectors):
+        await index.clear()
+
+        assert not index.trained
+        assert len(index) == 0
+        assert index.search(vectors[0]) == []
@@ -0,0 +1,71 @@
+"""Tests for MMR reranking and its similarity sources."""
+
+import numpy as np
+import pytest
+
+from src.domain.document.models.document import Document
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.mmr_reranker import MMRReranker, mmr
+from src.infrastructure.algorithms.similarity import (
+    EmbeddingSimilarity,
+    ShingleSimilarity,
+)
+
+RIVERS = "The Amazon river carries more water than any other river on Earth"
+DESERTS = "The Sahara desert covers most of North Africa with sand and rock"
+
+
+def test_mmr_skips_redundant_items():
+    relevance = np.array([0.9, 0.89, 0.5])
+    similarity = np.array([[1.0, 0.99, 0.1], [0.99, 1.0, 0.1], [0.1, 0.1, 1.0]])
+
+    assert mmr(relevance, similarity, 2, relevance_weight=0.5) == [0, 2]
+    assert mmr(relevance, similarity, 2, relevance_weight=1.0) == [0, 1]
+    assert mmr(relevance, similarity, 5) == [0, 2, 1]
+
+
+async def test_shingle_similarity_finds_near_duplicates():
+    documents = [
+        Document(title="Rivers", content=RIVERS),
+        Document(title="Rivers", content=RIVERS + " today"),
+        Document(title="Deserts", content=DESERTS),
+    ]
+
+    relevance, similarity = await ShingleSimilarity(size=2).similarities(
+        "amazon river", documents
+    )
+
+    assert relevance.tolist() == [1.0, 1.0, 0.0]
+    assert similarity[0, 1] > 0.7
+    assert similarity[0, 2] < 0.2
+    assert np.allclose(similarity, similarity.T)
+
+
+async def test_embedding_similarity_uses_cosine():
+    vectors = {"query": [1.0, 0.0], "A\n\na": [2.0, 0.0], "B\n\nb": [0.0, 3.0]}
+
+    async def embed(text):
+        return vectors[text]
+
+    relevance, similarity = await EmbeddingSimilarity(embed).similarities(
+        "query",
+        [Document(title="A", content="a"), Document(title="B", content="b")],
+    )
+
+    assert relevance.tolist() == pytest.approx([1.0, 0.0])
+    assert np.allclose(similarity, np.eye(2))
+
+
+async def test_reranker_replaces_duplicates_with_new_content():
+    original = Document(title="Rivers", content=RIVERS)
+    copy = Document(title="Rivers", content=RIVERS)
+    other = Document(title="Deserts", content=DESERTS + " and the river Nile")
+    reranker = MMRReranker(ShingleSimilarity())
+
+    reranked = await reranker.rerank("river", [original, copy, other], 2)
+    by_relevance = await reranker.rerank(
+        "river", [original, copy, other], 2, RetrievalOptions(mmr_lambda=1.0)
+    )
+
+    assert reranked == [original, other]
+    assert by_relevance == [original, copy]
@@ -0,0 +1,130 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.vector_index import VectorIndex
+
+_KEYWORDS = ("python", "snake", "pasta", "dinner")
+
+
+async def keyword_embedding(text: str) -> list[float]:
+    """Embed text as counts of a few keywords, plus a constant component."""
+    lowered = text.lower()
+    return [float(lowered.count(keyword)) for keyword in _KEYWORDS] + [0.1]
+
+
+class TestVectorIndex:
+    @pytest.fixture
+    def documents(self):
+        return [
+            Document(title="Python", content="Python programming with python."),
+            Document(title="Snakes", content="A python is a snake."),
+            Document(title="Cooking", content="Pasta for dinner."),
+        ]
+
+    @pytest.fixture
+    async def index(self, documents):
+        index = VectorIndex(keyword_embedding, initial_capacity=2)
+        await index.add(documents)
+        return index
+
+    async def test_ranks_by_similarity(self, index, documents):
+        results = await index.query("python", top_k=2)
+
+        assert [document_id for document_id, _ in results] == [
+            documents[0].id,
+            documents[1].id,
+        ]
+        assert results[0][1] == pytest.approx(1.0, abs=0.01)
+
+    async def test_grows_capacity(self, index):
+        assert len(index) == 3
+        assert index.capacity == 4
+
+    async def test_update_replaces_row(self, index, documents):
+        documents[2].update_content("Python for dinner.")
+        await index.add([documents[2]])
+
+        assert len(index) == 3
+        assert len(await index.query("pasta", top_k=5)) == 3
+        assert (await index.query("pasta", top_k=1))[0][1] < 0.5
+        assert (await index.query("dinner", top_k=1))[0][0] == documents[2].id
+
+    async def test_remove_and_compaction(self, documents):
+        index = VectorIndex(keyword_embedding, compaction_ratio=0.4)
+        await index.add(documents)
+
+        await index.remove(documents[0].id)
+        assert [d for d, _ in await index.query("python", top_k=3)][0] == (
+            documents[1].id
+        )
+
+        await index.remove(documents[1].id)  # exceeds the ratio and compacts
+        await index.remove(uuid4())
+
+        assert len(index) == 1
+        assert [d for d, _ in await index.query("python", top_k=3)] == [documents[2].id]
+
+    async def test_dimension_mismatch(self, index):
+        with pytest.raises(ValueError, match="dimensions"):
+            index.put(uuid4(), [1.0, 2.0])
+
+    async def test_clear(self, index):
+        await index.clear()
+
+        assert len(index) == 0
+        assert await index.query("python") == []
+
+    async def test_failed_load_is_rolled_back_and_retried(self, documents):
+        failures = [RuntimeError("rate limited")]
+
+        async def flaky_embedding(text: str) -> list[float]:
+            if "dinner" in text and failures:
+                raise failures.pop()
+            return await keyword_embedding(text)
+
+        async def source():
+            for document in documents:
+                yield document
+
+        index = VectorIndex(flaky_embedding)
+
+        with pytest.raises(RuntimeError, match="rate limited"):
+            await index.load(source(), batch_size=2)
+
+        assert not index.loaded
+        assert len(index) == 0
+
+        await index.load(source(), batch_size=2)
+
+        assert index.loaded
+        assert len(index) == 3
+
+    async def test_writes_during_embedding_supersede_the_add(self, documents):
+        python, snakes, cooking = documents
+        release = asyncio.Event()
+
+        async def gated_embedding(text: str) -> list[float]:
+            if text.startswith("Cooking"):
+                await release.wait()
+            return await keyword_embedding(text)
+
+        index = VectorIndex(gated_embedding)
+        adding = asyncio.create_task(index.add([python, cooking]))
+        await asyncio.sleep(0)
+
+        # While the add awaits the "Cooking" embedding, its documents are
+        # removed and rewritten
+        await index.remove(python.id)
+        rewritten = cooking.model_copy(update={"title": "Now", "content": "Python."})
+        await index.add([rewritten, snakes])
+        release.set()
+        await adding
+
+        assert len(index) == 2
+        results = dict(index.search(await keyword_embedding("python"), top_k=3))
+        assert python.id not in results
+        # The rewritten document kept its newer embedding
+        assert results[cooking.id] == pytest.approx(1.0, abs=0.01)
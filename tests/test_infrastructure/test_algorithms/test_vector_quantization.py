@@ -0,0 +1,146 @@
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.ivf_index import IVFVectorIndex
+from src.infrastructure.algorithms.vector_index import VectorIndex, normalize
+from src.infrastructure.algorithms.vector_quantization import (
+    MappedVectors,
+    VectorEncoder,
+)
+
+
+async def _unused_embed(_text: str) -> list[float]:
+    raise NotImplementedError
+
+
+def random_vectors(count: int, dimensions: int = 64):
+    rng = np.random.default_rng(2)
+    vectors = rng.standard_normal((count, dimensions), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestVectorEncoder:
+    def test_int8_codes_approximate_dot_products(self):
+        vectors = random_vectors(100)
+        encoder = VectorEncoder(64, "int8")
+
+        codes, scales = encoder.encode(vectors)
+
+        assert codes.dtype == np.int8
+        assert scales is not None
+        approximate = codes.astype(np.float32) @ vectors[0] * scales
+        np.testing.assert_allclose(approximate, vectors @ vectors[0], atol=0.02)
+
+    def test_projection_reduces_dimensions(self):
+        encoder = VectorEncoder(64, "float16", projection_dimensions=16)
+
+        codes, scales = encoder.encode(random_vectors(10))
+
+        assert codes.shape == (10, 16)
+        assert codes.dtype == np.float16
+        assert scales is None
+        assert not encoder.lossless
+
+    def test_float32_without_projection_is_lossless(self):
+        assert VectorEncoder(64).lossless
+        assert VectorEncoder(64, projection_dimensions=64).lossless
+
+
+class TestMappedVectors:
+    def test_put_get_and_reuse_of_freed_rows(self):
+        vectors = random_vectors(3)
+        store = MappedVectors(64, initial_capacity=1)
+        store.put_many([10, 11, 12], vectors)
+        store.discard(11)
+        store.put_many([13], vectors[1:2] * 2)
+
+        np.testing.assert_array_equal(store.get([12, 10]), vectors[[2, 0]])
+        np.testing.assert_array_equal(store.get([13]), vectors[1:2] * 2)
+        assert len(store) == 3
+        store.close()
+
+
+class TestQuantizedVectorIndex:
+    @pytest.fixture
+    def vectors(self):
+        return random_vectors(500)
+
+    @pytest.fixture
+    def ids(self, vectors):
+        return [uuid4() for _ in range(len(vectors))]
+
+    @pytest.fixture
+    def exact(self, ids, vectors):
+        index = VectorIndex(_unused_embed)
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+        return index
+
+    @pytest.mark.parametrize("precision", ["float16", "int8"])
+    def test_rescored_results_match_exact(self, ids, vectors, exact, precision):
+        index = VectorIndex(_unused_embed, precision=precision)
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+
+        for query in vectors[:20]:
+            expected = exact.search(query, 5)
+            results = index.search(query, 5)
+            assert [document_id for document_id, _ in results] == [
+                document_id for document_id, _ in expected
+            ]
+            np.testing.assert_allclose(
+                [score for _, score in results],
+                [score for _, score in expected],
+                rtol=1e-5,
+            )
+
+    def test_stores_fewer_bytes(self, ids, vectors, exact):
+        index = VectorIndex(_unused_embed, precision="int8", projection_dimensions=16)
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+
+        assert index.nbytes * 8 < exact.nbytes
+
+    def test_rescoring_recovers_projection_loss(self, ids, vectors, exact):
+        index = VectorIndex(_unused_embed, precision="int8", projection_dimensions=32)
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+
+        def recall(options: RetrievalOptions) -> float:
+            hits = 0
+            for query in vectors[:50]:
+                truth = {document_id for document_id, _ in exact.search(query, 10)}
+                found = {d for d, _ in index.search(query, 10, options)}
+                hits += len(truth & found)
+            return hits / 500
+
+        coarse = recall(RetrievalOptions(rescore_factor=0))
+        assert recall(RetrievalOptions(rescore_factor=10)) > coarse
+
+    async def test_removed_documents_are_not_rescored(self, ids, vectors):
+        index = VectorIndex(_unused_embed, precision="int8")
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+
+        await index.remove(ids[0])
+
+        assert ids[0] not in {d for d, _ in index.search(vectors[0], 10)}
+        assert len(index) == len(ids) - 1
+
+    def test_ivf_trains_on_original_vectors(self, ids, vectors, exact):
+        index = IVFVectorIndex(
+            _unused_embed, nlist=4, min_train_size=200, precision="int8"
+        )
+        for document_id, vector in zip(ids, vectors, strict=True):
+            index.put(document_id, vector)
+
+        assert index.trained
+        query = normalize(vectors[7])
+        options = RetrievalOptions(nprobe=4)
+        assert index.search(query, 5, options)[0][0] == ids[7]
+        assert [d for d, _ in index.search(query, 5, options)] == [
+            d for d, _ in exact.search(query, 5)
+        ]
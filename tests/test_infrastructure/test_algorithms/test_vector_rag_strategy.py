@@ -0,0 +1,70 @@
+import asyncio
+
+from src.domain.document.models.document import Document
+from src.domain.rag.models.query import RetrievalOptions
+from src.infrastructure.algorithms.ivf_index import IVFVectorIndex
+from src.infrastructure.algorithms.vector_index import VectorIndex
+from src.infrastructure.algorithms.vector_rag_strategy import VectorRAGStrategy
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+
+
+async def keyword_embedding(text: str) -> list[float]:
+    lowered = text.lower()
+    return [float(lowered.count(word)) for word in ("python", "pasta")] + [0.1]
+
+
+class TestVectorRAGStrategy:
+    async def test_loads_existing_documents_on_first_query(self):
+        repository = InMemoryDocumentRepository()
+        python = Document(title="Python", content="Python is a programming language.")
+        cooking = Document(title="Cooking", content="Pasta recipes for dinner.")
+        await repository.save_many([python, cooking])
+        strategy = VectorRAGStrategy(repository, VectorIndex(keyword_embedding))
+
+        documents = await strategy.retrieve_documents("pasta?", top_k=1)
+
+        assert documents == [cooking]
+        assert strategy.index.loaded
+
+    async def test_concurrent_first_queries_share_one_load(self):
+        repository = InMemoryDocumentRepository()
+        python = Document(title="Python", content="Python is a programming language.")
+        cooking = Document(title="Cooking", content="Pasta recipes for dinner.")
+        await repository.save_many([python, cooking])
+        embedded: list[str] = []
+
+        async def slow_embedding(text: str) -> list[float]:
+            embedded.append(text)
+            await asyncio.sleep(0.05)
+            return await keyword_embedding(text)
+
+        strategy = VectorRAGStrategy(repository, VectorIndex(slow_embedding))
+
+        results = await asyncio.gather(
+            *(strategy.retrieve_documents("pasta?", top_k=1) for _ in range(3))
+        )
+
+        # No query ran against the half-loaded index
+        assert results == [[cooking]] * 3
+        # Two documents loaded once, plus one embedding per query
+        assert len(embedded) == 5
+
+    async def test_passes_options_to_approximate_index(self):
+        repository = InMemoryDocumentRepository()
+        python = Document(title="Python", content="Python is a programming language.")
+        cooking = Document(title="Cooking", content="Pasta recipes for dinner.")
+        await repository.save_many([python, cooking])
+        index = IVFVectorIndex(keyword_embedding, nlist=2, min_train_size=2)
+        await index.load(repository.iter_all())
+        # Loading started the training; wait for the lists to be swapped in
+        await index.retrain()
+        strategy = VectorRAGStrategy(repository, index)
+
+        documents = await strategy.retrieve_documents(
+            "pasta?", top_k=2, options=RetrievalOptions(nprobe=2)
+        )
+
+        assert index.trained
+        assert documents == [cooking, python]
@@ -0,0 +1,133 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.external.azure_openai_client import AzureOpenAIClient
+from src.infrastructure.external.embedding_batcher import EmbeddingBatcher
+
+
+class RecordingUpstream:
+    """Embeds each text as [length] and records the batches it received."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.batches: list[list[str]] = []
+        self.delay = delay
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(texts)
+        await asyncio.sleep(self.delay)
+        return [[float(len(text))] for text in texts]
+
+
+class TestEmbeddingBatcher:
+    async def test_coalesces_concurrent_calls(self):
+        upstream = RecordingUpstream()
+        batcher = EmbeddingBatcher(upstream, max_wait_ms=10)
+
+        vectors = await asyncio.gather(*(batcher.embed("x" * n) for n in range(50)))
+
+        assert vectors == [[float(n)] for n in range(50)]
+        assert len(upstream.batches) == 1
+        assert batcher.upstream_calls == 1
+        assert batcher.embedded_texts == 50
+
+    async def test_max_items_splits_batches(self):
+        upstream = RecordingUpstream()
+        batcher = EmbeddingBatcher(upstream, max_batch_items=20, max_wait_ms=1000)
+
+        await asyncio.gather(*(batcher.embed("text") for _ in range(50)))
+
+        # Full batches go out at once; the remainder waits for the window
+        assert [len(batch) for batch in upstream.batches] == [20, 20, 10]
+
+    async def test_max_chars_splits_batches(self):
+        upstream = RecordingUpstream()
+        batcher = EmbeddingBatcher(upstream, max_batch_chars=10, max_wait_ms=1)
+
+        await asyncio.gather(
+            *(batcher.embed(text) for text in ["aaaa"] * 5 + ["b" * 20])
+        )
+
+        assert [len(batch) for batch in upstream.batches] == [2, 2, 1, 1]
+
+    async def test_wait_window_bounds_latency(self):
+        upstream = RecordingUpstream()
+        batcher = EmbeddingBatcher(upstream, max_wait_ms=20)
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        assert await batcher.embed("alone") == [5.0]
+
+        assert 0.015 <= loop.time() - started < 0.5
+
+    async def test_batches_do_not_wait_for_each_other(self):
+        upstream = RecordingUpstream(delay=0.05)
+        batcher = EmbeddingBatcher(upstream, max_batch_items=1)
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        await asyncio.gather(*(batcher.embed("text") for _ in range(10)))
+
+        assert loop.time() - started < 0.3
+        assert len(upstream.batches) == 10
+
+    async def test_upstream_error_reaches_every_caller(self):
+        async def failing(_texts: list[str]) -> list[list[float]]:
+            raise RuntimeError("upstream down")
+
+        batcher = EmbeddingBatcher(failing, max_wait_ms=1)
+
+        results = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def test_wrong_number_of_embeddings(self):
+        async def short(_texts: list[str]) -> list[list[float]]:
+            return [[1.0]]
+
+        batcher = EmbeddingBatcher(short, max_wait_ms=1)
+
+        with pytest.raises(ValueError, match="Expected 2 embeddings"):
+            await asyncio.gather(batcher.embed("a"), batcher.embed("b"))
+
+
+class TestAzureOpenAIClientEmbeddings:
+    @pytest.fixture
+    def client(self):
+        client = AzureOpenAIClient(Settings(embedding_batch_max_wait_ms=1))
+        requests = []
+
+        async def create(model: str, input: list[str]) -> SimpleNamespace:
+            requests.append((model, input))
+            # The API may return items out of order; each carries its index
+            data = [
+                SimpleNamespace(index=i, embedding=[float(len(text))])
+                for i, text in enumerate(input)
+            ]
+            return SimpleNamespace(data=list(reversed(data)))
+
+        client.client = SimpleNamespace(embeddings=SimpleNamespace(create=create))  # type: ignore[assignment]
+        client.requests = requests  # type: ignore[attr-defined]
+        return client
+
+    async def test_get_embeddings_batch_orders_by_index(self, client):
+        vectors = await client.get_embeddings_batch(["a", "bb", "ccc"])
+
+        assert vectors == [[1.0], [2.0], [3.0]]
+        assert client.requests == [("text-embedding-ada-002", ["a", "bb", "ccc"])]
+
+    async def test_concurrent_get_embeddings_share_a_request(self, client):
+        vectors = await asyncio.gather(
+            *(client.get_embeddings("x" * n) for n in range(1, 6))
+        )
+
+        assert vectors == [[float(n)] for n in range(1, 6)]
+        assert len(client.requests) == 1
+
+    async def test_explicit_model_bypasses_batching(self, client):
+        assert await client.get_embeddings("abc", model="other") == [3.0]
+        assert client.requests == [("other", ["abc"])]
@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.external.azure_openai_client import AzureOpenAIClient
+from src.infrastructure.external.embedding_cache import EmbeddingCache, cache_key
+
+
+class TestEmbeddingCache:
+    def test_key_normalizes_whitespace_and_separates_deployments(self):
+        assert cache_key("ada", "a  b\n c ") == cache_key("ada", "a b c")
+        assert cache_key("ada", "a b") != cache_key("large", "a b")
+
+    async def test_memory_hits_and_misses(self):
+        cache = EmbeddingCache()
+        await cache.put_many("ada", ["one"], [[0.5, 1.0]])
+
+        assert await cache.get_many("ada", ["one", "two"]) == [[0.5, 1.0], None]
+        assert cache.get_from_memory("ada", " one ") == [0.5, 1.0]
+        assert cache.get_from_memory("ada", "two") is None
+        assert cache.stats() == {
+            "memory_entries": 1,
+            "memory_hits": 2,
+            "disk_hits": 0,
+            "misses": 1,
+            "hit_ratio": 2 / 3,
+        }
+
+    async def test_lru_evicts_least_recently_used(self):
+        cache = EmbeddingCache(memory_size=2)
+        await cache.put_many("ada", ["a", "b"], [[1.0], [2.0]])
+        cache.get_from_memory("ada", "a")
+        await cache.put_many("ada", ["c"], [[3.0]])
+
+        assert await cache.get_many("ada", ["a", "b", "c"]) == [[1.0], None, [3.0]]
+
+    async def test_disk_store_survives_restart(self, tmp_path):
+        path = str(tmp_path / "embeddings.db")
+        cache = EmbeddingCache(path)
+        stored = await cache.put_many("ada", ["one", "two"], [[0.1, 0.2], [0.3, 0.4]])
+        cache.close()
+
+        reopened = EmbeddingCache(path, memory_size=10)
+        vectors = await reopened.get_many("ada", ["two", "one", "three"])
+
+        assert vectors == [stored[1], stored[0], None]
+        assert vectors[0] == pytest.approx([0.3, 0.4])
+        assert reopened.stats()["disk_hits"] == 2
+        # Disk hits are promoted to memory
+        assert reopened.get_from_memory("ada", "one") == stored[0]
+        reopened.close()
+
+
+class TestAzureOpenAIClientEmbeddingCache:
+    @pytest.fixture
+    def client(self, tmp_path):
+        settings = Settings(
+            embedding_batch_max_wait_ms=1,
+            embedding_cache_path=str(tmp_path / "embeddings.db"),
+        )
+        client = AzureOpenAIClient(settings)
+        requests: list[list[str]] = []
+
+        async def create(model: str, input: list[str]) -> SimpleNamespace:  # noqa: ARG001
+            requests.append(input)
+            data = [
+                SimpleNamespace(index=i, embedding=[float(len(text))])
+                for i, text in enumerate(input)
+            ]
+            return SimpleNamespace(data=data)
+
+        client.client = SimpleNamespace(embeddings=SimpleNamespace(create=create))  # type: ignore[assignment]
+        client.requests = requests  # type: ignore[attr-defined]
+        yield client
+        client.embedding_cache.close()
+
+    async def test_only_missing_texts_are_requested(self, client):
+        await client.get_embeddings_batch(["a", "bb"])
+
+        vectors = await client.get_embeddings_batch(["bb", "ccc", "a"])
+
+        assert vectors == [[2.0], [3.0], [1.0]]
+        assert client.requests == [["a", "bb"], ["ccc"]]
+
+    async def test_repeated_query_skips_the_api(self, client):
+        first = await client.get_embeddings("what is python?")
+        second = await asyncio.gather(
+            *(client.get_embeddings("what is python?") for _ in range(3))
+        )
+
+        assert second == [first] * 3
+        assert len(client.requests) == 1
+        assert client.embedding_cache.stats()["memory_hits"] == 3
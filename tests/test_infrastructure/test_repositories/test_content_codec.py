@@ -0,0 +1,64 @@
+import pytest
+
+from src.infrastructure.repositories.content_codec import (
+    MAX_DICTIONARY_BYTES,
+    ContentCodec,
+    train_dictionary,
+)
+
+_BODY = "The quick brown fox jumps over the lazy dog. " * 20
+
+
+class TestContentCodec:
+    @pytest.mark.parametrize("algorithm", ["zlib", "lzma"])
+    def test_round_trip(self, algorithm):
+        codec = ContentCodec(algorithm)
+
+        blob = codec.compress(_BODY)
+
+        assert len(blob) < len(_BODY)
+        assert codec.decompress(blob) == _BODY
+
+    def test_incompressible_body_is_kept_raw(self):
+        codec = ContentCodec()
+
+        blob = codec.compress("xyz")
+
+        assert len(blob) == 4
+        assert codec.decompress(blob) == "xyz"
+
+    def test_non_ascii_round_trip(self):
+        codec = ContentCodec()
+        body = "Ünïcödé tëxt — 文字 " * 10
+
+        assert codec.decompress(codec.compress(body)) == body
+
+    def test_dictionary_is_trained_from_small_bodies(self):
+        codec = ContentCodec(training_samples=3)
+        early = codec.compress(_BODY)
+        codec.compress(_BODY)
+        codec.compress(_BODY)
+
+        assert codec.dictionary
+        late = codec.compress(_BODY)
+        assert len(late) < len(early)
+        # Bodies compressed before training remain readable
+        assert codec.decompress(early) == _BODY
+        assert codec.decompress(late) == _BODY
+
+    def test_large_bodies_skip_the_dictionary(self):
+        codec = ContentCodec(dictionary=b"quick brown fox", small_body_bytes=16)
+
+        assert codec.decompress(codec.compress(_BODY)) == _BODY
+
+    def test_unsupported_algorithm(self):
+        with pytest.raises(ValueError, match="Unsupported compression algorithm"):
+            ContentCodec("brotli")  # type: ignore[arg-type]
+
+
+def test_train_dictionary_prefers_frequent_words():
+    dictionary = train_dictionary(["alpha beta beta gamma"] * 5 + ["omega"])
+
+    assert b"beta" in dictionary
+    assert b"omega" not in dictionary
+    assert len(train_dictionary([_BODY] * 10)) <= MAX_DICTIONARY_BYTES
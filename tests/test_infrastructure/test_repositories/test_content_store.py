@@ -0,0 +1,80 @@
+from src.domain.document.models.document import compute_content_hash
+from src.infrastructure.repositories.content_codec import ContentCodec
+from src.infrastructure.repositories.content_store import ContentStore
+
+
+class TestContentStore:
+    def test_acquire_shares_identical_bodies(self):
+        store = ContentStore()
+
+        first_hash, first = store.acquire("".join(["shared ", "body"]))
+        second_hash, second = store.acquire("".join(["shared ", "body"]))
+
+        assert first_hash == second_hash == compute_content_hash("shared body")
+        assert first is second
+        assert store.stats()["unique_bodies"] == 1
+        assert store.stats()["body_references"] == 2
+        assert store.stats()["dedup_ratio"] == 2.0
+
+    def test_release_drops_body_after_last_reference(self):
+        store = ContentStore()
+        content_hash, _ = store.acquire("body")
+        store.acquire("body")
+
+        store.release(content_hash)
+        assert store.stats()["unique_bodies"] == 1
+
+        store.release(content_hash)
+        assert store.stats() == {
+            "unique_bodies": 0,
+            "body_references": 0,
+            "dedup_ratio": 1.0,
+            "logical_chars": 0,
+            "stored_chars": 0,
+        }
+
+    def test_char_counts(self):
+        store = ContentStore()
+        store.acquire("abcd")
+        store.acquire("abcd")
+        store.acquire("xy")
+
+        stats = store.stats()
+        assert stats["logical_chars"] == 10
+        assert stats["stored_chars"] == 6
+
+    def test_compressed_bodies_are_decompressed_on_read(self):
+        store = ContentStore(ContentCodec(), cache_size=1)
+        body = "compressible text " * 50
+
+        content_hash, shared = store.acquire(body)
+
+        assert shared == ""
+        assert store.get(content_hash) == body
+        assert store.get(content_hash) == body
+        stats = store.stats()
+        assert stats["cache_misses"] == 1
+        assert stats["cache_hits"] == 1
+        assert stats["compressed_bytes"] < len(body)
+        assert stats["compression_ratio"] > 1
+
+    def test_cache_evicts_least_recently_used(self):
+        store = ContentStore(ContentCodec(), cache_size=1)
+        first, _ = store.acquire("first body " * 10)
+        second, _ = store.acquire("second body " * 10)
+
+        store.get(first)
+        store.get(second)
+        store.get(first)
+
+        assert store.stats()["cache_misses"] == 3
+
+    def test_frozen_reader_ignores_later_releases(self):
+        store = ContentStore(ContentCodec())
+        content_hash, _ = store.acquire("snapshot body " * 10)
+        read = store.frozen_reader()
+
+        store.release(content_hash)
+
+        assert read(content_hash) == "snapshot body " * 10
+        assert store.stats()["compressed_bytes"] == 0
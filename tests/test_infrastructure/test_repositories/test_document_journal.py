@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.infrastructure.repositories.content_codec import ContentCodec
+from src.infrastructure.repositories.content_store import ContentStore
+from src.infrastructure.repositories.document_journal import DocumentJournal
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+
+
+def wal_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith("wal-"))
+
+
+class TestDocumentJournal:
+    @pytest.fixture
+    def directory(self, tmp_path):
+        return str(tmp_path / "journal")
+
+    def open_repository(self, directory, snapshot_interval=100_000, contents=None):
+        return InMemoryDocumentRepository(
+            DocumentJournal(directory, snapshot_interval=snapshot_interval), contents
+        )
+
+    async def test_restores_from_wal(self, directory):
+        repository = self.open_repository(directory)
+        kept = Document(title="Kept", content="Kept content", source="a.pdf")
+        updated = Document(title="Updated", content="Original content")
+        deleted = Document(title="Deleted", content="Deleted content")
+        await repository.save_many([kept, updated, deleted])
+        updated.update_content("Changed content")
+        await repository.update(updated)
+        await repository.delete(deleted.id)
+        repository.close()
+
+        restored = self.open_repository(directory)
+
+        assert await restored.count() == 2
+        assert await restored.find_by_id(kept.id) == kept
+        assert (await restored.find_by_id(updated.id)).content == "Changed content"
+        assert await restored.find_by_id(deleted.id) is None
+        restored.close()
+
+    async def test_restores_after_delete_all(self, directory):
+        repository = self.open_repository(directory)
+        await repository.save(Document(title="Old", content="Content"))
+        await repository.delete_all()
+        new = Document(title="New", content="Content")
+        await repository.save(new)
+        repository.close()
+
+        restored = self.open_repository(directory)
+
+        assert [d.id for d in await restored.find_all()] == [new.id]
+        restored.close()
+
+    async def test_snapshot_plus_wal_tail(self, directory):
+        repository = self.open_repository(directory, snapshot_interval=3)
+        docs = [Document(title=f"Doc {i}", content=f"Content {i}") for i in range(5)]
+        for doc in docs[:3]:
+            await repository.save(doc)  # third save triggers a snapshot
+        repository._journal._snapshot_thread.join()
+        for doc in docs[3:]:
+            await repository.save(doc)
+        await repository.delete(docs[0].id)
+        repository.close()
+
+        assert os.path.exists(os.path.join(directory, "snapshot.bin"))
+        assert len(wal_files(directory)) == 1
+
+        restored = self.open_repository(directory)
+
+        assert await restored.count() == 4
+        assert [d.id for d in await restored.find_all()] == [d.id for d in docs[1:]]
+        restored.close()
+
+    async def test_snapshot_of_compressed_bodies(self, directory):
+        repository = self.open_repository(
+            directory, snapshot_interval=3, contents=ContentStore(ContentCodec())
+        )
+        docs = [Document(title=f"Doc {i}", content=f"Body {i} " * 20) for i in range(3)]
+        await repository.save_many(docs)
+        repository._journal._snapshot_thread.join()
+        repository.close()
+
+        restored = self.open_repository(directory)
+
+        assert [d.content for d in await restored.find_all()] == [
+            d.content for d in docs
+        ]
+        restored.close()
+
+    async def test_torn_wal_tail_is_discarded(self, directory):
+        repository = self.open_repository(directory)
+        doc = Document(title="Doc", content="Content")
+        await repository.save(doc)
+        repository.close()
+        with open(os.path.join(directory, wal_files(directory)[-1]), "ab") as f:
+            f.write(b"\x01\x02\x03")
+
+        restored = self.open_repository(directory)
+
+        assert await restored.find_by_id(doc.id) == doc
+        restored.close()
+
+    async def test_explicit_snapshot_removes_covered_wal(self, directory):
+        journal = DocumentJournal(directory)
+        repository = InMemoryDocumentRepository(journal)
+        doc = Document(title="Doc", content="Content")
+        await repository.save(doc)
+
+        journal.snapshot(list(repository._records.values()), wait=True)
+        repository.close()
+
+        assert len(wal_files(directory)) == 1
+        restored = self.open_repository(directory)
+        assert await restored.find_by_id(doc.id) == doc
+        restored.close()
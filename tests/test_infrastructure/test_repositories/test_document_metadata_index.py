@@ -0,0 +1,140 @@
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter
+from src.domain.document.models.document_record import (
+    DocumentRecord,
+    datetime_to_micros,
+    micros_to_datetime,
+)
+from src.infrastructure.repositories.document_metadata_index import (
+    DocumentMetadataIndex,
+)
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def make_record(day: int, title: str, source: str, updated_day: int | None = None):
+    created = datetime_to_micros(START + timedelta(days=day))
+    updated = datetime_to_micros(START + timedelta(days=updated_day or day))
+    return DocumentRecord(uuid4().int, title, "Content", source, created, updated)
+
+
+@pytest.fixture
+def records():
+    return [
+        make_record(day, f"{'Alpha' if day % 2 else 'Beta'} {day}", f"s{day % 3}")
+        for day in range(30)
+    ]
+
+
+@pytest.fixture
+def index(records):
+    index = DocumentMetadataIndex()
+    for record in records:
+        index.add(record.id, record)
+    return index
+
+
+def expected(records, predicate):
+    return [
+        r.id
+        for r in sorted(records, key=lambda r: (r.created_at, r.id))
+        if predicate(r)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("document_filter", "predicate"),
+    [
+        (DocumentFilter(source="s1"), lambda r: r.source == "s1"),
+        (DocumentFilter(title_prefix="Alpha"), lambda r: r.title.startswith("Alpha")),
+        (
+            DocumentFilter(source="s2", created_after=START + timedelta(days=10)),
+            lambda r: (
+                r.source == "s2"
+                and r.created_at >= datetime_to_micros(START + timedelta(days=10))
+            ),
+        ),
+        (
+            DocumentFilter(
+                updated_after=START + timedelta(days=3),
+                updated_before=START + timedelta(days=6),
+            ),
+            lambda r: 3 <= (micros_to_datetime(r.updated_at) - START).days < 6,
+        ),
+        (DocumentFilter(source="missing"), lambda _: False),
+    ],
+)
+def test_filtered_listing_matches_a_full_scan(
+    index, records, document_filter, predicate
+):
+    matching = expected(records, predicate)
+
+    assert index.slice(100, 0, document_filter) == matching
+    assert index.slice(2, 1, document_filter) == matching[1:3]
+    assert index.count(document_filter) == len(matching)
+    assert sorted(index.ids(document_filter)) == sorted(matching)
+
+
+def test_filtered_keyset_pages(index, records):
+    document_filter = DocumentFilter(source="s0")
+    pages = []
+    cursor = None
+    while page := index.after(cursor, 3, document_filter):
+        pages.extend(page)
+        record = next(r for r in records if r.id == page[-1])
+        cursor = DocumentCursor(
+            created_at=micros_to_datetime(record.created_at),
+            document_id=UUID(int=record.id),
+        )
+
+    assert pages == expected(records, lambda r: r.source == "s0")
+
+
+def test_indexes_follow_updates_and_removals(index, records):
+    moved = records[0]
+    index.add(moved.id, make_record(0, "Gamma", "s9"))
+    index.remove(records[1].id)
+
+    assert index.ids(DocumentFilter(source="s9")) == [moved.id]
+    assert index.ids(DocumentFilter(title_prefix="Gamma")) == [moved.id]
+    assert moved.id not in index.ids(DocumentFilter(source="s0"))
+    assert index.count(DocumentFilter(title_prefix="Alpha 1 ")) == 0
+    assert records[1].id not in index.ids(DocumentFilter(title_prefix="Alpha"))
+    assert len(index) == len(records) - 1
+
+
+def test_rebuild_matches_incremental_adds(index, records):
+    rebuilt = DocumentMetadataIndex()
+    rebuilt.rebuild((record.id, record) for record in records)
+
+    document_filter = DocumentFilter(title_prefix="Beta", source="s1")
+    assert rebuilt.slice(100, 0, document_filter) == index.slice(
+        100, 0, document_filter
+    )
+
+
+def test_buffered_writes_survive_merges(monkeypatch, records):
+    monkeypatch.setattr(
+        "src.infrastructure.repositories.document_metadata_index._MERGE_THRESHOLD", 2
+    )
+    index = DocumentMetadataIndex()
+    for record in records:
+        index.add(record.id, record)
+    for record in records[::3]:
+        index.add(record.id, make_record(0, f"Moved {record.title}", "s0"))
+    for record in records[1::3]:
+        index.remove(record.id)
+
+    moved = {record.id for record in records[::3]}
+    assert set(index.ids(DocumentFilter(title_prefix="Moved"))) == moved
+    assert set(index.ids(DocumentFilter(title_prefix="Alpha"))) == {
+        r.id for r in records[2::3] if r.title.startswith("Alpha")
+    }
+    assert index.count(DocumentFilter(updated_before=START + timedelta(days=1))) == (
+        len(moved)
+    )
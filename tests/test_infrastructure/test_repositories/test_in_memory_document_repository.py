@@ -4,6 +4,10 @@ from uuid import UUID
 import pytest
 
 from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter
+from src.infrastructure.repositories.content_codec import ContentCodec
+from src.infrastructure.repositories.content_store import ContentStore
 from src.infrastructure.repositories.in_memory_document_repository import (
     InMemoryDocumentRepository,
 )
@@ -139,3 +143,205 @@ class TestInMemoryDocumentRepository:
         # Verify all deleted
         docs = await repository.find_all()
         assert len(docs) == 0
+
+    async def test_find_after_pages_in_order(self, repository):
+        docs = []
+        for i in range(7):
+            doc = Document(
+                title=f"Document {i}",
+                content=f"Content {i}",
+                created_at=datetime(2024, 1, 7 - i, tzinfo=UTC),
+            )
+            docs.append(doc)
+            await repository.save(doc)
+        expected = sorted(docs, key=lambda d: d.created_at)
+
+        first_page = await repository.find_after(None, limit=3)
+        cursor = DocumentCursor.from_document(first_page[-1])
+        second_page = await repository.find_after(cursor, limit=3)
+        cursor = DocumentCursor.from_document(second_page[-1])
+        last_page = await repository.find_after(cursor, limit=3)
+
+        assert [d.id for d in first_page + second_page + last_page] == [
+            d.id for d in expected
+        ]
+        assert len(last_page) == 1
+
+    async def test_find_after_breaks_created_at_ties_by_id(self, repository):
+        created_at = datetime(2024, 1, 1, tzinfo=UTC)
+        for i in range(4):
+            await repository.save(
+                Document(title=f"Doc {i}", content="Content", created_at=created_at)
+            )
+
+        first_page = await repository.find_after(None, limit=2)
+        cursor = DocumentCursor.from_document(first_page[-1])
+        second_page = await repository.find_after(cursor, limit=2)
+
+        ids = [d.id for d in first_page + second_page]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == 4
+
+    async def test_ordered_index_follows_updates_and_deletes(self, repository):
+        docs = [
+            Document(
+                title=f"Document {i}",
+                content=f"Content {i}",
+                created_at=datetime(2024, 1, i + 1, tzinfo=UTC),
+            )
+            for i in range(3)
+        ]
+        for doc in docs:
+            await repository.save(doc)
+
+        await repository.delete(docs[0].id)
+        docs[1].created_at = datetime(2024, 2, 1, tzinfo=UTC)
+        await repository.update(docs[1])
+
+        found_docs = await repository.find_all()
+
+        assert [d.id for d in found_docs] == [docs[2].id, docs[1].id]
+
+    async def test_version_grows_on_every_mutation(self, repository, sample_document):
+        """Test that writes bump the version and reads do not."""
+        versions = [repository.version]
+        await repository.save(sample_document)
+        versions.append(repository.version)
+        await repository.find_all()
+        await repository.update(sample_document)
+        versions.append(repository.version)
+        await repository.delete(sample_document.id)
+        versions.append(repository.version)
+        await repository.delete_all()
+        versions.append(repository.version)
+
+        assert versions == sorted(set(versions))
+        assert len(versions) == 5
+
+    async def test_filtered_listing_uses_metadata(self, repository):
+        docs = [
+            Document(
+                title=f"{'Guide' if i % 2 else 'Notes'} {i}",
+                content=f"Content {i}",
+                source="wiki" if i < 4 else "blog",
+                created_at=datetime(2024, 1, i + 1, tzinfo=UTC),
+                updated_at=datetime(2024, 2, i + 1, tzinfo=UTC),
+            )
+            for i in range(6)
+        ]
+        await repository.save_many(docs)
+        document_filter = DocumentFilter(
+            source="wiki", created_after=datetime(2024, 1, 2, tzinfo=UTC)
+        )
+
+        first_page = await repository.find_all(limit=2, document_filter=document_filter)
+        cursor = DocumentCursor.from_document(first_page[-1])
+        rest = await repository.find_after(cursor, document_filter=document_filter)
+
+        assert [d.id for d in first_page + rest] == [d.id for d in docs[1:4]]
+        assert await repository.count(document_filter) == 3
+        assert await repository.find_ids(DocumentFilter(title_prefix="Gui")) == {
+            docs[1].id,
+            docs[3].id,
+            docs[5].id,
+        }
+        assert await repository.find_ids(
+            DocumentFilter(updated_before=datetime(2024, 2, 2, tzinfo=UTC))
+        ) == {docs[0].id}
+
+    async def test_count(self, repository, sample_document):
+        assert await repository.count() == 0
+
+        await repository.save(sample_document)
+        await repository.save(sample_document)
+
+        assert await repository.count() == 1
+
+    async def test_find_existing(self, repository, sample_document):
+        await repository.save(sample_document)
+        missing = Document(title="Missing", content="Content")
+
+        found = await repository.find_existing([sample_document.id, missing.id])
+
+        assert found == {sample_document.id}
+
+    async def test_save_many(self, repository, sample_document):
+        await repository.save(sample_document)
+        sample_document.update_content("Changed content")
+        docs = [Document(title=f"Doc {i}", content="Content") for i in range(3)]
+
+        saved = await repository.save_many([sample_document, *docs])
+
+        assert saved == [sample_document, *docs]
+        assert await repository.count() == 4
+        found_doc = await repository.find_by_id(sample_document.id)
+        assert found_doc.content == "Changed content"
+
+    async def test_iter_all(self, repository):
+        docs = [
+            Document(
+                title=f"Document {i}",
+                content=f"Content {i}",
+                created_at=datetime(2024, 1, 10 - i, tzinfo=UTC),
+            )
+            for i in range(7)
+        ]
+        await repository.save_many(docs)
+
+        found = [doc async for doc in repository.iter_all(batch_size=3)]
+
+        assert [d.id for d in found] == [
+            d.id for d in sorted(docs, key=lambda d: d.created_at)
+        ]
+
+    async def test_identical_bodies_are_stored_once(self, repository):
+        first = Document(title="First", content="".join(["same ", "body"]))
+        second = Document(title="Second", content="".join(["same ", "body"]))
+        await repository.save_many([first, second])
+
+        found_first = await repository.find_by_id(first.id)
+        found_second = await repository.find_by_id(second.id)
+
+        assert found_first.content is found_second.content
+        stats = await repository.stats()
+        assert stats["documents"] == 2
+        assert stats["unique_bodies"] == 1
+        assert stats["dedup_ratio"] == 2.0
+
+    async def test_body_references_follow_update_and_delete(
+        self, repository, sample_document
+    ):
+        copy = Document(title="Copy", content=sample_document.content)
+        await repository.save_many([sample_document, copy])
+
+        sample_document.update_content("Different content")
+        await repository.update(sample_document)
+        stats = await repository.stats()
+        assert stats["unique_bodies"] == 2
+        assert stats["body_references"] == 2
+
+        await repository.delete(copy.id)
+        await repository.delete(sample_document.id)
+        stats = await repository.stats()
+        assert stats["unique_bodies"] == 0
+        assert stats["body_references"] == 0
+
+    async def test_compressed_bodies(self):
+        repository = InMemoryDocumentRepository(contents=ContentStore(ContentCodec()))
+        docs = [
+            Document(
+                title=f"Document {i}",
+                content=f"Compressible content {i % 2} " * 20,
+                created_at=datetime(2024, 1, 1 + i, tzinfo=UTC),
+            )
+            for i in range(4)
+        ]
+        await repository.save_many(docs)
+        docs[0].update_content("Replaced content " * 20)
+        await repository.update(docs[0])
+
+        assert await repository.find_by_id(docs[0].id) == docs[0]
+        assert await repository.find_all() == docs
+        stats = await repository.stats()
+        assert stats["unique_bodies"] == 3
+        assert stats["compressed_bytes"] < stats["stored_chars"]
@@ -0,0 +1,265 @@
+import os
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter
+from src.infrastructure.repositories.segment_document_repository import (
+    SegmentDocumentRepository,
+)
+
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".log"))
+
+
+class TestSegmentDocumentRepository:
+    @pytest.fixture
+    def directory(self, tmp_path):
+        return str(tmp_path / "segments")
+
+    @pytest.fixture
+    def repository(self, directory):
+        repository = SegmentDocumentRepository(directory)
+        yield repository
+        repository.close()
+
+    @pytest.fixture
+    def sample_document(self):
+        return Document(
+            title="Test Document",
+            content="This is test content",
+            source="test.pdf",
+            created_at=datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC),
+            updated_at=datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC),
+        )
+
+    async def test_save_and_find_by_id(self, repository, sample_document):
+        await repository.save(sample_document)
+
+        found_doc = await repository.find_by_id(sample_document.id)
+
+        assert found_doc == sample_document
+
+    async def test_find_by_id_not_found(self, repository):
+        random_id = UUID("12345678-1234-5678-1234-567812345678")
+
+        assert await repository.find_by_id(random_id) is None
+
+    async def test_find_all_and_find_after(self, repository):
+        docs = [
+            Document(
+                title=f"Document {i}",
+                content=f"Content {i}",
+                created_at=datetime(2024, 1, 5 - i, tzinfo=UTC),
+            )
+            for i in range(5)
+        ]
+        for doc in docs:
+            await repository.save(doc)
+        expected = [d.id for d in sorted(docs, key=lambda d: d.created_at)]
+
+        first_page = await repository.find_all(limit=2)
+        cursor = DocumentCursor.from_document(first_page[-1])
+        rest = await repository.find_after(cursor, limit=10)
+
+        assert [d.id for d in first_page + rest] == expected
+        assert [d.content for d in rest] == ["Content 2", "Content 1", "Content 0"]
+
+    async def test_version_grows_on_every_mutation(self, repository, sample_document):
+        """Test that writes bump the version and reads do not."""
+        versions = [repository.version]
+        await repository.save(sample_document)
+        versions.append(repository.version)
+        await repository.find_all()
+        await repository.update(sample_document)
+        versions.append(repository.version)
+        await repository.delete(sample_document.id)
+        versions.append(repository.version)
+        await repository.delete_all()
+        versions.append(repository.version)
+
+        assert versions == sorted(set(versions))
+        assert len(versions) == 5
+
+    async def test_filtered_listing_uses_metadata(self, repository):
+        docs = [
+            Document(
+                title=f"{'Guide' if i % 2 else 'Notes'} {i}",
+                content=f"Content {i}",
+                source="wiki" if i < 4 else "blog",
+                created_at=datetime(2024, 1, i + 1, tzinfo=UTC),
+                updated_at=datetime(2024, 2, i + 1, tzinfo=UTC),
+            )
+            for i in range(6)
+        ]
+        await repository.save_many(docs)
+        document_filter = DocumentFilter(
+            source="wiki", created_after=datetime(2024, 1, 2, tzinfo=UTC)
+        )
+
+        first_page = await repository.find_all(limit=2, document_filter=document_filter)
+        cursor = DocumentCursor.from_document(first_page[-1])
+        rest = await repository.find_after(cursor, document_filter=document_filter)
+
+        assert [d.id for d in first_page + rest] == [d.id for d in docs[1:4]]
+        assert await repository.count(document_filter) == 3
+        assert await repository.find_ids(DocumentFilter(title_prefix="Gui")) == {
+            docs[1].id,
+            docs[3].id,
+            docs[5].id,
+        }
+        assert await repository.find_ids(
+            DocumentFilter(updated_before=datetime(2024, 2, 2, tzinfo=UTC))
+        ) == {docs[0].id}
+
+    async def test_update_and_delete(self, repository, sample_document):
+        await repository.save(sample_document)
+        sample_document.update_content("Updated content")
+        await repository.update(sample_document)
+
+        found_doc = await repository.find_by_id(sample_document.id)
+        assert found_doc.content == "Updated content"
+
+        assert await repository.delete(sample_document.id) is True
+        assert await repository.delete(sample_document.id) is False
+        assert await repository.count() == 0
+
+    async def test_update_nonexistent_document(self, repository):
+        doc = Document(title="New", content="Content")
+
+        with pytest.raises(ValueError, match=f"Document with id {doc.id} not found"):
+            await repository.update(doc)
+
+    async def test_delete_all(self, repository, directory):
+        for i in range(5):
+            await repository.save(Document(title=f"Doc {i}", content="Content"))
+
+        count = await repository.delete_all()
+
+        assert count == 5
+        assert await repository.find_all() == []
+        assert len(segment_files(directory)) == 1
+
+    async def test_state_is_restored_on_reopen(self, directory, sample_document):
+        repository = SegmentDocumentRepository(directory)
+        kept = Document(title="Kept", content="Kept content")
+        deleted = Document(title="Deleted", content="Deleted content")
+        for doc in (sample_document, kept, deleted):
+            await repository.save(doc)
+        sample_document.update_content("Updated content")
+        await repository.update(sample_document)
+        await repository.delete(deleted.id)
+        repository.close()
+
+        reopened = SegmentDocumentRepository(directory)
+        try:
+            assert await reopened.count() == 2
+            found_doc = await reopened.find_by_id(sample_document.id)
+            assert found_doc.content == "Updated content"
+            assert await reopened.find_by_id(deleted.id) is None
+        finally:
+            reopened.close()
+
+    async def test_torn_tail_record_is_discarded(self, directory, sample_document):
+        repository = SegmentDocumentRepository(directory)
+        await repository.save(sample_document)
+        repository.close()
+        path = os.path.join(directory, segment_files(directory)[-1])
+        with open(path, "ab") as f:
+            f.write(b"\x00\x01partial")
+
+        reopened = SegmentDocumentRepository(directory)
+        try:
+            assert await reopened.find_by_id(sample_document.id) == sample_document
+            other = Document(title="Other", content="Other content")
+            await reopened.save(other)
+            assert await reopened.find_by_id(other.id) == other
+        finally:
+            reopened.close()
+
+    async def test_segments_roll_over(self, directory):
+        repository = SegmentDocumentRepository(directory, max_segment_bytes=256)
+        try:
+            for i in range(10):
+                await repository.save(Document(title=f"Doc {i}", content="x" * 100))
+
+            assert len(segment_files(directory)) > 1
+            assert len(await repository.find_all()) == 10
+        finally:
+            repository.close()
+
+    async def test_compaction_reclaims_space(self, directory):
+        repository = SegmentDocumentRepository(
+            directory, max_segment_bytes=512, min_compaction_bytes=10**9
+        )
+        docs = [Document(title=f"Doc {i}", content="x" * 100) for i in range(10)]
+        for doc in docs:
+            await repository.save(doc)
+        for doc in docs[:8]:
+            await repository.delete(doc.id)
+        docs[8].update_content("y" * 100)
+        await repository.update(docs[8])
+        size_before = sum(
+            os.path.getsize(os.path.join(directory, name))
+            for name in segment_files(directory)
+        )
+
+        repository.compact()
+
+        size_after = sum(
+            os.path.getsize(os.path.join(directory, name))
+            for name in segment_files(directory)
+        )
+        assert size_after < size_before
+        assert [d.id for d in await repository.find_all()] == [
+            docs[8].id,
+            docs[9].id,
+        ]
+        assert (await repository.find_by_id(docs[8].id)).content == "y" * 100
+        repository.close()
+
+        reopened = SegmentDocumentRepository(directory)
+        try:
+            assert await reopened.count() == 2
+            assert (await reopened.find_by_id(docs[9].id)).content == "x" * 100
+        finally:
+            reopened.close()
+
+    async def test_background_compaction_is_triggered(self, directory):
+        repository = SegmentDocumentRepository(
+            directory, max_segment_bytes=512, min_compaction_bytes=1
+        )
+        try:
+            doc = Document(title="Doc", content="x" * 100)
+            for _ in range(20):
+                await repository.save(doc)
+            repository._compaction_thread.join()
+
+            assert (await repository.find_by_id(doc.id)).content == "x" * 100
+            assert await repository.count() == 1
+        finally:
+            repository.close()
+
+    async def test_find_existing(self, repository, sample_document):
+        await repository.save(sample_document)
+        missing = Document(title="Missing", content="Content")
+
+        found = await repository.find_existing([sample_document.id, missing.id])
+
+        assert found == {sample_document.id}
+
+    async def test_save_many(self, repository, sample_document):
+        await repository.save(sample_document)
+        sample_document.update_content("Changed content")
+        docs = [Document(title=f"Doc {i}", content=f"Content {i}") for i in range(3)]
+
+        await repository.save_many([sample_document, *docs])
+
+        assert await repository.count() == 4
+        found_doc = await repository.find_by_id(sample_document.id)
+        assert found_doc.content == "Changed content"
+        assert (await repository.find_by_id(docs[2].id)).content == "Content 2"
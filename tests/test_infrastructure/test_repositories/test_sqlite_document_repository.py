@@ -0,0 +1,259 @@
+import asyncio
+import threading
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.domain.document.models.document_cursor import DocumentCursor
+from src.domain.document.models.document_filter import DocumentFilter
+from src.infrastructure.repositories.sqlite_document_repository import (
+    SqliteDocumentRepository,
+)
+
+
+class TestSqliteDocumentRepository:
+    @pytest.fixture
+    def database_path(self, tmp_path):
+        return str(tmp_path / "documents.db")
+
+    @pytest.fixture
+    def repository(self, database_path):
+        repository = SqliteDocumentRepository(database_path, reader_pool_size=2)
+        yield repository
+        repository.close()
+
+    @pytest.fixture
+    def sample_document(self):
+        return Document(
+            title="Test Document",
+            content="This is test content",
+            source="test.pdf",
+            created_at=datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC),
+            updated_at=datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC),
+        )
+
+    async def test_save_and_find_by_id(self, repository, sample_document):
+        saved_doc = await repository.save(sample_document)
+
+        found_doc = await repository.find_by_id(sample_document.id)
+
+        assert saved_doc == sample_document
+        assert found_doc == sample_document
+
+    async def test_find_by_id_not_found(self, repository):
+        random_id = UUID("12345678-1234-5678-1234-567812345678")
+
+        assert await repository.find_by_id(random_id) is None
+
+    async def test_save_existing_document_overwrites(self, repository, sample_document):
+        await repository.save(sample_document)
+        sample_document.update_content("Changed content")
+        await repository.save(sample_document)
+
+        found_doc = await repository.find_by_id(sample_document.id)
+
+        assert found_doc.content == "Changed content"
+        assert await repository.count() == 1
+
+    async def test_find_all_with_pagination(self, repository):
+        docs = [
+            Document(
+                title=f"Document {i}",
+                content=f"Content {i}",
+                created_at=datetime(2024, 1, 10 - i, tzinfo=UTC),
+            )
+            for i in range(10)
+        ]
+        for doc in docs:
+            await repository.save(doc)
+        expected = sorted(docs, key=lambda d: d.created_at)
+
+        first_page = await repository.find_all(limit=3)
+        beyond = await repository.find_all(limit=5, offset=8)
+
+        assert [d.id for d in first_page] == [d.id for d in expected[:3]]
+        assert [d.id for d in beyond] == [d.id for d in expected[8:]]
+
+    async def test_find_after_pages_in_order(self, repository):
+        created_at = datetime(2024, 1, 1, tzinfo=UTC)
+        docs = [
+            Document(title=f"Doc {i}", content="Content", created_at=created_at)
+            for i in range(5)
+        ]
+        for doc in docs:
+            await repository.save(doc)
+
+        first_page = await repository.find_after(None, limit=3)
+        cursor = DocumentCursor.from_document(first_page[-1])
+        second_page = await repository.find_after(cursor, limit=3)
+
+        ids = [d.id for d in first_page + second_page]
+        assert ids == sorted(d.id for d in docs)
+
+    async def test_version_grows_on_every_mutation(self, repository, sample_document):
+        """Test that writes bump the version and reads do not."""
+        versions = [repository.version]
+        await repository.save(sample_document)
+        versions.append(repository.version)
+        await repository.find_all()
+        await repository.update(sample_document)
+        versions.append(repository.version)
+        await repository.delete(sample_document.id)
+        versions.append(repository.version)
+        await repository.delete_all()
+        versions.append(repository.version)
+
+        assert versions == sorted(set(versions))
+        assert len(versions) == 5
+
+    async def test_filtered_listing_uses_metadata(self, repository):
+        docs = [
+            Document(
+                title=f"{'Guide' if i % 2 else 'Notes'} {i}",
+                content=f"Content {i}",
+                source="wiki" if i < 4 else "blog",
+                created_at=datetime(2024, 1, i + 1, tzinfo=UTC),
+                updated_at=datetime(2024, 2, i + 1, tzinfo=UTC),
+            )
+            for i in range(6)
+        ]
+        await repository.save_many(docs)
+        document_filter = DocumentFilter(
+            source="wiki", created_after=datetime(2024, 1, 2, tzinfo=UTC)
+        )
+
+        first_page = await repository.find_all(limit=2, document_filter=document_filter)
+        cursor = DocumentCursor.from_document(first_page[-1])
+        rest = await repository.find_after(cursor, document_filter=document_filter)
+
+        assert [d.id for d in first_page + rest] == [d.id for d in docs[1:4]]
+        assert await repository.count(document_filter) == 3
+        assert await repository.find_ids(DocumentFilter(title_prefix="Gui")) == {
+            docs[1].id,
+            docs[3].id,
+            docs[5].id,
+        }
+        assert await repository.find_ids(
+            DocumentFilter(updated_before=datetime(2024, 2, 2, tzinfo=UTC))
+        ) == {docs[0].id}
+
+    async def test_update_document(self, repository, sample_document):
+        await repository.save(sample_document)
+
+        sample_document.update_content("Updated content")
+        await repository.update(sample_document)
+
+        found_doc = await repository.find_by_id(sample_document.id)
+        assert found_doc.content == "Updated content"
+        assert found_doc.updated_at == sample_document.updated_at
+
+    async def test_update_nonexistent_document(self, repository):
+        doc = Document(title="New", content="Content")
+
+        with pytest.raises(ValueError, match=f"Document with id {doc.id} not found"):
+            await repository.update(doc)
+
+    async def test_delete_document(self, repository, sample_document):
+        await repository.save(sample_document)
+
+        assert await repository.delete(sample_document.id) is True
+        assert await repository.delete(sample_document.id) is False
+        assert await repository.find_by_id(sample_document.id) is None
+        assert await repository.count() == 0
+
+    async def test_delete_all(self, repository):
+        for i in range(5):
+            await repository.save(Document(title=f"Doc {i}", content="Content"))
+
+        count = await repository.delete_all()
+
+        assert count == 5
+        assert await repository.find_all() == []
+        assert await repository.count() == 0
+
+    async def test_concurrent_writes_are_group_committed(self, repository):
+        docs = [Document(title=f"Doc {i}", content="Content") for i in range(50)]
+
+        await asyncio.gather(*(repository.save(doc) for doc in docs))
+
+        assert await repository.count() == 50
+        assert len(await repository.find_all(limit=100)) == 50
+
+    async def test_failed_write_does_not_abort_group(self, repository):
+        missing = Document(title="Missing", content="Content")
+        docs = [Document(title=f"Doc {i}", content="Content") for i in range(5)]
+
+        results = await asyncio.gather(
+            repository.update(missing),
+            *(repository.save(doc) for doc in docs),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], ValueError)
+        assert await repository.count() == 5
+
+    async def test_cancelled_write_does_not_stop_the_writer(self, repository):
+        release = threading.Event()
+        cancelled = Document(title="Cancelled", content="Content")
+        later = Document(title="Later", content="Content")
+
+        # Hold the writer so the next write waits in the queue
+        blocker = asyncio.create_task(
+            repository._write(lambda _connection: (release.wait(), 0))
+        )
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(repository.save(cancelled))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        release.set()
+        await blocker
+
+        await asyncio.wait_for(repository.save(later), timeout=5)
+
+        assert await repository.find_by_id(later.id) == later
+        assert await repository.find_by_id(cancelled.id) is None
+
+    async def test_documents_persist_across_instances(
+        self, database_path, sample_document
+    ):
+        repository = SqliteDocumentRepository(database_path)
+        await repository.save(sample_document)
+        repository.close()
+
+        reopened = SqliteDocumentRepository(database_path)
+        try:
+            assert await reopened.count() == 1
+            assert await reopened.find_by_id(sample_document.id) == sample_document
+        finally:
+            reopened.close()
+
+    async def test_save_many(self, repository, sample_document):
+        await repository.save(sample_document)
+        sample_document.update_content("Changed content")
+        docs = [Document(title=f"Doc {i}", content="Content") for i in range(600)]
+
+        saved = await repository.save_many([sample_document, *docs, docs[0]])
+
+        assert len(saved) == 602
+        assert await repository.count() == 601
+        found_doc = await repository.find_by_id(sample_document.id)
+        assert found_doc.content == "Changed content"
+
+    async def test_find_existing(self, repository):
+        docs = [Document(title=f"Doc {i}", content="Content") for i in range(600)]
+        await repository.save_many(docs[::2])
+
+        found = await repository.find_existing([d.id for d in docs])
+
+        assert found == {d.id for d in docs[::2]}
+
+    async def test_iter_all(self, repository):
+        docs = [Document(title=f"Doc {i}", content="Content") for i in range(7)]
+        await repository.save_many(docs)
+
+        found = [doc async for doc in repository.iter_all(batch_size=3)]
+
+        assert sorted(d.id for d in found) == sorted(d.id for d in docs)
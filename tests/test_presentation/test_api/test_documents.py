@@ -1,5 +1,7 @@
 """Tests for document API endpoints."""
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -8,9 +10,11 @@ from src.presentation.api.app import create_app
 
 @pytest.fixture
 def client():
-    """Create test client."""
+    """Create test client and clear documents created by the test."""
     app = create_app()
-    return TestClient(app)
+    client = TestClient(app)
+    yield client
+    client.delete("/api/documents")
 
 
 def test_create_document(client: TestClient):
@@ -183,3 +187,249 @@ def test_delete_all_documents(client: TestClient):
     # Verify all are deleted
     list_response = client.get("/api/documents")
     assert list_response.json()["documents"] == []
+
+
+def test_list_documents_total_counts_all_documents(client: TestClient):
+    """Test that total reports the full document count, not the page size."""
+    client.delete("/api/documents")
+    for i in range(5):
+        client.post(
+            "/api/documents",
+            json={"title": f"Document {i}", "content": f"Content {i}"},
+        )
+
+    response = client.get("/api/documents?limit=2")
+    data = response.json()
+    assert len(data["documents"]) == 2
+    assert data["total"] == 5
+
+
+def test_list_documents_with_cursor(client: TestClient):
+    """Test keyset pagination using next_cursor."""
+    client.delete("/api/documents")
+    created_ids = []
+    for i in range(5):
+        response = client.post(
+            "/api/documents",
+            json={"title": f"Document {i}", "content": f"Content {i}"},
+        )
+        created_ids.append(response.json()["id"])
+
+    seen_ids = []
+    cursor = None
+    while True:
+        url = "/api/documents?limit=2"
+        if cursor:
+            url += f"&cursor={cursor}"
+        data = client.get(url).json()
+        seen_ids.extend(doc["id"] for doc in data["documents"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen_ids == created_ids
+
+
+def test_list_documents_with_invalid_cursor(client: TestClient):
+    """Test listing documents with a malformed cursor."""
+    response = client.get("/api/documents?cursor=not-a-cursor")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_list_documents_with_filters(client: TestClient):
+    """Test filtering the listing by source, title prefix and creation time."""
+    client.delete("/api/documents")
+    lines = [
+        {"title": "Guide 1", "content": "A", "source": "wiki"},
+        {"title": "Notes", "content": "B", "source": "wiki"},
+        {
+            "title": "Guide 2",
+            "content": "C",
+            "source": "blog",
+            "created_at": "2020-01-01T00:00:00Z",
+        },
+    ]
+    client.post(
+        "/api/documents/bulk",
+        content="\n".join(json.dumps(line) for line in lines),
+    )
+
+    wiki = client.get("/api/documents", params={"source": "wiki"}).json()
+    guides = client.get("/api/documents", params={"title_prefix": "Guide"}).json()
+    old = client.get(
+        "/api/documents", params={"created_before": "2021-01-01T00:00:00Z"}
+    ).json()
+
+    assert wiki["total"] == 2
+    assert {doc["title"] for doc in wiki["documents"]} == {"Guide 1", "Notes"}
+    assert [doc["title"] for doc in guides["documents"]] == ["Guide 2", "Guide 1"]
+    assert [doc["title"] for doc in old["documents"]] == ["Guide 2"]
+    invalid = client.get("/api/documents", params={"created_after": "yesterday"})
+    assert invalid.status_code == 422
+
+
+def test_bulk_create_documents(client: TestClient):
+    """Test bulk ingestion from an NDJSON body."""
+    client.delete("/api/documents")
+    lines = [
+        json.dumps({"title": f"Document {i}", "content": f"Content {i}"})
+        for i in range(5)
+    ]
+
+    response = client.post(
+        "/api/documents/bulk?batch_size=2",
+        content="\n".join(lines) + "\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 5, "updated": 0, "errors": []}
+    assert client.get("/api/documents").json()["total"] == 5
+
+
+def test_bulk_create_documents_reports_line_errors(client: TestClient):
+    """Test that invalid lines are reported without aborting the batch."""
+    client.delete("/api/documents")
+    body = "\n".join(
+        [
+            json.dumps({"title": "Valid", "content": "Content"}),
+            "not json",
+            "",
+            json.dumps({"title": "", "content": "Content"}),
+            json.dumps({"title": "Also valid", "content": "Content"}),
+        ]
+    )
+
+    response = client.post("/api/documents/bulk", content=body)
+
+    data = response.json()
+    assert data["inserted"] == 2
+    assert [error["line"] for error in data["errors"]] == [2, 4]
+    assert "Document title cannot be empty" in data["errors"][1]["error"]
+
+
+def test_bulk_create_documents_preserves_ids(client: TestClient):
+    """Test that ids and timestamps in the NDJSON body are kept."""
+    document_id = "123e4567-e89b-12d3-a456-426614174000"
+    line = json.dumps(
+        {
+            "id": document_id,
+            "title": "Imported",
+            "content": "Content",
+            "created_at": "2024-01-01T00:00:00Z",
+        }
+    )
+
+    client.post("/api/documents/bulk", content=line)
+
+    data = client.get(f"/api/documents/{document_id}").json()
+    assert data["title"] == "Imported"
+    assert data["created_at"] == "2024-01-01T00:00:00Z"
+
+
+def test_bulk_create_documents_counts_replaced_documents_as_updated(
+    client: TestClient,
+):
+    """Test that lines with an existing id are reported as updates."""
+    client.delete("/api/documents")
+    existing = client.post(
+        "/api/documents", json={"title": "Original", "content": "Content"}
+    ).json()
+    body = "\n".join(
+        [
+            json.dumps({**existing, "title": "Replaced"}),
+            json.dumps({"title": "New", "content": "Content"}),
+        ]
+    )
+
+    response = client.post("/api/documents/bulk", content=body)
+
+    assert response.json() == {"inserted": 1, "updated": 1, "errors": []}
+    assert client.get(f"/api/documents/{existing['id']}").json()["title"] == "Replaced"
+    assert client.get("/api/documents").json()["total"] == 2
+
+
+def test_bulk_create_documents_joins_lines_split_across_chunks(client: TestClient):
+    """Test that a streamed body is split into lines whatever its chunking."""
+    client.delete("/api/documents")
+    body = "\n".join(
+        json.dumps({"title": f"Document {i}", "content": "Content " * 50})
+        for i in range(3)
+    ).encode()
+
+    def chunks():
+        for start in range(0, len(body), 7):
+            yield body[start : start + 7]
+
+    response = client.post("/api/documents/bulk", content=chunks())
+
+    assert response.json() == {"inserted": 3, "updated": 0, "errors": []}
+    titles = {d["title"] for d in client.get("/api/documents").json()["documents"]}
+    assert titles == {"Document 0", "Document 1", "Document 2"}
+
+
+def test_export_documents(client: TestClient):
+    """Test streaming all documents as NDJSON."""
+    client.delete("/api/documents")
+    created_ids = [
+        client.post(
+            "/api/documents",
+            json={"title": f"Document {i}", "content": f"Content {i}"},
+        ).json()["id"]
+        for i in range(3)
+    ]
+
+    response = client.get(
+        "/api/documents/export", headers={"Accept-Encoding": "identity"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+    lines = response.text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == created_ids
+
+
+def test_export_documents_gzip(client: TestClient):
+    """Test that the export is gzip-compressed when accepted."""
+    client.delete("/api/documents")
+    client.post("/api/documents", json={"title": "Document", "content": "Content"})
+
+    response = client.get("/api/documents/export", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert json.loads(response.text.strip())["title"] == "Document"
+
+
+def test_export_then_bulk_import_round_trip(client: TestClient):
+    """Test that an export can be re-ingested through the bulk endpoint."""
+    client.delete("/api/documents")
+    for i in range(3):
+        client.post(
+            "/api/documents",
+            json={"title": f"Document {i}", "content": f"Content {i}"},
+        )
+    exported = client.get("/api/documents/export").text
+    client.delete("/api/documents")
+
+    response = client.post("/api/documents/bulk", content=exported)
+
+    assert response.json() == {"inserted": 3, "updated": 0, "errors": []}
+    assert client.get("/api/documents/export").text == exported
+
+
+def test_metrics_report_dedup_ratio(client: TestClient):
+    """Test that duplicate bodies are reported by the metrics endpoint."""
+    for title in ("One", "Two", "Three"):
+        client.post("/api/documents", json={"title": title, "content": "Same body"})
+    client.post("/api/documents", json={"title": "Four", "content": "Other body"})
+
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    repository = response.json()["repository"]
+    assert repository["documents"] == 4
+    assert repository["unique_bodies"] == 2
+    assert repository["dedup_ratio"] == 2.0
+    assert "hit_ratio" in response.json()["embedding_cache"]
@@ -1,9 +1,13 @@
 """Tests for RAG API endpoints."""
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
 from src.presentation.api.app import create_app
+from src.presentation.api.dependencies import get_rag_query_usecase
+from src.usecase.document.indexing_queue import IndexLagTimeout, UnknownIndexSequence
 
 
 @pytest.fixture
@@ -28,6 +32,8 @@ def test_execute_rag_query(client: TestClient):
     assert data["query"]["top_k"] == 3
     assert "answer" in data
     assert isinstance(data["sources"], list)
+    # Context packing is opt-in, so the retrieved documents are used whole
+    assert data["context"] is None
 
 
 def test_execute_rag_query_with_default_top_k(client: TestClient):
@@ -76,3 +82,88 @@ def test_execute_rag_query_invalid_top_k(client: TestClient):
         },
     )
     assert response.status_code == 422
+
+
+def test_stream_rag_query(client: TestClient):
+    """Test streaming a RAG query as Server-Sent Events."""
+    with client.stream(
+        "POST", "/api/rag/query/stream", json={"text": "What is ML?", "top_k": 3}
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = response.read().decode()
+
+    events = [
+        (lines[0].removeprefix("event: "), json.loads(lines[1].removeprefix("data: ")))
+        for lines in (block.split("\n") for block in body.strip().split("\n\n"))
+    ]
+    names = [name for name, _ in events]
+    assert names[0] == "sources"
+    assert set(names[1:-1]) <= {"token"}
+    assert names[-1] == "done"
+    done = events[-1][1]
+    assert done["query"]["text"] == "What is ML?"
+    tokens = [data["text"] for name, data in events if name == "token"]
+    assert "".join(tokens) == done["answer"]
+    assert events[0][1]["sources"] == done["sources"]
+
+
+def test_stream_rag_query_empty_text(client: TestClient):
+    """Test that an invalid streamed query is rejected before streaming."""
+    response = client.post("/api/rag/query/stream", json={"text": ""})
+    assert response.status_code == 422
+
+
+def test_retrieval_cache_is_opt_in(client: TestClient):
+    """Test that queries are not cached unless a cache size is configured."""
+    client.post("/api/rag/query", json={"text": "What is machine learning?"})
+
+    metrics = client.get("/api/metrics").json()
+
+    assert metrics["retrieval_cache"] == {}
+
+
+def test_query_coalescing_is_opt_in(client: TestClient):
+    """Test that queries are not coalesced unless COALESCE_QUERIES is set."""
+    client.post("/api/rag/query", json={"text": "What is machine learning?"})
+
+    metrics = client.get("/api/metrics").json()
+
+    assert metrics["query_coalescing"] == {}
+
+
+class _FailingUseCase:
+    """Use case stub whose queries raise a given error."""
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+    async def execute(self, **_kwargs):
+        raise self.error
+
+    async def stream(self, **_kwargs):
+        raise self.error
+
+
+@pytest.mark.parametrize("path", ["/api/rag/query", "/api/rag/query/stream"])
+@pytest.mark.parametrize(
+    ("error", "status_code"),
+    [
+        (IndexLagTimeout("lagging"), 503),
+        (UnknownIndexSequence("unknown"), 400),
+        # Other failures are not mistaken for index lag or a bad sequence
+        (TimeoutError("upstream timed out"), 500),
+        (ValueError("bad value"), 500),
+    ],
+)
+def test_rag_query_maps_only_index_wait_errors(path, error, status_code):
+    """Test that only index wait failures get their dedicated status codes."""
+    app = create_app()
+    app.dependency_overrides[get_rag_query_usecase] = lambda: _FailingUseCase(error)
+    client = TestClient(app, raise_server_exceptions=False)
+
+    response = client.post(
+        path, json={"text": "Question", "options": {"index_sequence": 1}}
+    )
+
+    assert response.status_code == status_code
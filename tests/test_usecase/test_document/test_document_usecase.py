@@ -4,6 +4,8 @@ from uuid import uuid4
 
 import pytest
 
+from src.domain.document.models.document import Document
+from src.infrastructure.algorithms.bm25_index import BM25Index
 from src.infrastructure.repositories.in_memory_document_repository import (
     InMemoryDocumentRepository,
 )
@@ -145,3 +147,46 @@ async def test_delete_all_documents(document_usecase):
     # Verify all are gone
     documents = await document_usecase.list()
     assert len(documents) == 0
+
+
+@pytest.mark.asyncio
+async def test_create_many_documents(document_usecase):
+    """Test saving a batch of documents."""
+    documents = [Document(title=f"Doc {i}", content=f"Content {i}") for i in range(3)]
+
+    created = await document_usecase.create_many(documents)
+
+    assert created == documents
+    assert await document_usecase.count() == 3
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_counts_inserts_and_updates(document_usecase):
+    """Test that documents with a stored ID are counted as updates."""
+    stored = await document_usecase.create(title="Stored", content="Content")
+    replacement = stored.model_copy(update={"title": "Replaced"})
+    new = Document(title="New", content="Content")
+
+    counts = await document_usecase.upsert_many([replacement, new, new])
+
+    assert counts == (1, 2)
+    assert (await document_usecase.get(stored.id)).title == "Replaced"
+    assert await document_usecase.count() == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_update_document_indexes():
+    """Test that registered indexes follow creates, deletes and delete_all."""
+    index = BM25Index()
+    usecase = DocumentUseCase(InMemoryDocumentRepository(), [index])
+
+    kept = await usecase.create(title="Kept", content="Alpha content")
+    removed = await usecase.create(title="Removed", content="Beta content")
+    await usecase.create_many([Document(title="Batch", content="Gamma content")])
+    assert len(index) == 3
+
+    await usecase.delete(removed.id)
+    assert [d for d, _ in index.search("alpha beta")] == [kept.id]
+
+    await usecase.delete_all()
+    assert len(index) == 0
@@ -0,0 +1,175 @@
+"""Tests for IndexingQueue."""
+
+import asyncio
+from uuid import UUID
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.domain.document.services.document_index import DocumentIndex
+from src.infrastructure.algorithms.bm25_index import BM25Index
+from src.infrastructure.repositories.in_memory_document_repository import (
+    InMemoryDocumentRepository,
+)
+from src.usecase.document.document_usecase import DocumentUseCase
+from src.usecase.document.indexing_queue import (
+    IndexingQueue,
+    IndexLagTimeout,
+    UnknownIndexSequence,
+)
+
+
+class RecordingIndex(DocumentIndex):
+    """Index recording its calls, optionally blocking until released."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, list[UUID]]] = []
+        self.documents: dict[UUID, Document] = {}
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def add(self, documents: list[Document]) -> None:
+        await self.release.wait()
+        self.calls.append(("add", [d.id for d in documents]))
+        self.documents.update((d.id, d) for d in documents)
+
+    async def remove(self, document_id: UUID) -> None:
+        await self.release.wait()
+        self.calls.append(("remove", [document_id]))
+        self.documents.pop(document_id, None)
+
+    async def clear(self) -> None:
+        self.calls.append(("clear", []))
+        self.documents.clear()
+
+
+class FailingIndex(RecordingIndex):
+    async def add(self, _documents: list[Document]) -> None:
+        raise RuntimeError("embedding service unavailable")
+
+
+def make_document(title: str = "Title") -> Document:
+    return Document(title=title, content=f"{title} content")
+
+
+@pytest.fixture
+def index():
+    return RecordingIndex()
+
+
+@pytest.fixture
+async def queue(index):
+    queue = IndexingQueue([index], workers=2)
+    yield queue
+    await queue.close()
+
+
+async def test_writes_are_applied_in_the_background(queue, index):
+    index.release.clear()
+    document = make_document()
+
+    sequence = await queue.add([document])
+
+    assert sequence == 1
+    assert queue.indexed_sequence == 0
+    assert queue.stats()["lag"] == 1
+    index.release.set()
+    await queue.wait_for(sequence, timeout=1)
+    assert document.id in index.documents
+    assert queue.stats()["lag"] == 0
+
+
+async def test_writes_of_a_document_stay_in_order(queue, index):
+    document = make_document()
+
+    await queue.add([document])
+    await queue.remove(document.id)
+    await queue.add([document.model_copy(update={"content": "new"})])
+    await queue.join()
+
+    assert index.documents[document.id].content == "new"
+    assert [kind for kind, _ in index.calls] == ["add", "remove", "add"]
+
+
+async def test_queued_additions_are_batched(index):
+    queue = IndexingQueue([index], workers=1)
+    index.release.clear()
+    first, second, third = make_document("a"), make_document("b"), make_document("c")
+
+    await queue.add([first])
+    await asyncio.sleep(0)  # The worker takes the first write alone
+    await queue.add([second, third])
+    index.release.set()
+    await queue.join()
+    await queue.close()
+
+    assert index.calls == [
+        ("add", [first.id]),
+        ("add", [second.id, third.id]),
+    ]
+
+
+async def test_full_queue_makes_writers_wait(index):
+    queue = IndexingQueue([index], workers=1, max_pending=1)
+    index.release.clear()
+    await queue.add([make_document()])
+    await asyncio.sleep(0)  # Taken by the worker, which blocks
+    await queue.add([make_document()])  # Fills the queue
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(queue.add([make_document()]), 0.05)
+    index.release.set()
+    await queue.join()
+    await queue.close()
+
+
+async def test_failing_index_does_not_stall_indexing():
+    index = FailingIndex()
+    queue = IndexingQueue([index], workers=1)
+
+    sequence = await queue.add([make_document()])
+    await queue.wait_for(sequence, timeout=1)
+    await queue.close()
+
+    assert queue.failed == 1
+    assert "embedding service unavailable" in queue.last_error
+
+
+async def test_wait_for_unassigned_sequence_raises(queue):
+    with pytest.raises(UnknownIndexSequence, match="not been assigned"):
+        await queue.wait_for(5)
+
+
+async def test_wait_for_times_out(queue, index):
+    index.release.clear()
+    sequence = await queue.add([make_document()])
+
+    with pytest.raises(IndexLagTimeout):
+        await queue.wait_for(sequence, timeout=0.01)
+    index.release.set()
+
+
+async def test_clear_applies_queued_writes_first(queue, index):
+    await queue.add([make_document(), make_document()])
+
+    sequence = await queue.clear()
+
+    assert queue.indexed_sequence == sequence == 3
+    assert index.calls[-1] == ("clear", [])
+    assert not index.documents
+
+
+async def test_document_usecase_queues_index_writes():
+    bm25 = BM25Index()
+    queue = IndexingQueue([bm25])
+    usecase = DocumentUseCase(InMemoryDocumentRepository(), indexing_queue=queue)
+
+    document = await usecase.create(title="Pasta", content="Boil the spaghetti")
+    assert usecase.indexing_sequence is not None
+    await queue.wait_for(usecase.indexing_sequence, timeout=1)
+    assert [d for d, _ in bm25.search("spaghetti")] == [document.id]
+
+    await usecase.delete(document.id)
+    await queue.wait_for(usecase.indexing_sequence, timeout=1)
+    assert bm25.search("spaghetti") == []
+    await queue.close()
@@ -0,0 +1,83 @@
+"""Tests for AnswerCache."""
+
+import pytest
+
+from src.domain.document.models.document import Document
+from src.domain.rag.models.query import Query, QueryResult
+from src.usecase.rag.answer_cache import AnswerCache
+
+VECTORS = {
+    "how do I reset my password": [1.0, 0.0, 0.0],
+    "how can I reset my password": [0.99, 0.1, 0.0],
+    "what are the opening hours": [0.0, 1.0, 0.0],
+}
+
+
+async def embed(text):
+    return VECTORS[text]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def documents():
+    return [
+        Document(title="Passwords", content="Use the reset link."),
+        Document(title="Accounts", content="Accounts are managed online."),
+    ]
+
+
+def result(text):
+    return QueryResult(query=Query(text=text), answer="Use the reset link.")
+
+
+async def store(cache, text, documents):
+    cache.put(await cache.embed(text), documents, result(text))
+
+
+async def lookup(cache, text, documents):
+    return cache.get(await cache.embed(text), documents)
+
+
+async def test_paraphrases_on_the_same_documents_hit(documents):
+    cache = AnswerCache(embed, threshold=0.95)
+    await store(cache, "how do I reset my password", documents)
+
+    hit = await lookup(cache, "how can I reset my password", documents[::-1])
+
+    assert hit is not None
+    assert hit.answer == "Use the reset link."
+    assert await lookup(cache, "what are the opening hours", documents) is None
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+async def test_changed_sources_miss(documents):
+    cache = AnswerCache(embed)
+    await store(cache, "how do I reset my password", documents)
+    edited = documents[0].model_copy(update={"content": "Call support."})
+
+    assert await lookup(cache, "how do I reset my password", documents[:1]) is None
+    assert (
+        await lookup(cache, "how do I reset my password", [edited, documents[1]])
+        is None
+    )
+
+
+async def test_entries_expire_and_are_bounded(documents):
+    clock = Clock()
+    cache = AnswerCache(embed, max_entries=1, ttl_seconds=10, clock=clock)
+    await store(cache, "how do I reset my password", documents)
+    await store(cache, "what are the opening hours", documents)
+
+    assert len(cache) == 1
+    assert await lookup(cache, "how do I reset my password", documents) is None
+    assert await lookup(cache, "what are the opening hours", documents) is not None
+    clock.now = 10
+    assert await lookup(cache, "what are the opening hours", documents) is None
+    assert len(cache) == 0
@@ -1,14 +1,20 @@
 """Tests for RAGQueryUseCase."""
 
+import asyncio
+
 import pytest
 
 from src.domain.document.models.document import Document
-from src.domain.rag.models.query import QueryResult
+from src.domain.rag.models.query import QueryResult, RetrievalOptions
+from src.domain.rag.services.reranker import Reranker
+from src.infrastructure.algorithms.context_packer import ContextPacker
 from src.infrastructure.algorithms.mock_rag_strategy import MockRAGStrategy
 from src.infrastructure.repositories.in_memory_document_repository import (
     InMemoryDocumentRepository,
 )
+from src.usecase.rag.answer_cache import AnswerCache
 from src.usecase.rag.rag_query_usecase import RAGQueryUseCase
+from src.usecase.rag.single_flight import SingleFlight
 from tests.test_infrastructure.test_algorithms.mock_openai_client import (
     MockOpenAIClient,
 )
@@ -98,3 +104,191 @@ async def test_execute_rag_query_with_invalid_top_k():
             query_text="Test query",
             top_k=101,
         )
+
+
+@pytest.mark.asyncio
+async def test_execute_rag_query_passes_retrieval_options():
+    """Test that per-query retrieval options reach the strategy."""
+    repository = InMemoryDocumentRepository()
+    strategy = MockRAGStrategy(repository)
+    received = []
+
+    async def retrieve_documents(_query_text, _top_k=5, options=None):
+        received.append(options)
+        return []
+
+    strategy.retrieve_documents = retrieve_documents  # type: ignore[method-assign]
+    usecase = RAGQueryUseCase(strategy, MockOpenAIClient())
+
+    result = await usecase.execute(
+        query_text="Test query", options=RetrievalOptions(nprobe=16)
+    )
+
+    assert received == [RetrievalOptions(nprobe=16)]
+    assert result.query.options.nprobe == 16
+
+
+@pytest.mark.asyncio
+async def test_execute_rag_query_reranks_deeper_candidates():
+    """Test that a rerank request retrieves more candidates and reranks them."""
+    repository = InMemoryDocumentRepository()
+    strategy = MockRAGStrategy(repository)
+    candidates = [Document(title=f"Doc {i}", content="Content") for i in range(8)]
+    depths = []
+
+    async def retrieve_documents(_query_text, top_k=5, _options=None):
+        depths.append(top_k)
+        return candidates[:top_k]
+
+    class ReverseReranker(Reranker):
+        async def rerank(self, _query_text, documents, top_k, _options=None):
+            return documents[::-1][:top_k]
+
+    strategy.retrieve_documents = retrieve_documents  # type: ignore[method-assign]
+    usecase = RAGQueryUseCase(
+        strategy, MockOpenAIClient(), reranker=ReverseReranker(), rerank_depth=6
+    )
+
+    result = await usecase.execute(
+        query_text="Test query", top_k=2, options=RetrievalOptions(rerank="mmr")
+    )
+    plain = await usecase.execute(query_text="Test query", top_k=2)
+
+    assert depths == [6, 2]
+    assert result.sources == [f"Doc {i} (ID: {candidates[i].id})" for i in (5, 4)]
+    assert len(plain.sources) == 2
+
+
+@pytest.mark.asyncio
+async def test_execute_rag_query_reuses_cached_answers():
+    """Test that a repeated question is answered from the answer cache."""
+    repository = InMemoryDocumentRepository()
+    await repository.save(Document(title="Test Document", content="Test content"))
+    client = MockOpenAIClient()
+    completions = []
+
+    async def get_chat_completion(messages, *_args):
+        completions.append(messages)
+        return "Generated answer"
+
+    client.get_chat_completion = get_chat_completion  # type: ignore[method-assign]
+    usecase = RAGQueryUseCase(
+        MockRAGStrategy(repository),
+        client,
+        answer_cache=AnswerCache(client.get_embeddings),
+    )
+
+    first = await usecase.execute(query_text="What is tested?")
+    second = await usecase.execute(query_text="What is tested here?")
+
+    assert len(completions) == 1
+    assert not first.cached
+    assert second.cached
+    assert second.answer == first.answer
+    assert second.query.text == "What is tested here?"
+
+
+@pytest.mark.asyncio
+async def test_execute_rag_query_coalesces_identical_queries():
+    """Test that concurrent identical queries share one generation."""
+    repository = InMemoryDocumentRepository()
+    await repository.save(Document(title="Test Document", content="Test content"))
+    client = MockOpenAIClient()
+    release = asyncio.Event()
+    completions = []
+
+    async def get_chat_completion(messages, *_args):
+        completions.append(messages)
+        await release.wait()
+        return "Generated answer"
+
+    client.get_chat_completion = get_chat_completion  # type: ignore[method-assign]
+    single_flight = SingleFlight()
+
+    def usecase():
+        # One use case per request, as in the API, sharing the flight table
+        return RAGQueryUseCase(
+            MockRAGStrategy(repository), client, single_flight=single_flight
+        )
+
+    queries = [
+        asyncio.create_task(usecase().execute(query_text=text))
+        for text in ["What is tested?", "what is  TESTED?", "Something else?"]
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    first, paraphrase, other = await asyncio.gather(*queries)
+
+    assert len(completions) == 2
+    assert paraphrase.answer == first.answer
+    assert paraphrase.query.text == "what is  TESTED?"
+    assert single_flight.stats()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_rag_query(rag_query_usecase):
+    """Test that a streamed query yields sources, answer pieces and a result."""
+    sources, answer = await rag_query_usecase.stream(query_text="What is tested?")
+    events = [event async for event in answer]
+    expected = await rag_query_usecase.execute(query_text="What is tested?")
+
+    assert sources == ["test.pdf"]
+    assert all(isinstance(event, str) for event in events[:-1])
+    assert len(events) > 2
+    assert "".join(events[:-1]) == expected.answer
+    assert events[-1] == expected
+
+
+@pytest.mark.asyncio
+async def test_stream_rag_query_shares_the_answer_cache():
+    """Test that streamed and plain queries reuse each other's answers."""
+    repository = InMemoryDocumentRepository()
+    await repository.save(Document(title="Test Document", content="Test content"))
+    client = MockOpenAIClient()
+    usecase = RAGQueryUseCase(
+        MockRAGStrategy(repository),
+        client,
+        answer_cache=AnswerCache(client.get_embeddings),
+    )
+
+    _, answer = await usecase.stream(query_text="What is tested?")
+    streamed = [event async for event in answer]
+    repeated = await usecase.execute(query_text="What is tested here?")
+    _, answer = await usecase.stream(query_text="What is tested?")
+    cached = [event async for event in answer]
+
+    assert repeated.cached
+    assert repeated.answer == streamed[-1].answer
+    assert cached[0] == repeated.answer
+    assert cached[-1].cached
+
+
+@pytest.mark.asyncio
+async def test_execute_rag_query_packs_the_context_into_the_budget():
+    """Test that long documents are reduced to relevant sentences."""
+    repository = InMemoryDocumentRepository()
+    filler = "Rivers and mountains shape the climate of every region. " * 200
+    answer = "The Amazon basin receives about two meters of rain per year."
+    await repository.save(Document(title="Climate", content=filler + answer))
+    client = MockOpenAIClient()
+    prompts = []
+
+    async def get_chat_completion(messages, *_args):
+        prompts.append(messages[1]["content"])
+        return "Generated answer"
+
+    client.get_chat_completion = get_chat_completion  # type: ignore[method-assign]
+    usecase = RAGQueryUseCase(
+        MockRAGStrategy(repository),
+        client,
+        context_packer=ContextPacker(max_tokens=500, max_document_tokens=200),
+    )
+
+    result = await usecase.execute(query_text="How much rain falls in the Amazon?")
+
+    assert answer in prompts[0]
+    assert len(prompts[0]) < len(filler) // 4
+    assert result.context is not None
+    assert result.context.tokens <= 200
+    assert result.context.tokens_saved > 2000
+    assert result.context.documents_compressed == 1
@@ -0,0 +1,67 @@
+"""Tests for SingleFlight."""
+
+import asyncio
+
+import pytest
+
+from src.usecase.rag.single_flight import SingleFlight
+
+
+class SlowWork:
+    """Work that finishes when released, counting its executions."""
+
+    def __init__(self, result="done"):
+        self.result = result
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight: SingleFlight[str] = SingleFlight()
+    work = SlowWork()
+
+    calls = [asyncio.create_task(flight.run("key", work)) for _ in range(5)]
+    other = asyncio.create_task(flight.run("other", work))
+    await asyncio.sleep(0)
+    work.release.set()
+
+    assert await asyncio.gather(*calls, other) == ["done"] * 6
+    assert work.calls == 2
+    assert flight.stats() == {"in_flight": 0, "executions": 2, "coalesced": 4}
+
+
+async def test_cancelled_callers_do_not_cancel_the_shared_work():
+    flight: SingleFlight[str] = SingleFlight()
+    work = SlowWork()
+
+    first = asyncio.create_task(flight.run("key", work))
+    second = asyncio.create_task(flight.run("key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    work.release.set()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_failures_reach_every_caller_and_release_the_key():
+    flight: SingleFlight[str] = SingleFlight()
+    work = SlowWork(ValueError("boom"))
+
+    calls = [asyncio.create_task(flight.run("key", work)) for _ in range(2)]
+    await asyncio.sleep(0)
+    work.release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert [str(result) for result in results] == ["boom", "boom"]
+    work.result = "again"
+    assert await flight.run("key", work) == "again"